@@ -11,13 +11,17 @@ hook; see :func:`code_puppy.callbacks.on_wrap_pydantic_agent`.
 
 from __future__ import annotations
 
+import asyncio
+import time
 import uuid
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 from pydantic_ai import Agent as PydanticAgent
 from pydantic_ai.capabilities import ProcessHistory
 
+from code_puppy import startup_profile
 from code_puppy.agents._compaction import make_history_processor
 from code_puppy.agents._model_message_transform import build_model_message_transform
 from code_puppy.agents._output_limits import (
@@ -36,6 +40,9 @@ from code_puppy.config import (
     CONFIG_DIR,
     get_agents_md_max_chars,
     get_global_model_name,
+    get_mcp_autostart_budget,
+    get_mcp_autostart_concurrency,
+    get_mcp_autostart_server_timeout,
     get_value,
 )
 from code_puppy.mcp_ import get_mcp_manager
@@ -204,6 +211,7 @@ def load_puppy_rules() -> Optional[str]:
     return "\n\n".join(rules) if rules else None
 
 
+@startup_profile.phase("mcp servers")
 def load_mcp_servers(
     extra_headers: Optional[Dict[str, str]] = None,
     agent_name: Optional[str] = None,
@@ -290,6 +298,7 @@ def _warn_missing_server(agent_name: str, server_name: str) -> None:
     )
 
 
+@startup_profile.phase("mcp autostart")
 def _autostart_bound_servers(manager: Any, agent_name: str) -> None:
     """Start any stopped servers bound to ``agent_name`` with auto_start=True.
 
@@ -317,30 +326,130 @@ def _autostart_bound_servers(manager: Any, agent_name: str) -> None:
             emit_warning(f"Auto-start failed for MCP server '{server_name}': {exc}")
 
 
-async def autostart_bound_servers_async(manager: Any, agent_name: str) -> None:
+@dataclass
+class AutostartReport:
+    """Outcome of :func:`autostart_bound_servers_async`.
+
+    ``pending`` lists servers that were still starting when the per-server
+    deadline or the overall budget ran out. They keep starting in the
+    background; callers should leave them out of the current run rather than
+    letting pydantic-ai enter a toolset the lifecycle task is still entering.
+    """
+
+    started: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    pending: List[str] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+
+# Strong refs to in-flight starts so ones that outlive their deadline (or the
+# autostart budget) aren't garbage-collected mid-start.
+_BACKGROUND_STARTS: Set[asyncio.Task] = set()
+
+
+def _record_start_result(
+    report: AutostartReport, server_name: str, task: asyncio.Task
+) -> None:
+    if task.cancelled():
+        report.failed[server_name] = "cancelled"
+        return
+    exc = task.exception()
+    if exc is not None:
+        report.failed[server_name] = str(exc) or type(exc).__name__
+    elif task.result() is False:
+        report.failed[server_name] = "server did not start"
+    else:
+        report.started.append(server_name)
+
+
+async def autostart_bound_servers_async(
+    manager: Any,
+    agent_name: str,
+    *,
+    concurrency: Optional[int] = None,
+    server_timeout: Optional[float] = None,
+    budget: Optional[float] = None,
+) -> AutostartReport:
     """Async variant of :func:`_autostart_bound_servers` that waits for ready.
 
-    Calls ``manager.start_server`` (the async API) and awaits it, so when
-    this coroutine returns the lifecycle task has finished entering the
-    pydantic-ai MCP singleton's context and a subsequent re-entry from
-    pydantic-ai inside ``agent.run()`` takes the no-op fast-path.
+    Calls ``manager.start_server`` (the async API) for every bound
+    ``auto_start`` server, at most ``concurrency`` at a time, so the wait is
+    roughly the slowest server rather than the sum of all of them. When this
+    coroutine returns, every server in ``report.started`` has its lifecycle
+    task inside the pydantic-ai MCP singleton's context and a subsequent
+    re-entry from ``agent.run()`` takes the no-op fast-path.
+
+    A server that isn't ready within ``server_timeout`` seconds frees its
+    concurrency slot and is reported as pending; its start keeps running in
+    the background. ``budget`` caps the whole autostart — anything not done
+    by then is pending too. One server failing never blocks the others.
+    Unset arguments fall back to the ``mcp_autostart_*`` config keys.
 
     Use this from any async caller that's about to immediately invoke a
     pydantic-ai agent against the same MCP servers (sub-agent invocation,
     notably).
     """
+    report = AutostartReport()
     targets = list(_iter_autostart_targets(manager, agent_name))
     if not targets:
-        return
+        return report
     await on_pre_mcp_autostart(agent_name, [name for name, _ in targets])
-    for server_name, config in targets:
-        try:
-            await manager.start_server(config.id)
-            emit_info(
-                f"Auto-started MCP server '{server_name}' for agent '{agent_name}'"
+
+    if concurrency is None:
+        concurrency = get_mcp_autostart_concurrency()
+    if server_timeout is None:
+        server_timeout = get_mcp_autostart_server_timeout()
+    if budget is None:
+        budget = get_mcp_autostart_budget()
+
+    slots = asyncio.Semaphore(max(1, concurrency))
+    started_at = time.monotonic()
+
+    async def _start_one(server_name: str, config: Any) -> None:
+        async with slots:
+            task = asyncio.create_task(
+                manager.start_server(config.id),
+                name=f"mcp_autostart_{server_name}",
             )
-        except Exception as exc:  # pragma: no cover - defensive
-            emit_warning(f"Auto-start failed for MCP server '{server_name}': {exc}")
+            _BACKGROUND_STARTS.add(task)
+            task.add_done_callback(_BACKGROUND_STARTS.discard)
+            done, _ = await asyncio.wait({task}, timeout=server_timeout)
+        if not done:
+            # Don't cancel: the lifecycle manager owns the start and may still
+            # finish it. The server just won't be attached to this run.
+            report.pending.append(server_name)
+            emit_warning(
+                f"MCP server '{server_name}' is still starting after "
+                f"{server_timeout:g}s; continuing without it for agent "
+                f"'{agent_name}'"
+            )
+            return
+        _record_start_result(report, server_name, task)
+
+    workers = {
+        asyncio.create_task(_start_one(server_name, config)): server_name
+        for server_name, config in targets
+    }
+    _, unfinished = await asyncio.wait(workers, timeout=budget)
+    for worker in unfinished:
+        # The worker is either queued for a slot or waiting on its deadline;
+        # cancelling it leaves an already-issued start_server running.
+        worker.cancel()
+        report.pending.append(workers[worker])
+    if unfinished:
+        await asyncio.gather(*unfinished, return_exceptions=True)
+        emit_warning(
+            f"MCP autostart budget ({budget:g}s) exhausted for agent "
+            f"'{agent_name}'; still starting: "
+            + ", ".join(workers[worker] for worker in unfinished)
+        )
+
+    for server_name in report.started:
+        emit_info(f"Auto-started MCP server '{server_name}' for agent '{agent_name}'")
+    for server_name, reason in report.failed.items():
+        emit_warning(f"Auto-start failed for MCP server '{server_name}': {reason}")
+    report.elapsed_seconds = time.monotonic() - started_at
+    return report
 
 
 def reload_mcp_servers(agent_name: Optional[str] = None) -> List[Any]:
@@ -598,6 +707,7 @@ def _assemble_instructions(agent: Any, resolved_model_name: str) -> str:
     return prepared.instructions
 
 
+@startup_profile.phase("agent build")
 def build_pydantic_agent(
     agent: Any,
     output_type: Any = str,
@@ -24,6 +24,12 @@ from pydantic_ai.messages import (
     ToolReturnPart,
 )
 
+from code_puppy.token_counting import (  # noqa: F401  (model_token_multiplier re-exported)
+    model_token_multiplier,
+    record_usage_sample,
+    tokenizer_for,
+)
+
 
 def _digest(text: str) -> str:
     """Deterministic 16-hex-char digest of ``text``.
@@ -106,38 +112,16 @@ def hash_message(message: Any) -> str:
     return _digest(canonical)
 
 
-def estimate_tokens(text: str) -> int:
-    """Dirt-simple tiktoken replacement: ``max(1, floor(len(text) / 2.5))``."""
-    return max(1, math.floor(len(text) / 2.5))
-
-
-# Models whose tokenizer the char/2.5 heuristic systematically *under*counts;
-# bump by a calibration factor. Case-insensitive substring match — vendor
-# naming order is a coin flip.
-_TOKEN_MULTIPLIER_RULES: tuple[tuple[tuple[str, ...], float], ...] = (
-    (("opus-4-7", "4-7-opus"), 1.35),
-)
-
+def estimate_tokens(text: str, model_name: Optional[str] = None) -> int:
+    """Token count of ``text`` for ``model_name``.
 
-def model_token_multiplier(model_name: Optional[str]) -> float:
-    """Per-model fudge factor for our char-based token estimator.
-
-    Returns 1.0 when ``model_name`` is falsy or doesn't match any rule.
+    Without a model this is the dirt-simple ``max(1, floor(len(text) / 2.5))``;
+    with one, :func:`code_puppy.token_counting.tokenizer_for` picks the exact
+    tokenizer, a usage-calibrated ratio or the per-model heuristic.
     """
-    if not model_name:
-        return 1.0
-    lowered = model_name.lower()
-    for needles, factor in _TOKEN_MULTIPLIER_RULES:
-        if any(needle in lowered for needle in needles):
-            return factor
-    return 1.0
-
-
-def _apply_multiplier(raw_tokens: int, model_name: Optional[str]) -> int:
-    multiplier = model_token_multiplier(model_name)
-    if multiplier == 1.0:
-        return raw_tokens
-    return max(1, math.floor(raw_tokens * multiplier))
+    if model_name:
+        return max(1, tokenizer_for(model_name).count(text))
+    return max(1, math.floor(len(text) / 2.5))
 
 
 def estimate_tokens_for_message(
@@ -146,16 +130,56 @@ def estimate_tokens_for_message(
 ) -> int:
     """Estimate the number of tokens in a single model message.
 
-    When ``model_name`` is provided, the raw count is scaled by
-    :func:`model_token_multiplier` to compensate for tokenizers that don't
-    play nicely with our char/2.5 heuristic.
+    When ``model_name`` is provided the count comes from that model's
+    tokenizer (see :func:`code_puppy.token_counting.tokenizer_for`), which
+    falls back to the char heuristic scaled by :func:`model_token_multiplier`.
     """
+    tokenizer = tokenizer_for(model_name)
     total = 0
     for part in getattr(message, "parts", []) or []:
         part_str = stringify_part(part)
         if part_str:
-            total += estimate_tokens(part_str)
-    return _apply_multiplier(max(1, total), model_name)
+            total += tokenizer.count(part_str)
+    return max(1, total)
+
+
+def record_usage_calibration(
+    messages: List[ModelMessage], model_name: Optional[str], start: int = 0
+) -> int:
+    """Fit ``model_name``'s chars-per-token ratio from provider-reported usage.
+
+    Consecutive responses' ``usage.input_tokens`` differ by exactly the
+    tokens of the messages sent in between, so each delta pairs those
+    messages' stringified length with a real token count; the system prompt
+    and tool definitions cancel out. Only responses at index ``start`` or
+    later are sampled, so replaying a run's history doesn't count it twice.
+
+    Returns the number of samples accepted.
+    """
+    if not model_name:
+        return 0
+    accepted = 0
+    previous: Optional[int] = None
+    previous_input = 0
+    for index, message in enumerate(messages):
+        if not isinstance(message, ModelResponse):
+            continue
+        usage = getattr(message, "usage", None)
+        input_tokens = getattr(usage, "input_tokens", 0) or 0
+        if not input_tokens:
+            previous = None
+            continue
+        delta = input_tokens - previous_input
+        if previous is not None and index >= start and delta > 0:
+            chars = sum(
+                len(stringify_part(part))
+                for between in messages[previous:index]
+                for part in getattr(between, "parts", []) or []
+            )
+            if record_usage_sample(model_name, chars, delta):
+                accepted += 1
+        previous, previous_input = index, input_tokens
+    return accepted
 
 
 def _extract_tool_description(tool_obj: Any) -> str:
@@ -192,7 +216,9 @@ def _extract_tool_json_schema(tool_obj: Any) -> Optional[dict]:
     return None
 
 
-def _estimate_mcp_tool_tokens(mcp_servers: Optional[List[Any]]) -> int:
+def _estimate_mcp_tool_tokens(
+    mcp_servers: Optional[List[Any]], model_name: Optional[str] = None
+) -> int:
     """Count tokens contributed by MCP toolsets' tool definitions.
 
     Reads each toolset's cached tool definitions (populated by pydantic-ai
@@ -211,20 +237,21 @@ def _estimate_mcp_tool_tokens(mcp_servers: Optional[List[Any]]) -> int:
 
     from code_puppy.mcp_.toolset_utils import iter_cached_tool_defs
 
+    count = tokenizer_for(model_name).count
     total = 0
     for server in mcp_servers:
         for full_name, description, schema in iter_cached_tool_defs(server):
             if full_name:
-                total += estimate_tokens(full_name)
+                total += count(full_name)
             if description:
-                total += estimate_tokens(description)
+                total += count(description)
             if schema:
                 try:
-                    total += estimate_tokens(json.dumps(schema, sort_keys=True))
+                    total += count(json.dumps(schema, sort_keys=True))
                 except (TypeError, ValueError):
                     # Schema isn't JSON-serializable for some reason — fall
                     # back to repr so we at least account for *something*.
-                    total += estimate_tokens(repr(schema))
+                    total += count(repr(schema))
     return total
 
 
@@ -253,29 +280,30 @@ def estimate_context_overhead(
     Returns:
         Estimated total token overhead.
     """
+    count = tokenizer_for(model_name).count
     total = 0
     if system_prompt:
-        total += estimate_tokens(system_prompt)
+        total += count(system_prompt)
 
     if pydantic_tools:
         for tool_name, tool_obj in pydantic_tools.items():
-            total += estimate_tokens(tool_name)
+            total += count(tool_name)
 
             description = _extract_tool_description(tool_obj)
             if description:
-                total += estimate_tokens(description)
+                total += count(description)
 
             schema = _extract_tool_json_schema(tool_obj)
             if schema is not None:
-                total += estimate_tokens(json.dumps(schema))
+                total += count(json.dumps(schema))
             else:
                 annotations = getattr(tool_obj, "__annotations__", None)
                 if annotations:
-                    total += estimate_tokens(str(annotations))
+                    total += count(str(annotations))
 
-    total += _estimate_mcp_tool_tokens(mcp_servers)
+    total += _estimate_mcp_tool_tokens(mcp_servers, model_name)
 
-    return _apply_multiplier(total, model_name)
+    return total
 
 
 # Pydantic-AI has FIVE part kinds carrying a tool_call_id that participate in
@@ -0,0 +1,280 @@
+"""Cached name / display name / description for discoverable agents.
+
+Listing agents (``/agent``, ``invoke_agent`` lookups, completions) used to
+construct every agent just to read three strings: each JSON agent file was
+parsed and validated on every discovery pass and again per listing, and
+every Python agent class was instantiated. Agents are now constructed only
+when one is actually loaded; listings read summaries from here.
+
+* JSON agents are keyed by path and fingerprinted by ``(mtime_ns, size)``.
+  The manifest is persisted to ``CACHE_DIR/agent_manifest.json`` so a new
+  process only re-parses files that changed since the last run. A file whose
+  mtime falls inside ``_RACY_WINDOW_NS`` of when it was summarized is always
+  re-read: a same-size rewrite within one filesystem timestamp tick would
+  otherwise look unchanged.
+* Python agent modules in the agents package are keyed by source path and
+  fingerprinted the same way, with one entry per agent class they define
+  (module, class name and the three strings). Discovery registers a
+  ``PythonAgentRef`` from the entry, so the module is imported and the class
+  constructed only when that agent is loaded.
+* Classes handed over directly (plugins, non-file modules) cannot change
+  within a process, so their summaries are kept in memory per class.
+
+Invalid JSON agents are remembered too (with the validation error) so a
+broken file is not re-parsed on every pass until it changes.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_MANIFEST_VERSION = 1
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+@dataclass(frozen=True)
+class AgentSummary:
+    """What agent listings need, without constructing the agent."""
+
+    name: str
+    display_name: str
+    description: str
+
+
+@dataclass(frozen=True)
+class PythonAgentRef:
+    """A Python agent class known from the manifest, imported only on use.
+
+    Calling the ref imports ``module`` and constructs ``class_name``, so it
+    stands in for the class wherever the registry would call one.
+    """
+
+    module: str
+    class_name: str
+    summary: AgentSummary
+
+    def load(self) -> type:
+        return getattr(importlib.import_module(self.module), self.class_name)
+
+    def __call__(self) -> Any:
+        return self.load()()
+
+
+_lock = threading.RLock()
+_json_entries: Dict[str, dict] = {}
+_python_entries: Dict[str, dict] = {}
+_loaded_from: Optional[Path] = None
+_dirty = False
+_class_summaries: "weakref.WeakKeyDictionary[type, AgentSummary]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _manifest_path() -> Path:
+    from code_puppy.config import CACHE_DIR
+
+    return Path(CACHE_DIR) / "agent_manifest.json"
+
+
+def _ensure_loaded() -> None:
+    global _loaded_from
+    path = _manifest_path()
+    if _loaded_from == path:
+        return
+    _loaded_from = path
+    _json_entries.clear()
+    _python_entries.clear()
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return
+    if isinstance(data, dict) and data.get("version") == _MANIFEST_VERSION:
+        for key, target in (
+            ("json_agents", _json_entries),
+            ("python_modules", _python_entries),
+        ):
+            entries = data.get(key)
+            if isinstance(entries, dict):
+                target.update(
+                    (path, value)
+                    for path, value in entries.items()
+                    if isinstance(value, dict)
+                )
+
+
+def _entry_is_current(entry: dict, st: os.stat_result) -> bool:
+    if entry.get("mtime_ns") != st.st_mtime_ns or entry.get("size") != st.st_size:
+        return False
+    recorded_at = entry.get("recorded_ns")
+    return isinstance(recorded_at, int) and (
+        st.st_mtime_ns < recorded_at - _RACY_WINDOW_NS
+    )
+
+
+def json_agent_summary(json_path: str) -> AgentSummary:
+    """Summary for the JSON agent at *json_path*.
+
+    Raises ``ValueError`` (or ``OSError``) when the file is missing or is not
+    a valid agent, exactly as constructing ``JSONAgent`` would.
+    """
+    global _dirty
+    st = os.stat(json_path)
+    with _lock:
+        _ensure_loaded()
+        entry = _json_entries.get(json_path)
+        if entry is None or not _entry_is_current(entry, st):
+            entry = _summarize_json_agent(json_path, st)
+            _json_entries[json_path] = entry
+            _dirty = True
+    if "error" in entry:
+        raise ValueError(entry["error"])
+    return AgentSummary(entry["name"], entry["display_name"], entry["description"])
+
+
+def _summarize_json_agent(json_path: str, st: os.stat_result) -> dict:
+    from code_puppy.agents.json_agent import JSONAgent
+
+    entry: dict = {
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "recorded_ns": time.time_ns(),
+    }
+    try:
+        agent = JSONAgent(json_path)
+        entry.update(
+            name=agent.name,
+            display_name=agent.display_name,
+            description=agent.description,
+        )
+    except Exception as e:
+        entry["error"] = f"{type(e).__name__}: {e}"
+    return entry
+
+
+def class_agent_summary(agent_class: type) -> AgentSummary:
+    """Summary for a Python agent class, instantiating it at most once."""
+    summary = _class_summaries.get(agent_class)
+    if summary is None:
+        agent = agent_class()
+        name = agent.name
+        # Listings used to fall back per field; keep that for odd classes.
+        try:
+            display_name = agent.display_name
+        except Exception:
+            display_name = name.title()
+        try:
+            description = agent.description
+        except Exception:
+            description = "No description available"
+        summary = AgentSummary(name, display_name, description)
+        _class_summaries[agent_class] = summary
+    return summary
+
+
+def python_module_agents(module_name: str, source_path: str) -> List[PythonAgentRef]:
+    """Agent classes defined by the module at *source_path*, without importing it.
+
+    The module is imported (and each agent class constructed once) only when
+    its file is new or changed; import errors propagate and are not cached,
+    since they usually depend on the environment rather than the file.
+    """
+    global _dirty
+    st = os.stat(source_path)
+    with _lock:
+        _ensure_loaded()
+        entry = _python_entries.get(source_path)
+        if (
+            entry is None
+            or entry.get("module") != module_name
+            or not isinstance(entry.get("agents"), list)
+            or not _entry_is_current(entry, st)
+        ):
+            entry = _summarize_python_module(module_name, st)
+            _python_entries[source_path] = entry
+            _dirty = True
+    return [
+        PythonAgentRef(
+            module_name,
+            agent["class_name"],
+            AgentSummary(agent["name"], agent["display_name"], agent["description"]),
+        )
+        for agent in entry["agents"]
+    ]
+
+
+def _summarize_python_module(module_name: str, st: os.stat_result) -> dict:
+    from code_puppy.agents.base_agent import BaseAgent
+    from code_puppy.agents.json_agent import JSONAgent
+
+    module = importlib.import_module(module_name)
+    agents = []
+    for attr_name in dir(module):
+        attr = getattr(module, attr_name)
+        if (
+            isinstance(attr, type)
+            and issubclass(attr, BaseAgent)
+            and attr not in (BaseAgent, JSONAgent)
+        ):
+            summary = class_agent_summary(attr)
+            agents.append(
+                {
+                    "class_name": attr_name,
+                    "name": summary.name,
+                    "display_name": summary.display_name,
+                    "description": summary.description,
+                }
+            )
+    return {
+        "module": module_name,
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "recorded_ns": time.time_ns(),
+        "agents": agents,
+    }
+
+
+def save_manifest() -> None:
+    """Persist agent summaries if anything changed; drop deleted files."""
+    global _dirty
+    with _lock:
+        if not _dirty:
+            return
+        for entries in (_json_entries, _python_entries):
+            for key in [key for key in entries if not os.path.exists(key)]:
+                del entries[key]
+        payload = {
+            "version": _MANIFEST_VERSION,
+            "json_agents": _json_entries,
+            "python_modules": _python_entries,
+        }
+        try:
+            from code_puppy.atomic_io import atomic_write_bytes
+
+            atomic_write_bytes(
+                str(_manifest_path()), json.dumps(payload).encode("utf-8")
+            )
+        except OSError as e:
+            logger.debug("Could not write agent manifest: %s", e)
+        _dirty = False
+
+
+def clear_manifest_cache() -> None:
+    """Forget every in-memory summary (the on-disk manifest is re-read lazily)."""
+    global _loaded_from, _dirty
+    with _lock:
+        _json_entries.clear()
+        _python_entries.clear()
+        _loaded_from = None
+        _dirty = False
+        _class_summaries.clear()
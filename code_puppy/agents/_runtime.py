@@ -67,6 +67,7 @@ try:
 except ImportError:  # pragma: no cover - 3.10 only
     BaseExceptionGroup = Exception  # type: ignore[misc,assignment]
 
+from code_puppy import startup_profile
 from code_puppy.agent_execution_context import executing_agent_context
 from code_puppy.agents import _history, _key_listeners
 from code_puppy.agents._builder import build_pydantic_agent
@@ -713,6 +714,8 @@ async def _run_with_mcp_impl(
 
     if output_type is not None:
         pydantic_agent = build_pydantic_agent(agent, output_type=output_type)
+    # Headless runs reach their first model request here.
+    startup_profile.finish("first model request")
 
     prompt = _should_prepend_system_prompt(agent, prompt)
     prompt_payload = _build_prompt_payload(prompt, attachments, link_attachments)
@@ -1096,6 +1099,17 @@ async def _run_with_mcp_impl(
             }
         except Exception:
             pass
+        try:
+            # Teach the fallback token estimator this model's real
+            # chars-per-token ratio from the responses we just got.
+            all_messages = list(result.all_messages())
+            _history.record_usage_calibration(
+                all_messages,
+                agent.get_model_name(),
+                start=len(all_messages) - len(result.new_messages()),
+            )
+        except Exception:
+            pass
         return result
     except asyncio.CancelledError:
         run_response_text = ""
@@ -166,6 +166,7 @@ A model pin is completely optional. If the user does not request one, omit the `
 ### 🧠 **Communication & Coordination**:
 - `list_agents` - List all available sub-agents (recommended for agent managers)
 - `invoke_agent` - Invoke other agents with specific prompts (recommended for agent managers)
+- `invoke_agents_parallel` - Run several independent sub-agent tasks concurrently (for orchestrator agents)
 
 ### 🔧 **Universal Constructor Tools** (custom tools):
 - These are tools created by Helios or via the Universal Constructor
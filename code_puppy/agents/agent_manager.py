@@ -13,14 +13,23 @@ from typing import Dict, List, Optional, Type, Union
 
 from pydantic_ai.messages import ModelMessage
 
+from code_puppy.agents._manifest import (
+    AgentSummary,
+    PythonAgentRef,
+    class_agent_summary,
+    json_agent_summary,
+    python_module_agents,
+    save_manifest,
+)
 from code_puppy.agents.base_agent import BaseAgent
 from code_puppy.agents.json_agent import JSONAgent, discover_json_agents
 from code_puppy.callbacks import on_agent_reload, on_register_agents
 from code_puppy.messaging import emit_success, emit_warning
 from code_puppy.tools.common import atomic_write_text
 
-# Registry of available agents (Python classes and JSON file paths)
-_AGENT_REGISTRY: Dict[str, Union[Type[BaseAgent], str]] = {}
+# Registry of available agents (Python classes, manifest refs to Python
+# classes that are imported on load, and JSON file paths)
+_AGENT_REGISTRY: Dict[str, Union[Type[BaseAgent], PythonAgentRef, str]] = {}
 _AGENT_HISTORIES: Dict[str, List[ModelMessage]] = {}
 _CURRENT_AGENT: Optional[BaseAgent] = None
 
@@ -265,26 +274,12 @@ def _discover_agents_locked(message_group_id: Optional[str] = None):
     # Iterate through all modules in the agents package
     skip_modules = _builtin_agent_modules_to_skip()
 
-    for _, modname, _ in pkgutil.iter_modules(agents_package.__path__):
+    for finder, modname, ispkg in pkgutil.iter_modules(agents_package.__path__):
         if modname.startswith("_") or modname in skip_modules:
             continue
 
         try:
-            # Import the module
-            module = importlib.import_module(f"code_puppy.agents.{modname}")
-
-            # Look for BaseAgent subclasses
-            for attr_name in dir(module):
-                attr = getattr(module, attr_name)
-                if (
-                    isinstance(attr, type)
-                    and issubclass(attr, BaseAgent)
-                    and attr not in [BaseAgent, JSONAgent]
-                ):
-                    # Create an instance to get the name
-                    agent_instance = attr()
-                    _AGENT_REGISTRY[agent_instance.name] = attr
-
+            _register_module_agents(f"code_puppy.agents.{modname}", finder, ispkg)
         except Exception as e:
             # Skip problematic modules
             emit_warning(
@@ -306,28 +301,14 @@ def _discover_agents_locked(message_group_id: Optional[str] = None):
             if not hasattr(subpkg, "__path__"):
                 continue
 
-            for _, modname, _ in pkgutil.iter_modules(subpkg.__path__):
+            for finder, modname, ispkg in pkgutil.iter_modules(subpkg.__path__):
                 if modname.startswith("_"):
                     continue
 
                 try:
-                    # Import the submodule
-                    module = importlib.import_module(
-                        f"code_puppy.agents.{subpkg_name}.{modname}"
+                    _register_module_agents(
+                        f"code_puppy.agents.{subpkg_name}.{modname}", finder, ispkg
                     )
-
-                    # Look for BaseAgent subclasses
-                    for attr_name in dir(module):
-                        attr = getattr(module, attr_name)
-                        if (
-                            isinstance(attr, type)
-                            and issubclass(attr, BaseAgent)
-                            and attr not in [BaseAgent, JSONAgent]
-                        ):
-                            # Create an instance to get the name
-                            agent_instance = attr()
-                            _AGENT_REGISTRY[agent_instance.name] = attr
-
                 except Exception as e:
                     emit_warning(
                         f"Warning: Could not load agent {subpkg_name}.{modname}: {e}",
@@ -350,7 +331,7 @@ def _discover_agents_locked(message_group_id: Optional[str] = None):
         # Python (builtin) agents take precedence over JSON agents.
         for agent_name, json_path in json_agents.items():
             existing = _AGENT_REGISTRY.get(agent_name)
-            if isinstance(existing, type):
+            if isinstance(existing, (type, PythonAgentRef)):
                 # Genuine collision with a builtin Python agent class; warn
                 # once per process (discovery re-runs and would repeat it).
                 if agent_name not in _WARNED_JSON_SHADOWED:
@@ -400,6 +381,58 @@ def _discover_agents_locked(message_group_id: Optional[str] = None):
             message_group=message_group_id,
         )
 
+    # Python entries recorded above may not have been saved with the JSON ones.
+    save_manifest()
+
+
+def _module_source_path(finder, modname: str, ispkg: bool) -> Optional[str]:
+    """The ``.py`` file behind a plain module, or None if it isn't one."""
+    directory = getattr(finder, "path", None)
+    if ispkg or not isinstance(directory, str):
+        return None
+    source = os.path.join(directory, f"{modname}.py")
+    return source if os.path.isfile(source) else None
+
+
+def _register_module_agents(module_name: str, finder, ispkg: bool) -> None:
+    """Register the agent classes in *module_name*.
+
+    Plain source modules go through the manifest, which imports them only
+    when the file changed; anything else is imported and scanned here.
+    """
+    source = _module_source_path(finder, module_name.rsplit(".", 1)[-1], ispkg)
+    if source is not None:
+        for ref in python_module_agents(module_name, source):
+            _AGENT_REGISTRY[ref.summary.name] = ref
+        return
+
+    module = importlib.import_module(module_name)
+    # Look for BaseAgent subclasses
+    for attr_name in dir(module):
+        attr = getattr(module, attr_name)
+        if (
+            isinstance(attr, type)
+            and issubclass(attr, BaseAgent)
+            and attr not in [BaseAgent, JSONAgent]
+        ):
+            # Instantiated once per class to learn its name
+            _AGENT_REGISTRY[class_agent_summary(attr).name] = attr
+
+
+def _agent_summary(
+    agent_ref: Union[Type[BaseAgent], PythonAgentRef, str],
+) -> AgentSummary:
+    """Name/display name/description for a registry entry without loading it.
+
+    Agents are only constructed by ``load_agent``; listings use the cached
+    summaries from ``_manifest``.
+    """
+    if isinstance(agent_ref, str):  # JSON agent (file path)
+        return json_agent_summary(agent_ref)
+    if isinstance(agent_ref, PythonAgentRef):
+        return agent_ref.summary
+    return class_agent_summary(agent_ref)
+
 
 def get_available_agents() -> Dict[str, str]:
     """Get a dictionary of available agents with their display names.
@@ -435,11 +468,7 @@ def get_available_agents() -> Dict[str, str]:
             continue
 
         try:
-            if isinstance(agent_ref, str):  # JSON agent (file path)
-                agent_instance = JSONAgent(agent_ref)
-            else:  # Python agent (class)
-                agent_instance = agent_ref()
-            agents[name] = agent_instance.display_name
+            agents[name] = _agent_summary(agent_ref).display_name
         except Exception:
             agents[name] = name.title()  # Fallback
 
@@ -549,7 +578,7 @@ def load_agent(agent_name: str) -> BaseAgent:
     agent_ref = _AGENT_REGISTRY[agent_name]
     if isinstance(agent_ref, str):  # JSON agent (file path)
         return JSONAgent(agent_ref)
-    else:  # Python agent (class)
+    else:  # Python agent (class, or a manifest ref that imports it now)
         return agent_ref()
 
 
@@ -587,11 +616,7 @@ def get_agent_descriptions() -> Dict[str, str]:
             continue
 
         try:
-            if isinstance(agent_ref, str):  # JSON agent (file path)
-                agent_instance = JSONAgent(agent_ref)
-            else:  # Python agent (class)
-                agent_instance = agent_ref()
-            descriptions[name] = agent_instance.description
+            descriptions[name] = _agent_summary(agent_ref).description
         except Exception:
             descriptions[name] = "No description available"
 
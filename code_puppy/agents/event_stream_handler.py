@@ -37,9 +37,30 @@ from code_puppy.tools.subagent_context import is_subagent
 logger = logging.getLogger(__name__)
 
 
+# Deltas queued for stream_event callbacks beyond this are dropped (and
+# counted) rather than letting a slow plugin buffer a whole response.
+STREAM_EVENT_QUEUE_MAX = 4096
+# How long the end of a response waits for callbacks to catch up; a slow or
+# hung plugin must not stall the turn.
+STREAM_EVENT_DRAIN_SECONDS = 2.0
+
+# Delivery tasks left running after their response ended (the loop itself
+# only keeps weak references to tasks).
+_detached_deliveries: "set[asyncio.Task]" = set()
+
+
+def _has_stream_event_callbacks() -> bool:
+    from code_puppy.callbacks import count_callbacks
+
+    return count_callbacks("stream_event") > 0
+
+
 def _fire_stream_event(event_type: str, event_data: Any) -> None:
     """Fire a stream event callback asynchronously (non-blocking).
 
+    One-off variant for callers outside :func:`event_stream_handler`, which
+    batches its events through a :class:`_StreamEventDispatcher` instead.
+
     Args:
         event_type: Type of the event (e.g., 'part_start', 'part_delta', 'part_end')
         event_data: Data associated with the event
@@ -48,6 +69,8 @@ def _fire_stream_event(event_type: str, event_data: Any) -> None:
         from code_puppy import callbacks
         from code_puppy.messaging import get_session_context
 
+        if not _has_stream_event_callbacks():
+            return
         agent_session_id = get_session_context()
 
         # Use create_task to fire callback without blocking
@@ -60,6 +83,113 @@ def _fire_stream_event(event_type: str, event_data: Any) -> None:
         logger.debug(f"Error firing stream event callback: {e}")
 
 
+class _StreamEventDispatcher:
+    """Deliver one run's stream events to callbacks from a single task.
+
+    Spawning a task per delta costs thousands of short-lived tasks per
+    response; here :meth:`fire` is a queue append and one consumer task
+    awaits the callbacks in order. Nothing is queued (and no task exists)
+    while no ``stream_event`` callback is registered.
+    """
+
+    def __init__(self, maxsize: int = STREAM_EVENT_QUEUE_MAX) -> None:
+        from code_puppy.callbacks import count_callbacks
+        from code_puppy.messaging import get_session_context
+
+        self._count_callbacks = count_callbacks
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._session_id = get_session_context()
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def fire(self, event_type: str, event_data: Any) -> None:
+        if not self._count_callbacks("stream_event"):
+            return
+        if self._queue.qsize() >= self.maxsize:
+            self.dropped += 1
+            return
+        self._queue.put_nowait((event_type, event_data))
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        from code_puppy.callbacks import on_stream_event
+
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            event_type, event_data = item
+            try:
+                await on_stream_event(event_type, event_data, self._session_id)
+            except Exception as e:
+                logger.debug(f"Error firing stream event callback: {e}")
+
+    def close(self) -> Optional[asyncio.Task]:
+        """Stop after the queued events; returns the task still delivering them."""
+        if self.dropped:
+            logger.debug(f"Dropped {self.dropped} stream events (queue full)")
+        if self._task is None:
+            return None
+        self._queue.put_nowait(None)
+        task = self._task
+        if not task.done():
+            _detached_deliveries.add(task)
+            task.add_done_callback(_detached_deliveries.discard)
+        return task
+
+    async def aclose(self, timeout: float = STREAM_EVENT_DRAIN_SECONDS) -> None:
+        """Deliver everything queued so far, giving up after ``timeout`` seconds.
+
+        On timeout the delivery task is cancelled and the rest is dropped.
+        """
+        task = self.close()
+        if task is None:
+            return
+        try:
+            await asyncio.wait_for(task, timeout)
+        except asyncio.TimeoutError:
+            logger.debug(
+                f"Stream event callbacks still busy after {timeout}s; "
+                f"dropped {self._queue.qsize()} queued events"
+            )
+
+
+class _LineBuffer:
+    """Incremental newline scanner over a list of pending chunks.
+
+    Re-splitting an ever-growing string costs O(n^2) on long lines without
+    newlines (minified JSON, wide tables); here a delta without a newline
+    is a list append, and each character is joined exactly once.
+    """
+
+    __slots__ = ("_chunks",)
+
+    def __init__(self) -> None:
+        self._chunks: list[str] = []
+
+    def feed(self, text: str) -> list[str]:
+        """Add ``text``; return the lines it completed (without newlines)."""
+        if "\n" not in text:
+            if text:
+                self._chunks.append(text)
+            return []
+        pieces = text.split("\n")
+        if self._chunks:
+            self._chunks.append(pieces[0])
+            pieces[0] = "".join(self._chunks)
+        tail = pieces.pop()
+        self._chunks = [tail] if tail else []
+        return pieces
+
+    def take_rest(self) -> str:
+        """Return and clear the incomplete last line."""
+        rest = "".join(self._chunks)
+        self._chunks = []
+        return rest
+
+
 # Module-level console for streaming output
 # Set via set_streaming_console() so every stream shares one console
 _streaming_console: Optional[Console] = None
@@ -170,14 +300,16 @@ async def event_stream_handler(
     banner_printed: set[int] = set()  # Track if banner was already printed
     token_count: dict[int, int] = {}  # Track token count per text/tool part
     tool_names: dict[int, str] = {}  # Track tool name per tool part index
-    tool_args_buffer: dict[int, str] = {}  # Accumulate raw tool-call args JSON
+    # Raw tool-call args JSON chunks, only kept for the high-mode dump.
+    tool_args_buffer: dict[int, list[str]] = {}
     did_stream_anything = False  # Track if we streamed any content
     is_high_mode = get_output_level() == "high"
+    stream_events = _StreamEventDispatcher()
 
     # Termflow streaming state for text parts
     termflow_parsers: dict[int, TermflowParser] = {}
     termflow_renderers: dict[int, TermflowRenderer] = {}
-    termflow_line_buffers: dict[int, str] = {}  # Buffer incomplete lines
+    termflow_line_buffers: dict[int, _LineBuffer] = {}  # Incomplete lines
     # Optional smooth (typewriter) writers wrapping the console for text parts.
     termflow_writers: dict[int, SmoothTermflowWriter] = {}
 
@@ -216,6 +348,15 @@ async def event_stream_handler(
             highlighter=on_termflow_highlighter(Highlighter()),
         )
 
+    def _render_text_lines(index: int, text: str) -> None:
+        """Render every line ``text`` completes for text part ``index``."""
+        lines = termflow_line_buffers[index].feed(text)
+        if lines:
+            parser = termflow_parsers[index]
+            renderer = termflow_renderers[index]
+            for line in lines:
+                renderer.render_all(parser.parse_line(line))
+
     # Smooth-stream state per thinking part: index → smoother (steady drain)
     # or ``thinking_direct`` when smoothing is off (print deltas immediately).
     thinking_smoothers: dict[int, ThinkingStreamSmoother] = {}
@@ -337,7 +478,7 @@ async def event_stream_handler(
             # PartStartEvent - register the part but defer banner until content arrives
             if isinstance(event, PartStartEvent):
                 # Fire stream event callback for part_start
-                _fire_stream_event(
+                stream_events.fire(
                     "part_start",
                     {
                         "index": event.index,
@@ -363,17 +504,16 @@ async def event_stream_handler(
                     # Initialize termflow streaming for this text part
                     termflow_parsers[event.index] = TermflowParser()
                     termflow_renderers[event.index] = _make_text_renderer(event.index)
-                    termflow_line_buffers[event.index] = ""
+                    termflow_line_buffers[event.index] = _LineBuffer()
                     # Handle initial content if present
                     if part.content and part.content.strip():
                         await _print_response_banner()
                         banner_printed.add(event.index)
-                        termflow_line_buffers[event.index] = part.content
+                        _render_text_lines(event.index, part.content)
                 elif isinstance(part, ToolCallPart):
                     streaming_parts.add(event.index)
                     tool_parts.add(event.index)
                     token_count[event.index] = 0  # Initialize token counter
-                    tool_args_buffer[event.index] = ""  # Accumulate JSON args
                     # Capture tool name from the start event
                     tool_names[event.index] = part.tool_name or ""
                     # Track tool name for display
@@ -384,7 +524,7 @@ async def event_stream_handler(
             # PartDeltaEvent - stream the content as it arrives
             elif isinstance(event, PartDeltaEvent):
                 # Fire stream event callback for part_delta
-                _fire_stream_event(
+                stream_events.fire(
                     "part_delta",
                     {
                         "index": event.index,
@@ -404,22 +544,7 @@ async def event_stream_handler(
                                     await _print_response_banner()
                                     banner_printed.add(event.index)
 
-                                # Add content to line buffer
-                                termflow_line_buffers[event.index] += (
-                                    delta.content_delta
-                                )
-
-                                # Process complete lines
-                                parser = termflow_parsers[event.index]
-                                renderer = termflow_renderers[event.index]
-                                buffer = termflow_line_buffers[event.index]
-
-                                while "\n" in buffer:
-                                    line, buffer = buffer.split("\n", 1)
-                                    events_to_render = parser.parse_line(line)
-                                    renderer.render_all(events_to_render)
-
-                                termflow_line_buffers[event.index] = buffer
+                                _render_text_lines(event.index, delta.content_delta)
                             else:
                                 # Stream thinking parts smoothly (dim) via a
                                 # rate-limited buffer; gate on output level /
@@ -438,9 +563,10 @@ async def event_stream_handler(
                             estimated_tokens = max(1, math.floor(len(args_delta) / 2.5))
                             token_count[event.index] += estimated_tokens
                             # Accumulate raw args JSON for high-mode display.
-                            tool_args_buffer[event.index] = (
-                                tool_args_buffer.get(event.index, "") + args_delta
-                            )
+                            if is_high_mode:
+                                tool_args_buffer.setdefault(event.index, []).append(
+                                    args_delta
+                                )
                         else:
                             # Even empty deltas count as activity
                             token_count[event.index] += 1
@@ -472,7 +598,7 @@ async def event_stream_handler(
             # PartEndEvent - finish the streaming with a newline
             elif isinstance(event, PartEndEvent):
                 # Fire stream event callback for part_end
-                _fire_stream_event(
+                stream_events.fire(
                     "part_end",
                     {
                         "index": event.index,
@@ -487,7 +613,7 @@ async def event_stream_handler(
                         if event.index in termflow_parsers:
                             parser = termflow_parsers[event.index]
                             renderer = termflow_renderers[event.index]
-                            remaining = termflow_line_buffers.get(event.index, "")
+                            remaining = termflow_line_buffers[event.index].take_rest()
 
                             # Parse and render any remaining partial line
                             if remaining.strip():
@@ -518,7 +644,7 @@ async def event_stream_handler(
                         # user can see exactly what the model sent to the tool.
                         if is_high_mode:
                             tool_name = tool_names.get(event.index, "tool")
-                            raw_args = tool_args_buffer.get(event.index, "")
+                            raw_args = "".join(tool_args_buffer.get(event.index, ()))
                             if raw_args:
                                 # Pretty-print the JSON if possible.
                                 import json as _json
@@ -560,6 +686,8 @@ async def event_stream_handler(
         # Cancelled/crashed mid-stream: the graceful drain never runs, orphaning
         # background drain tasks that keep typing into the terminal. Abort them.
         _abort_all_drainers()
+        # Callbacks still get what was already queued, just not awaited here.
+        stream_events.close()
         raise
 
     # Drain any smoothers/writers that didn't see a PartEndEvent (e.g. the
@@ -573,3 +701,4 @@ async def event_stream_handler(
     for writer in list(termflow_writers.values()):
         await writer.close()
     termflow_writers.clear()
+    await stream_events.aclose()
@@ -6,6 +6,7 @@ from typing import Any, Dict, List, Optional
 
 from code_puppy import atomic_json
 
+from ._manifest import json_agent_summary, save_manifest
 from .base_agent import BaseAgent
 
 logger = logging.getLogger(__name__)
@@ -241,6 +242,8 @@ def discover_json_agents() -> Dict[str, str]:
     2. Project agents directory (<CWD>/.code_puppy/agents/) - if it exists
 
     Project agents take priority over user agents when names collide.
+    Files unchanged since they were last summarized are not re-parsed (see
+    ``_manifest``).
 
     Returns:
         Dict mapping agent names to their JSON file paths.
@@ -257,8 +260,7 @@ def discover_json_agents() -> Dict[str, str]:
     if user_agents_dir.exists() and user_agents_dir.is_dir():
         for json_file in user_agents_dir.glob("*.json"):
             try:
-                agent = JSONAgent(str(json_file))
-                agents[agent.name] = str(json_file)
+                agents[json_agent_summary(str(json_file)).name] = str(json_file)
             except Exception as e:
                 logger.debug(
                     "Skipping invalid user agent file: %s (reason: %s: %s)",
@@ -274,8 +276,7 @@ def discover_json_agents() -> Dict[str, str]:
         project_agents_dir = Path(project_agents_dir_str)
         for json_file in project_agents_dir.glob("*.json"):
             try:
-                agent = JSONAgent(str(json_file))
-                agents[agent.name] = str(json_file)
+                agents[json_agent_summary(str(json_file)).name] = str(json_file)
             except Exception as e:
                 logger.debug(
                     "Skipping invalid project agent file: %s (reason: %s: %s)",
@@ -285,4 +286,5 @@ def discover_json_agents() -> Dict[str, str]:
                 )
                 continue
 
+    save_manifest()
     return agents
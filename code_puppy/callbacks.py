@@ -991,6 +991,12 @@ def on_handle_cli_args(args: Any) -> List[Any]:
     that merely observe the args (without short-circuiting) should return
     ``None``.
 
+    This runs before the console renderers start, so a plugin that takes
+    over the process (an ACP host, a script runner) gets no rendering.
+    Such a plugin should call ``code_puppy.messaging.set_headless_sink``
+    with a callable that forwards or discards messages; otherwise they
+    collect in the bounded startup buffers and the oldest are dropped.
+
     Callback contract: ``(args: argparse.Namespace) -> dict | None``.
 
     Returns the list of callback results for the runner to scan.
@@ -3,10 +3,13 @@
 Contains the main application logic, interactive mode, and entry point.
 """
 
+from code_puppy import startup_profile
+
 # Apply pydantic-ai patches BEFORE any pydantic-ai imports
-from code_puppy.pydantic_patches import apply_all_patches
+with startup_profile.phase("pydantic patches"):
+    from code_puppy.pydantic_patches import apply_all_patches
 
-apply_all_patches()
+    apply_all_patches()
 
 import argparse
 import asyncio
@@ -53,7 +56,8 @@ from code_puppy.terminal_utils import (
 )
 from code_puppy.version_checker import default_version_mismatch_behavior
 
-plugins.load_plugin_callbacks()
+with startup_profile.phase("plugin load"):
+    plugins.load_plugin_callbacks()
 
 _HEADLESS_AUTONOMY_PROMPT = """\
 This is an unattended, non-interactive run. Never ask for confirmation, approval,
@@ -241,6 +245,18 @@ async def main():
             "precedence chain is used instead of crashing."
         ),
     )
+    parser.add_argument(
+        startup_profile.FLAG,
+        nargs="?",
+        const=startup_profile.DEFAULT_REPORT_PATH,
+        default=None,
+        metavar="PATH",
+        help=(
+            "Write a JSON breakdown of startup import and init time to PATH "
+            f"(default {startup_profile.DEFAULT_REPORT_PATH}) once the first "
+            "prompt is ready"
+        ),
+    )
     parser.add_argument(
         "command", nargs="*", help="Run a single command (deprecated, use -p instead)"
     )
@@ -266,7 +282,9 @@ async def main():
         get_message_bus,
     )
 
-    # Create a shared console for both renderers
+    # Create a shared console for both renderers. Every run past this point,
+    # -p included, renders here; hosts that take over in handle_cli_args
+    # above opt into messaging.set_headless_sink instead.
     display_console = Console()
 
     # Legacy renderer for backward compatibility (emits via get_global_queue)
@@ -444,10 +462,11 @@ async def main():
         emit_system_message(version_msg)
         emit_system_message(update_disabled_msg)
     else:
-        if len(callbacks.get_callbacks("version_check")):
-            await callbacks.on_version_check(current_version)
-        else:
-            default_version_mismatch_behavior(current_version)
+        with startup_profile.phase("version check"):
+            if len(callbacks.get_callbacks("version_check")):
+                await callbacks.on_version_check(current_version)
+            else:
+                default_version_mismatch_behavior(current_version)
 
     core_plugins_version = get_core_plugins_version()
     if core_plugins_version is None:
@@ -462,23 +481,18 @@ async def main():
     try:
         from code_puppy.session_migration import sweep_contexts_to_autosaves
 
-        sweep_contexts_to_autosaves()
+        with startup_profile.phase("session sweeps"):
+            sweep_contexts_to_autosaves()
     except Exception:
         # Sweep failure must never block startup -- it logs internally.
         pass
 
-    # One-time format migration: legacy pickle sessions -> versioned JSON
-    # envelopes (idempotent via marker file). Runs after the location sweep so
-    # freshly-moved contexts/ files are migrated in the same boot.
-    try:
-        from code_puppy.session_format_migration import sweep_legacy_pickle_sessions
-
-        sweep_legacy_pickle_sessions()
-    except Exception:
-        # Never block startup; failures are logged/warned internally.
-        pass
+    # The pickle -> JSON format migration and its quarantine retries run as
+    # background maintenance once the interactive prompt is up (see
+    # interactive_mode); load_session migrates any pickle it reaches first.
 
-    await callbacks.on_startup()
+    with startup_profile.phase("startup callbacks"):
+        await callbacks.on_startup()
 
     # Resolve --quick-resume into --resume for the canonical (git-root + branch) scope.
     apply_quick_resume(args)
@@ -608,6 +622,12 @@ async def main():
             message_renderer.stop()
         if bus_renderer:
             bus_renderer.stop()
+        try:
+            from code_puppy.messaging import log_dropped_messages
+
+            log_dropped_messages()
+        except Exception:
+            pass
         # session_end fires before shutdown so plugins react while bus state is coherent.
         try:
             await callbacks.on_session_end()
@@ -892,6 +912,23 @@ async def interactive_mode(message_renderer, initial_command: str = None) -> Non
         except Exception:
             persistent_prompt = False  # degrade to classic on any failure
 
+    if startup_profile.is_active():
+        # The first prompt would build the agent (and autostart its MCP
+        # servers); do it now so the profile covers the whole critical path.
+        from code_puppy.agents.agent_manager import get_current_agent
+
+        try:
+            get_current_agent().reload_code_generation_agent()
+        except Exception:
+            pass
+        startup_profile.finish("interactive prompt")
+
+    # Idempotent housekeeping (session format migration, quarantine retries)
+    # on a low-priority worker, now that nothing is waiting on it.
+    from code_puppy.maintenance import start_background_maintenance
+
+    start_background_maintenance()
+
     while True:
         from code_puppy.agents.agent_manager import get_current_agent
         from code_puppy.messaging import emit_info
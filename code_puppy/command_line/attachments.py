@@ -6,13 +6,17 @@ import mimetypes
 import os
 import re
 import shlex
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, List, Sequence, Union
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple, Union
 
 from pydantic_ai import BinaryContent, DocumentUrl, ImageUrl
 
-from code_puppy.command_line.image_utils import normalize_image_bytes
 
 SUPPORTED_INLINE_SCHEMES = {"http", "https"}
 
@@ -20,6 +24,12 @@ SUPPORTED_INLINE_SCHEMES = {"http", "https"}
 # Most OS have limits around 4096, but we set lower to catch garbage early
 MAX_PATH_LENGTH = 1024
 
+# How long the live prompt highlighter trusts a stat result; a file that is
+# created or deleted while typing shows up (or disappears) within this window.
+PATH_STAT_TTL_SECONDS = 2.0
+# Paths remembered by the highlighter's stat cache (every prefix typed counts).
+PATH_STAT_CACHE_MAX_ENTRIES = 512
+
 # Allow common extensions people drag in the terminal.
 DEFAULT_ACCEPTED_IMAGE_EXTENSIONS = {
     ".png",
@@ -205,18 +215,31 @@ def _load_binary(path: Path) -> bytes:
         ) from exc
 
 
+def normalize_image_bytes(data: bytes, media_type: str) -> Tuple[bytes, str]:
+    """Resize oversized images; PIL is imported on the first attachment, not at startup."""
+    from code_puppy.command_line.image_utils import normalize_image_bytes as normalize
+
+    return normalize(data, media_type)
+
+
 def _tokenise(prompt: str) -> Iterable[str]:
     """Split the prompt preserving quoted segments using shell-like semantics."""
 
     if not prompt:
         return []
+    # On Windows, avoid POSIX escaping so backslashes are preserved
+    return list(_tokenise_cached(prompt, os.name != "nt"))
+
+
+@lru_cache(maxsize=64)
+def _tokenise_cached(prompt: str, posix_mode: bool) -> Tuple[str, ...]:
+    # The prompt is re-rendered many times per edit (cursor moves, menus,
+    # toolbar refreshes); shlex is pure Python, so only run it on new text.
     try:
-        # On Windows, avoid POSIX escaping so backslashes are preserved
-        posix_mode = os.name != "nt"
-        return shlex.split(prompt, posix=posix_mode)
+        return tuple(shlex.split(prompt, posix=posix_mode))
     except ValueError:
         # Fallback naive split when shlex fails (e.g. unmatched quotes)
-        return prompt.split()
+        return tuple(prompt.split())
 
 
 def _strip_attachment_token(token: str) -> str:
@@ -259,6 +282,84 @@ def _parse_link(token: str) -> PromptLinkAttachment | None:
     return None
 
 
+def _is_existing_file(path: Path) -> Optional[bool]:
+    """Whether ``path`` is an existing regular file; None if the stat failed."""
+    try:
+        return path.exists() and path.is_file()
+    except OSError:
+        # ENAMETOOLONG and friends: not a path worth attaching.
+        return None
+
+
+class PathStatCache:
+    """TTL cache of :func:`_is_existing_file` results for the live highlighter.
+
+    :meth:`is_file` never touches the filesystem: a miss (or an expired
+    entry) queues the stat on a worker thread and reports "not a file" for
+    now. When results land, ``on_update`` is called from the worker so the
+    prompt can redraw and the placeholder fills in. ``generation`` changes
+    whenever a result does. At most ``max_entries`` paths are remembered,
+    least recently asked about evicted first.
+    """
+
+    def __init__(
+        self,
+        ttl: float = PATH_STAT_TTL_SECONDS,
+        on_update: Optional[Callable[[], None]] = None,
+        executor: Optional[Executor] = None,
+        clock: Callable[[], float] = time.monotonic,
+        max_entries: int = PATH_STAT_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl = ttl
+        self.on_update = on_update
+        self.generation = 0
+        self.max_entries = max_entries
+        self._clock = clock
+        self._executor = executor
+        self._entries: "OrderedDict[Path, Tuple[float, Optional[bool]]]" = OrderedDict()
+        self._pending: set[Path] = set()
+        self._lock = threading.Lock()
+
+    def is_file(self, path: Path) -> Optional[bool]:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None:
+                self._entries.move_to_end(path)
+                if now - entry[0] < self.ttl:
+                    return entry[1]
+            # Until the stat lands, keep showing the previous answer (no flicker).
+            answer = entry[1] if entry is not None else False
+            if path in self._pending:
+                return answer
+            self._pending.add(path)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="prompt-path-stat"
+            )
+        self._executor.submit(self._refresh, path, answer)
+        return answer
+
+    def _refresh(self, path: Path, answered: Optional[bool]) -> None:
+        result = _is_existing_file(path)
+        with self._lock:
+            self._entries[path] = (self._clock(), result)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._pending.discard(path)
+            # Only an answer different from the one is_file gave is worth a
+            # redraw.
+            changed = answered != result
+            if changed:
+                self.generation += 1
+        if changed and self.on_update is not None:
+            try:
+                self.on_update()
+            except Exception:
+                pass
+
+
 @dataclass
 class _DetectedPath:
     placeholder: str
@@ -272,14 +373,23 @@ class _DetectedPath:
         return self.path is not None and not self.unsupported
 
 
-def _detect_path_tokens(prompt: str) -> tuple[list[_DetectedPath], list[str]]:
+def _detect_path_tokens(
+    prompt: str,
+    is_file: Callable[[Path], Optional[bool]] = _is_existing_file,
+) -> tuple[list[_DetectedPath], list[str]]:
+    """Find attachment paths in ``prompt``.
+
+    ``is_file`` answers "is this an existing regular file?" (None: the stat
+    failed, skip the token); the live highlighter passes a
+    :class:`PathStatCache` so rendering never blocks on the filesystem.
+    """
     # Preserve backslash-spaces from drag-and-drop before shlex tokenization
     # Replace '\ ' with a marker that shlex won't split, then restore later
     ESCAPE_MARKER = "\u0000ESCAPED_SPACE\u0000"
     masked_prompt = prompt.replace(r"\ ", ESCAPE_MARKER)
-    tokens = list(_tokenise(masked_prompt))
+    masked_tokens = list(_tokenise(masked_prompt))
     # Restore escaped spaces in individual tokens
-    tokens = [t.replace(ESCAPE_MARKER, " ") for t in tokens]
+    tokens = [t.replace(ESCAPE_MARKER, " ") for t in masked_tokens]
 
     detections: list[_DetectedPath] = []
     warnings: list[str] = []
@@ -316,7 +426,7 @@ def _detect_path_tokens(prompt: str) -> tuple[list[_DetectedPath], list[str]]:
         consumed_until = index + 1
         candidate_path_token = stripped_token
         # For placeholder: try to reconstruct escaped representation; if none, use raw token
-        original_tokens_for_slice = list(_tokenise(masked_prompt))[index:consumed_until]
+        original_tokens_for_slice = masked_tokens[index:consumed_until]
         candidate_placeholder = "".join(
             ot.replace(ESCAPE_MARKER, r"\ ") if ESCAPE_MARKER in ot else ot
             for ot in original_tokens_for_slice
@@ -332,16 +442,13 @@ def _detect_path_tokens(prompt: str) -> tuple[list[_DetectedPath], list[str]]:
             index = consumed_until
             continue
 
-        # Guard filesystem operations against OS errors (ENAMETOOLONG, etc.)
-        try:
-            path_exists = path.exists()
-            path_is_file = path.is_file() if path_exists else False
-        except OSError:
+        path_is_file = is_file(path)
+        if path_is_file is None:
             # Skip this token if filesystem check fails (path too long, etc.)
             index = consumed_until
             continue
 
-        if not path_exists or not path_is_file:
+        if not path_is_file:
             found_span = False
             last_path = path
             for joined, end_index in _candidate_paths(tokens, index):
@@ -359,14 +466,11 @@ def _detect_path_tokens(prompt: str) -> tuple[list[_DetectedPath], list[str]]:
                     # Suppress warnings for non-file spans; just skip quietly
                     found_span = False
                     break
-                try:
-                    if last_path.exists() and last_path.is_file():
-                        path = last_path
-                        found_span = True
-                        # We'll rebuild escaped placeholder after this block
-                        break
-                except OSError:
-                    continue
+                if is_file(last_path):
+                    path = last_path
+                    found_span = True
+                    # We'll rebuild escaped placeholder after this block
+                    break
             if not found_span:
                 # Quietly skip tokens that are not files
                 index += 1
@@ -480,6 +584,7 @@ def parse_prompt_attachments(prompt: str) -> ProcessedPrompt:
 
 
 __all__ = [
+    "PathStatCache",
     "ProcessedPrompt",
     "PromptAttachment",
     "PromptLinkAttachment",
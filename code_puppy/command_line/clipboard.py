@@ -31,8 +31,12 @@ except ImportError:
 # Shared resize/verify helpers and limits — single source of truth.
 from code_puppy.command_line.image_utils import (  # noqa: E402
     MAX_IMAGE_SIZE_BYTES,
+    NormalizedImage,
     _resize_image_if_needed,
     _safe_open_image,
+    image_digest,
+    normalized_image_cache,
+    pixel_digest,
 )
 
 # Import BinaryContent for pydantic-ai integration
@@ -131,10 +135,24 @@ def _get_linux_clipboard_image() -> Optional[bytes]:
     return None
 
 
-def _image_to_png_bytes(image: "Image.Image") -> Optional[bytes]:
-    """Normalize a PIL image and return PNG bytes within configured limits."""
+def _image_to_png_bytes(
+    image: "Image.Image", cache_key: Optional[str] = None
+) -> Optional[bytes]:
+    """Normalize a PIL image and return PNG bytes within configured limits.
+
+    The first encode is the answer whenever it fits; only an oversized
+    result is resized (scaled from the measured size) and encoded again.
+    Results are cached under *cache_key*, or the image's pixel digest.
+    """
     if Image is None:
         return None
+    if cache_key is None:
+        cache_key = pixel_digest(image, "png", MAX_IMAGE_SIZE_BYTES)
+    if cache_key is not None:
+        cached = normalized_image_cache.get(cache_key)
+        if cached is not None:
+            return cached.data
+
     if image.mode in ("RGBA", "LA") or (
         image.mode == "P" and "transparency" in image.info
     ):
@@ -142,11 +160,22 @@ def _image_to_png_bytes(image: "Image.Image") -> Optional[bytes]:
     elif image.mode != "RGB":
         image = image.convert("RGB")
 
-    image = _resize_image_if_needed(image, MAX_IMAGE_SIZE_BYTES)
     buffer = io.BytesIO()
     image.save(buffer, format="PNG", optimize=True)
     image_bytes = buffer.getvalue()
+    if len(image_bytes) > MAX_IMAGE_SIZE_BYTES:
+        image = _resize_image_if_needed(
+            image, MAX_IMAGE_SIZE_BYTES, encoded_size=len(image_bytes)
+        )
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG", optimize=True)
+        image_bytes = buffer.getvalue()
     logger.info(f"Clipboard image size: {len(image_bytes) / 1024:.1f}KB")
+    if cache_key is not None:
+        normalized_image_cache.put(
+            cache_key,
+            NormalizedImage(image_bytes, "image/png", image.width, image.height),
+        )
     return image_bytes
 
 
@@ -161,8 +190,13 @@ def get_image_file_as_png(file_path: str) -> Optional[bytes]:
         if path.stat().st_size > MAX_IMAGE_FILE_SIZE_BYTES:
             logger.warning(f"Rejected oversized image file: {path}")
             return None
-        image = _safe_open_image(path.read_bytes())
-        return None if image is None else _image_to_png_bytes(image)
+        data = path.read_bytes()
+        image = _safe_open_image(data)
+        if image is None:
+            return None
+        return _image_to_png_bytes(
+            image, cache_key=image_digest(data, "png", MAX_IMAGE_SIZE_BYTES)
+        )
     except Exception as e:
         logger.debug(f"Failed to read pasted image file {file_path!r}: {e}")
         return None
@@ -263,10 +297,24 @@ def get_clipboard_image() -> Optional[bytes]:
                         "Image verification failed for Linux clipboard image"
                     )
                     return None
-                image = _resize_image_if_needed(image, MAX_IMAGE_SIZE_BYTES)
+                key = image_digest(image_bytes, "png", MAX_IMAGE_SIZE_BYTES)
+                cached = normalized_image_cache.get(key)
+                if cached is not None:
+                    return cached.data
+                # The clipboard tools hand over PNG, so its length is the
+                # PNG size the resize has to beat.
+                image = _resize_image_if_needed(
+                    image, MAX_IMAGE_SIZE_BYTES, encoded_size=len(image_bytes)
+                )
                 buffer = io.BytesIO()
                 image.save(buffer, format="PNG", optimize=True)
                 image_bytes = buffer.getvalue()
+                normalized_image_cache.put(
+                    key,
+                    NormalizedImage(
+                        image_bytes, "image/png", image.width, image.height
+                    ),
+                )
             except Exception as e:
                 logger.warning(f"Error resizing Linux clipboard image: {e}")
                 return None
@@ -137,6 +137,49 @@ def handle_tools_command(command: str) -> bool:
     return True
 
 
+@register_command(
+    name="tool_stats",
+    description="Show per-tool call counts and wall time for this session",
+    usage="/tool_stats [reset]",
+    category="core",
+)
+def handle_tool_stats_command(command: str) -> bool:
+    """Render the in-process tool timing registry (or reset it)."""
+    from rich.table import Table
+
+    from code_puppy.messaging import emit_info, emit_success
+    from code_puppy.tool_metrics import get_tool_timings, reset_tool_timings
+
+    tokens = command.split()
+    if len(tokens) > 1 and tokens[1].lower() == "reset":
+        reset_tool_timings()
+        emit_success("Tool timing stats reset.")
+        return True
+
+    timings = get_tool_timings()
+    if not timings:
+        emit_info("No tool calls recorded yet.")
+        return True
+
+    table = Table(title="Tool wall time (this session)")
+    table.add_column("Tool", style="cyan")
+    for column in ("Calls", "Errors", "Mean ms", "Min ms", "Max ms", "Total ms"):
+        table.add_column(column, justify="right")
+    ranked = sorted(timings.items(), key=lambda item: item[1].total_ms, reverse=True)
+    for name, timing in ranked:
+        table.add_row(
+            name,
+            str(timing.calls),
+            str(timing.errors),
+            f"{timing.mean_ms:.1f}",
+            f"{timing.min_ms:.1f}",
+            f"{timing.max_ms:.1f}",
+            f"{timing.total_ms:.1f}",
+        )
+    emit_info(table)
+    return True
+
+
 @register_command(
     name="paste",
     description="Paste image from clipboard (same as F3, or Ctrl+V with image)",
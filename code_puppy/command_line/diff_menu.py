@@ -7,9 +7,11 @@ Supports cycling through all supported languages with left/right arrows!
 import asyncio
 import io
 import sys
+from collections import OrderedDict
 from typing import Callable, Optional
 
 from prompt_toolkit import Application
+from prompt_toolkit.application.current import get_app_or_none
 from prompt_toolkit.formatted_text import ANSI, FormattedText
 from prompt_toolkit.key_binding import KeyBindings
 from prompt_toolkit.layout import Layout, VSplit, Window
@@ -350,6 +352,132 @@ SUPPORTED_LANGUAGES = [
 ]
 
 
+# The preview is rendered at this width; its diff body shows only as many
+# lines as fit below the header (DEFAULT_PREVIEW_LINES when the terminal
+# size is unknown).
+PREVIEW_WIDTH = 90
+PREVIEW_CHROME_ROWS = 18
+DEFAULT_PREVIEW_LINES = 30
+PREVIEW_CACHE_GROUPS = 256
+
+
+def _preview_console(buffer: io.StringIO) -> Console:
+    return Console(
+        file=buffer,
+        force_terminal=True,
+        width=PREVIEW_WIDTH,
+        legacy_windows=False,
+        color_system="truecolor",
+        no_color=False,
+        force_interactive=True,  # Force interactive mode for better color support
+    )
+
+
+class _PreviewRenderCache:
+    """Rendered ANSI for the preview, built one visible line at a time.
+
+    A diff line's ANSI depends only on its language and on the color of its
+    own kind, so lines are grouped under ``(language, kind, color)``.
+    Changing the addition color misses only the ``added`` group: context
+    and removed lines are reused as they are. Syntax highlighting, which no
+    color affects, is kept per line, and only lines in view are ever drawn.
+    """
+
+    def __init__(self, max_groups: int = PREVIEW_CACHE_GROUPS):
+        self.max_groups = max_groups
+        # language -> (lexer, [(kind, line)], {line index: highlighted code})
+        self._bodies: dict[str, tuple] = {}
+        self._groups: OrderedDict[tuple, dict[int, str]] = OrderedDict()
+        self._markup: OrderedDict[str, str] = OrderedDict()
+        self._buffer = io.StringIO()
+        self._console = _preview_console(self._buffer)
+        self.hits = 0
+        self.misses = 0
+
+    def body(self, language: str) -> list[tuple[str, str]]:
+        """``(kind, line)`` for each displayed line of ``language``'s sample."""
+        return self._parsed(language)[1]
+
+    def _parsed(self, language: str):
+        parsed = self._bodies.get(language)
+        if parsed is None:
+            from code_puppy.tools.common import (
+                _diff_line_kind,
+                _extract_file_extension_from_diff,
+                _get_lexer_for_extension,
+            )
+
+            _, sample_diff = LANGUAGE_SAMPLES.get(language, LANGUAGE_SAMPLES["python"])
+            lines = sample_diff.split("\n")
+            if lines and lines[-1] == "":
+                lines = lines[:-1]
+            body = []
+            for line in lines:
+                kind = _diff_line_kind(line) if line else "blank"
+                if kind is not None:
+                    body.append((kind, line))
+            lexer = _get_lexer_for_extension(
+                _extract_file_extension_from_diff(sample_diff)
+            )
+            parsed = self._bodies[language] = (lexer, body, {})
+        return parsed
+
+    def _print(self, renderable) -> str:
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._console.print(renderable, end="")
+        return self._buffer.getvalue()
+
+    def _remember(self, store: OrderedDict, key, value) -> None:
+        store[key] = value
+        if len(store) > self.max_groups:
+            store.popitem(last=False)
+
+    def markup(self, text: str) -> str:
+        """ANSI for a Rich markup string (header and footer)."""
+        ansi = self._markup.get(text)
+        if ansi is None:
+            ansi = self._print(text)
+            self._remember(self._markup, text, ansi)
+        else:
+            self._markup.move_to_end(text)
+        return ansi
+
+    def line(
+        self, language: str, index: int, addition_color: str, deletion_color: str
+    ) -> str:
+        """ANSI for body line ``index`` of ``language`` under the given colors."""
+        from code_puppy.tools.common import _format_diff_line, _highlight_diff_code
+
+        lexer, body, highlighted = self._parsed(language)
+        kind, text = body[index]
+        color = {"added": addition_color, "removed": deletion_color}.get(kind)
+        key = (language, kind, color)
+        group = self._groups.get(key)
+        if group is None:
+            group = {}
+            self._remember(self._groups, key, group)
+        else:
+            self._groups.move_to_end(key)
+        ansi = group.get(index)
+        if ansi is not None:
+            self.hits += 1
+            return ansi
+        self.misses += 1
+        if kind == "blank":
+            ansi = ""
+        else:
+            # Highlighting is color-independent: do it once per line.
+            code = highlighted.get(index)
+            if code is None:
+                code = highlighted[index] = _highlight_diff_code(text, lexer)
+            ansi = self._print(
+                _format_diff_line(text, lexer, addition_color, deletion_color, code)
+            )
+        group[index] = ansi
+        return ansi
+
+
 class DiffConfiguration:
     """Holds the current diff configuration state."""
 
@@ -365,6 +493,8 @@ class DiffConfiguration:
         self.original_add_color = self.current_add_color
         self.original_del_color = self.current_del_color
         self.current_language_index = 0  # Track current language for preview
+        self.preview_offset = 0  # First diff line shown in the preview
+        self.preview_cache = _PreviewRenderCache()
 
     def has_changes(self) -> bool:
         """Check if any changes have been made."""
@@ -378,12 +508,18 @@ class DiffConfiguration:
         self.current_language_index = (self.current_language_index + 1) % len(
             SUPPORTED_LANGUAGES
         )
+        self.preview_offset = 0
 
     def prev_language(self):
         """Cycle to the previous language."""
         self.current_language_index = (self.current_language_index - 1) % len(
             SUPPORTED_LANGUAGES
         )
+        self.preview_offset = 0
+
+    def scroll_preview(self, lines: int) -> None:
+        """Move the preview viewport; clamped when the preview is drawn."""
+        self.preview_offset = max(0, self.preview_offset + lines)
 
     def get_current_language(self) -> str:
         """Get the currently selected language."""
@@ -564,6 +700,18 @@ async def _split_panel_selector(
             config.next_language()
             event.app.invalidate()
 
+    @kb.add("pageup")
+    def scroll_up(event):
+        if config is not None:
+            config.scroll_preview(-_preview_body_height())
+            event.app.invalidate()
+
+    @kb.add("pagedown")
+    def scroll_down(event):
+        if config is not None:
+            config.scroll_preview(_preview_body_height())
+            event.app.invalidate()
+
     @kb.add("enter")
     def accept(event):
         if choices:
@@ -729,16 +877,32 @@ def _convert_rich_color_to_prompt_toolkit(color: str) -> str:
     return "white"
 
 
-def _get_preview_text_for_prompt_toolkit(config: DiffConfiguration) -> ANSI:
+def _preview_body_height() -> int:
+    """Diff lines that fit in the preview frame of the running app."""
+    app = get_app_or_none()
+    if app is None:
+        return DEFAULT_PREVIEW_LINES
+    try:
+        rows = app.output.get_size().rows
+    except Exception:
+        return DEFAULT_PREVIEW_LINES
+    return max(5, rows - PREVIEW_CHROME_ROWS)
+
+
+def _get_preview_text_for_prompt_toolkit(
+    config: DiffConfiguration, height: Optional[int] = None
+) -> ANSI:
     """Get preview as ANSI for embedding in selector with live colors.
 
-    Returns ANSI-formatted text that prompt_toolkit can render with full colors.
+    Only the diff lines inside the viewport (``height`` lines from
+    ``config.preview_offset``) are rendered, each through the config's
+    render cache, so a keypress costs at most one screenful of highlighting.
     """
-    from code_puppy.tools.common import format_diff_with_colors
+    cache = config.preview_cache
 
     # Get the current language and its sample
     current_lang = config.get_current_language()
-    filename, sample_diff = LANGUAGE_SAMPLES.get(
+    filename, _ = LANGUAGE_SAMPLES.get(
         current_lang,
         LANGUAGE_SAMPLES["python"],  # Fallback to Python
     )
@@ -762,38 +926,35 @@ def _get_preview_text_for_prompt_toolkit(config: DiffConfiguration) -> ANSI:
     header_parts.append(f"[bold] Example ({filename}):[/bold]")
     header_parts.append("")
 
-    header_text = "\n".join(header_parts)
+    body = cache.body(current_lang)
+    height = height or _preview_body_height()
+    start = min(config.preview_offset, max(0, len(body) - height))
+    config.preview_offset = start
+    end = min(len(body), start + height)
 
     # Pass preview colors directly. A preview should not scribble in puppy.cfg.
-    formatted_diff = format_diff_with_colors(
-        sample_diff,
-        addition_color=config.current_add_color,
-        deletion_color=config.current_del_color,
-    )
+    visible = [
+        cache.line(
+            current_lang, index, config.current_add_color, config.current_del_color
+        )
+        for index in range(start, end)
+    ]
+
+    footer = "[bold]═" * 50 + "[/bold]"
+    if start > 0 or end < len(body):
+        footer = (
+            f"[dim] lines {start + 1}-{end} of {len(body)}  "
+            f"(PgUp/PgDn to scroll)[/dim]\n" + footer
+        )
 
-    # Render everything with Rich Console to get ANSI output with proper color support
-    buffer = io.StringIO()
-    console = Console(
-        file=buffer,
-        force_terminal=True,
-        width=90,
-        legacy_windows=False,
-        color_system="truecolor",
-        no_color=False,
-        force_interactive=True,  # Force interactive mode for better color support
+    ansi_output = (
+        cache.markup("\n".join(header_parts))
+        + "\n"
+        + "\n".join(visible)
+        + "\n\n"
+        + cache.markup(footer)
     )
 
-    # Print header
-    console.print(header_text, end="\n")
-
-    # Print diff (handles both Text objects and markup strings)
-    console.print(formatted_diff, end="\n\n")
-
-    # Print footer
-    console.print("[bold]═" * 50 + "[/bold]", end="")
-
-    ansi_output = buffer.getvalue()
-
     # Wrap in ANSI() so prompt_toolkit can render it
     return ANSI(ansi_output)
 
@@ -4,15 +4,26 @@ Provides PIL-based image verification, decompression-bomb protection, and
 size-based downscaling.  Both ``clipboard.py`` and ``attachments.py`` import
 from here so that the resize policy lives in exactly one place.
 
+Sizing never trial-encodes: bytes that already fit are passed through
+without decoding, and the downscale factor comes from the encoded length
+(PNG sources) or the raw pixel size, which bounds the PNG output from above.
+JPEGs are decoded at a reduced scale via ``draft()`` and large downscales
+``reduce()`` before the final LANCZOS pass.  Normalized output is cached by
+the SHA-256 of the input, so re-pasting or re-loading the same screenshot
+costs one hash.
+
 All public functions fail gracefully — if PIL is unavailable, or the bytes
 are not a recognisable image, the original data is returned unchanged.
 """
 
 from __future__ import annotations
 
+import hashlib
 import io
 import logging
-from typing import Optional, Tuple
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +37,34 @@ MAX_IMAGE_SIZE_BYTES: int = 10 * 1024 * 1024  # 10 MB
 #: Hard cap on either dimension after any resize.
 MAX_IMAGE_DIMENSION: int = 4096  # px
 
+#: Normalized outputs remembered for repeat pastes/loads of the same bytes.
+NORMALIZED_CACHE_ENTRIES: int = 16
+NORMALIZED_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+#: ``Image.resize(reducing_gap=...)``: box-reduce by an integer factor first,
+#: leaving LANCZOS at most this much downscaling to do.
+REDUCING_GAP: float = 3.0
+
+# Decoded bytes per pixel; width * height * this bounds the PNG encoding.
+_BYTES_PER_PIXEL = {
+    "1": 1,
+    "L": 1,
+    "P": 1,
+    "LA": 2,
+    "I;16": 2,
+    "RGB": 3,
+    "YCbCr": 3,
+    "LAB": 3,
+    "HSV": 3,
+    "RGBA": 4,
+    "CMYK": 4,
+    "I": 4,
+    "F": 4,
+}
+
+# Modes PNG can store directly; anything else is converted to RGB.
+_PNG_MODES = ("RGB", "RGBA", "L", "LA", "P")
+
 
 # ---------------------------------------------------------------------------
 # Optional PIL import
@@ -42,6 +81,94 @@ except ImportError:  # pragma: no cover
     Image = None  # type: ignore[misc, assignment]
 
 
+# ---------------------------------------------------------------------------
+# Normalized-output cache
+# ---------------------------------------------------------------------------
+
+
+class NormalizedImage(NamedTuple):
+    data: bytes
+    media_type: str
+    width: int
+    height: int
+
+
+class _NormalizedImageCache:
+    """Thread-safe LRU of normalized images, bounded by count and total bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._bytes = 0
+        self._entries: "OrderedDict[str, NormalizedImage]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[NormalizedImage]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: NormalizedImage) -> None:
+        if len(value.data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous.data)
+            self._entries[key] = value
+            self._bytes += len(value.data)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = 0
+
+
+normalized_image_cache = _NormalizedImageCache(
+    NORMALIZED_CACHE_ENTRIES, NORMALIZED_CACHE_MAX_BYTES
+)
+
+
+def normalized_image_cache_stats() -> dict:
+    """Hit/miss counters, entry count and byte size of the normalized cache."""
+    return {
+        "hits": normalized_image_cache.hits,
+        "misses": normalized_image_cache.misses,
+        "size": len(normalized_image_cache._entries),
+        "bytes": normalized_image_cache._bytes,
+    }
+
+
+def image_digest(data: bytes, *params: object) -> str:
+    """Cache key: SHA-256 of *data* plus the normalization parameters."""
+    digest = hashlib.sha256(data).hexdigest()
+    return ":".join([digest, *map(str, params)])
+
+
+def pixel_digest(image: "Image.Image", *params: object) -> Optional[str]:
+    """Cache key for an already-decoded image (e.g. from ``ImageGrab``).
+
+    Returns ``None`` when *image* is not a real PIL image.
+    """
+    if Image is None or not isinstance(image, Image.Image):
+        return None
+    pixels = image.tobytes()
+    if not isinstance(pixels, bytes):
+        return None
+    return image_digest(pixels, image.mode, *image.size, *params)
+
+
 # ---------------------------------------------------------------------------
 # Internal helpers (re-exported for callers that hold a PIL Image already)
 # ---------------------------------------------------------------------------
@@ -76,14 +203,48 @@ def _safe_open_image(image_bytes: bytes) -> "Optional[Image.Image]":
     return None
 
 
+def _estimated_png_bytes(image: "Image.Image") -> int:
+    """Upper bound on *image*'s PNG size: its decoded pixel bytes."""
+    return image.width * image.height * _BYTES_PER_PIXEL.get(image.mode, 4)
+
+
+def _scaled_size(
+    width: int, height: int, current: int, max_bytes: int
+) -> Tuple[int, int]:
+    """Target dimensions for shrinking *current* bytes to *max_bytes*."""
+    scale = (max_bytes / current) ** 0.5 * 0.9  # 10 % safety margin
+    new_w = int(width * scale)
+    new_h = int(height * scale)
+
+    # Respect aspect ratio when a dimension hits the hard cap
+    if new_w > MAX_IMAGE_DIMENSION:
+        ratio = MAX_IMAGE_DIMENSION / new_w
+        new_w = MAX_IMAGE_DIMENSION
+        new_h = int(new_h * ratio)
+    if new_h > MAX_IMAGE_DIMENSION:
+        ratio = MAX_IMAGE_DIMENSION / new_h
+        new_h = MAX_IMAGE_DIMENSION
+        new_w = int(new_w * ratio)
+
+    # Floor both dimensions
+    return max(new_w, 100), max(new_h, 100)
+
+
 def _resize_image_if_needed(
     image: "Image.Image",
     max_bytes: int,
+    *,
+    encoded_size: Optional[int] = None,
 ) -> "Image.Image":
     """Return *image* downscaled so its PNG encoding fits within *max_bytes*.
 
-    Uses a square-root area estimate with a 10 % safety margin.  Dimensions
-    are capped at :data:`MAX_IMAGE_DIMENSION` and floored at 100 px.
+    *encoded_size* is the PNG size when the caller already knows it (a PNG
+    source, or an encode it needs anyway); otherwise the decoded pixel size
+    stands in for it, so nothing is encoded just to measure.  Uses a
+    square-root area estimate with a 10 % safety margin.  Dimensions are
+    capped at :data:`MAX_IMAGE_DIMENSION` and floored at 100 px.
+
+    Call it before the image is loaded to let JPEGs decode at reduced scale.
 
     Returns the **same object** unchanged when no resize is required — callers
     can use ``result is image`` to detect whether a resize occurred.
@@ -91,42 +252,29 @@ def _resize_image_if_needed(
     if Image is None:  # pragma: no cover
         return image
 
-    buf = io.BytesIO()
-    image.save(buf, format="PNG", optimize=True)
-    current = buf.tell()
-
+    current = encoded_size if encoded_size is not None else _estimated_png_bytes(image)
     if current <= max_bytes:
         return image
 
     logger.info(
-        "Image size (%.2f MB) exceeds limit (%.2f MB), resizing…",
+        "Image size (~%.2f MB as PNG) exceeds limit (%.2f MB), resizing…",
         current / 1024 / 1024,
         max_bytes / 1024 / 1024,
     )
 
-    scale = (max_bytes / current) ** 0.5 * 0.9  # 10 % safety margin
-    new_w = int(image.width * scale)
-    new_h = int(image.height * scale)
+    width, height = image.width, image.height
+    new_w, new_h = _scaled_size(width, height, current, max_bytes)
 
-    # Respect aspect ratio when a dimension hits the hard cap
-    if new_w > MAX_IMAGE_DIMENSION:
-        ratio = MAX_IMAGE_DIMENSION / new_w
-        new_w = MAX_IMAGE_DIMENSION
-        new_h = int(new_h * ratio)
-    if new_h > MAX_IMAGE_DIMENSION:
-        ratio = MAX_IMAGE_DIMENSION / new_h
-        new_h = MAX_IMAGE_DIMENSION
-        new_w = int(new_w * ratio)
-
-    # Floor both dimensions
-    new_w = max(new_w, 100)
-    new_h = max(new_h, 100)
-
-    resized = image.resize((new_w, new_h), Image.Resampling.LANCZOS)
+    # JPEG only (a no-op elsewhere, or once loaded): decode at 1/2, 1/4 or
+    # 1/8 scale, never below the target size.
+    image.draft(None, (new_w, new_h))
+    resized = image.resize(
+        (new_w, new_h), Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP
+    )
     logger.info(
         "Resized image from %dx%d to %dx%d",
-        image.width,
-        image.height,
+        width,
+        height,
         new_w,
         new_h,
     )
@@ -152,46 +300,66 @@ def normalize_image_bytes(
         max_bytes: Byte budget; defaults to :data:`MAX_IMAGE_SIZE_BYTES`.
 
     Returns:
-        A ``(bytes, media_type)`` tuple.  If a resize was performed the bytes
-        are re-encoded as PNG and *media_type* is updated to ``"image/png"``.
-        The original ``(data, media_type)`` pair is returned unchanged when:
+        A ``(bytes, media_type)`` tuple.  If the input exceeded *max_bytes*
+        the image is resized as needed and re-encoded as PNG, and
+        *media_type* becomes ``"image/png"``.  The original
+        ``(data, media_type)`` pair is returned unchanged when:
 
         - *media_type* does not start with ``"image/"``
+        - the bytes already fit within *max_bytes* (checked before decoding)
         - PIL is unavailable
-        - the image already fits within *max_bytes*
         - any error occurs (always fails gracefully)
     """
     if not media_type.startswith("image/"):
         return data, media_type
 
+    if len(data) <= max_bytes:
+        # What the model receives already fits: no decode, no re-encode.
+        return data, media_type
+
     if not _PIL_AVAILABLE:
         logger.debug("PIL unavailable; skipping image normalization")
         return data, media_type
 
+    key = image_digest(data, "png", max_bytes)
+    cached = normalized_image_cache.get(key)
+    if cached is not None:
+        return cached.data, cached.media_type
+
     image = _safe_open_image(data)
     if image is None:
         # Corrupt or unrecognised — pass through and let the model deal with it
         return data, media_type
 
-    # Ensure PIL can PNG-encode the mode
-    if image.mode not in ("RGB", "RGBA", "L", "LA", "P"):
-        image = image.convert("RGB")
-
-    resized = _resize_image_if_needed(image, max_bytes)
-
-    if resized is image:
-        # No resize was needed; return the original bytes untouched
+    try:
+        # A PNG's length predicts its re-encode; other formats fall back
+        # to the decoded-size bound.
+        encoded_size = len(data) if image.format == "PNG" else None
+        resized = _resize_image_if_needed(image, max_bytes, encoded_size=encoded_size)
+        # Ensure PIL can PNG-encode the mode
+        if resized.mode not in _PNG_MODES:
+            resized = resized.convert("RGB")
+        buf = io.BytesIO()
+        resized.save(buf, format="PNG", optimize=True)
+    except Exception as exc:
+        logger.warning("Failed to normalize image: %s: %s", type(exc).__name__, exc)
         return data, media_type
 
-    buf = io.BytesIO()
-    resized.save(buf, format="PNG", optimize=True)
-    return buf.getvalue(), "image/png"
+    normalized = NormalizedImage(buf.getvalue(), "image/png", *resized.size)
+    normalized_image_cache.put(key, normalized)
+    return normalized.data, normalized.media_type
 
 
 __all__ = [
     "MAX_IMAGE_SIZE_BYTES",
     "MAX_IMAGE_DIMENSION",
+    "REDUCING_GAP",
+    "NormalizedImage",
+    "image_digest",
     "normalize_image_bytes",
+    "normalized_image_cache",
+    "normalized_image_cache_stats",
+    "pixel_digest",
     # Internal helpers re-exported for clipboard.py
     "_safe_open_image",
     "_resize_image_if_needed",
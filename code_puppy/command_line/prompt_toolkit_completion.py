@@ -11,6 +11,7 @@ import sys
 from typing import Optional
 
 from prompt_toolkit import PromptSession
+from prompt_toolkit.application.current import get_app_or_none
 from prompt_toolkit.completion import Completer, Completion, merge_completers
 from prompt_toolkit.filters import is_searching
 from prompt_toolkit.formatted_text import FormattedText
@@ -24,12 +25,10 @@ from prompt_toolkit.styles import Style
 from code_puppy.command_line.attachments import (
     DEFAULT_ACCEPTED_DOCUMENT_EXTENSIONS,
     DEFAULT_ACCEPTED_IMAGE_EXTENSIONS,
+    PathStatCache,
     _detect_path_tokens,
     _tokenise,
 )
-from code_puppy.command_line.clipboard import (
-    capture_clipboard_image_to_pending,
-)
 from code_puppy.command_line.command_registry import get_unique_commands
 from code_puppy.command_line.file_path_completion import FilePathCompleter
 from code_puppy.command_line.load_context_completion import LoadContextCompleter
@@ -50,6 +49,15 @@ from code_puppy.config import (
 )
 
 
+def capture_clipboard_image_to_pending():
+    """Clipboard image capture; PIL is imported on the first paste, not at startup."""
+    from code_puppy.command_line.clipboard import (
+        capture_clipboard_image_to_pending as capture,
+    )
+
+    return capture()
+
+
 def _sanitize_for_encoding(text: str) -> str:
     """Remove or replace characters that can't be safely encoded.
 
@@ -175,6 +183,19 @@ class AttachmentPlaceholderProcessor(Processor):
     # Skip expensive path detection for very long input (likely pasted content)
     _MAX_TEXT_LENGTH_FOR_REALTIME = 500
 
+    def __init__(self, stat_cache: Optional[PathStatCache] = None) -> None:
+        # Stats run on a worker thread; when one lands we redraw so the
+        # placeholder fills in without the keystroke ever waiting on disk.
+        self._stat_cache = stat_cache or PathStatCache()
+        if self._stat_cache.on_update is None:
+            self._stat_cache.on_update = self._redraw
+        self._app = None
+        self._memo: tuple[str, int, list[tuple[int, int, str]]] | None = None
+
+    def _redraw(self) -> None:
+        if self._app is not None:
+            self._app.invalidate()
+
     def apply_transformation(self, transformation_input):
         document = transformation_input.document
         text = document.text
@@ -185,7 +206,20 @@ class AttachmentPlaceholderProcessor(Processor):
         if len(text) > self._MAX_TEXT_LENGTH_FOR_REALTIME:
             return Transformation(list(transformation_input.fragments))
 
-        detections, _warnings = _detect_path_tokens(text)
+        if self._app is None:
+            self._app = get_app_or_none()
+        generation = self._stat_cache.generation
+        if self._memo is not None and self._memo[:2] == (text, generation):
+            replacements = self._memo[2]
+        else:
+            replacements = self._find_replacements(text)
+            self._memo = (text, generation, replacements)
+        if not replacements:
+            return Transformation(list(transformation_input.fragments))
+        return self._render(text, replacements)
+
+    def _find_replacements(self, text: str) -> list[tuple[int, int, str]]:
+        detections, _warnings = _detect_path_tokens(text, self._stat_cache.is_file)
         replacements: list[tuple[int, int, str]] = []
         search_cursor = 0
         ESCAPE_MARKER = "\u0000ESCAPED_SPACE\u0000"
@@ -222,11 +256,12 @@ class AttachmentPlaceholderProcessor(Processor):
             replacements.append((index, index + span_len, display_text))
             search_cursor = index + span_len
 
-        if not replacements:
-            return Transformation(list(transformation_input.fragments))
-
         replacements.sort(key=lambda item: item[0])
+        return replacements
 
+    def _render(
+        self, text: str, replacements: list[tuple[int, int, str]]
+    ) -> Transformation:
         new_fragments: list[tuple[str, str]] = []
         source_to_display_map: list[int] = []
         display_to_source_map: list[int] = []
@@ -41,6 +41,9 @@ from code_puppy.config import (
     get_http2,
     get_max_hook_retries,
     get_max_saved_sessions,
+    get_mcp_autostart_budget,
+    get_mcp_autostart_concurrency,
+    get_mcp_autostart_server_timeout,
     get_mcp_disabled,
     get_mcp_unbound_warning_silenced,
     get_message_limit,
@@ -48,6 +51,7 @@ from code_puppy.config import (
     get_owner_name,
     get_pack_agents_enabled,
     get_protected_token_count,
+    get_token_estimator,
     get_puppy_name,
     get_puppy_token,
     get_resume_message_count,
@@ -58,8 +62,13 @@ from code_puppy.config import (
     get_safety_permission_level,
     get_smooth_response_stream,
     get_smooth_thinking_stream,
+    get_subagent_max_concurrency,
+    get_subagent_max_concurrency_per_model,
     get_subagent_recursion_limit,
     get_subagent_recursion_limit_gpt_5_6,
+    get_subagent_session_max_age_days,
+    get_subagent_session_max_count,
+    get_subagent_session_max_mb,
     get_subagent_verbose,
     get_summarization_model_name,
     get_suppress_informational_messages,
@@ -183,6 +192,27 @@ _BEHAVIOR = SettingsCategory(
             type_hint="int",
             effective_getter=get_subagent_recursion_limit_gpt_5_6,
         ),
+        Setting(
+            key="subagent_max_concurrency",
+            display_name="Sub-agent Max Concurrency",
+            description=(
+                "Maximum sub-agent runs in flight at once per nesting level "
+                "(parallel invoke_agent calls and invoke_agents_parallel "
+                "tasks). Extra runs queue in arrival order."
+            ),
+            type_hint="int",
+            effective_getter=get_subagent_max_concurrency,
+        ),
+        Setting(
+            key="subagent_max_concurrency_per_model",
+            display_name="Sub-agent Max Concurrency per Model",
+            description=(
+                "Maximum concurrent sub-agent runs on any single model, so "
+                "one provider is not flooded while others sit idle."
+            ),
+            type_hint="int",
+            effective_getter=get_subagent_max_concurrency_per_model,
+        ),
         Setting(
             key="subagent_verbose",
             display_name="Sub-agent Verbose",
@@ -249,6 +279,36 @@ _SESSION = SettingsCategory(
             type_hint="int",
             effective_getter=get_max_saved_sessions,
         ),
+        Setting(
+            key="subagent_session_max_age_days",
+            display_name="Sub-Agent Session Max Age",
+            description=(
+                "Days an untouched sub-agent session is kept before cleanup "
+                "(default 30, 0 = no age limit)."
+            ),
+            type_hint="int",
+            effective_getter=get_subagent_session_max_age_days,
+        ),
+        Setting(
+            key="subagent_session_max_count",
+            display_name="Sub-Agent Session Max Count",
+            description=(
+                "Maximum number of sub-agent sessions kept on disk "
+                "(default 200, 0 = unlimited)."
+            ),
+            type_hint="int",
+            effective_getter=get_subagent_session_max_count,
+        ),
+        Setting(
+            key="subagent_session_max_mb",
+            display_name="Sub-Agent Session Disk Budget (MB)",
+            description=(
+                "Total disk space sub-agent sessions may use before the "
+                "oldest are removed (default 256, 0 = unlimited)."
+            ),
+            type_hint="int",
+            effective_getter=get_subagent_session_max_mb,
+        ),
         Setting(
             key="resume_message_count",
             display_name="Resume Message Count",
@@ -285,6 +345,17 @@ _COMPACTION = SettingsCategory(
             type_hint="int",
             effective_getter=get_protected_token_count,
         ),
+        Setting(
+            key="token_estimator",
+            display_name="Token Estimator",
+            description=(
+                "How context tokens are counted: exact tokenizer when available "
+                "(auto), usage-calibrated ratio, or the fixed heuristic."
+            ),
+            type_hint="choice",
+            valid_values=("auto", "calibrated", "heuristic"),
+            effective_getter=get_token_estimator,
+        ),
     ),
 )
 
@@ -626,6 +697,37 @@ _MCP = SettingsCategory(
             type_hint="bool",
             effective_getter=get_mcp_unbound_warning_silenced,
         ),
+        Setting(
+            key="mcp_autostart_concurrency",
+            display_name="MCP Autostart Concurrency",
+            description=(
+                "Maximum number of bound MCP servers started at the same "
+                "time when an agent boots (default 4)."
+            ),
+            type_hint="int",
+            effective_getter=get_mcp_autostart_concurrency,
+        ),
+        Setting(
+            key="mcp_autostart_server_timeout",
+            display_name="MCP Autostart Server Timeout",
+            description=(
+                "Seconds a single MCP server may take to become ready before "
+                "the agent stops waiting for it (default 30). The server "
+                "keeps starting in the background."
+            ),
+            type_hint="float",
+            effective_getter=get_mcp_autostart_server_timeout,
+        ),
+        Setting(
+            key="mcp_autostart_budget",
+            display_name="MCP Autostart Budget",
+            description=(
+                "Total seconds to wait for bound MCP servers before running "
+                "with whichever are ready. Unset waits for all of them."
+            ),
+            type_hint="float",
+            effective_getter=get_mcp_autostart_budget,
+        ),
     ),
 )
 
@@ -117,6 +117,37 @@ def get_subagent_recursion_limit_gpt_5_6() -> int:
     return limit if limit >= 0 else DEFAULT_SUBAGENT_RECURSION_LIMIT_GPT_5_6
 
 
+# Sub-agent run concurrency (see tools/subagent_governor.py), per nesting depth.
+DEFAULT_SUBAGENT_MAX_CONCURRENCY = 6
+DEFAULT_SUBAGENT_MAX_CONCURRENCY_PER_MODEL = 4
+
+
+def get_subagent_max_concurrency() -> int:
+    """Return how many sub-agent runs may talk to models at once (default 6).
+
+    Values below 1 or unparseable values fall back to the default.
+    """
+    cfg_val = get_value("subagent_max_concurrency")
+    try:
+        limit = int(str(cfg_val).strip()) if cfg_val is not None else 0
+    except (TypeError, ValueError):
+        limit = 0
+    return limit if limit >= 1 else DEFAULT_SUBAGENT_MAX_CONCURRENCY
+
+
+def get_subagent_max_concurrency_per_model() -> int:
+    """Return how many concurrent sub-agent runs one model may serve (default 4).
+
+    Values below 1 or unparseable values fall back to the default.
+    """
+    cfg_val = get_value("subagent_max_concurrency_per_model")
+    try:
+        limit = int(str(cfg_val).strip()) if cfg_val is not None else 0
+    except (TypeError, ValueError):
+        limit = 0
+    return limit if limit >= 1 else DEFAULT_SUBAGENT_MAX_CONCURRENCY_PER_MODEL
+
+
 # Pack agents - the specialized sub-agents coordinated by Pack Leader
 PACK_AGENT_NAMES = frozenset(
     [
@@ -188,6 +219,62 @@ def set_mcp_unbound_warning_silenced(silenced: bool) -> None:
     set_value("mcp_unbound_warning_silenced", "true" if silenced else "false")
 
 
+# Bound MCP servers are started concurrently; these cap the fan-out and how
+# long a single slow server may hold up an agent run.
+MCP_AUTOSTART_CONCURRENCY_DEFAULT = 4
+MCP_AUTOSTART_SERVER_TIMEOUT_DEFAULT = 30.0
+
+
+def get_mcp_autostart_concurrency() -> int:
+    """Return how many bound MCP servers may be starting at the same time.
+
+    Read from the ``mcp_autostart_concurrency`` config key. Defaults to
+    ``MCP_AUTOSTART_CONCURRENCY_DEFAULT`` (4) when unset, non-numeric, or
+    below 1 (a zero cap would never start anything).
+    """
+    val = get_value("mcp_autostart_concurrency")
+    try:
+        parsed = int(val) if val else MCP_AUTOSTART_CONCURRENCY_DEFAULT
+    except (ValueError, TypeError):
+        return MCP_AUTOSTART_CONCURRENCY_DEFAULT
+    return parsed if parsed >= 1 else MCP_AUTOSTART_CONCURRENCY_DEFAULT
+
+
+def get_mcp_autostart_server_timeout() -> float:
+    """Return the per-server autostart deadline in seconds.
+
+    A server that isn't ready by then keeps starting in the background but no
+    longer blocks the agent run, and its slot is handed to the next server.
+    Read from ``mcp_autostart_server_timeout``; defaults to
+    ``MCP_AUTOSTART_SERVER_TIMEOUT_DEFAULT`` (30s) when unset, non-numeric,
+    or not positive.
+    """
+    val = get_value("mcp_autostart_server_timeout")
+    try:
+        parsed = float(val) if val else MCP_AUTOSTART_SERVER_TIMEOUT_DEFAULT
+    except (ValueError, TypeError):
+        return MCP_AUTOSTART_SERVER_TIMEOUT_DEFAULT
+    return parsed if parsed > 0 else MCP_AUTOSTART_SERVER_TIMEOUT_DEFAULT
+
+
+def get_mcp_autostart_budget() -> Optional[float]:
+    """Return the overall autostart budget in seconds, or ``None`` for no cap.
+
+    When set, an agent run proceeds once the budget elapses with whichever
+    bound servers are ready; the rest attach on a later run. Read from
+    ``mcp_autostart_budget``; unset, non-numeric, or non-positive values mean
+    "wait for every server (each still bounded by its own deadline)".
+    """
+    val = get_value("mcp_autostart_budget")
+    try:
+        parsed = float(val) if val else None
+    except (ValueError, TypeError):
+        return None
+    if parsed is None or parsed <= 0:
+        return None
+    return parsed
+
+
 def get_max_hook_retries() -> int:
     """Return the maximum number of plugin hook retries after an agent run.
 
@@ -471,13 +558,19 @@ def get_config_keys():
         "compaction_strategy",
         "protected_token_count",
         "compaction_threshold",
+        "token_estimator",
         "summarization_model",
         "message_limit",
         "allow_recursion",
         "subagent_recursion_limit",
         "subagent_recursion_limit_gpt_5_6",
+        "subagent_max_concurrency",
+        "subagent_max_concurrency_per_model",
         "auto_save_session",
         "max_saved_sessions",
+        "subagent_session_max_age_days",
+        "subagent_session_max_count",
+        "subagent_session_max_mb",
         "http2",
         "diff_context_lines",
         "default_agent",
@@ -495,6 +588,10 @@ def get_config_keys():
     default_keys.append("enable_universal_constructor")
     # Add hook retry limit key
     default_keys.append("max_hook_retries")
+    # Bound MCP server autostart fan-out/deadlines (see get_mcp_autostart_*).
+    default_keys.append("mcp_autostart_concurrency")
+    default_keys.append("mcp_autostart_server_timeout")
+    default_keys.append("mcp_autostart_budget")
     # Add streaming control key
     default_keys.append("enable_streaming")
     # Opt-in Logfire observability (see code_puppy/observability.py)
@@ -548,6 +645,8 @@ def set_config_value(key: str, value: str):
         config[DEFAULT_SECTION][key] = value
 
     mutate_config(CONFIG_FILE, _apply)
+    if key == "token_estimator":
+        reset_token_estimator_cache()
 
 
 # Alias for API compatibility
@@ -566,6 +665,8 @@ def reset_value(key: str) -> None:
         return False  # nothing to remove -- skip the write entirely
 
     mutate_config(CONFIG_FILE, _apply)
+    if key == "token_estimator":
+        reset_token_estimator_cache()
 
 
 # --- MODEL STICKY EXTENSION STARTS HERE ---
@@ -744,6 +845,13 @@ def clear_model_cache():
     _warned_no_model = False
 
 
+def _invalidate_tool_prefix_mode() -> None:
+    """Drop the tool-call patch's cached claude-code check after a model change."""
+    from code_puppy.pydantic_patches import invalidate_tool_prefix_mode
+
+    invalidate_tool_prefix_mode()
+
+
 def reset_session_model():
     """Reset the session-local model cache.
 
@@ -752,6 +860,7 @@ def reset_session_model():
     """
     global _SESSION_MODEL
     _SESSION_MODEL = None
+    _invalidate_tool_prefix_mode()
 
 
 def model_supports_setting(
@@ -898,6 +1007,7 @@ def set_model_name(model: str):
 
     # Update session cache immediately
     _SESSION_MODEL = model
+    _invalidate_tool_prefix_mode()
 
     # Also persist to file for new terminal sessions
     def _apply(config: configparser.ConfigParser) -> None:
@@ -1682,6 +1792,38 @@ def get_compaction_strategy() -> str:
     return "summarization"
 
 
+# Read on every token count, so parsed once; writing the key through
+# set_config_value/reset_value drops it.
+_token_estimator_cache: Optional[str] = None
+
+
+def get_token_estimator() -> str:
+    """
+    Returns how context token counts are estimated for compaction.
+    'auto' uses a model's exact tokenizer when one is available locally and
+    otherwise a chars-per-token ratio calibrated from provider usage;
+    'calibrated' skips exact tokenizers; 'heuristic' is the fixed 2.5
+    chars/token estimate. Defaults to 'auto'.
+    The built-in exact tokenizers (OpenAI families) need tiktoken: install
+    the 'tokenizers' extra (``pip install code-puppy[tokenizers]``); without
+    it 'auto' behaves like 'calibrated'.
+    Configurable by 'token_estimator' key.
+    """
+    global _token_estimator_cache
+    if _token_estimator_cache is None:
+        from code_puppy.token_counting import TOKEN_ESTIMATORS
+
+        val = (get_value("token_estimator") or "").strip().lower()
+        _token_estimator_cache = val if val in TOKEN_ESTIMATORS else "auto"
+    return _token_estimator_cache
+
+
+def reset_token_estimator_cache() -> None:
+    """Forget the parsed 'token_estimator' value (next read hits the config)."""
+    global _token_estimator_cache
+    _token_estimator_cache = None
+
+
 def get_http2() -> bool:
     """
     Get the http2 configuration value.
@@ -1875,6 +2017,46 @@ def set_max_saved_sessions(max_sessions: int):
     set_config_value("max_saved_sessions", str(max_sessions))
 
 
+# Retention for ``DATA_DIR/subagent_sessions`` (see tools/subagent_sessions.py).
+# Zero disables the corresponding limit.
+SUBAGENT_SESSION_MAX_AGE_DAYS_DEFAULT = 30
+SUBAGENT_SESSION_MAX_COUNT_DEFAULT = 200
+SUBAGENT_SESSION_MAX_MB_DEFAULT = 256
+
+
+def _get_non_negative_int(key: str, default: int) -> int:
+    val = get_value(key)
+    try:
+        return max(0, int(val)) if val is not None else default
+    except (ValueError, TypeError):
+        return default
+
+
+def get_subagent_session_max_age_days() -> int:
+    """Days a sub-agent session may sit untouched before it is deleted.
+
+    Read from ``subagent_session_max_age_days``; defaults to 30. 0 keeps
+    sessions regardless of age.
+    """
+    return _get_non_negative_int(
+        "subagent_session_max_age_days", SUBAGENT_SESSION_MAX_AGE_DAYS_DEFAULT
+    )
+
+
+def get_subagent_session_max_count() -> int:
+    """Most sub-agent sessions to keep (oldest go first); 0 for unlimited."""
+    return _get_non_negative_int(
+        "subagent_session_max_count", SUBAGENT_SESSION_MAX_COUNT_DEFAULT
+    )
+
+
+def get_subagent_session_max_mb() -> int:
+    """Disk budget in MB for all sub-agent sessions together; 0 for unlimited."""
+    return _get_non_negative_int(
+        "subagent_session_max_mb", SUBAGENT_SESSION_MAX_MB_DEFAULT
+    )
+
+
 def set_diff_highlight_style(style: str):
     """Set the diff highlight style.
 
@@ -4,10 +4,10 @@ Main HookEngine orchestration class.
 
 import logging
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from .executor import execute_hooks_sequential, get_blocking_result
-from .matcher import matches
+from .matcher import CompiledMatcher, compile_matcher
 from .models import (
     EventData,
     HookConfig,
@@ -20,6 +20,7 @@ from .validator import (
     get_config_suggestions,
     validate_hooks_config,
 )
+from .workers import kill_hook_workers
 
 logger = logging.getLogger(__name__)
 
@@ -75,6 +76,8 @@ class HookEngine:
                 self._registry = HookRegistry()
 
     def reload_config(self, config: Dict[str, Any]) -> None:
+        # Persistent workers are running the old scripts; restart on demand.
+        kill_hook_workers()
         self.load_config(config)
 
     async def process_event(
@@ -92,19 +95,10 @@ class HookEngine:
                 blocked=False, executed_hooks=0, results=[], total_duration_ms=0.0
             )
 
-        all_hooks = self._registry.get_hooks_for_event(event_type)
-
-        if not all_hooks:
-            duration_ms = (time.perf_counter() - start_time) * 1000
-            return ProcessEventResult(
-                blocked=False,
-                executed_hooks=0,
-                results=[],
-                total_duration_ms=duration_ms,
-            )
-
-        matching_hooks = self._filter_hooks_by_matcher(
-            all_hooks, event_data.tool_name, event_data.tool_args
+        matching_hooks = self._match_indexed_hooks(
+            self._registry.get_hook_candidates(event_type, event_data.tool_name),
+            event_data.tool_name,
+            event_data.tool_args,
         )
 
         if not matching_hooks:
@@ -159,11 +153,23 @@ class HookEngine:
         hooks: List[HookConfig],
         tool_name: str,
         tool_args: Dict[str, Any],
+    ) -> List[HookConfig]:
+        return self._match_indexed_hooks(
+            [(hook, compile_matcher(hook.matcher)) for hook in hooks],
+            tool_name,
+            tool_args,
+        )
+
+    @staticmethod
+    def _match_indexed_hooks(
+        candidates: List[Tuple[HookConfig, CompiledMatcher]],
+        tool_name: str,
+        tool_args: Dict[str, Any],
     ) -> List[HookConfig]:
         matching_hooks = []
-        for hook in hooks:
+        for hook, compiled in candidates:
             try:
-                if matches(hook.matcher, tool_name, tool_args):
+                if compiled.matches(tool_name, tool_args):
                     matching_hooks.append(hook)
             except Exception as e:
                 logger.error(
@@ -17,6 +17,9 @@ Stdout JSON control payloads are also honored (exit code 0 + JSON verdict):
   - Plugin dialect: {"result": "block", "reason": ...}
 Control payloads are stripped from stdout so they never leak into model
 context; hookSpecificOutput.additionalContext replaces stdout when present.
+
+Hooks configured with "mode": "persistent" run as long-lived workers that
+take one JSON line per event instead (see workers.py).
 """
 
 import asyncio
@@ -30,6 +33,7 @@ from typing import Any, Dict, List, Optional, Tuple
 
 from .matcher import _extract_file_path
 from .models import EventData, ExecutionResult, HookConfig
+from .workers import WorkerError, WorkerTimeout, get_worker_pool
 
 logger = logging.getLogger(__name__)
 
@@ -162,6 +166,11 @@ async def execute_hook(
             hook_id=hook.id,
         )
 
+    if hook.mode == "persistent":
+        result = await _execute_persistent_hook(hook, event_data, env_vars)
+        if result is not None:
+            return result
+
     command = _substitute_variables(hook.command, event_data, env_vars or {})
     stdin_payload = _build_stdin_payload(event_data)
     start_time = time.perf_counter()
@@ -191,16 +200,7 @@ async def execute_hook(
                 pass
 
             duration_ms = (time.perf_counter() - start_time) * 1000
-            return ExecutionResult(
-                blocked=True,
-                hook_command=command,
-                stdout="",
-                stderr=f"Command timed out after {hook.timeout}ms",
-                exit_code=-1,
-                duration_ms=duration_ms,
-                error=f"Hook execution timed out after {hook.timeout}ms",
-                hook_id=hook.id,
-            )
+            return _timed_out_result(hook, command, duration_ms)
 
         duration_ms = (time.perf_counter() - start_time) * 1000
         stdout_str = stdout.decode("utf-8", errors="replace") if stdout else ""
@@ -239,6 +239,104 @@ async def execute_hook(
         )
 
 
+def _timed_out_result(
+    hook: HookConfig, command: str, duration_ms: float
+) -> ExecutionResult:
+    return ExecutionResult(
+        blocked=True,
+        hook_command=command,
+        stdout="",
+        stderr=f"Command timed out after {hook.timeout}ms",
+        exit_code=-1,
+        duration_ms=duration_ms,
+        error=f"Hook execution timed out after {hook.timeout}ms",
+        hook_id=hook.id,
+    )
+
+
+async def _execute_persistent_hook(
+    hook: HookConfig,
+    event_data: EventData,
+    env_vars: Optional[Dict[str, str]] = None,
+) -> Optional[ExecutionResult]:
+    """
+    Send one event to the hook's long-lived worker.
+
+    The command runs verbatim (no per-event ``$file``-style substitution —
+    the worker outlives any single event; it reads them from the stdin JSON).
+    Returns None when the worker keeps crashing, so the caller falls back to
+    spawning the command per event.
+    """
+    cwd = os.getcwd()
+    pool = get_worker_pool(
+        hook.command,
+        cwd,
+        env_vars or {},
+        hook.workers,
+        lambda: _build_worker_environment(env_vars),
+    )
+    if pool.broken:
+        if not pool.fallback_warned:
+            pool.fallback_warned = True
+            logger.warning(
+                f"Persistent hook '{hook.command}' keeps failing; "
+                "running it once per event instead"
+            )
+        return None
+
+    start_time = time.perf_counter()
+    try:
+        reply = await pool.request(
+            _build_stdin_payload(event_data), hook.timeout / 1000.0
+        )
+    except WorkerTimeout:
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        return _timed_out_result(hook, hook.command, duration_ms)
+    except (WorkerError, OSError) as e:
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        logger.warning(f"Persistent hook worker failed: {e}")
+        return ExecutionResult(
+            blocked=False,
+            hook_command=hook.command,
+            stdout="",
+            stderr=str(e),
+            exit_code=-1,
+            duration_ms=duration_ms,
+            error=f"Persistent hook worker failed: {e}",
+            hook_id=hook.id,
+        )
+    duration_ms = (time.perf_counter() - start_time) * 1000
+
+    exit_code = reply.get("exit_code", 0)
+    if isinstance(exit_code, bool) or not isinstance(exit_code, int):
+        exit_code = -1
+    stdout_str = reply.get("stdout") if isinstance(reply.get("stdout"), str) else ""
+    stderr_str = reply.get("stderr") if isinstance(reply.get("stderr"), str) else ""
+
+    blocked = exit_code == 1
+    error = stderr_str if exit_code != 0 and stderr_str else None
+    control = {key: reply[key] for key in _CONTROL_KEYS & reply.keys()}
+    if control:
+        stdout_str, blocked, error = _interpret_control_payload(
+            json.dumps(control), blocked, error
+        )
+    else:
+        stdout_str, blocked, error = _interpret_control_payload(
+            stdout_str, blocked, error
+        )
+
+    return ExecutionResult(
+        blocked=blocked,
+        hook_command=hook.command,
+        stdout=stdout_str,
+        stderr=stderr_str,
+        exit_code=exit_code,
+        duration_ms=duration_ms,
+        error=error,
+        hook_id=hook.id,
+    )
+
+
 def _substitute_variables(
     command: str,
     event_data: EventData,
@@ -465,6 +563,20 @@ def _build_environment(
     return env
 
 
+def _build_worker_environment(
+    env_vars: Optional[Dict[str, str]] = None,
+) -> Dict[str, str]:
+    # Same inheritance policy as _build_environment, minus the per-event
+    # values: a persistent worker gets those from each stdin line.
+    env = dict(os.environ)
+    env["CLAUDE_PROJECT_DIR"] = os.getcwd()
+    env["CLAUDE_CODE_HOOK"] = "1"
+    env["CLAUDE_HOOK_PERSISTENT"] = "1"
+    if env_vars:
+        env.update(env_vars)
+    return env
+
+
 async def execute_hooks_parallel(
     hooks: List[HookConfig],
     event_data: EventData,
@@ -6,9 +6,10 @@ based on tool name, arguments, and other event data.
 """
 
 import re
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
-from .aliases import get_aliases
+from .aliases import ALIAS_LOOKUP, get_aliases
 
 
 def matches(matcher: str, tool_name: str, tool_args: Dict[str, Any]) -> bool:
@@ -22,60 +23,201 @@ def matches(matcher: str, tool_name: str, tool_args: Dict[str, Any]) -> bool:
         - "Pattern1 && Pattern2" - AND condition (all must match)
         - "Pattern1 || Pattern2" - OR condition (any must match)
     """
-    if not matcher:
-        return False
-
-    if matcher.strip() == "*":
-        return True
-
-    if "||" in matcher:
-        parts = [p.strip() for p in matcher.split("||")]
-        return any(matches(part, tool_name, tool_args) for part in parts)
-
-    if "&&" in matcher:
-        parts = [p.strip() for p in matcher.split("&&")]
-        return all(matches(part, tool_name, tool_args) for part in parts)
+    return compile_matcher(matcher).matches(tool_name, tool_args)
 
-    return _match_single(matcher.strip(), tool_name, tool_args)
 
+class CompiledMatcher:
+    """A matcher string parsed once, with its glob/regex patterns precompiled.
 
-def _match_single(pattern: str, tool_name: str, tool_args: Dict[str, Any]) -> bool:
-    if pattern == tool_name:
-        return True
+    ``matches`` gives the same answer as the original string-walking
+    evaluation; ``tool_keys`` is the set of lowercased tool names the matcher
+    can possibly accept, or None when it also depends on wildcards, regexes,
+    or file paths and therefore cannot be bucketed by tool name.
+    """
 
-    if pattern.lower() == tool_name.lower():
-        return True
+    __slots__ = ()
+
+    always = False
+    tool_keys: Optional[FrozenSet[str]] = None
+
+    def matches(self, tool_name: str, tool_args: Dict[str, Any]) -> bool:
+        raise NotImplementedError
+
+
+class _Constant(CompiledMatcher):
+    __slots__ = ("always", "tool_keys")
+
+    def __init__(self, value: bool):
+        self.always = value
+        self.tool_keys = None if value else frozenset()
+
+    def matches(self, tool_name: str, tool_args: Dict[str, Any]) -> bool:
+        return self.always
+
+
+_ALWAYS = _Constant(True)
+_NEVER = _Constant(False)
+
+
+class _AnyOf(CompiledMatcher):
+    __slots__ = ("parts", "tool_keys")
+
+    def __init__(self, parts: List[CompiledMatcher]):
+        self.parts = parts
+        keys = [part.tool_keys for part in parts]
+        if any(part.always for part in parts) or None in keys:
+            self.tool_keys = None
+        else:
+            self.tool_keys = frozenset().union(*keys)
+
+    def matches(self, tool_name: str, tool_args: Dict[str, Any]) -> bool:
+        return any(part.matches(tool_name, tool_args) for part in self.parts)
+
+
+class _AllOf(CompiledMatcher):
+    __slots__ = ("parts", "tool_keys")
+
+    def __init__(self, parts: List[CompiledMatcher]):
+        self.parts = parts
+        # Every part must accept the tool, so the narrowest bucketable part
+        # bounds the whole conjunction.
+        keys = [part.tool_keys for part in parts if part.tool_keys is not None]
+        self.tool_keys = min(keys, key=len) if keys else None
+
+    def matches(self, tool_name: str, tool_args: Dict[str, Any]) -> bool:
+        return all(part.matches(tool_name, tool_args) for part in self.parts)
+
+
+class _Single(CompiledMatcher):
+    __slots__ = ("pattern", "lowered", "aliases", "glob", "regex", "tool_keys")
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.lowered = pattern.lower()
+        self.aliases = get_aliases(pattern)
+        self.glob = None
+        self.regex = None
+        self.tool_keys = None
+        if pattern.startswith("."):
+            return
+        if "*" in pattern:
+            parts = pattern.split("*")
+            self.glob = re.compile(
+                "^" + ".*".join(re.escape(part) for part in parts) + "$",
+                re.IGNORECASE,
+            )
+        if _is_regex_pattern(pattern):
+            try:
+                self.regex = re.compile(pattern, re.IGNORECASE)
+            except re.error:
+                pass
+        elif self.glob is None:
+            # Plain name: only an exact, case-insensitive, or alias match can
+            # succeed, and all three are decided by the tool name alone.
+            self.tool_keys = frozenset(
+                {self.lowered}
+                | {
+                    key
+                    for key, group in ALIAS_LOOKUP.items()
+                    if not group.isdisjoint(self.aliases)
+                }
+            )
+
+    def matches(self, tool_name: str, tool_args: Dict[str, Any]) -> bool:
+        pattern = self.pattern
+        if pattern == tool_name or self.lowered == tool_name.lower():
+            return True
 
-    # Check cross-provider aliases: a hook written for "Bash" (Claude Code) should
-    # fire when code_puppy calls "agent_run_shell_command", and vice-versa.
-    tool_aliases = get_aliases(tool_name)
-    pattern_aliases = get_aliases(pattern)
-    if tool_aliases & pattern_aliases:  # non-empty intersection → same logical tool
-        return True
+        # Check cross-provider aliases: a hook written for "Bash" (Claude Code)
+        # should fire when code_puppy calls "agent_run_shell_command", and
+        # vice-versa.
+        if not get_aliases(tool_name).isdisjoint(self.aliases):
+            return True
 
-    if pattern.startswith("."):
-        file_path = _extract_file_path(tool_args)
-        if file_path:
-            return file_path.endswith(pattern)
-        return False
+        if pattern.startswith("."):
+            file_path = _extract_file_path(tool_args)
+            if file_path:
+                return file_path.endswith(pattern)
+            return False
 
-    if "*" in pattern:
-        parts = pattern.split("*")
-        regex_pattern = ".*".join(re.escape(part) for part in parts)
-        if re.match(f"^{regex_pattern}$", tool_name, re.IGNORECASE):
+        if self.glob is not None and self.glob.match(tool_name):
             return True
 
-    if _is_regex_pattern(pattern):
-        try:
-            if re.search(pattern, tool_name, re.IGNORECASE):
+        if self.regex is not None:
+            if self.regex.search(tool_name):
                 return True
             file_path = _extract_file_path(tool_args)
-            if file_path and re.search(pattern, file_path, re.IGNORECASE):
+            if file_path and self.regex.search(file_path):
                 return True
-        except re.error:
-            pass
 
-    return False
+        return False
+
+
+@lru_cache(maxsize=1024)
+def compile_matcher(matcher: str) -> CompiledMatcher:
+    """Parse *matcher* once; see :func:`matches` for the syntax."""
+    if not matcher:
+        return _NEVER
+
+    if matcher.strip() == "*":
+        return _ALWAYS
+
+    if "||" in matcher:
+        return _AnyOf([compile_matcher(p.strip()) for p in matcher.split("||")])
+
+    if "&&" in matcher:
+        return _AllOf([compile_matcher(p.strip()) for p in matcher.split("&&")])
+
+    return _Single(matcher.strip())
+
+
+class MatcherIndex:
+    """Hooks of one registry bucketed by the tool names their matchers accept.
+
+    Hooks whose matcher is a plain tool name (or an OR of them, or an AND
+    containing one) land in per-name buckets; ``*`` hooks and anything using
+    wildcards, regexes, or file extensions go to a fallback list that every
+    lookup considers. Candidates for a tool name are merged back into
+    registration order once and cached, so dispatch touches only hooks that
+    could plausibly fire and re-evaluates nothing but their compiled matchers.
+    """
+
+    _MAX_CACHED_TOOLS = 1024
+
+    def __init__(self, hooks_by_event: Dict[str, List[Any]]):
+        self._buckets: Dict[str, Dict[str, List[Tuple[int, Any, CompiledMatcher]]]] = {}
+        self._fallback: Dict[str, List[Tuple[int, Any, CompiledMatcher]]] = {}
+        self._candidates: Dict[
+            Tuple[str, str], Tuple[Tuple[Any, CompiledMatcher], ...]
+        ] = {}
+        for event_attr, hooks in hooks_by_event.items():
+            buckets = self._buckets[event_attr] = {}
+            fallback = self._fallback[event_attr] = []
+            for position, hook in enumerate(hooks):
+                compiled = compile_matcher(hook.matcher)
+                entry = (position, hook, compiled)
+                if compiled.tool_keys is None:
+                    fallback.append(entry)
+                    continue
+                for key in compiled.tool_keys:
+                    buckets.setdefault(key, []).append(entry)
+
+    def candidates(
+        self, event_attr: str, tool_name: str
+    ) -> Tuple[Tuple[Any, CompiledMatcher], ...]:
+        """(hook, compiled matcher) pairs that might match, in registration order."""
+        cache_key = (event_attr, tool_name.lower())
+        cached = self._candidates.get(cache_key)
+        if cached is not None:
+            return cached
+        entries = list(self._fallback.get(event_attr, ()))
+        entries.extend(self._buckets.get(event_attr, {}).get(cache_key[1], ()))
+        entries.sort(key=lambda entry: entry[0])
+        result = tuple((hook, compiled) for _, hook, compiled in entries)
+        if len(self._candidates) >= self._MAX_CACHED_TOOLS:
+            self._candidates.clear()
+        self._candidates[cache_key] = result
+        return result
 
 
 def _extract_file_path(tool_args: Dict[str, Any]) -> Optional[str]:
@@ -5,8 +5,12 @@ Defines all data structures used throughout the hook engine with full type
 safety and validation.
 """
 
+import re
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Literal, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+from .matcher import CompiledMatcher, MatcherIndex
 
 
 @dataclass
@@ -22,6 +26,9 @@ class HookConfig:
         once: Execute only once per session (default: False)
         enabled: Whether this hook is enabled (default: True)
         id: Optional unique identifier for this hook
+        mode: "spawn" runs the command per event (default); "persistent"
+            keeps it running and exchanges one JSON line per event
+        workers: Maximum concurrent worker processes in persistent mode
     """
 
     matcher: str
@@ -31,6 +38,8 @@ class HookConfig:
     once: bool = False
     enabled: bool = True
     id: Optional[str] = None
+    mode: Literal["spawn", "persistent"] = "spawn"
+    workers: int = 1
 
     def __post_init__(self):
         """Validate hook configuration after initialization."""
@@ -48,6 +57,14 @@ class HookConfig:
         if self.timeout < 100:
             raise ValueError(f"Hook timeout must be >= 100ms, got: {self.timeout}")
 
+        if self.mode not in ("spawn", "persistent"):
+            raise ValueError(
+                f"Hook mode must be 'spawn' or 'persistent', got: {self.mode}"
+            )
+
+        if not isinstance(self.workers, int) or self.workers < 1:
+            raise ValueError(f"Hook workers must be >= 1, got: {self.workers}")
+
         if self.id is None:
             import hashlib
 
@@ -147,20 +164,59 @@ class HookRegistry:
     subagent_stop: List[HookConfig] = field(default_factory=list)
 
     _executed_once_hooks: set = field(default_factory=set, repr=False)
+    # Built by build_registry_from_config, dropped by add_hook/remove_hook and
+    # rebuilt on the next dispatch. Code that edits the per-event lists
+    # directly must call rebuild_matcher_index() itself.
+    _matcher_index: Optional[MatcherIndex] = field(
+        default=None, repr=False, compare=False
+    )
+
+    _EVENT_ATTRS = (
+        "pre_tool_use",
+        "post_tool_use",
+        "session_start",
+        "session_end",
+        "pre_compact",
+        "user_prompt_submit",
+        "notification",
+        "stop",
+        "subagent_stop",
+    )
+
+    def is_active(self, hook: HookConfig) -> bool:
+        """Enabled, and not a ``once`` hook that already ran this session."""
+        if not hook.enabled:
+            return False
+        return not (hook.once and hook.id in self._executed_once_hooks)
 
     def get_hooks_for_event(self, event_type: str) -> List[HookConfig]:
         attr_name = self._normalize_event_type(event_type)
         if not hasattr(self, attr_name):
             return []
-        all_hooks = getattr(self, attr_name)
-        enabled_hooks = []
-        for hook in all_hooks:
-            if not hook.enabled:
-                continue
-            if hook.once and hook.id in self._executed_once_hooks:
-                continue
-            enabled_hooks.append(hook)
-        return enabled_hooks
+        return [hook for hook in getattr(self, attr_name) if self.is_active(hook)]
+
+    def rebuild_matcher_index(self) -> MatcherIndex:
+        self._matcher_index = MatcherIndex(
+            {attr: getattr(self, attr) for attr in self._EVENT_ATTRS}
+        )
+        return self._matcher_index
+
+    def get_hook_candidates(
+        self, event_type: str, tool_name: str
+    ) -> List[Tuple[HookConfig, CompiledMatcher]]:
+        """Active hooks for *event_type* whose matcher could accept *tool_name*.
+
+        Returned in registration order with their compiled matchers; the
+        caller still evaluates each matcher against the tool arguments.
+        """
+        index = self._matcher_index or self.rebuild_matcher_index()
+        return [
+            (hook, compiled)
+            for hook, compiled in index.candidates(
+                self._normalize_event_type(event_type), tool_name
+            )
+            if self.is_active(hook)
+        ]
 
     def mark_hook_executed(self, hook_id: str) -> None:
         self._executed_once_hooks.add(hook_id)
@@ -169,9 +225,8 @@ class HookRegistry:
         self._executed_once_hooks.clear()
 
     @staticmethod
+    @lru_cache(maxsize=64)
     def _normalize_event_type(event_type: str) -> str:
-        import re
-
         s1 = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", event_type)
         return re.sub("([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
 
@@ -180,6 +235,7 @@ class HookRegistry:
         if not hasattr(self, attr_name):
             raise ValueError(f"Unknown event type: {event_type}")
         getattr(self, attr_name).append(hook)
+        self._matcher_index = None
 
     def remove_hook(self, event_type: str, hook_id: str) -> bool:
         attr_name = self._normalize_event_type(event_type)
@@ -189,25 +245,13 @@ class HookRegistry:
         for i, hook in enumerate(hooks_list):
             if hook.id == hook_id:
                 hooks_list.pop(i)
+                self._matcher_index = None
                 return True
         return False
 
     def count_hooks(self, event_type: Optional[str] = None) -> int:
         if event_type is None:
-            total = 0
-            for attr in [
-                "pre_tool_use",
-                "post_tool_use",
-                "session_start",
-                "session_end",
-                "pre_compact",
-                "user_prompt_submit",
-                "notification",
-                "stop",
-                "subagent_stop",
-            ]:
-                total += len(getattr(self, attr))
-            return total
+            return sum(len(getattr(self, attr)) for attr in self._EVENT_ATTRS)
         attr_name = self._normalize_event_type(event_type)
         if not hasattr(self, attr_name):
             return 0
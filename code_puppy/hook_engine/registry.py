@@ -68,11 +68,14 @@ def build_registry_from_config(config: Dict[str, Any]) -> HookRegistry:
                         once=hook_data.get("once", False),
                         enabled=hook_data.get("enabled", True),
                         id=hook_data.get("id"),
+                        mode=hook_data.get("mode", "spawn"),
+                        workers=hook_data.get("workers", 1),
                     )
                     registry.add_hook(event_type, hook)
                 except (ValueError, KeyError) as e:
                     logger.warning(f"Skipping invalid hook in {event_type}: {e}")
 
+    registry.rebuild_matcher_index()
     return registry
 
 
@@ -23,6 +23,8 @@ VALID_EVENT_TYPES = [
 
 VALID_HOOK_TYPES = ["command", "prompt"]
 
+VALID_HOOK_MODES = ["spawn", "persistent"]
+
 
 def validate_hooks_config(config: Dict[str, Any]) -> Tuple[bool, List[str]]:
     """
@@ -105,6 +107,17 @@ def _validate_hook(
         if not isinstance(timeout, (int, float)) or timeout < 100:
             errors.append(f"{prefix} 'timeout' must be >= 100ms, got: {timeout}")
 
+    mode = hook.get("mode")
+    if mode is not None and mode not in VALID_HOOK_MODES:
+        errors.append(
+            f"{prefix} invalid mode '{mode}'. Must be one of: {', '.join(VALID_HOOK_MODES)}"
+        )
+
+    workers = hook.get("workers")
+    if workers is not None:
+        if isinstance(workers, bool) or not isinstance(workers, int) or workers < 1:
+            errors.append(f"{prefix} 'workers' must be an integer >= 1, got: {workers}")
+
     return errors
 
 
@@ -0,0 +1,250 @@
+"""
+Long-lived worker processes for ``"mode": "persistent"`` hooks.
+
+Spawn mode (the default) pays shell fork/exec and interpreter start-up on
+every event. A persistent hook's command is started once and kept running:
+each event is written to its stdin as one line of JSON (the same payload
+spawn mode sends), and the worker answers each line with one line of JSON
+on stdout:
+
+    {"exit_code": 0, "stdout": "...", "stderr": "..."}
+
+Every key is optional. Control keys (``decision``, ``reason``,
+``hookSpecificOutput``, ...) are honored exactly as they are on spawn-mode
+stdout. Anything the worker writes to stderr is kept only as a short tail
+for diagnostics.
+
+A worker that misses a request deadline, sends a malformed reply, or exits
+is killed and replaced on the next event. After ``MAX_CONSECUTIVE_FAILURES``
+crashes in a row the pool is marked broken and the executor falls back to
+spawn-per-event for that hook.
+"""
+
+import asyncio
+import atexit
+import json
+import logging
+import os
+import signal
+import weakref
+from collections import deque
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAX_LINE_BYTES = 1024 * 1024
+MAX_CONSECUTIVE_FAILURES = 3
+_STDERR_TAIL_LINES = 20
+
+# Process groups of every running worker, so atexit and reload_config can
+# reap them even when the event loop that started them is gone.
+_live_pids: Set[int] = set()
+
+
+class WorkerError(Exception):
+    """A persistent worker exited, misbehaved, or could not be started."""
+
+
+class WorkerTimeout(WorkerError):
+    """A persistent worker did not answer before the request deadline."""
+
+
+def _kill_process_group(pid: int) -> None:
+    try:
+        if os.name == "nt":
+            os.kill(pid, signal.SIGTERM)
+        else:
+            os.killpg(pid, signal.SIGKILL)
+    except (OSError, ProcessLookupError):
+        pass
+
+
+class _HookWorker:
+    """One running hook command speaking the line-delimited protocol."""
+
+    def __init__(self, proc: asyncio.subprocess.Process):
+        self.proc = proc
+        self.stderr_tail: deque = deque(maxlen=_STDERR_TAIL_LINES)
+        self._stderr_task = asyncio.ensure_future(self._drain_stderr())
+        _live_pids.add(proc.pid)
+
+    @classmethod
+    async def start(cls, command: str, env: Dict[str, str], cwd: str) -> "_HookWorker":
+        proc = await asyncio.create_subprocess_shell(
+            command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=cwd,
+            env=env,
+            limit=MAX_LINE_BYTES,
+            # Own process group, so killing the worker also takes down
+            # whatever the shell started rather than orphaning it.
+            start_new_session=os.name != "nt",
+        )
+        return cls(proc)
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.returncode is None and not self.proc.stdout.at_eof()
+
+    async def _drain_stderr(self) -> None:
+        try:
+            async for line in self.proc.stderr:
+                self.stderr_tail.append(line.decode("utf-8", errors="replace").rstrip())
+        except Exception:
+            pass
+
+    def _stderr_hint(self) -> str:
+        return f": {self.stderr_tail[-1]}" if self.stderr_tail else ""
+
+    async def _exchange(self, payload: bytes) -> bytes:
+        self.proc.stdin.write(payload + b"\n")
+        await self.proc.stdin.drain()
+        return await self.proc.stdout.readline()
+
+    async def request(self, payload: bytes, timeout: float) -> Dict[str, Any]:
+        try:
+            line = await asyncio.wait_for(self._exchange(payload), timeout)
+        except asyncio.TimeoutError:
+            raise WorkerTimeout(f"no reply within {timeout:g}s") from None
+        except (OSError, ValueError) as e:
+            # ValueError: reply longer than MAX_LINE_BYTES.
+            raise WorkerError(f"worker pipe failed: {e}") from e
+        if not line:
+            raise WorkerError(f"worker exited{self._stderr_hint()}")
+        try:
+            reply = json.loads(line)
+        except ValueError:
+            raise WorkerError(
+                f"reply is not JSON: {line[:200].decode('utf-8', 'replace')!r}"
+            ) from None
+        if not isinstance(reply, dict):
+            raise WorkerError(
+                f"reply must be a JSON object, got {type(reply).__name__}"
+            )
+        return reply
+
+    def kill(self) -> None:
+        _live_pids.discard(self.proc.pid)
+        if self.proc.returncode is None:
+            _kill_process_group(self.proc.pid)
+        # Closing our end of stdin lets the transport finish once the process
+        # is reaped, instead of lingering until the loop closes.
+        try:
+            self.proc.stdin.close()
+        except Exception:
+            pass
+        self._stderr_task.cancel()
+
+    async def aclose(self, grace: float = 1.0) -> None:
+        """Close stdin so the worker can exit cleanly, then make sure it did."""
+        try:
+            self.proc.stdin.close()
+            await asyncio.wait_for(self.proc.wait(), grace)
+        except Exception:
+            pass
+        self.kill()
+
+
+class WorkerPool:
+    """Up to ``max_workers`` workers for one hook command, one request each."""
+
+    def __init__(
+        self,
+        command: str,
+        cwd: str,
+        env_factory: Callable[[], Dict[str, str]],
+        max_workers: int = 1,
+    ):
+        self.command = command
+        self.cwd = cwd
+        self.max_workers = max_workers
+        self._env_factory = env_factory
+        self._slots = asyncio.Semaphore(max_workers)
+        self._idle: List[_HookWorker] = []
+        self.consecutive_failures = 0
+        self.starts = 0
+        self.requests = 0
+        self.fallback_warned = False
+
+    @property
+    def broken(self) -> bool:
+        return self.consecutive_failures >= MAX_CONSECUTIVE_FAILURES
+
+    async def request(self, payload: bytes, timeout: float) -> Dict[str, Any]:
+        async with self._slots:
+            worker = self._idle.pop() if self._idle else None
+            if worker is not None and not worker.alive:
+                worker.kill()
+                worker = None
+            try:
+                if worker is None:
+                    worker = await _HookWorker.start(
+                        self.command, self._env_factory(), self.cwd
+                    )
+                    self.starts += 1
+                reply = await worker.request(payload, timeout)
+            except WorkerTimeout:
+                # A slow hook is not a crashing one; replace it, but do not
+                # count it towards falling back to spawn mode.
+                worker.kill()
+                raise
+            except (WorkerError, OSError):
+                if worker is not None:
+                    worker.kill()
+                self.consecutive_failures += 1
+                raise
+            except BaseException:
+                # Cancelled mid-exchange: the reply stream is out of step.
+                if worker is not None:
+                    worker.kill()
+                raise
+            self.consecutive_failures = 0
+            self.requests += 1
+            self._idle.append(worker)
+            return reply
+
+    async def aclose(self) -> None:
+        idle, self._idle = self._idle, []
+        await asyncio.gather(*(worker.aclose() for worker in idle))
+
+
+# Pools are per event loop: asyncio subprocess pipes cannot cross loops.
+_PoolsByKey = Dict[Tuple, WorkerPool]
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _PoolsByKey]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_worker_pool(
+    command: str,
+    cwd: str,
+    env_vars: Dict[str, str],
+    max_workers: int,
+    env_factory: Callable[[], Dict[str, str]],
+) -> WorkerPool:
+    """The running loop's pool for this command, created on first use."""
+    pools = _pools.setdefault(asyncio.get_running_loop(), {})
+    key = (command, cwd, max_workers, tuple(sorted(env_vars.items())))
+    pool = pools.get(key)
+    if pool is None:
+        pool = pools[key] = WorkerPool(command, cwd, env_factory, max_workers)
+    return pool
+
+
+async def shutdown_hook_workers() -> None:
+    """Close every pool owned by the running loop."""
+    pools = _pools.pop(asyncio.get_running_loop(), {})
+    await asyncio.gather(*(pool.aclose() for pool in pools.values()))
+
+
+def kill_hook_workers() -> None:
+    """Forget every pool and kill every worker process, from any thread."""
+    _pools.clear()
+    for pid in list(_live_pids):
+        _kill_process_group(pid)
+    _live_pids.clear()
+
+
+atexit.register(kill_hook_workers)
@@ -7,13 +7,22 @@ The neon splash starts BEFORE the cli_runner import below: that import pulls
 in pydantic-ai, prompt_toolkit, rich, and friends (~seconds of cold start),
 which is exactly the window the shimmer covers. ``code_puppy.splash`` is
 stdlib-only by design -- keep it that way, and keep it first.
+
+``--profile-startup`` is detected here, before the splash, for the same
+reason: ``code_puppy.startup_profile`` (also stdlib-only) has to be
+recording before the imports it is meant to measure.
 """
 
-from code_puppy.splash import start_splash
+from code_puppy import startup_profile
+
+startup_profile.start_from_argv()
+
+from code_puppy.splash import start_splash  # noqa: E402
 
 _splash = start_splash()
 try:
-    from code_puppy.cli_runner import main_entry
+    with startup_profile.phase("import cli_runner"):
+        from code_puppy.cli_runner import main_entry
 finally:
     _splash.stop()
 
@@ -0,0 +1,289 @@
+"""Background housekeeping that stays off the startup critical path.
+
+Idempotent maintenance (session format migration, quarantine retries, ...)
+used to run synchronously before the first prompt; with years of autosaves
+that is seconds of staring at a blank terminal on every launch. Jobs now
+register with a :class:`MaintenanceScheduler`, whose worker thread starts
+once the interactive prompt is up and runs at the lowest OS priority.
+
+Each job has:
+
+* a **fingerprint** -- a cheap snapshot (typically one ``stat`` per watched
+  directory) of whatever the job depends on. When it matches the
+  fingerprint stored after the job's last complete run, the job is skipped
+  without doing any work;
+* a **time budget** per slice. The job receives a :class:`JobBudget` and
+  checks :meth:`JobBudget.exhausted` between units of work, returning
+  ``False`` when it stopped early. The worker gives unfinished jobs further
+  slices after the others have had theirs; a process that exits first
+  simply resumes next launch, since jobs are idempotent.
+
+Last-run times and fingerprints persist in
+``STATE_DIR/maintenance_state.json``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+STATE_FILENAME = "maintenance_state.json"
+DEFAULT_JOB_BUDGET_SECONDS = 2.0
+# Let the prompt paint (and the first keystrokes land) before any disk churn.
+START_DELAY_SECONDS = 1.0
+# Breather between rounds when a job used its whole slice.
+ROUND_PAUSE_SECONDS = 0.5
+
+
+class JobBudget:
+    """Deadline handed to a running job; checking it also yields the GIL."""
+
+    def __init__(self, seconds: float, clock: Optional[Callable[[], float]] = None):
+        self._clock = clock or time.monotonic
+        self.deadline = self._clock() + seconds
+
+    def exhausted(self) -> bool:
+        time.sleep(0)  # let the UI thread run between units of work
+        return self._clock() >= self.deadline
+
+
+@dataclass
+class MaintenanceJob:
+    """One idempotent housekeeping task.
+
+    ``run(budget)`` returns True once everything is done, False when it
+    stopped because ``budget.exhausted()``. ``fingerprint()`` must be cheap
+    and change whenever there may be new work.
+    """
+
+    name: str
+    run: Callable[[JobBudget], bool]
+    fingerprint: Callable[[], str]
+    budget_seconds: float = DEFAULT_JOB_BUDGET_SECONDS
+
+
+def _default_state_path() -> str:
+    from code_puppy.config import STATE_DIR
+
+    return os.path.join(STATE_DIR, STATE_FILENAME)
+
+
+def _lower_thread_priority() -> None:
+    """Nice the calling thread.
+
+    Only Linux nices threads individually, by their native thread id; on other
+    platforms that id is not a pid, so leave the priority alone.
+    """
+    if not sys.platform.startswith("linux"):
+        return
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+    except (AttributeError, OSError):
+        pass
+
+
+class MaintenanceScheduler:
+    def __init__(
+        self,
+        state_path: Optional[str] = None,
+        start_delay: float = START_DELAY_SECONDS,
+        round_pause: float = ROUND_PAUSE_SECONDS,
+    ):
+        self._state_path = state_path
+        self.start_delay = start_delay
+        self.round_pause = round_pause
+        self._jobs: List[MaintenanceJob] = []
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def state_path(self) -> str:
+        return self._state_path or _default_state_path()
+
+    def register(self, job: MaintenanceJob) -> None:
+        """Add ``job``; registering a name twice replaces the earlier job."""
+        with self._lock:
+            self._jobs = [j for j in self._jobs if j.name != job.name] + [job]
+
+    def jobs(self) -> List[MaintenanceJob]:
+        with self._lock:
+            return list(self._jobs)
+
+    # -- persistent state ---------------------------------------------------
+    def load_state(self) -> Dict[str, dict]:
+        from code_puppy.atomic_json import JsonFileCorrupt, load_json
+
+        try:
+            state = load_json(self.state_path, default={})
+        except (JsonFileCorrupt, OSError):
+            return {}
+        return state if isinstance(state, dict) else {}
+
+    def _record(self, name: str, entry: dict) -> None:
+        from code_puppy.atomic_json import JsonFileCorrupt, mutate_json
+
+        def update(state):
+            state = state if isinstance(state, dict) else {}
+            state[name] = entry
+            return state
+
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        try:
+            mutate_json(self.state_path, update, default={})
+        except JsonFileCorrupt:
+            # Our own bookkeeping, not a user file: start it over.
+            os.replace(self.state_path, self.state_path + ".corrupt")
+            mutate_json(self.state_path, update, default={})
+
+    # -- running ------------------------------------------------------------
+    def run_job(self, job: MaintenanceJob, state: Dict[str, dict]) -> str:
+        """Run one slice of ``job``: ``skipped``, ``done``, ``partial`` or ``failed``."""
+        previous = state.get(job.name) or {}
+        try:
+            fingerprint = job.fingerprint()
+        except Exception as exc:
+            logger.debug("Maintenance job %s fingerprint failed: %r", job.name, exc)
+            fingerprint = None
+        if (
+            fingerprint is not None
+            and previous.get("complete")
+            and previous.get("fingerprint") == fingerprint
+        ):
+            return "skipped"
+
+        started = time.monotonic()
+        try:
+            finished = bool(job.run(JobBudget(job.budget_seconds)))
+        except Exception as exc:
+            logger.debug("Maintenance job %s failed: %r", job.name, exc)
+            return "failed"
+        elapsed = time.monotonic() - started
+
+        entry = {
+            "last_run": time.time(),
+            "duration_seconds": round(elapsed, 3),
+            "complete": finished,
+            # Taken after the run: the job's own moves must not look like new work.
+            "fingerprint": _safe_fingerprint(job) if finished else None,
+        }
+        state[job.name] = entry
+        try:
+            self._record(job.name, entry)
+        except Exception as exc:
+            logger.debug("Could not persist maintenance state: %r", exc)
+        return "done" if finished else "partial"
+
+    def run_pending(self, max_rounds: Optional[int] = None) -> Dict[str, str]:
+        """Run every job until all are done/skipped; returns each job's outcome."""
+        state = self.load_state()
+        outcomes: Dict[str, str] = {}
+        pending = self.jobs()
+        rounds = 0
+        while pending and not self._stop.is_set():
+            for job in pending:
+                if self._stop.is_set():
+                    break
+                outcomes[job.name] = self.run_job(job, state)
+            pending = [j for j in pending if outcomes.get(j.name) == "partial"]
+            rounds += 1
+            if max_rounds is not None and rounds >= max_rounds:
+                break
+            if pending and self._stop.wait(self.round_pause):
+                break
+        return outcomes
+
+    def start(self) -> bool:
+        """Start the worker thread once; False if already started."""
+        with self._lock:
+            if self._thread is not None:
+                return False
+            self._thread = threading.Thread(
+                target=self._worker, name="code-puppy-maintenance", daemon=True
+            )
+        self._thread.start()
+        return True
+
+    def _worker(self) -> None:
+        _lower_thread_priority()
+        if self._stop.wait(self.start_delay):
+            return
+        try:
+            self.run_pending()
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.debug("Maintenance worker aborted: %r", exc)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Ask the worker to finish after the current unit of work."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+
+def _safe_fingerprint(job: MaintenanceJob) -> Optional[str]:
+    try:
+        return job.fingerprint()
+    except Exception:
+        return None
+
+
+def directory_fingerprint(*paths: str) -> str:
+    """``mtime_ns`` of each path (``-`` if missing): one stat apiece.
+
+    Adding, removing or renaming an entry bumps a directory's mtime, so
+    this changes whenever a job watching these directories may have work.
+    """
+    parts = []
+    for path in paths:
+        try:
+            parts.append(str(os.stat(path).st_mtime_ns))
+        except OSError:
+            parts.append("-")
+    return ",".join(parts)
+
+
+_scheduler: Optional[MaintenanceScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def _builtin_jobs() -> List[MaintenanceJob]:
+    from code_puppy import session_format_migration
+
+    return [
+        MaintenanceJob(
+            name="session-format-migration",
+            run=session_format_migration.run_maintenance,
+            fingerprint=session_format_migration.maintenance_fingerprint,
+        ),
+    ]
+
+
+def get_maintenance_scheduler() -> MaintenanceScheduler:
+    """The process-wide scheduler, with the built-in jobs registered.
+
+    Plugins may ``register`` further jobs before the worker starts.
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = MaintenanceScheduler()
+            for job in _builtin_jobs():
+                _scheduler.register(job)
+        return _scheduler
+
+
+def start_background_maintenance() -> bool:
+    """Start the shared scheduler's worker (idempotent, never raises)."""
+    try:
+        return get_maintenance_scheduler().start()
+    except Exception as exc:  # pragma: no cover - defensive
+        logger.debug("Could not start background maintenance: %r", exc)
+        return False
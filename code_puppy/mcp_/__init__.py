@@ -19,6 +19,7 @@ from .managed_server import ManagedMCPServer, ServerConfig, ServerState
 from .manager import MCPManager, ServerInfo, get_mcp_manager
 from .mcp_logs import (
     clear_logs,
+    flush_logs,
     get_log_file_path,
     get_log_stats,
     get_mcp_logs_dir,
@@ -60,6 +61,7 @@ __all__ = [
     "get_log_file_path",
     "read_logs",
     "write_log",
+    "flush_logs",
     "clear_logs",
     "list_servers_with_logs",
     "get_log_stats",
@@ -18,9 +18,14 @@ from pathlib import Path
 from typing import Any, List, Optional, Sequence
 
 from fastmcp.client.transports import StdioTransport
-from pydantic_ai.mcp import MCPToolset
 
-from code_puppy.mcp_.mcp_logs import get_log_file_path, rotate_log_if_needed, write_log
+from code_puppy.mcp_.mcp_logs import (
+    flush_logs,
+    get_log_file_path,
+    rotate_log_if_needed,
+    write_log,
+)
+from code_puppy.mcp_.tool_index import IndexedMCPToolset
 from code_puppy.messaging import emit_info
 
 
@@ -63,6 +68,8 @@ class StderrFileCapture:
 
         # Write startup marker
         write_log(self.server_name, "--- Server starting ---", "INFO")
+        # Land the marker before the tail thread records its start offset.
+        flush_logs(self.server_name)
 
         self.stop_monitoring.clear()
         self.monitor_thread = threading.Thread(target=self._monitor_file)
@@ -119,6 +126,7 @@ class StderrFileCapture:
 
         # Write shutdown marker
         write_log(self.server_name, "--- Server stopped ---", "INFO")
+        flush_logs(self.server_name)
 
         # Read any remaining content for in-memory capture
         if self.log_path and os.path.exists(self.log_path):
@@ -131,7 +139,7 @@ class StderrFileCapture:
         return list(self.captured_lines)
 
 
-class BlockingStdioToolset(MCPToolset):
+class BlockingStdioToolset(IndexedMCPToolset):
     """Stdio ``MCPToolset`` that captures stderr and tracks readiness.
 
     Replaces the deprecated ``MCPServerStdio`` subclasses
@@ -165,7 +173,7 @@ class BlockingStdioToolset(MCPToolset):
                 messages. Defaults to ``command``.
             emit_stderr: Echo captured stderr lines to the user.
             message_group: Message group for user-facing output.
-            **toolset_kwargs: Forwarded to ``MCPToolset`` (``init_timeout``,
+            **toolset_kwargs: Forwarded to ``IndexedMCPToolset`` (``init_timeout``,
                 ``read_timeout``, ``process_tool_call``, ...).
         """
         self.command = command
@@ -3,6 +3,12 @@ Health monitoring system for MCP servers.
 
 This module provides continuous health monitoring for MCP servers with
 automatic recovery actions when consecutive failures are detected.
+
+Every transport is probed with a protocol-level MCP ``ping`` bounded by a
+deadline, so a server whose process is alive but no longer answering is
+reported unhealthy. Probe latencies feed the status tracker's histogram, and
+repeated probe timeouts trip a per-server circuit breaker that quarantines
+the server before an agent tool call can block on it.
 """
 
 import asyncio
@@ -13,9 +19,9 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Callable, Dict, List, Optional
 
-import httpx
-
+from .circuit_breaker import CircuitBreaker
 from .managed_server import ManagedMCPServer
+from .status_tracker import ServerStatusTracker
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +35,7 @@ class HealthStatus:
     latency_ms: Optional[float]
     error: Optional[str]
     check_type: str  # "ping", "list_tools", "get_request", etc.
+    timed_out: bool = False
 
 
 @dataclass
@@ -38,6 +45,7 @@ class HealthCheckResult:
     success: bool
     latency_ms: float
     error: Optional[str]
+    timed_out: bool = False
 
 
 class HealthMonitor:
@@ -51,6 +59,9 @@ class HealthMonitor:
     - Custom health check registration
     - Automatic recovery triggering on consecutive failures
     - Configurable check intervals
+    - MCP ``ping`` probes with a deadline for every transport
+    - Probe latency histograms exposed through ``ServerStatusTracker``
+    - Circuit breaker isolation of servers whose probes keep timing out
 
     Example usage:
         monitor = HealthMonitor(check_interval=30)
@@ -63,14 +74,32 @@ class HealthMonitor:
         history = monitor.get_health_history("server-1", limit=50)
     """
 
-    def __init__(self, check_interval: int = 30):
+    def __init__(
+        self,
+        check_interval: int = 30,
+        probe_timeout: float = 5.0,
+        timeout_threshold: int = 3,
+        isolation_seconds: int = 60,
+        status_tracker: Optional[ServerStatusTracker] = None,
+    ):
         """
         Initialize the health monitor.
 
         Args:
             check_interval: Interval between health checks in seconds
+            probe_timeout: Deadline for a single ping probe in seconds
+            timeout_threshold: Consecutive probe timeouts that open a
+                server's circuit breaker
+            isolation_seconds: How long an open breaker (and the matching
+                quarantine) isolates the server before a probe is retried
+            status_tracker: Tracker that receives probe latency samples
         """
         self.check_interval = check_interval
+        self.probe_timeout = probe_timeout
+        self.timeout_threshold = timeout_threshold
+        self.isolation_seconds = isolation_seconds
+        self.status_tracker = status_tracker
+        self.circuit_breakers: Dict[str, CircuitBreaker] = {}
         self.monitoring_tasks: Dict[str, asyncio.Task] = {}
         self.health_history: Dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
         self.custom_health_checks: Dict[str, Callable] = {}
@@ -85,21 +114,32 @@ class HealthMonitor:
 
     def _register_default_health_checks(self) -> None:
         """Register default health check methods for each server type."""
-        self.register_health_check("sse", self._check_sse_health)
-        self.register_health_check("http", self._check_http_health)
-        self.register_health_check("stdio", self._check_stdio_health)
+        for server_type in ("sse", "http", "stdio"):
+            self.register_health_check(server_type, self._check_ping_health)
 
-    async def start_monitoring(self, server_id: str, server: ManagedMCPServer) -> None:
+    async def start_monitoring(
+        self, server_id: str, server: ManagedMCPServer, initial_check: bool = True
+    ) -> None:
         """
         Start continuous health monitoring for a server.
 
         Args:
             server_id: Unique identifier for the server
             server: The managed MCP server instance to monitor
-        """
-        if server_id in self.monitoring_tasks:
-            logger.warning(f"Server {server_id} is already being monitored")
-            return
+            initial_check: Probe once right away instead of waiting a full
+                ``check_interval`` for the first result
+        """
+        existing = self.monitoring_tasks.get(server_id)
+        if existing is not None:
+            # A task that finished, or belongs to a loop that has since gone
+            # away, no longer monitors anything.
+            if (
+                not existing.done()
+                and existing.get_loop() is asyncio.get_running_loop()
+            ):
+                logger.warning(f"Server {server_id} is already being monitored")
+                return
+            self.monitoring_tasks.pop(server_id, None)
 
         logger.info(f"Starting health monitoring for server {server_id}")
 
@@ -108,11 +148,14 @@ class HealthMonitor:
             self._monitoring_loop(server_id, server), name=f"health_monitor_{server_id}"
         )
         self.monitoring_tasks[server_id] = task
+        if not initial_check:
+            return
 
         # Perform initial health check
         try:
             health_status = await self.check_health(server)
             await self._record_health_status(server_id, health_status)
+            self._observe_probe(server_id, server, health_status)
         except Exception as e:
             logger.error(f"Initial health check failed for {server_id}: {e}")
             error_status = HealthStatus(
@@ -144,9 +187,26 @@ class HealthMonitor:
             async with self._lock:
                 self.consecutive_failures.pop(server_id, None)
             self.last_check_time.pop(server_id, None)
+            self.circuit_breakers.pop(server_id, None)
         else:
             logger.warning(f"No monitoring task found for server {server_id}")
 
+    def cancel_monitoring(self, server_id: str) -> None:
+        """
+        Stop monitoring a server without waiting for its task to finish.
+
+        For synchronous callers such as removing or reloading a server.
+
+        Args:
+            server_id: Unique identifier for the server
+        """
+        task = self.monitoring_tasks.pop(server_id, None)
+        if task is not None:
+            task.cancel()
+        self.consecutive_failures.pop(server_id, None)
+        self.last_check_time.pop(server_id, None)
+        self.circuit_breakers.pop(server_id, None)
+
     async def check_health(self, server: ManagedMCPServer) -> HealthStatus:
         """
         Perform a health check for a server.
@@ -180,6 +240,7 @@ class HealthMonitor:
                 latency_ms=result.latency_ms,
                 error=result.error,
                 check_type=server_type,
+                timed_out=result.timed_out,
             )
         except Exception as e:
             logger.error(f"Health check failed for server {server.config.id}: {e}")
@@ -236,7 +297,12 @@ class HealthMonitor:
 
         except Exception as e:
             latency_ms = (time.time() - start_time) * 1000
-            return HealthCheckResult(success=False, latency_ms=latency_ms, error=str(e))
+            return HealthCheckResult(
+                success=False,
+                latency_ms=latency_ms,
+                error=str(e),
+                timed_out=isinstance(e, TimeoutError),
+            )
 
     def register_health_check(self, server_type: str, check_func: Callable) -> None:
         """
@@ -305,13 +371,14 @@ class HealthMonitor:
                 # Wait for check interval
                 await asyncio.sleep(self.check_interval)
 
-                # Skip if server is not enabled
-                if not server.is_enabled():
+                # Skip if server is not enabled, or has no session to probe
+                if not server.is_enabled() or not server.is_connected():
                     continue
 
                 # Perform health check
                 health_status = await self.check_health(server)
                 await self._record_health_status(server_id, health_status)
+                self._observe_probe(server_id, server, health_status)
 
                 # Handle consecutive failures
                 async with self._lock:
@@ -429,115 +496,85 @@ class HealthMonitor:
             logger.error(f"Recovery action failed for server {server_id}: {e}")
             raise
 
-    async def _check_sse_health(self, server: ManagedMCPServer) -> HealthCheckResult:
+    def _observe_probe(
+        self, server_id: str, server: ManagedMCPServer, status: HealthStatus
+    ) -> None:
         """
-        Health check for SSE servers using GET request.
+        Feed a probe outcome into the latency histogram and circuit breaker.
 
-        Args:
-            server: The managed MCP server to check
-
-        Returns:
-            HealthCheckResult with check results
-        """
-        try:
-            config = server.config.config
-            url = config.get("url")
-            if not url:
-                return HealthCheckResult(
-                    success=False,
-                    latency_ms=0.0,
-                    error="No URL configured for SSE server",
-                )
+        Only timeouts count against the breaker: a fast, explicit error is
+        already surfaced by the consecutive-failure handling, whereas a probe
+        that hangs means agent tool calls would hang too. When the breaker
+        opens the server is quarantined for ``isolation_seconds``, which makes
+        ``get_pydantic_server`` refuse it until a later probe succeeds.
 
-            # Add health endpoint if available, otherwise use base URL
-            health_url = (
-                f"{url.rstrip('/')}/health" if not url.endswith("/health") else url
+        Args:
+            server_id: Unique identifier for the server
+            server: The managed MCP server that was probed
+            status: Result of the probe
+        """
+        if status.is_healthy and status.latency_ms is not None:
+            if self.status_tracker is not None:
+                self.status_tracker.record_latency(server_id, status.latency_ms)
+
+        breaker = self.circuit_breakers.get(server_id)
+        if breaker is None:
+            breaker = self.circuit_breakers[server_id] = CircuitBreaker(
+                failure_threshold=self.timeout_threshold,
+                timeout=self.isolation_seconds,
             )
 
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(health_url)
-
-                if response.status_code == 404:
-                    # Try base URL if health endpoint doesn't exist
-                    response = await client.get(url)
-
-                success = 200 <= response.status_code < 400
-                error = (
-                    None
-                    if success
-                    else f"HTTP {response.status_code}: {response.reason_phrase}"
-                )
-
-                return HealthCheckResult(
-                    success=success,
-                    latency_ms=0.0,  # Will be filled by perform_health_check
-                    error=error,
+        if status.timed_out:
+            was_open = breaker.is_open()
+            breaker.record_failure()
+            if breaker.is_open() and not was_open:
+                logger.error(
+                    f"Server {server_id} missed {self.timeout_threshold} ping "
+                    f"deadlines, isolating for {self.isolation_seconds}s"
                 )
+                try:
+                    server.quarantine(self.isolation_seconds)
+                except Exception as e:
+                    logger.error(f"Failed to quarantine server {server_id}: {e}")
+        elif status.is_healthy:
+            breaker.record_success()
 
-        except Exception as e:
-            return HealthCheckResult(success=False, latency_ms=0.0, error=str(e))
-
-    async def _check_http_health(self, server: ManagedMCPServer) -> HealthCheckResult:
-        """
-        Health check for HTTP servers using GET request.
-
-        Args:
-            server: The managed MCP server to check
-
-        Returns:
-            HealthCheckResult with check results
+    async def _check_ping_health(self, server: ManagedMCPServer) -> HealthCheckResult:
         """
-        # HTTP servers use the same check as SSE servers
-        return await self._check_sse_health(server)
+        Health check for any transport using an MCP ``ping`` request.
 
-    async def _check_stdio_health(self, server: ManagedMCPServer) -> HealthCheckResult:
-        """
-        Health check for stdio servers using ping command.
+        The ping travels over the server's open session and must complete
+        within ``probe_timeout``; a hung server therefore reports a timeout
+        instead of looking healthy.
 
         Args:
             server: The managed MCP server to check
 
         Returns:
-            HealthCheckResult with check results
+            HealthCheckResult with round-trip latency and timeout flag
         """
+        start_time = time.perf_counter()
         try:
-            server.get_pydantic_server()
-
-            # NOTE: simplified health check — confirm the server responds and is
-            # configured; no real MCP message is sent.
-            try:
-                config = server.config.config
-                command = config.get("command")
-
-                if not command:
-                    return HealthCheckResult(
-                        success=False,
-                        latency_ms=0.0,
-                        error="No command configured for stdio server",
-                    )
-
-                # Basic validation that command exists
-                import shutil
-
-                if not shutil.which(command):
-                    return HealthCheckResult(
-                        success=False,
-                        latency_ms=0.0,
-                        error=f"Command '{command}' not found in PATH",
-                    )
-
-                # If we get here, basic checks passed
-                return HealthCheckResult(success=True, latency_ms=0.0, error=None)
-
-            except Exception as e:
-                return HealthCheckResult(
-                    success=False,
-                    latency_ms=0.0,
-                    error=f"Server communication failed: {str(e)}",
-                )
-
+            ok = await server.ping(timeout=self.probe_timeout)
+        except (asyncio.TimeoutError, TimeoutError):
+            return HealthCheckResult(
+                success=False,
+                latency_ms=(time.perf_counter() - start_time) * 1000,
+                error=f"Ping timed out after {self.probe_timeout}s",
+                timed_out=True,
+            )
         except Exception as e:
-            return HealthCheckResult(success=False, latency_ms=0.0, error=str(e))
+            return HealthCheckResult(
+                success=False,
+                latency_ms=(time.perf_counter() - start_time) * 1000,
+                error=f"Ping failed: {e}",
+            )
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        return HealthCheckResult(
+            success=bool(ok),
+            latency_ms=latency_ms,
+            error=None if ok else "Ping returned an unexpected result",
+        )
 
     async def close(self) -> None:
         """Close the health monitor, stopping all monitoring tasks."""
@@ -578,5 +615,6 @@ class HealthMonitor:
         self.monitoring_tasks.clear()
         self.consecutive_failures.clear()
         self.last_check_time.clear()
+        self.circuit_breakers.clear()
 
         logger.info("Health monitor shutdown complete")
@@ -5,6 +5,7 @@ This module provides a managed wrapper around pydantic-ai MCP server classes
 that adds management capabilities while maintaining 100% compatibility.
 """
 
+import asyncio
 import os
 import uuid
 from dataclasses import dataclass, field
@@ -21,6 +22,7 @@ from pydantic_ai.toolsets import AbstractToolset
 from code_puppy.http_utils import create_async_client, get_cert_bundle_path
 from code_puppy.mcp_.blocking_startup import BlockingStdioToolset
 from code_puppy.mcp_.tool_arg_coercion import coerce_tool_args
+from code_puppy.mcp_.tool_index import IndexedMCPToolset
 
 
 def _expand_env_vars(value: Any) -> Any:
@@ -136,22 +138,30 @@ class ServerConfig:
     config: Dict = field(default_factory=dict)  # Raw config from JSON
 
 
+def _toolset_for_call(call_tool: CallToolFunc) -> Any:
+    """Recover the ``MCPToolset`` behind pydantic-ai's ``call_tool`` callable.
+
+    ``call_tool`` is ``MCPToolset.direct_call_tool`` — either the bound
+    method itself or a ``functools.partial`` around it — so unwrapping
+    ``.func``/``__self__`` yields the toolset.
+    """
+    func = getattr(call_tool, "func", call_tool)  # unwrap functools.partial
+    return getattr(func, "__self__", None)
+
+
 async def _input_schema_for_tool(
     call_tool: CallToolFunc, name: str
 ) -> Optional[Dict[str, Any]]:
     """Best-effort lookup of an MCP tool's JSON inputSchema.
 
-    ``call_tool`` is pydantic-ai's ``MCPToolset.direct_call_tool`` — either
-    the bound method itself or a ``functools.partial`` around it — so
-    unwrapping ``.func``/``__self__`` yields the toolset, which exposes a
-    (cached) ``list_tools()``. The ``name`` here is already prefix-stripped,
-    matching the raw tool names returned by ``list_tools()``.
+    Fallback for toolsets without a ``ToolIndex``: awaits the toolset's
+    (cached) ``list_tools()`` and scans it. The ``name`` here is already
+    prefix-stripped, matching the raw tool names returned by ``list_tools()``.
 
     Returns ``None`` if the schema cannot be resolved for any reason -- callers
     must treat that as "don't coerce".
     """
-    func = getattr(call_tool, "func", call_tool)  # unwrap functools.partial
-    server = getattr(func, "__self__", None)
+    server = _toolset_for_call(call_tool)
     list_tools = getattr(server, "list_tools", None)
     if list_tools is None:
         return None
@@ -165,6 +175,36 @@ async def _input_schema_for_tool(
     return None
 
 
+async def _coerce_for_tool(
+    call_tool: CallToolFunc, name: str, tool_args: dict[str, Any]
+) -> dict[str, Any]:
+    """Coerce ``tool_args`` using the server's tool index when it has one."""
+    server = _toolset_for_call(call_tool)
+    if isinstance(server, IndexedMCPToolset):
+        try:
+            indexed = await server.lookup_tool(name)
+        except Exception:
+            indexed = None
+        if indexed is None:
+            return tool_args
+        return indexed.coerce_args(tool_args)
+    input_schema = await _input_schema_for_tool(call_tool, name)
+    return coerce_tool_args(tool_args, input_schema)
+
+
+_console = None
+
+
+def _get_console():
+    """Shared rich console for MCP tool-call banners (created on first use)."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console()
+    return _console
+
+
 async def process_tool_call(
     ctx: RunContext[Any],
     call_tool: CallToolFunc,
@@ -175,19 +215,16 @@ async def process_tool_call(
 
     pydantic-ai forwards MCP tool args without coercing them against each tool's
     real JSON Schema, so models that emit stringified arrays/bools/numbers cause
-    downstream validation failures. We coerce here before forwarding.
+    downstream validation failures. We coerce here before forwarding, using the
+    per-server ``ToolIndex`` so no ``tools/list`` request is made per call.
     """
-    from rich.console import Console
-
     from code_puppy.config import get_banner_color
 
-    console = Console()
     color = get_banner_color("mcp_tool_call")
     banner = f"[bold white on {color}] MCP TOOL CALL [/bold white on {color}]"
-    console.print(f"\n{banner} 🔧 [bold cyan]{name}[/bold cyan]")
+    _get_console().print(f"\n{banner} 🔧 [bold cyan]{name}[/bold cyan]")
 
-    input_schema = await _input_schema_for_tool(call_tool, name)
-    tool_args = coerce_tool_args(tool_args, input_schema)
+    tool_args = await _coerce_for_tool(call_tool, name, tool_args)
 
     return await call_tool(name, tool_args, metadata={"deps": ctx.deps})
 
@@ -315,7 +352,7 @@ class ManagedMCPServer:
                     else None
                 ),
             )
-            self._toolset = MCPToolset(transport, **self._toolset_kwargs(config))
+            self._toolset = IndexedMCPToolset(transport, **self._toolset_kwargs(config))
 
         elif server_type == "stdio":
             if "command" not in config:
@@ -363,7 +400,7 @@ class ManagedMCPServer:
                 url=_expand_env_vars(config["url"]),
                 headers=headers,
             )
-            self._toolset = MCPToolset(transport, **self._toolset_kwargs(config))
+            self._toolset = IndexedMCPToolset(transport, **self._toolset_kwargs(config))
 
         else:
             raise ValueError(f"Unsupported server type: {server_type}")
@@ -461,6 +498,36 @@ class ManagedMCPServer:
             return self._toolset.get_captured_stderr()
         return []
 
+    def is_connected(self) -> bool:
+        """
+        Check whether the underlying toolset holds an open MCP session.
+
+        Returns:
+            True if a session is open, False otherwise
+        """
+        return self._toolset is not None and bool(self._toolset.is_running)
+
+    async def ping(self, timeout: float = 5.0) -> bool:
+        """
+        Send an MCP ``ping`` request over the open session.
+
+        Works for every transport; the request goes through the same session
+        agent tool calls use, so a wedged server fails here too.
+
+        Args:
+            timeout: Deadline for the round-trip in seconds
+
+        Returns:
+            True if the server answered with an empty result
+
+        Raises:
+            RuntimeError: If no session is open
+            TimeoutError: If the server doesn't answer within ``timeout``
+        """
+        if not self.is_connected():
+            raise RuntimeError(f"Server {self.config.name} has no open session")
+        return await asyncio.wait_for(self._toolset.client.ping(), timeout=timeout)
+
     async def wait_until_ready(self, timeout: float = 30.0) -> bool:
         """
         Wait until the server is ready.
@@ -11,13 +11,14 @@ import asyncio
 import logging
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 from pydantic_ai.toolsets import AbstractToolset
 
 from code_puppy.messaging import emit_warning
 
 from .async_lifecycle import get_lifecycle_manager
+from .health_monitor import HealthMonitor
 from .managed_server import ManagedMCPServer, ServerConfig, ServerState
 from .registry import ServerRegistry
 from .status_tracker import ServerStatusTracker
@@ -135,6 +136,10 @@ class MCPManager:
         # Initialize core components
         self.registry = ServerRegistry()
         self.status_tracker = ServerStatusTracker()
+        # Pings running servers; latencies land in status_tracker and servers
+        # that stop answering are quarantined.
+        self.health_monitor = HealthMonitor(status_tracker=self.status_tracker)
+        self._shutdown_registered = False
 
         # Active managed servers (server_id -> ManagedMCPServer)
         self._managed_servers: Dict[str, ManagedMCPServer] = {}
@@ -300,6 +305,7 @@ class MCPManager:
     def get_servers_for_agent(
         self,
         agent_name: Optional[str] = None,
+        exclude_names: Optional[Set[str]] = None,
     ) -> List[AbstractToolset[Any]]:
         """
         Get pydantic-ai compatible toolsets for agent use.
@@ -314,6 +320,8 @@ class MCPManager:
                 this agent via ``mcp_agent_bindings.json`` (strict opt-in).
                 If ``None``, return every enabled server (legacy behaviour
                 used by status / listing code paths).
+            exclude_names: Server names to leave out even if bound — e.g.
+                servers whose autostart is still in flight.
 
         Returns:
             List of pydantic-ai toolsets ready for ``Agent(toolsets=...)``
@@ -352,6 +360,12 @@ class MCPManager:
                     ):
                         unbound_to_warn.append(managed_server.config.name)
                     continue
+                if exclude_names and managed_server.config.name in exclude_names:
+                    logger.debug(
+                        "Skipping server %s: excluded by caller",
+                        managed_server.config.name,
+                    )
+                    continue
                 # Only include enabled, non-quarantined servers
                 if managed_server.is_enabled() and not managed_server.is_quarantined():
                     # Get the actual pydantic-ai server instance
@@ -465,8 +479,12 @@ class MCPManager:
                         "error": status.get("error_message"),
                     }
 
-                # Get latency from metadata
+                # Get latency from metadata, falling back to the probe median
                 latency_ms = self.status_tracker.get_metadata(server_id, "latency_ms")
+                if latency_ms is None:
+                    latency_ms = self.status_tracker.get_latency_percentiles(server_id)[
+                        "p50_ms"
+                    ]
 
                 server_info = ServerInfo(
                     id=server_id,
@@ -549,6 +567,7 @@ class MCPManager:
                         "started",
                         {"message": "Server started and process running"},
                     )
+                    await self._start_health_monitoring(server_id, managed_server)
                 else:
                     logger.warning(
                         f"Could not start process for server {server_id}, but it's enabled"
@@ -699,6 +718,7 @@ class MCPManager:
         try:
             # First disable the server
             managed_server.disable()
+            self.health_monitor.cancel_monitoring(server_id)
             self.status_tracker.set_status(server_id, ServerState.STOPPED)
             self.status_tracker.record_stop_time(server_id)
 
@@ -740,6 +760,28 @@ class MCPManager:
             )
             return False
 
+    async def _start_health_monitoring(
+        self, server_id: str, managed_server: ManagedMCPServer
+    ) -> None:
+        """Probe a started server in the background until it stops."""
+        if not self._shutdown_registered:
+            from code_puppy.callbacks import register_callback
+
+            register_callback("shutdown", self.shutdown)
+            self._shutdown_registered = True
+        try:
+            # No initial probe: autostart waits on start_server, and the
+            # session may still be settling.
+            await self.health_monitor.start_monitoring(
+                server_id, managed_server, initial_check=False
+            )
+        except Exception as e:
+            logger.warning(f"Could not monitor server {server_id}: {e}")
+
+    async def shutdown(self) -> None:
+        """Stop background health monitoring of every server."""
+        await self.health_monitor.shutdown()
+
     def stop_server_sync(self, server_id: str) -> bool:
         """
         Synchronous wrapper for stop_server.
@@ -822,6 +864,7 @@ class MCPManager:
                 old_server = self._managed_servers[server_id]
                 logger.debug(f"Removing old server instance: {old_server.config.name}")
                 del self._managed_servers[server_id]
+                self.health_monitor.cancel_monitoring(server_id)
 
             # Create new managed server
             managed_server = ManagedMCPServer(config)
@@ -871,6 +914,7 @@ class MCPManager:
         if server_id in self._managed_servers:
             del self._managed_servers[server_id]
             managed_removed = True
+        self.health_monitor.cancel_monitoring(server_id)
 
         # Record removal event if server existed
         if registry_removed or managed_removed:
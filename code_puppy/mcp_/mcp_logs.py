@@ -3,11 +3,20 @@ MCP Server Log Management.
 
 This module provides persistent log file management for MCP servers.
 Logs are stored in STATE_DIR/mcp_logs/<server_name>.log
+
+Writes go through a per-file ``_BufferedLogWriter`` that keeps the file open,
+batches lines in memory, and tracks the file size itself so rotation doesn't
+cost a ``stat`` per line. Buffers are flushed when they grow past
+``FLUSH_THRESHOLD_BYTES``, every ``FLUSH_INTERVAL_SECONDS`` by a background
+thread, before any read/rotate/clear of the same file, and at exit.
 """
 
+import atexit
+import os
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from code_puppy.config import STATE_DIR
 
@@ -17,6 +26,18 @@ MAX_LOG_SIZE = 5 * 1024 * 1024
 # Number of rotated logs to keep
 MAX_ROTATED_LOGS = 3
 
+# Buffered writer tuning: flush once this many bytes are pending, or after
+# this many seconds, whichever comes first.
+FLUSH_THRESHOLD_BYTES = 64 * 1024
+FLUSH_INTERVAL_SECONDS = 0.5
+
+# Block size used when seeking backwards from EOF to tail a log
+TAIL_BLOCK_SIZE = 64 * 1024
+
+# write_log resolves the log path on every line; memoize it per
+# (STATE_DIR, server_name) so the hot path doesn't rebuild Path objects.
+_log_paths: Dict[Tuple[str, str], Path] = {}
+
 
 def get_mcp_logs_dir() -> Path:
     """
@@ -42,9 +63,180 @@ def get_log_file_path(server_name: str) -> Path:
     Returns:
         Path to the server's log file
     """
+    key = (STATE_DIR, server_name)
+    cached = _log_paths.get(key)
+    if cached is not None:
+        return cached
     # Sanitize server name for filesystem
     safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in server_name)
-    return get_mcp_logs_dir() / f"{safe_name}.log"
+    path = get_mcp_logs_dir() / f"{safe_name}.log"
+    _log_paths[key] = path
+    return path
+
+
+def _shift_rotated_logs(log_path: Path) -> None:
+    """Rename ``x.log`` -> ``x.log.1`` (shifting older rotations up)."""
+    # Remove oldest rotated log if we're at the limit
+    oldest = log_path.with_name(f"{log_path.name}.{MAX_ROTATED_LOGS}")
+    if oldest.exists():
+        oldest.unlink()
+
+    # Shift existing rotated logs
+    for i in range(MAX_ROTATED_LOGS - 1, 0, -1):
+        old_path = log_path.with_name(f"{log_path.name}.{i}")
+        new_path = log_path.with_name(f"{log_path.name}.{i + 1}")
+        if old_path.exists():
+            old_path.rename(new_path)
+
+    # Rotate current log
+    log_path.rename(log_path.with_name(f"{log_path.name}.1"))
+
+
+class _BufferedLogWriter:
+    """Append-only writer for one log file with in-memory size bookkeeping.
+
+    The file is opened once and kept open. ``size`` is seeded from ``fstat``
+    when the file is opened and refreshed after every flush, which also picks
+    up bytes appended by other writers (the stdio transport writes server
+    stderr straight into the same file).
+
+    Once ``close`` runs the writer is retired: ``write`` refuses the line and
+    returns False so the caller fetches the writer that replaced it, instead
+    of reopening the file on an object nothing flushes any more.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.closed = False
+        self._file = None
+        self._pending: List[str] = []
+        self._pending_bytes = 0
+        self.size = 0
+
+    def write(self, line: str) -> bool:
+        with self.lock:
+            if self.closed:
+                return False
+            if self._file is None:
+                self._open()
+            self._pending.append(line)
+            # ASCII log lines dominate; len() is a cheap, close-enough estimate.
+            self._pending_bytes += len(line)
+            if self.size + self._pending_bytes >= MAX_LOG_SIZE:
+                self._flush_locked()
+                if self.size >= MAX_LOG_SIZE:
+                    self._rotate_locked()
+            elif self._pending_bytes >= FLUSH_THRESHOLD_BYTES:
+                self._flush_locked()
+        return True
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._pending)
+
+    def flush(self) -> None:
+        with self.lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        with self.lock:
+            self.closed = True
+            self._flush_locked()
+            self._close_locked()
+
+    def _open(self) -> None:
+        try:
+            self._file = open(self.path, "a", encoding="utf-8")
+        except FileNotFoundError:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self.size = os.fstat(self._file.fileno()).st_size
+
+    def _flush_locked(self) -> None:
+        if not self._pending or self._file is None:
+            return
+        self._file.write("".join(self._pending))
+        self._file.flush()
+        self._pending.clear()
+        self._pending_bytes = 0
+        self.size = os.fstat(self._file.fileno()).st_size
+
+    def _close_locked(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _rotate_locked(self) -> None:
+        self._close_locked()
+        if self.path.exists():
+            _shift_rotated_logs(self.path)
+        self.size = 0
+
+
+_writers: Dict[Path, _BufferedLogWriter] = {}
+_writers_lock = threading.Lock()
+_flusher: Optional[threading.Thread] = None
+_flusher_stop = threading.Event()
+
+
+def _flush_loop() -> None:
+    while not _flusher_stop.wait(FLUSH_INTERVAL_SECONDS):
+        for writer in list(_writers.values()):
+            if writer.dirty:
+                try:
+                    writer.flush()
+                except OSError:
+                    pass  # Disk full / file yanked; the next write retries
+
+
+def _get_writer(log_path: Path) -> _BufferedLogWriter:
+    global _flusher
+    writer = _writers.get(log_path)
+    if writer is not None:
+        return writer
+    with _writers_lock:
+        writer = _writers.setdefault(log_path, _BufferedLogWriter(log_path))
+        if _flusher is None:
+            _flusher = threading.Thread(
+                target=_flush_loop, name="mcp-log-flusher", daemon=True
+            )
+            _flusher.start()
+    return writer
+
+
+def _release_writer(log_path: Path) -> None:
+    """Flush and close the writer for ``log_path`` (if any) so the file can move."""
+    with _writers_lock:
+        writer = _writers.pop(log_path, None)
+    if writer is not None:
+        writer.close()
+
+
+def flush_logs(server_name: Optional[str] = None) -> None:
+    """
+    Flush buffered log lines to disk.
+
+    Args:
+        server_name: Only flush this server's log. None flushes every server.
+    """
+    if server_name is None:
+        writers = list(_writers.values())
+    else:
+        writer = _writers.get(get_log_file_path(server_name))
+        writers = [writer] if writer is not None else []
+    for writer in writers:
+        writer.flush()
+
+
+@atexit.register
+def _close_all_writers() -> None:
+    _flusher_stop.set()
+    for log_path in list(_writers):
+        try:
+            _release_writer(log_path)
+        except OSError:
+            pass
 
 
 def rotate_log_if_needed(server_name: str) -> None:
@@ -55,6 +247,8 @@ def rotate_log_if_needed(server_name: str) -> None:
         server_name: Name of the MCP server
     """
     log_path = get_log_file_path(server_name)
+    # Pending lines belong to the current file, so they land before the move.
+    _release_writer(log_path)
 
     if not log_path.exists():
         return
@@ -63,42 +257,53 @@ def rotate_log_if_needed(server_name: str) -> None:
     if log_path.stat().st_size < MAX_LOG_SIZE:
         return
 
-    logs_dir = get_mcp_logs_dir()
-    safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in server_name)
-
-    # Remove oldest rotated log if we're at the limit
-    oldest = logs_dir / f"{safe_name}.log.{MAX_ROTATED_LOGS}"
-    if oldest.exists():
-        oldest.unlink()
-
-    # Shift existing rotated logs
-    for i in range(MAX_ROTATED_LOGS - 1, 0, -1):
-        old_path = logs_dir / f"{safe_name}.log.{i}"
-        new_path = logs_dir / f"{safe_name}.log.{i + 1}"
-        if old_path.exists():
-            old_path.rename(new_path)
-
-    # Rotate current log
-    rotated_path = logs_dir / f"{safe_name}.log.1"
-    log_path.rename(rotated_path)
+    _shift_rotated_logs(log_path)
 
 
 def write_log(server_name: str, message: str, level: str = "INFO") -> None:
     """
     Write a log message for a server.
 
+    The line is buffered; see :func:`flush_logs` to force it to disk.
+
     Args:
         server_name: Name of the MCP server
         message: Log message to write
         level: Log level (INFO, ERROR, WARN, DEBUG)
     """
-    rotate_log_if_needed(server_name)
-
     log_path = get_log_file_path(server_name)
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    line = f"[{timestamp}] [{level}] {message}\n"
+    # A rotate/clear can retire the writer between lookup and write; the
+    # retired one refuses the line, so fetch its replacement and try again.
+    while not _get_writer(log_path).write(line):
+        pass
 
-    with open(log_path, "a", encoding="utf-8") as f:
-        f.write(f"[{timestamp}] [{level}] {message}\n")
+
+def _tail_file(path: Path, lines: int) -> List[str]:
+    """Return the last ``lines`` lines of ``path`` without reading it all.
+
+    Seeks backwards from EOF in ``TAIL_BLOCK_SIZE`` blocks until enough
+    newlines have been seen, then decodes only that tail.
+    """
+    with open(path, "rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        blocks: List[bytes] = []
+        newlines = 0
+        # One extra newline: the file normally ends with one.
+        while pos > 0 and newlines <= lines:
+            step = min(TAIL_BLOCK_SIZE, pos)
+            pos -= step
+            f.seek(pos)
+            block = f.read(step)
+            blocks.append(block)
+            newlines += block.count(b"\n")
+    data = b"".join(reversed(blocks))
+    if pos > 0:
+        # Drop the partial line we landed in the middle of.
+        data = data[data.index(b"\n") + 1 :]
+    return data.decode("utf-8", errors="replace").splitlines()[-lines:]
 
 
 def read_logs(
@@ -115,6 +320,27 @@ def read_logs(
     Returns:
         List of log lines (most recent last)
     """
+    log_path = get_log_file_path(server_name)
+    flush_logs(server_name)
+
+    if lines is not None and lines > 0:
+        # Tail newest-first, only touching rotated files if the current one
+        # is too short.
+        tail: List[str] = []
+        sources = [log_path]
+        if include_rotated:
+            sources += [
+                log_path.with_name(f"{log_path.name}.{i}")
+                for i in range(1, MAX_ROTATED_LOGS + 1)
+            ]
+        for source in sources:
+            if not source.exists():
+                continue
+            tail = _tail_file(source, lines - len(tail)) + tail
+            if len(tail) >= lines:
+                break
+        return tail
+
     all_lines = []
 
     # Read rotated logs first (oldest to newest)
@@ -129,15 +355,10 @@ def read_logs(
                     all_lines.extend(f.read().splitlines())
 
     # Read current log
-    log_path = get_log_file_path(server_name)
     if log_path.exists():
         with open(log_path, "r", encoding="utf-8", errors="replace") as f:
             all_lines.extend(f.read().splitlines())
 
-    # Return requested number of lines
-    if lines is not None and lines > 0:
-        return all_lines[-lines:]
-
     return all_lines
 
 
@@ -150,6 +371,7 @@ def clear_logs(server_name: str, include_rotated: bool = True) -> None:
         include_rotated: Whether to also clear rotated log files
     """
     log_path = get_log_file_path(server_name)
+    _release_writer(log_path)
 
     if log_path.exists():
         log_path.unlink()
@@ -196,6 +418,7 @@ def get_log_stats(server_name: str) -> dict:
         Dictionary with log statistics
     """
     log_path = get_log_file_path(server_name)
+    flush_logs(server_name)
 
     stats = {
         "exists": log_path.exists(),
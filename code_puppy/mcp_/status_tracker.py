@@ -5,6 +5,7 @@ This module provides the ServerStatusTracker class that tracks the runtime
 status of MCP servers including state, metrics, and events.
 """
 
+import bisect
 import logging
 import threading
 from collections import defaultdict, deque
@@ -28,6 +29,82 @@ class Event:
     server_id: str
 
 
+def _geometric_bounds(low: float, high: float, ratio: float) -> tuple:
+    bounds = []
+    value = low
+    while value < high:
+        bounds.append(round(value, 3))
+        value *= ratio
+    bounds.append(high)
+    return tuple(bounds)
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram with bounded memory.
+
+    Buckets grow geometrically (25% per bucket) from 0.5ms to 2 minutes, so
+    recording is a binary search plus an increment and percentiles are
+    accurate to within one bucket width regardless of how many samples are
+    recorded. Samples above the last bound land in an overflow bucket.
+    """
+
+    BUCKET_BOUNDS_MS = _geometric_bounds(0.5, 120_000.0, 1.25)
+
+    def __init__(self):
+        self._counts = [0] * (len(self.BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.min_ms: Optional[float] = None
+        self.max_ms: Optional[float] = None
+
+    def record(self, latency_ms: float) -> None:
+        """Add a single latency sample (milliseconds)."""
+        latency_ms = max(0.0, float(latency_ms))
+        self._counts[bisect.bisect_left(self.BUCKET_BOUNDS_MS, latency_ms)] += 1
+        self.count += 1
+        if self.min_ms is None or latency_ms < self.min_ms:
+            self.min_ms = latency_ms
+        if self.max_ms is None or latency_ms > self.max_ms:
+            self.max_ms = latency_ms
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Estimate the ``q``-th percentile (0-100) in milliseconds.
+
+        Interpolates linearly inside the bucket holding the target rank and
+        clamps to the observed min/max. Returns None when empty.
+        """
+        if self.count == 0:
+            return None
+        rank = max(1.0, min(q, 100.0) / 100.0 * self.count)
+        seen = 0
+        for index, bucket_count in enumerate(self._counts):
+            if bucket_count == 0:
+                continue
+            if seen + bucket_count >= rank:
+                lower = self.BUCKET_BOUNDS_MS[index - 1] if index > 0 else 0.0
+                upper = (
+                    self.BUCKET_BOUNDS_MS[index]
+                    if index < len(self.BUCKET_BOUNDS_MS)
+                    else self.max_ms
+                )
+                estimate = lower + (upper - lower) * ((rank - seen) / bucket_count)
+                return min(max(estimate, self.min_ms), self.max_ms)
+            seen += bucket_count
+        return self.max_ms
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        """Return count, min/max and p50/p95/p99 as a plain dict."""
+        return {
+            "count": self.count,
+            "min_ms": self.min_ms,
+            "max_ms": self.max_ms,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+        }
+
+
 class ServerStatusTracker:
     """
     Tracks the runtime status of MCP servers including state, metrics, and events.
@@ -62,6 +139,9 @@ class ServerStatusTracker:
         self._start_times: Dict[str, datetime] = {}
         self._stop_times: Dict[str, datetime] = {}
 
+        # Probe round-trip latency (server_id -> histogram)
+        self._latency: Dict[str, LatencyHistogram] = {}
+
         logger.info("ServerStatusTracker initialized")
 
     def set_status(self, server_id: str, state: ServerState) -> None:
@@ -200,6 +280,38 @@ class ServerStatusTracker:
                 self._server_events[server_id].clear()
                 logger.info(f"Cleared all events for server: {server_id}")
 
+    def record_latency(self, server_id: str, latency_ms: float) -> None:
+        """
+        Record a round-trip latency sample for a server.
+
+        Unlike metadata updates this does not emit an event: probes run
+        continuously and would otherwise flood the event history.
+
+        Args:
+            server_id: Unique identifier for the server
+            latency_ms: Round-trip time in milliseconds
+        """
+        with self._lock:
+            histogram = self._latency.get(server_id)
+            if histogram is None:
+                histogram = self._latency[server_id] = LatencyHistogram()
+            histogram.record(latency_ms)
+
+    def get_latency_percentiles(self, server_id: str) -> Dict[str, Optional[float]]:
+        """
+        Get latency percentiles for a server.
+
+        Args:
+            server_id: Unique identifier for the server
+
+        Returns:
+            Dictionary with count, min_ms, max_ms, p50_ms, p95_ms and p99_ms
+            (values are None until a sample has been recorded)
+        """
+        with self._lock:
+            histogram = self._latency.get(server_id) or LatencyHistogram()
+            return histogram.summary()
+
     def get_uptime(self, server_id: str) -> Optional[timedelta]:
         """
         Calculate uptime for a server based on start/stop times.
@@ -293,6 +405,7 @@ class ServerStatusTracker:
             all_ids.update(self._server_events.keys())
             all_ids.update(self._start_times.keys())
             all_ids.update(self._stop_times.keys())
+            all_ids.update(self._latency.keys())
 
             return sorted(list(all_ids))
 
@@ -315,6 +428,7 @@ class ServerStatusTracker:
                 "uptime": self.get_uptime(server_id),
                 "start_time": self._start_times.get(server_id),
                 "stop_time": self._stop_times.get(server_id),
+                "latency": self.get_latency_percentiles(server_id),
                 "last_event_time": (
                     list(self._server_events.get(server_id, deque()))[-1].timestamp
                     if server_id in self._server_events
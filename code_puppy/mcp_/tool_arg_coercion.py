@@ -23,9 +23,9 @@ unchanged. It never raises and never drops data.
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-__all__ = ["coerce_tool_args"]
+__all__ = ["coerce_tool_args", "compile_tool_arg_coercer"]
 
 # JSON Schema "type" keywords we know how to coerce a string *into*.
 _COERCIBLE_TYPES = frozenset({"array", "object", "number", "integer", "boolean"})
@@ -72,6 +72,47 @@ def coerce_tool_args(
     return coerced
 
 
+def compile_tool_arg_coercer(
+    input_schema: Optional[Dict[str, Any]],
+) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Pre-resolve ``input_schema`` into a reusable coercion function.
+
+    Equivalent to ``functools.partial(coerce_tool_args, input_schema=...)``
+    but walks the schema once up front: only properties that declare a
+    coercible type are kept, so per-call work is a dict lookup per argument.
+    Used by the per-server tool index, which builds one coercer per tool when
+    the tool list is fetched rather than on every call.
+    """
+    plan: Dict[str, List[str]] = {}
+    if isinstance(input_schema, dict):
+        properties = input_schema.get("properties")
+        if isinstance(properties, dict):
+            for key, prop_schema in properties.items():
+                if isinstance(prop_schema, dict):
+                    types = _schema_types(prop_schema)
+                    if types:
+                        plan[key] = types
+
+    def coerce(tool_args: Dict[str, Any]) -> Dict[str, Any]:
+        if not plan or not isinstance(tool_args, dict):
+            return tool_args
+        coerced: Dict[str, Any] = dict(tool_args)
+        for key, value in tool_args.items():
+            if not isinstance(value, str):
+                continue
+            types = plan.get(key)
+            if types is None:
+                continue
+            for schema_type in types:
+                result, ok = _coerce_to_type(value, schema_type)
+                if ok:
+                    coerced[key] = result
+                    break
+        return coerced
+
+    return coerce
+
+
 def _schema_types(prop_schema: Dict[str, Any]) -> List[str]:
     """Extract the candidate JSON Schema types for a property.
 
@@ -0,0 +1,121 @@
+"""Per-server index of MCP tool schemas for O(1) tool-call dispatch.
+
+``process_tool_call`` needs each tool's JSON ``inputSchema`` to coerce
+stringified arguments. Looking it up by awaiting ``list_tools()`` and scanning
+the result on every call costs an await (and, whenever pydantic-ai's own cache
+is cold, a full ``tools/list`` round-trip to the server) per invocation.
+
+``IndexedMCPToolset`` keeps a ``ToolIndex`` (name -> schema + compiled
+coercer) alongside the toolset:
+
+- it is (re)built whenever ``list_tools()`` returns a *freshly fetched* list,
+  which pydantic-ai does once per connection when the agent first asks for
+  tool definitions;
+- it is invalidated on ``notifications/tools/list_changed`` and when the
+  last session context exits, so a reconnect or a server-side tool change
+  always re-fetches.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from mcp import types as mcp_types
+from pydantic_ai.mcp import MCPToolset
+
+from code_puppy.mcp_.tool_arg_coercion import compile_tool_arg_coercer
+
+
+@dataclass(frozen=True)
+class IndexedTool:
+    """A single indexed MCP tool."""
+
+    name: str
+    input_schema: Optional[Dict[str, Any]]
+    coerce_args: Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+class ToolIndex:
+    """Name -> ``IndexedTool`` map for one MCP server."""
+
+    def __init__(self) -> None:
+        self._tools: Dict[str, IndexedTool] = {}
+        self._source: Optional[Sequence[Any]] = None
+        self.populated = False
+        self.builds = 0
+
+    def rebuild(self, tools: Sequence[Any]) -> None:
+        """Replace the index with entries built from a ``list_tools()`` result."""
+        indexed: Dict[str, IndexedTool] = {}
+        for tool in tools:
+            name = getattr(tool, "name", None)
+            if not name:
+                continue
+            schema = getattr(tool, "inputSchema", None)
+            indexed[name] = IndexedTool(name, schema, compile_tool_arg_coercer(schema))
+        self._tools = indexed
+        self._source = tools
+        self.populated = True
+        self.builds += 1
+
+    def sync(self, tools: Sequence[Any]) -> None:
+        """Rebuild only if ``tools`` is a different list than the last one indexed.
+
+        pydantic-ai hands back the *same* cached list object until its cache
+        is invalidated, so an identity check is enough to skip redundant work.
+        """
+        if not self.populated or tools is not self._source:
+            self.rebuild(tools)
+
+    def invalidate(self) -> None:
+        """Drop all entries; the next lookup re-fetches the tool list."""
+        self._tools = {}
+        self._source = None
+        self.populated = False
+
+    def get(self, name: str) -> Optional[IndexedTool]:
+        return self._tools.get(name)
+
+    def __len__(self) -> int:
+        return len(self._tools)
+
+
+def _is_tool_list_changed(message: Any) -> bool:
+    notification = getattr(message, "root", message)
+    return isinstance(notification, mcp_types.ToolListChangedNotification)
+
+
+class IndexedMCPToolset(MCPToolset):
+    """``MCPToolset`` that maintains a ``ToolIndex`` of its tools.
+
+    Accepts the same arguments as ``MCPToolset``. A caller-supplied
+    ``message_handler`` still runs; ours only adds index invalidation.
+    """
+
+    def __init__(self, *args: Any, message_handler: Any = None, **kwargs: Any):
+        self.tool_index = ToolIndex()
+        user_handler = message_handler
+
+        async def _on_message(message: Any) -> None:
+            if _is_tool_list_changed(message):
+                self.tool_index.invalidate()
+            if user_handler is not None:
+                await user_handler(message)
+
+        super().__init__(*args, message_handler=_on_message, **kwargs)
+
+    async def list_tools(self) -> list:
+        tools = await super().list_tools()
+        self.tool_index.sync(tools)
+        return tools
+
+    async def lookup_tool(self, name: str) -> Optional[IndexedTool]:
+        """Resolve ``name`` from the index, fetching the tool list only if cold."""
+        if not self.tool_index.populated:
+            await self.list_tools()
+        return self.tool_index.get(name)
+
+    async def __aexit__(self, *args: Any) -> Optional[bool]:
+        result = await super().__aexit__(*args)
+        if not self.is_running:
+            self.tool_index.invalidate()
+        return result
@@ -46,7 +46,9 @@ from .bus import (
     emit_shell_line,
     get_message_bus,
     get_session_context,
+    log_dropped_messages,
     reset_message_bus,
+    set_headless_sink,
     set_session_context,
 )
 from .bus import emit as bus_emit  # Convenience functions (new API versions)
@@ -274,6 +276,8 @@ __all__ = [
     "MessageBus",
     "get_message_bus",
     "reset_message_bus",
+    "set_headless_sink",
+    "log_dropped_messages",
     # Session context
     "set_session_context",
     "get_session_context",
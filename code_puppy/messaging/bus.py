@@ -33,9 +33,11 @@ It also handles request/response correlation for user interactions:
 """
 
 import asyncio
+import logging
 import queue
 import threading
-from typing import Any, Dict, List, Optional, Tuple
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 from uuid import uuid4
 
 from .commands import (
@@ -57,6 +59,8 @@ from .messages import (
     UserInputRequest,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class MessageBus:
     """Central coordinator for bidirectional Agent <-> UI communication.
@@ -82,9 +86,16 @@ class MessageBus:
         # Event loop reference for async request/response (optional)
         self._event_loop: Optional[asyncio.AbstractEventLoop] = None
 
-        # Startup buffering
-        self._startup_buffer: List[AnyMessage] = []
+        # Startup buffering: a ring of the newest ``maxsize`` messages, so a
+        # headless run that never attaches a renderer does O(1) work per emit.
+        self._startup_buffer: Deque[AnyMessage] = deque(
+            maxlen=maxsize if maxsize > 0 else None
+        )
         self._has_active_renderer = False
+        self._headless_sink: Optional[Callable[[AnyMessage], None]] = None
+        self._buffer_dropped = 0
+        self._buffer_dropped_reported = 0
+        self._outgoing_dropped = 0
 
         # Request/Response correlation: prompt_id → Future (for async usage)
         self._pending_requests: Dict[str, asyncio.Future[Any]] = {}
@@ -100,7 +111,8 @@ class MessageBus:
         """Emit a message to the UI.
 
         Thread-safe. Can be called from sync or async context.
-        If no renderer is active, messages are buffered for later.
+        If no renderer is active, messages go to the headless sink when one
+        is set, and are otherwise buffered for later (oldest dropped first).
         Auto-tags message with current session_id if not already set.
 
         Args:
@@ -112,22 +124,32 @@ class MessageBus:
                 message.session_id = self._current_session_id
 
             if not self._has_active_renderer:
-                self._startup_buffer.append(message)
-                # Prevent unbounded buffer growth in headless mode
-                if len(self._startup_buffer) > self._maxsize:
-                    self._startup_buffer = self._startup_buffer[-self._maxsize :]
-                return
-
-            # Direct put into thread-safe queue - inside lock to prevent race
-            try:
-                self._outgoing.put_nowait(message)
-            except queue.Full:
-                # Drop oldest and retry
+                sink = self._headless_sink
+                if sink is None:
+                    buffer = self._startup_buffer
+                    if len(buffer) == buffer.maxlen:
+                        self._buffer_dropped += 1
+                    buffer.append(message)
+                    return
+            else:
+                # Direct put into thread-safe queue - inside lock to prevent race
                 try:
-                    self._outgoing.get_nowait()
                     self._outgoing.put_nowait(message)
-                except queue.Empty:
-                    pass
+                except queue.Full:
+                    # Drop oldest and retry
+                    try:
+                        self._outgoing.get_nowait()
+                        self._outgoing_dropped += 1
+                        self._outgoing.put_nowait(message)
+                    except queue.Empty:
+                        pass
+                return
+
+        # Outside the lock: a slow sink must not serialize every emitter.
+        try:
+            sink(message)
+        except Exception as exc:
+            logger.debug("Headless sink failed: %r", exc)
 
     def emit_text(
         self,
@@ -479,10 +501,18 @@ class MessageBus:
         """Mark that a renderer is now active and consuming messages.
 
         Call this when a renderer attaches. Messages will no longer be
-        buffered and will go directly to the outgoing queue.
+        buffered and will go directly to the outgoing queue. Startup
+        messages the full buffer dropped since the last attach are logged.
         """
         with self._lock:
             self._has_active_renderer = True
+            dropped = self._buffer_dropped - self._buffer_dropped_reported
+            self._buffer_dropped_reported = self._buffer_dropped
+        if dropped:
+            logger.warning(
+                "Message bus dropped %d startup message(s) before a renderer attached",
+                dropped,
+            )
 
     def mark_renderer_inactive(self) -> None:
         """Mark that no renderer is currently active.
@@ -498,6 +528,25 @@ class MessageBus:
         with self._lock:
             return self._has_active_renderer
 
+    def set_headless_sink(
+        self, sink: Optional[Callable[[AnyMessage], None]]
+    ) -> Optional[Callable[[AnyMessage], None]]:
+        """Deliver messages to ``sink`` instead of buffering them.
+
+        For runs that will never attach a renderer (ACP hosts, scripts,
+        tests): while no renderer is active each message is handed straight
+        to ``sink`` (called outside the bus lock; exceptions are logged and
+        swallowed). Messages already buffered stay buffered. Pass None to go
+        back to buffering.
+
+        Returns:
+            The previously installed sink, so callers can restore it.
+        """
+        with self._lock:
+            previous = self._headless_sink
+            self._headless_sink = sink
+            return previous
+
     # =========================================================================
     # Queue Status
     # =========================================================================
@@ -512,6 +561,18 @@ class MessageBus:
         """Number of commands waiting in the incoming queue."""
         return self._incoming.qsize()
 
+    @property
+    def buffer_dropped_count(self) -> int:
+        """Messages pushed out of the full startup buffer, oldest first."""
+        with self._lock:
+            return self._buffer_dropped
+
+    @property
+    def outgoing_dropped_count(self) -> int:
+        """Messages dropped from the full outgoing queue to make room."""
+        with self._lock:
+            return self._outgoing_dropped
+
     @property
     def pending_requests_count(self) -> int:
         """Number of requests waiting for responses."""
@@ -543,6 +604,43 @@ def get_message_bus() -> MessageBus:
         return _global_bus
 
 
+def set_headless_sink(sink: Optional[Callable[[Any], None]]) -> None:
+    """Route messages to ``sink`` on both the bus and the legacy queue.
+
+    The opt-in for hosts that take over the process without starting the
+    console renderers (e.g. an ACP host run from a ``handle_cli_args``
+    plugin): while no renderer is attached, every message is handed to
+    ``sink`` instead of piling up in the bounded startup buffers. ``-p``
+    runs attach renderers and need no sink. Pass None to go back to
+    buffering.
+    """
+    from code_puppy.messaging.message_queue import get_global_queue
+
+    get_message_bus().set_headless_sink(sink)
+    get_global_queue().set_headless_sink(sink)
+
+
+def log_dropped_messages() -> None:
+    """Log how many messages the bus and legacy queue dropped, if any.
+
+    Called at shutdown so an overrun renderer (or a headless run without a
+    sink) leaves a trace instead of losing output silently.
+    """
+    from code_puppy.messaging.message_queue import get_global_queue
+
+    bus = get_message_bus()
+    queue_ = get_global_queue()
+    counts = {
+        "bus startup buffer": bus.buffer_dropped_count,
+        "bus outgoing queue": bus.outgoing_dropped_count,
+        "legacy startup buffer": queue_.buffer_dropped_count,
+        "legacy queue": queue_.queue_dropped_count,
+    }
+    dropped = ", ".join(f"{name}: {n}" for name, n in counts.items() if n)
+    if dropped:
+        logger.warning("Dropped messages (%s)", dropped)
+
+
 def reset_message_bus() -> None:
     """Reset the global MessageBus (for testing).
 
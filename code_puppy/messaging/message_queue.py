@@ -8,10 +8,11 @@ import asyncio
 import logging
 import queue
 import threading
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, Optional, Union
+from typing import Any, Callable, Deque, Dict, Optional, Union
 
 from rich.text import Text
 
@@ -76,8 +77,16 @@ class MessageQueue:
         self._listeners = []
         self._running = False
         self._thread = None
-        self._startup_buffer = []  # Buffer messages before any renderer starts
+        # Buffer messages before any renderer starts; the newest ``maxsize``
+        # are kept, so a run that never starts one stays bounded.
+        self._startup_buffer: Deque[UIMessage] = deque(
+            maxlen=maxsize if maxsize > 0 else None
+        )
         self._has_active_renderer = False
+        self._headless_sink: Optional[Callable[[UIMessage], None]] = None
+        self.buffer_dropped_count = 0
+        self._buffer_dropped_reported = 0
+        self.queue_dropped_count = 0
         self._event_loop = None  # Store reference to the event loop
         self._prompt_responses = {}  # Store responses to human input requests
         self._prompt_events = {}  # threading.Event per prompt_id
@@ -120,7 +129,17 @@ class MessageQueue:
         """Emit a message to the queue."""
         # If no renderer is active yet, buffer the message for startup
         if not self._has_active_renderer:
-            self._startup_buffer.append(message)
+            sink = self._headless_sink
+            if sink is not None:
+                try:
+                    sink(message)
+                except Exception as e:
+                    logger.debug("Headless sink error in message queue: %s", e)
+                return
+            buffer = self._startup_buffer
+            if len(buffer) == buffer.maxlen:
+                self.buffer_dropped_count += 1
+            buffer.append(message)
             return
 
         try:
@@ -129,6 +148,7 @@ class MessageQueue:
             # Drop oldest message to make room
             try:
                 self._queue.get_nowait()
+                self.queue_dropped_count += 1
                 self._queue.put_nowait(message)
             except queue.Empty:
                 pass
@@ -228,11 +248,27 @@ class MessageQueue:
     def mark_renderer_active(self):
         """Mark that a renderer is now active and consuming messages."""
         self._has_active_renderer = True
+        dropped = self.buffer_dropped_count - self._buffer_dropped_reported
+        self._buffer_dropped_reported = self.buffer_dropped_count
+        if dropped:
+            logger.warning(
+                "Message queue dropped %d startup message(s) before a renderer started",
+                dropped,
+            )
 
     def mark_renderer_inactive(self):
         """Mark that no renderer is currently active."""
         self._has_active_renderer = False
 
+    def set_headless_sink(self, sink: Optional[Callable[[UIMessage], None]]):
+        """Hand messages to ``sink`` instead of buffering them.
+
+        Applies while no renderer is active; already-buffered messages stay
+        put. Pass None to resume buffering. Returns the previous sink.
+        """
+        previous, self._headless_sink = self._headless_sink, sink
+        return previous
+
     def create_prompt_request(self, prompt_text: str) -> str:
         """Create a human input request and return its unique ID."""
         self._prompt_id_counter += 1
@@ -540,9 +540,63 @@ def get_custom_config(model_config):
     return url, headers, verify, api_key, timeout
 
 
+_BUNDLED_MODELS_FILE = pathlib.Path(__file__).parent / "models.json"
+
+# Callback phases whose registrations change what ``load_config`` returns.
+_MODEL_CONFIG_HOOK_PHASES = (
+    "load_model_config",
+    "load_models_config",
+    "load_claude_oauth_models",
+)
+
+
+def _extra_model_sources() -> list[tuple[pathlib.Path, str, bool]]:
+    """``(path, label, use_filtered)`` for each JSON overlay ``load_config`` reads."""
+    # Import OAuth model file paths from main config
+    from code_puppy.config import (
+        CHATGPT_MODELS_FILE,
+        CLAUDE_MODELS_FILE,
+        COPILOT_MODELS_FILE,
+        GEMINI_MODELS_FILE,
+    )
+
+    return [
+        (pathlib.Path(EXTRA_MODELS_FILE), "extra models", False),
+        (pathlib.Path(CHATGPT_MODELS_FILE), "ChatGPT OAuth models", False),
+        (pathlib.Path(CLAUDE_MODELS_FILE), "Claude Code OAuth models", True),
+        (pathlib.Path(GEMINI_MODELS_FILE), "Gemini OAuth models", False),
+        (pathlib.Path(COPILOT_MODELS_FILE), "Copilot models", False),
+    ]
+
+
 class ModelFactory:
     """A factory for creating and managing different AI models."""
 
+    @staticmethod
+    def config_fingerprint() -> tuple:
+        """Cheap signature of every input :meth:`load_config` merges.
+
+        ``(mtime_ns, size, inode)`` of the bundled ``models.json`` and each
+        overlay file (missing files included, so creating one changes the
+        fingerprint), plus the callbacks registered for the model-config
+        hooks. Equal fingerprints mean a reload would read the same files
+        through the same plugins, so callers can reuse anything they derived
+        from the last load. Costs a handful of ``stat`` calls, no JSON parsing.
+        """
+        files = []
+        paths = [_BUNDLED_MODELS_FILE] + [p for p, _, _ in _extra_model_sources()]
+        for path in paths:
+            try:
+                st = path.stat()
+            except OSError:
+                files.append((str(path), None))
+                continue
+            files.append((str(path), st.st_mtime_ns, st.st_size, st.st_ino))
+        hooks = tuple(
+            tuple(callbacks.get_callbacks(phase)) for phase in _MODEL_CONFIG_HOOK_PHASES
+        )
+        return tuple(files), hooks
+
     @staticmethod
     def load_config() -> Dict[str, Any]:
         load_model_config_callbacks = callbacks.get_callbacks("load_model_config")
@@ -555,28 +609,10 @@ class ModelFactory:
         else:
             # Load bundled models.json so upstream updates propagate; user
             # additions live in extra_models.json (overlay below).
-            bundled_models = pathlib.Path(__file__).parent / "models.json"
-            with open(bundled_models, "r") as f:
+            with open(_BUNDLED_MODELS_FILE, "r") as f:
                 config = json.load(f)
 
-        # Import OAuth model file paths from main config
-        from code_puppy.config import (
-            CHATGPT_MODELS_FILE,
-            CLAUDE_MODELS_FILE,
-            COPILOT_MODELS_FILE,
-            GEMINI_MODELS_FILE,
-        )
-
-        # Build list of extra model sources
-        extra_sources: list[tuple[pathlib.Path, str, bool]] = [
-            (pathlib.Path(EXTRA_MODELS_FILE), "extra models", False),
-            (pathlib.Path(CHATGPT_MODELS_FILE), "ChatGPT OAuth models", False),
-            (pathlib.Path(CLAUDE_MODELS_FILE), "Claude Code OAuth models", True),
-            (pathlib.Path(GEMINI_MODELS_FILE), "Gemini OAuth models", False),
-            (pathlib.Path(COPILOT_MODELS_FILE), "Copilot models", False),
-        ]
-
-        for source_path, label, use_filtered in extra_sources:
+        for source_path, label, use_filtered in _extra_model_sources():
             if not source_path.exists():
                 continue
             try:
@@ -626,8 +662,7 @@ class ModelFactory:
         try:
             from code_puppy.model_descriptions import apply_description_overlays
 
-            bundled_models = pathlib.Path(__file__).parent / "models.json"
-            with open(bundled_models, "r") as f:
+            with open(_BUNDLED_MODELS_FILE, "r") as f:
                 bundled_config = json.load(f)
 
             bundled_descriptions = {
@@ -1032,6 +1067,8 @@ class ModelFactory:
 
             # Get the rotate_every parameter (default: 1)
             rotate_every = model_config.get("rotate_every", 1)
+            # "adaptive" weights by candidate health; "round_robin" rotates blindly
+            routing = model_config.get("routing", "adaptive")
 
             # Resolve each model name to an actual model instance
             models = []
@@ -1041,7 +1078,7 @@ class ModelFactory:
                 models.append(model)
 
             # Create and return the round-robin model
-            return RoundRobinModel(*models, rotate_every=rotate_every)
+            return RoundRobinModel(*models, rotate_every=rotate_every, routing=routing)
 
         else:
             # Check for plugin-registered model type handlers
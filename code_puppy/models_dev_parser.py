@@ -10,19 +10,31 @@ JSON file if the API is unavailable.
 
 The parser supports filtering by cost, context length, capabilities, and provides
 comprehensive type safety throughout the implementation.
+
+Parsed registries are cached under ``CACHE_DIR/models_dev``, one file per
+source: a file source is reused while its content digest matches, and the live
+API is revalidated with its ETag (a 304 skips the download and the parse).
+Searches run against an index built on first use: models pre-sorted by name,
+trigram postings over names and IDs, and per-capability and per-provider sets.
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
-from dataclasses import dataclass, field
+import logging
+import marshal
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Collection, Dict, Iterable, List, Optional, Set
 
 import httpx
 
+from code_puppy.atomic_io import atomic_write_bytes
 from code_puppy.messaging import emit_error, emit_info, emit_warning
 
+logger = logging.getLogger(__name__)
+
 # Live API endpoint for models.dev
 MODELS_DEV_API_URL = "https://models.dev/api.json"
 
@@ -112,6 +124,154 @@ class ModelInfo:
         return getattr(self, capability, False) is True
 
 
+# Bump when the meaning of a cached row changes without its fields changing.
+_CACHE_VERSION = 1
+_CACHE_SCHEMA = (
+    _CACHE_VERSION,
+    tuple(f.name for f in fields(ProviderInfo)),
+    tuple(f.name for f in fields(ModelInfo)),
+)
+_LIVE_CACHE_SLOT = "live"
+_BUNDLED_CACHE_SLOT = "bundled"
+
+# Returned by _fetch_from_api when the server says our cached copy is current.
+_NOT_MODIFIED: Any = object()
+
+# Query length that can use the trigram postings; shorter queries scan.
+_GRAM = 3
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def _cache_path(slot: str) -> Path:
+    from code_puppy.config import CACHE_DIR
+
+    return Path(CACHE_DIR) / "models_dev" / f"{slot}.bin"
+
+
+def _read_cache(slot: str, key: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """The cached parse in ``slot`` if it is readable, current and for ``key``."""
+    try:
+        payload = marshal.loads(_cache_path(slot).read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(payload, dict) or payload.get("schema") != _CACHE_SCHEMA:
+        return None
+    if key is not None and payload.get("key") != key:
+        return None
+    return payload
+
+
+def _write_cache(
+    slot: str,
+    key: str,
+    providers: Iterable[ProviderInfo],
+    models: Iterable[ModelInfo],
+    index: _SearchIndex,
+) -> None:
+    payload = {
+        "schema": _CACHE_SCHEMA,
+        "key": key,
+        "providers": [
+            tuple(getattr(p, name) for name in _CACHE_SCHEMA[1]) for p in providers
+        ],
+        "models": [
+            tuple(getattr(m, name) for name in _CACHE_SCHEMA[2]) for m in models
+        ],
+        "index": index.export(),
+    }
+    try:
+        atomic_write_bytes(str(_cache_path(slot)), marshal.dumps(payload))
+    except (OSError, ValueError) as e:
+        logger.debug("Could not cache models.dev registry %s: %s", slot, e)
+
+
+def _grams(text: str) -> Set[str]:
+    return {text[i : i + _GRAM] for i in range(len(text) - _GRAM + 1)}
+
+
+class _SearchIndex:
+    """Lookup structures over one snapshot of ``ModelsDevRegistry.models``.
+
+    Models are identified by their rank in name order, so any subset comes
+    back correctly sorted by sorting its ranks.
+    """
+
+    def __init__(
+        self, models: Dict[str, ModelInfo], exported: Optional[bytes] = None
+    ) -> None:
+        self.source = models
+        self.size = len(models)
+        self.ordered = sorted(models.values(), key=lambda m: m.name.lower())
+        self.names = [m.name.lower() for m in self.ordered]
+        self.ids = [m.model_id.lower() for m in self.ordered]
+        self.by_provider: Dict[str, List[int]] = {}
+        for rank, model in enumerate(self.ordered):
+            self.by_provider.setdefault(model.provider_id, []).append(rank)
+        self._postings: Optional[Dict[str, Collection[int]]] = None
+        self._exported = exported
+        self._capabilities: Dict[str, Set[int]] = {}
+
+    def is_current(self, models: Dict[str, ModelInfo]) -> bool:
+        return models is self.source and len(models) == self.size
+
+    def _gram_postings(self) -> Dict[str, Collection[int]]:
+        if self._postings is None:
+            self._postings = self._imported_postings() or self._build_postings()
+        return self._postings
+
+    def _build_postings(self) -> Dict[str, Collection[int]]:
+        postings: Dict[str, List[int]] = {}
+        for rank, (name, model_id) in enumerate(zip(self.names, self.ids)):
+            for gram in _grams(name) | _grams(model_id):
+                postings.setdefault(gram, []).append(rank)
+        return postings
+
+    def _imported_postings(self) -> Optional[Dict[str, Collection[int]]]:
+        """Postings saved with the cached registry, if they fit these models."""
+        exported, self._exported = self._exported, None
+        if exported is None:
+            return None
+        try:
+            names, ids, postings = marshal.loads(exported)
+        except (EOFError, ValueError, TypeError):
+            return None
+        if names != self.names or ids != self.ids:
+            return None
+        return postings
+
+    def export(self) -> bytes:
+        """Postings for the disk cache, decoded again only on first search."""
+        postings = {gram: tuple(ranks) for gram, ranks in self._gram_postings().items()}
+        return marshal.dumps((self.names, self.ids, postings))
+
+    def matching(self, query: str) -> Iterable[int]:
+        """Ranks whose name or model ID contains ``query`` (already lowercased)."""
+        if len(query) < _GRAM:
+            candidates: Iterable[int] = range(self.size)
+        else:
+            postings = self._gram_postings()
+            lists = sorted((postings.get(gram, ()) for gram in _grams(query)), key=len)
+            # Every trigram of the query must occur; the substring check
+            # below then rules out trigrams that occur out of order.
+            candidates = set(lists[0]).intersection(*lists[1:])
+        return [r for r in candidates if query in self.names[r] or query in self.ids[r]]
+
+    def having(self, capability: str) -> Set[int]:
+        """Ranks of models for which ``supports_capability`` is true."""
+        ranks = self._capabilities.get(capability)
+        if ranks is None:
+            ranks = {
+                rank
+                for rank, model in enumerate(self.ordered)
+                if model.supports_capability(capability)
+            }
+            self._capabilities[capability] = ranks
+        return ranks
+
+
 class ModelsDevRegistry:
     """Registry for managing models and providers from models.dev API.
 
@@ -139,20 +299,34 @@ class ModelsDevRegistry:
             str, List[str]
         ] = {}  # Maps provider_id to list of model IDs
         self.data_source: str = "unknown"  # Track where data came from
+        self.from_cache: bool = False  # True if the parse was reused from disk
+        self._api_etag: Optional[str] = None
+        self._index: Optional[_SearchIndex] = None
+        self._exported_index: Optional[bytes] = None
         self._load_data()
 
-    def _fetch_from_api(self) -> Optional[Dict[str, Any]]:
+    def _fetch_from_api(self, etag: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Fetch data from the live models.dev API.
 
+        Args:
+            etag: ETag of our cached copy; if the server still has it, the
+                body is skipped.
+
         Returns:
-            Parsed JSON data if successful, None otherwise.
+            Parsed JSON data if successful, ``_NOT_MODIFIED`` if ``etag`` is
+            still current, None otherwise.
         """
+        headers = {"If-None-Match": etag} if etag else None
         try:
             with httpx.Client(timeout=10.0) as client:
-                response = client.get(MODELS_DEV_API_URL)
+                response = client.get(MODELS_DEV_API_URL, headers=headers)
+                if etag and response.status_code == 304:
+                    return _NOT_MODIFIED
                 response.raise_for_status()
                 data = response.json()
                 if isinstance(data, dict) and len(data) > 0:
+                    new_etag = response.headers.get("etag")
+                    self._api_etag = new_etag if isinstance(new_etag, str) else None
                     return data
                 return None
         except httpx.TimeoutException:
@@ -173,46 +347,98 @@ class ModelsDevRegistry:
         """Get the path to the bundled JSON file."""
         return Path(__file__).parent / BUNDLED_JSON_FILENAME
 
+    def _read_source(self, path: Path) -> tuple[str, str]:
+        """Read a JSON source file; returns its text and content digest."""
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        return text, _digest(text)
+
+    def _parse_json(self, text: str, label: str) -> Any:
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            emit_error(f"Invalid JSON in {label}: {e}")
+            raise
+
     def _load_data(self) -> None:
         """Load data from API or fallback sources, populating internal data structures."""
         data: Optional[Dict[str, Any]] = None
+        cached: Optional[Dict[str, Any]] = None
+        cache_slot: Optional[str] = None
+        cache_key: Optional[str] = None
 
         # If explicit json_path provided, use that directly (for testing)
         if self.json_path:
             if not self.json_path.exists():
                 raise FileNotFoundError(f"Models API file not found: {self.json_path}")
-            try:
-                with open(self.json_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                self.data_source = f"file:{self.json_path}"
-            except json.JSONDecodeError as e:
-                emit_error(f"Invalid JSON in {self.json_path}: {e}")
-                raise
+            text, cache_key = self._read_source(self.json_path)
+            cache_slot = "file-" + _digest(str(self.json_path.absolute()))[:16]
+            cached = _read_cache(cache_slot, cache_key)
+            if cached is None:
+                data = self._parse_json(text, str(self.json_path))
+            self.data_source = f"file:{self.json_path}"
         else:
-            # Try live API first
-            data = self._fetch_from_api()
-            if data:
+            # Try live API first, revalidating our cached copy if we have one
+            live = _read_cache(_LIVE_CACHE_SLOT)
+            fetched = self._fetch_from_api(etag=live["key"] if live else None)
+            if fetched is _NOT_MODIFIED:
+                cached = live
+            elif fetched:
+                data = fetched
+                if self._api_etag:
+                    cache_slot, cache_key = _LIVE_CACHE_SLOT, self._api_etag
+            if cached is not None or data:
                 self.data_source = "live:models.dev"
                 emit_info("📡 Fetched latest models from models.dev")
             else:
                 # Fall back to bundled JSON
                 bundled_path = self._get_bundled_json_path()
                 if bundled_path.exists():
-                    try:
-                        with open(bundled_path, "r", encoding="utf-8") as f:
-                            data = json.load(f)
-                        self.data_source = f"bundled:{bundled_path.name}"
-                        emit_info(
-                            "📦 Using bundled models database (models.dev unavailable)"
-                        )
-                    except json.JSONDecodeError as e:
-                        emit_error(f"Invalid JSON in bundled file {bundled_path}: {e}")
-                        raise
+                    text, cache_key = self._read_source(bundled_path)
+                    cache_slot = _BUNDLED_CACHE_SLOT
+                    cached = _read_cache(cache_slot, cache_key)
+                    if cached is None:
+                        data = self._parse_json(text, f"bundled file {bundled_path}")
+                    self.data_source = f"bundled:{bundled_path.name}"
+                    emit_info(
+                        "📦 Using bundled models database (models.dev unavailable)"
+                    )
                 else:
                     raise FileNotFoundError(
                         f"No data source available: models.dev API failed and bundled file not found at {bundled_path}"
                     )
 
+        if cached is not None:
+            self._restore(cached)
+        else:
+            self._parse_data(data)
+            if cache_slot and cache_key:
+                _write_cache(
+                    cache_slot,
+                    cache_key,
+                    self.providers.values(),
+                    self.models.values(),
+                    self._search_index(),
+                )
+
+        emit_info(
+            f"Loaded {len(self.providers)} providers and {len(self.models)} models"
+        )
+
+    def _restore(self, payload: Dict[str, Any]) -> None:
+        """Populate from a cached parse (see ``_write_cache``)."""
+        for row in payload["providers"]:
+            provider = ProviderInfo(*row)
+            self.providers[provider.id] = provider
+            self.provider_models[provider.id] = []
+        for row in payload["models"]:
+            model = ModelInfo(*row)
+            self.models[model.full_id] = model
+            self.provider_models[model.provider_id].append(model.model_id)
+        self._exported_index = payload.get("index")
+        self.from_cache = True
+
+    def _parse_data(self, data: Any) -> None:
         if not isinstance(data, dict):
             raise ValueError("Top-level JSON must be an object")
 
@@ -242,10 +468,6 @@ class ModelsDevRegistry:
                 emit_warning(f"Skipping malformed provider {provider_id}: {e}")
                 continue
 
-        emit_info(
-            f"Loaded {len(self.providers)} providers and {len(self.models)} models"
-        )
-
     def _parse_provider(self, provider_id: str, data: Dict[str, Any]) -> ProviderInfo:
         """Parse provider data from JSON."""
         # Only name and env are truly required - api is optional for SDK-based providers
@@ -310,6 +532,13 @@ class ModelsDevRegistry:
             open_weights=data.get("open_weights", False),
         )
 
+    def _search_index(self) -> _SearchIndex:
+        """The lookup index, rebuilt if ``self.models`` was replaced or resized."""
+        if self._index is None or not self._index.is_current(self.models):
+            self._index = _SearchIndex(self.models, self._exported_index)
+            self._exported_index = None
+        return self._index
+
     def get_providers(self) -> List[ProviderInfo]:
         """
         Get all providers, sorted by name.
@@ -341,17 +570,12 @@ class ModelsDevRegistry:
         Returns:
             List of ModelInfo objects sorted by name
         """
+        index = self._search_index()
         if provider_id:
-            model_ids = self.provider_models.get(provider_id, [])
-            models = [
-                self.models[f"{provider_id}::{model_id}"]
-                for model_id in model_ids
-                if f"{provider_id}::{model_id}" in self.models
+            return [
+                index.ordered[rank] for rank in index.by_provider.get(provider_id, [])
             ]
-        else:
-            models = list(self.models.values())
-
-        return sorted(models, key=lambda m: m.name.lower())
+        return list(index.ordered)
 
     def get_model(self, provider_id: str, model_id: str) -> Optional[ModelInfo]:
         """
@@ -382,33 +606,28 @@ class ModelsDevRegistry:
         Returns:
             List of matching ModelInfo objects
         """
-        models = list(self.models.values())
+        index = self._search_index()
+        ranks: Iterable[int] = range(index.size)
 
         # Filter by query
         if query:
-            query_lower = query.lower()
-            models = [
-                m
-                for m in models
-                if query_lower in m.name.lower() or query_lower in m.model_id.lower()
-            ]
+            ranks = index.matching(query.lower())
 
         # Filter by capabilities
         if capability_filters:
             for capability, required in capability_filters.items():
                 if isinstance(required, bool):
-                    models = [
-                        m
-                        for m in models
-                        if m.supports_capability(capability) == required
-                    ]
+                    having = index.having(capability)
+                    ranks = [r for r in ranks if (r in having) == required]
                 else:
                     # Handle other capability filter types if needed
-                    models = [
-                        m for m in models if getattr(m, capability, None) == required
+                    ranks = [
+                        r
+                        for r in ranks
+                        if getattr(index.ordered[r], capability, None) == required
                     ]
 
-        return sorted(models, key=lambda m: m.name.lower())
+        return [index.ordered[r] for r in sorted(ranks)]
 
     def filter_by_cost(
         self,
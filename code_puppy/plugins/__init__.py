@@ -1,14 +1,17 @@
+import hashlib
 import importlib
 import importlib.abc
 import importlib.machinery
 import importlib.util
 import logging
+import marshal
 import os
 import sys
 from importlib.metadata import entry_points
 import types
 from pathlib import Path
 
+from code_puppy.atomic_io import atomic_write_bytes
 from code_puppy.callbacks import clear_loading_context, set_loading_context
 from code_puppy.plugins import trust as _trust
 
@@ -28,18 +31,88 @@ USER_PLUGINS_DIR = Path.home() / ".code_puppy" / "plugins"
 _PROJECT_PLUGIN_PYCACHE = str(Path.home() / ".code_puppy" / "plugin_bytecode_cache")
 
 
+# Compiled code for *trusted* project plugin modules. Entries are keyed by the
+# interpreter's bytecode magic, the plugin's verified trust hash, and the
+# module's resolved path, and each one carries the SHA-256 of the exact source
+# it was compiled from; see _ProjectPluginLoader.get_code.
+_PROJECT_PLUGIN_CODE_CACHE = str(Path(_PROJECT_PLUGIN_PYCACHE) / "verified")
+
+_SOURCE_DIGEST_SIZE = hashlib.sha256().digest_size
+
+
+def _verified_code_cache_path(source_path: str) -> Path | None:
+    """Cache entry for *source_path*, or None if no trusted plugin owns it."""
+    resolved = Path(source_path).resolve()
+    for parent in resolved.parents:
+        plugin_hash = _trust.get_verified_hash(parent)
+        if plugin_hash:
+            name = hashlib.sha256(str(resolved).encode()).hexdigest()[:32]
+            return (
+                Path(_PROJECT_PLUGIN_CODE_CACHE)
+                / importlib.util.MAGIC_NUMBER.hex()
+                / plugin_hash
+                / f"{name}.code"
+            )
+    return None
+
+
+def _read_cached_code(cache_path: Path, source_digest: bytes):
+    try:
+        data = cache_path.read_bytes()
+    except OSError:
+        return None
+    if data[:_SOURCE_DIGEST_SIZE] != source_digest:
+        return None
+    try:
+        code = marshal.loads(data[_SOURCE_DIGEST_SIZE:])
+    except (EOFError, ValueError, TypeError):
+        return None
+    return code if isinstance(code, types.CodeType) else None
+
+
+def _write_cached_code(cache_path: Path, source_digest: bytes, code) -> None:
+    try:
+        atomic_write_bytes(str(cache_path), source_digest + marshal.dumps(code))
+    except (OSError, ValueError) as exc:
+        logger.debug("Could not cache compiled plugin code %s: %s", cache_path, exc)
+
+
 class _ProjectPluginLoader(importlib.machinery.SourceFileLoader):
     """Load project plugin source directly; never read or write ``.pyc`` caches.
 
     Compiling from source keeps a plugin executing exactly the file that was
-    trusted, and writes no cache back. Within the ``project_plugins`` namespace
-    this loader is the only one the finder hands out; a plugin directory that
-    ships any bytecode is refused before it reaches here (see
-    ``_load_one_project_plugin``).
+    trusted, and nothing is ever written next to it. Within the
+    ``project_plugins`` namespace this loader is the only one the finder hands
+    out; a plugin directory that ships any bytecode is refused before it
+    reaches here (see ``_load_one_project_plugin``).
+
+    For a plugin that passed the trust check this process, compiled code is
+    kept under ``_PROJECT_PLUGIN_CODE_CACHE`` (outside the project tree) and
+    reused only while the SHA-256 of the source read now matches the digest
+    stored with the entry. Anything else — a miss, a digest mismatch, a
+    truncated or corrupt entry — compiles from source, so the cache can make a
+    load faster but never change what runs.
     """
 
     def get_code(self, fullname):  # noqa: D102
-        return compile(self.get_source(fullname), self.path, "exec", dont_inherit=True)
+        source_bytes = self.get_data(self.path)
+        cache_path = _verified_code_cache_path(self.path)
+        if cache_path is None:
+            return self._compile(source_bytes)
+        source_digest = hashlib.sha256(source_bytes).digest()
+        code = _read_cached_code(cache_path, source_digest)
+        if code is None:
+            code = self._compile(source_bytes)
+            _write_cached_code(cache_path, source_digest, code)
+        return code
+
+    def _compile(self, source_bytes: bytes):
+        return compile(
+            importlib.util.decode_source(source_bytes),
+            self.path,
+            "exec",
+            dont_inherit=True,
+        )
 
 
 class _ProjectPluginFinder(importlib.abc.MetaPathFinder):
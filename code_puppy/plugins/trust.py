@@ -37,6 +37,11 @@ TRUSTED = "trusted"  # entry exists and hash matches current contents
 CHANGED = "changed"  # entry exists but contents differ since acceptance
 UNTRUSTED = "untrusted"  # no entry — user never accepted this plugin
 
+# Resolved plugin dir -> the content hash it had when get_trust_status last
+# found it TRUSTED. The plugin loader keys its compiled-code cache on this, so
+# cached code is only ever reused for content the user accepted.
+_verified_hashes: dict[str, str] = {}
+
 
 def _project_key(project_root: Path) -> str:
     """Canonical store key for a project root (resolved absolute path)."""
@@ -105,16 +110,27 @@ def compute_plugin_hash(plugin_dir: Path) -> str | None:
 
 def get_trust_status(project_root: Path, plugin_name: str, plugin_dir: Path) -> str:
     """Return TRUSTED, CHANGED, or UNTRUSTED for a project plugin."""
+    dir_key = str(Path(plugin_dir).resolve())
+    _verified_hashes.pop(dir_key, None)
     store = _load_store()
     entry = store["projects"].get(_project_key(project_root), {}).get(plugin_name)
     if not isinstance(entry, dict) or not entry.get("hash"):
         return UNTRUSTED
     current = compute_plugin_hash(plugin_dir)
     if current is not None and current == entry["hash"]:
+        _verified_hashes[dir_key] = current
         return TRUSTED
     return CHANGED
 
 
+def get_verified_hash(plugin_dir: Path) -> str | None:
+    """Content hash *plugin_dir* had when it last passed the trust check.
+
+    None if it never did in this process, or failed the most recent check.
+    """
+    return _verified_hashes.get(str(Path(plugin_dir).resolve()))
+
+
 def is_plugin_trusted(project_root: Path, plugin_name: str, plugin_dir: Path) -> bool:
     """True only when a stored hash exists AND matches current contents."""
     return get_trust_status(project_root, plugin_name, plugin_dir) == TRUSTED
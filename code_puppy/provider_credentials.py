@@ -13,7 +13,7 @@ Used by:
 from __future__ import annotations
 
 import os
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 
 def _add_env_var_tokens(value: object, names: List[str]) -> None:
@@ -266,6 +266,30 @@ _WELL_KNOWN_CREDENTIAL_ENV_VARS = frozenset(
 )
 
 
+def _catalog_fingerprint() -> Optional[tuple]:
+    """``ModelFactory.config_fingerprint()``, or ``None`` if it can't be taken."""
+    try:
+        from code_puppy.model_factory import ModelFactory
+
+        return ModelFactory.config_fingerprint()
+    except Exception:
+        return None
+
+
+# (catalog fingerprint, names) from the last credential_env_var_names() miss.
+_credential_names_cache: Optional[Tuple[tuple, frozenset]] = None
+# (credential names, raw os.environ snapshot, scrubbed env) from the last
+# environment_without_credentials() miss.
+_scrubbed_env_cache: Optional[Tuple[frozenset, dict, Dict[str, str]]] = None
+
+
+def clear_credential_caches() -> None:
+    """Forget the cached credential names and scrubbed environment."""
+    global _credential_names_cache, _scrubbed_env_cache
+    _credential_names_cache = None
+    _scrubbed_env_cache = None
+
+
 def credential_env_var_names() -> frozenset:
     """Every env var name that carries an agent provider credential.
 
@@ -274,14 +298,25 @@ def credential_env_var_names() -> frozenset:
     ``Authorization``/``X-Api-Key`` bearer authenticates provider calls just as
     an api_key does), so the scrub below cannot miss a custom provider.
     Non-secret header vars (e.g. ``$SITE_URL``) are left out -- they belong to
-    the user's shell. Recomputed on every call so any catalog change --
-    including a hand-edit to ``extra_models.json`` -- takes effect immediately.
+    the user's shell.
+
+    The result is cached against ``ModelFactory.config_fingerprint()`` (stat
+    of every catalog file plus the registered model-config plugin hooks), so
+    a catalog change -- including a hand-edit to ``extra_models.json`` --
+    still takes effect on the very next call without reparsing the catalog
+    for every shell command in between.
 
     Residual: MCP server secrets (``mcp_servers.json`` ``env``/``headers``
     ``$VAR`` references) are not folded in -- there is no clean way to tell a
     secret from a non-secret like ``$HOME``/``$PATH`` there, and scrubbing the
     latter would re-break tooling. Left for the maintainer to decide.
     """
+    global _credential_names_cache
+    fingerprint = _catalog_fingerprint()
+    cached = _credential_names_cache
+    if fingerprint is not None and cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
     names = set(_WELL_KNOWN_CREDENTIAL_ENV_VARS)
     try:
         names.update(all_api_key_env_vars())
@@ -289,7 +324,10 @@ def credential_env_var_names() -> frozenset:
     except Exception:
         # A broken catalog must not break environment scrubbing.
         pass
-    return frozenset(names)
+    result = frozenset(names)
+    if fingerprint is not None:
+        _credential_names_cache = (fingerprint, result)
+    return result
 
 
 def environment_without_credentials() -> Dict[str, str]:
@@ -301,11 +339,30 @@ def environment_without_credentials() -> Dict[str, str]:
     Everything else passes through so routine tooling keeps working: the user's
     own ``GITHUB_TOKEN``, ``AWS_*`` and proxies, and non-secret header vars like
     ``$SITE_URL``.
+
+    The scrubbed mapping is rebuilt only when the credential set or
+    ``os.environ`` changed since the last call; callers get their own copy.
     """
+    global _scrubbed_env_cache
     credentials = credential_env_var_names()
-    return {
+    # os.environ's backing dict: comparing it is a C-level dict compare,
+    # whereas iterating os.environ decodes every key and value in Python.
+    raw = getattr(os.environ, "_data", None)
+    cached = _scrubbed_env_cache
+    if (
+        raw is not None
+        and cached is not None
+        and cached[0] is credentials
+        and cached[1] == raw
+    ):
+        return dict(cached[2])
+
+    scrubbed = {
         name: value for name, value in os.environ.items() if name not in credentials
     }
+    if isinstance(raw, dict):
+        _scrubbed_env_cache = (credentials, dict(raw), scrubbed)
+    return dict(scrubbed)
 
 
 def credential_hint(env_var: str) -> str:
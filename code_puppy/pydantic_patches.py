@@ -23,10 +23,23 @@ Usage:
 import importlib.metadata
 import logging
 import warnings
-from typing import Any
+from typing import Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# Whether the session model strips the ``cp_`` tool prefix; ``None`` until the
+# first prefixed call resolves it. Reset on every session-model change
+# (``config.set_model_name`` / ``config.reset_session_model``) so tool calls
+# read a plain global instead of going back to config.
+_tool_prefix_strip: Optional[bool] = None
+
+
+def invalidate_tool_prefix_mode() -> None:
+    """Forget the cached claude-code check; the next prefixed call re-resolves."""
+    global _tool_prefix_strip
+    _tool_prefix_strip = None
+
+
 # Loud failures recorded during the current apply_all_patches() run, so the
 # summary line can distinguish real breakage from skipped optional deps.
 _LOUD_FAILURES: list[str] = []
@@ -256,7 +269,9 @@ def patch_tool_call_callbacks() -> bool:
     single execution entry point since pydantic-ai split validation from
     execution in the public ``pydantic_ai.tool_manager`` module) so every tool
     invocation also triggers the ``pre_tool_call`` and ``post_tool_call``
-    callbacks defined in ``code_puppy.callbacks``.
+    callbacks defined in ``code_puppy.callbacks``. When neither phase has a
+    callback registered the wrapper skips argument parsing and both awaits.
+    Every execution's wall time lands in ``code_puppy.tool_metrics``.
 
     Why not the v2 ``Hooks`` capability? Evaluated against pydantic-ai
     2.31.0 and rejected:
@@ -274,6 +289,8 @@ def patch_tool_call_callbacks() -> bool:
     """
     import time
 
+    from code_puppy.tool_metrics import record_tool_call
+
     try:
         from pydantic_ai.tool_manager import ToolManager
 
@@ -294,13 +311,22 @@ def patch_tool_call_callbacks() -> bool:
             initialised; any failure means "not claude-code" so we never
             accidentally strip prefixes from non-claude-code tool names.
             """
+            global _tool_prefix_strip
+            strip = _tool_prefix_strip
+            if strip is not None:
+                return strip
             try:
                 from code_puppy.config import get_global_model_name
 
-                model_name = get_global_model_name() or ""
-                return model_name.startswith(_CLAUDE_CODE_MODEL_PREFIX)
+                model_name = get_global_model_name()
             except Exception:
                 return False
+            if not model_name:
+                # No session model yet; don't pin "False" past a later /add_model.
+                return False
+            strip = model_name.startswith(_CLAUDE_CODE_MODEL_PREFIX)
+            _tool_prefix_strip = strip
+            return strip
 
         def _normalize_tool_name(name: Any) -> Any:
             """Strip the ``cp_`` prefix if present (claude-code models only)."""
@@ -336,10 +362,31 @@ def patch_tool_call_callbacks() -> bool:
 
         # -- execute_tool_call wrapper with callbacks ----------------------------
 
+        async def _execute_and_record(self, validated, tool_name, **kwargs):
+            """Hook-free fast path: run the tool and record its wall time."""
+            start = time.perf_counter()
+            try:
+                result = await _original_execute_tool_call(self, validated, **kwargs)
+            except Exception:
+                record_tool_call(
+                    tool_name, (time.perf_counter() - start) * 1000, error=True
+                )
+                raise
+            record_tool_call(tool_name, (time.perf_counter() - start) * 1000)
+            return result
+
         async def _patched_execute_tool_call(self, validated, **kwargs):
             call = validated.call
             tool_name, call = _normalize_call_tool_name(call)
 
+            from code_puppy import callbacks
+
+            has_pre_hooks = callbacks.count_callbacks("pre_tool_call") > 0
+            has_post_hooks = callbacks.count_callbacks("post_tool_call") > 0
+            if not has_pre_hooks and not has_post_hooks:
+                # Nothing will look at the args; skip parsing them.
+                return await _execute_and_record(self, validated, tool_name, **kwargs)
+
             # Give hooks a dict view of the args. Prefer the already-validated
             # dict — execution passes it to the tool, so in-place mutations
             # flow through automatically. Remember the original call.args shape
@@ -375,14 +422,13 @@ def patch_tool_call_callbacks() -> bool:
             # Dispatching is isolated, but the block decision below is NOT: an
             # error while rendering a deny must not silently become an allow.
             callback_results: list = []
-            try:
-                from code_puppy import callbacks
-
-                callback_results = await callbacks.on_pre_tool_call(
-                    tool_name, tool_args
-                )
-            except Exception:
-                pass  # import/dispatch failure leaves nothing to act on
+            if has_pre_hooks:
+                try:
+                    callback_results = await callbacks.on_pre_tool_call(
+                        tool_name, tool_args
+                    )
+                except Exception:
+                    pass  # dispatch failure leaves nothing to act on
 
             # Collect non-blocking hook context messages (e.g. PreToolUse
             # stdout) so the model sees them — otherwise they're lost.
@@ -438,15 +484,15 @@ def patch_tool_call_callbacks() -> bool:
                 raise
             finally:
                 duration_ms = (time.perf_counter() - start) * 1000
-                final_result = result if error is None else {"error": str(error)}
-                try:
-                    from code_puppy import callbacks
-
-                    await callbacks.on_post_tool_call(
-                        tool_name, tool_args, final_result, duration_ms
-                    )
-                except Exception:
-                    pass  # never block tool execution
+                record_tool_call(tool_name, duration_ms, error=error is not None)
+                if has_post_hooks:
+                    final_result = result if error is None else {"error": str(error)}
+                    try:
+                        await callbacks.on_post_tool_call(
+                            tool_name, tool_args, final_result, duration_ms
+                        )
+                    except Exception:
+                        pass  # never block tool execution
 
         ToolManager.get_tool_def = _patched_get_tool_def
         ToolManager.validate_tool_call = _patched_validate_tool_call
@@ -1,9 +1,12 @@
 import threading
-from contextlib import asynccontextmanager, suppress
+import time
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
 from dataclasses import dataclass, field
-from typing import Any, AsyncIterator, List
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
 
+import httpx
 from pydantic_ai import RunContext
+from pydantic_ai.exceptions import ModelAPIError, ModelHTTPError
 from pydantic_ai.models import (
     Model,
     ModelMessage,
@@ -28,43 +31,132 @@ except ImportError:
         return DummySpan()
 
 
+# Weight of the newest sample in each moving average.
+EWMA_ALPHA = 0.3
+# A failing candidate sits out this long, doubling per consecutive failure.
+EJECT_BASE_SECONDS = 5.0
+EJECT_MAX_SECONDS = 300.0
+# Slow candidates keep a trickle of traffic so their numbers stay current.
+MIN_WEIGHT = 0.05
+ROUTING_MODES = ("adaptive", "round_robin")
+# Errors that say the candidate is unhealthy rather than the request being bad.
+# pydantic-ai reports provider connection failures as a bare ModelAPIError.
+_TRANSPORT_ERRORS: tuple = (httpx.TransportError, TimeoutError, ConnectionError)
+
+
+def _is_candidate_fault(exc: BaseException) -> bool:
+    """True for transport errors, timeouts, 429 and 5xx; only these eject and retry.
+
+    A 4xx such as a 400 would fail identically on every candidate, so it is
+    raised as-is without touching the candidate's health.
+    """
+    if isinstance(exc, ModelHTTPError):
+        return exc.status_code in (408, 429) or exc.status_code >= 500
+    return isinstance(exc, (ModelAPIError, *_TRANSPORT_ERRORS))
+
+
+def _ewma(average: Optional[float], sample: float) -> float:
+    if average is None:
+        return sample
+    return average + EWMA_ALPHA * (sample - average)
+
+
+@dataclass
+class CandidateHealth:
+    """Moving averages and ejection state for one round-robin candidate."""
+
+    latency: Optional[float] = None
+    ttft: Optional[float] = None
+    error_rate: float = 0.0
+    requests: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    ejected_until: float = 0.0
+
+    @property
+    def cost(self) -> Optional[float]:
+        """Seconds a caller waits before output starts, if known."""
+        return self.ttft if self.ttft is not None else self.latency
+
+    def record_success(self, latency: Optional[float] = None) -> None:
+        self.requests += 1
+        if latency is not None:
+            self.latency = _ewma(self.latency, latency)
+        self.error_rate = _ewma(self.error_rate, 0.0)
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+
+    def record_failure(self, now: float) -> None:
+        self.requests += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.error_rate = _ewma(self.error_rate, 1.0)
+        backoff = EJECT_BASE_SECONDS * 2 ** (self.consecutive_failures - 1)
+        self.ejected_until = now + min(backoff, EJECT_MAX_SECONDS)
+
+
 @dataclass(init=False)
 class RoundRobinModel(Model):
     """A model that cycles through multiple models in a round-robin fashion.
 
     This model distributes requests across multiple candidate models to help
     overcome rate limits or distribute load.
+
+    With ``routing="adaptive"`` (the default) the rotation is weighted by each
+    candidate's health: moving averages of latency, time to first token and
+    error rate. A candidate that fails is ejected for a backoff that doubles
+    with each consecutive failure, and the failed request is retried once on
+    the next-best candidate. Healthy candidates with similar latency rotate
+    exactly as plain round-robin does. ``routing="round_robin"`` keeps the
+    blind rotation with no ejection or retry.
     """
 
     models: List[Model]
+    health: List[CandidateHealth] = field(repr=False)
     _current_index: int = field(default=0, repr=False)
     _model_name: str = field(repr=False)
     _rotate_every: int = field(default=1, repr=False)
     _request_count: int = field(default=0, repr=False)
+    _routing: str = field(default="adaptive", repr=False)
+    _current_weights: List[float] = field(repr=False)
+    _clock: Callable[[], float] = field(repr=False)
     _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
 
     def __init__(
         self,
         *models: Model,
         rotate_every: int = 1,
+        routing: str = "adaptive",
         settings: ModelSettings | None = None,
+        clock: Callable[[], float] = time.monotonic,
     ):
         """Initialize a round-robin model instance.
 
         Args:
             models: The model instances to cycle through.
             rotate_every: Number of requests before rotating to the next model (default: 1).
+            routing: "adaptive" (health-weighted, with ejection and one retry)
+                or "round_robin" (blind rotation).
             settings: Model settings that will be used as defaults for this model.
+            clock: Monotonic clock used for latency and ejection timing.
         """
         super().__init__(settings=settings)
         if not models:
             raise ValueError("At least one model must be provided")
         if rotate_every < 1:
             raise ValueError("rotate_every must be at least 1")
+        if routing not in ROUTING_MODES:
+            raise ValueError(
+                f"routing must be one of {', '.join(ROUTING_MODES)}, got {routing!r}"
+            )
         self.models = list(models)
+        self.health = [CandidateHealth() for _ in self.models]
         self._current_index = 0
         self._request_count = 0
         self._rotate_every = rotate_every
+        self._routing = routing
+        self._current_weights = [0.0] * len(self.models)
+        self._clock = clock
         self._lock = threading.Lock()
 
     @property
@@ -85,39 +177,143 @@ class RoundRobinModel(Model):
         """Base URL from the current model."""
         return self.models[self._current_index].base_url
 
-    def _get_next_model(self) -> Model:
-        """Get the next model in the round-robin sequence and update the index."""
+    @property
+    def adaptive(self) -> bool:
+        return self._routing == "adaptive"
+
+    def _weights(self, now: float, exclude: Optional[int] = None) -> Dict[int, float]:
+        """Selection weight per eligible candidate index. Caller holds the lock."""
+        indices = [i for i in range(len(self.models)) if i != exclude]
+        if not self.adaptive:
+            return {i: 1.0 for i in indices}
+        eligible = [i for i in indices if self.health[i].ejected_until <= now]
+        if not eligible and indices:
+            # Everyone is out: try whoever is due back first rather than fail.
+            eligible = [min(indices, key=lambda i: self.health[i].ejected_until)]
+        costs = [self.health[i].cost for i in eligible]
+        known = [c for c in costs if c is not None]
+        best = max(min(known), 1e-3) if known else None
+        weights = {}
+        for i, cost in zip(eligible, costs):
+            # Unmeasured candidates count as fast, so they get explored.
+            speed = 1.0 if best is None or cost is None else best / max(cost, best)
+            weights[i] = max(speed * (1.0 - self.health[i].error_rate), MIN_WEIGHT)
+        return weights
+
+    def _get_next_index(self) -> int:
+        """Pick the candidate for a new request (smooth weighted round-robin)."""
         with self._lock:
-            model = self.models[self._current_index]
+            weights = self._weights(self._clock())
+            if self._request_count == 0 or self._current_index not in weights:
+                total = sum(weights.values())
+                for i, weight in weights.items():
+                    self._current_weights[i] += weight
+                chosen = max(weights, key=lambda i: self._current_weights[i])
+                self._current_weights[chosen] -= total
+                self._current_index = chosen
+                self._request_count = 0
             self._request_count += 1
             if self._request_count >= self._rotate_every:
-                self._current_index = (self._current_index + 1) % len(self.models)
                 self._request_count = 0
-            return model
+            return self._current_index
 
-    async def request(
+    def _get_next_model(self) -> Model:
+        """Get the next model in the round-robin sequence and update the index."""
+        return self.models[self._get_next_index()]
+
+    def _get_retry_index(self, failed: int) -> Optional[int]:
+        """The best other candidate for one retry, or None if there is none."""
+        if not self.adaptive:
+            return None
+        with self._lock:
+            weights = self._weights(self._clock(), exclude=failed)
+        if not weights:
+            return None
+        return max(weights, key=weights.get)
+
+    def _record_success(self, index: int, latency: Optional[float] = None) -> None:
+        with self._lock:
+            self.health[index].record_success(latency)
+
+    def _record_failure(self, index: int) -> None:
+        with self._lock:
+            self.health[index].record_failure(self._clock())
+            self._current_weights[index] = 0.0
+
+    async def _request_on(
         self,
+        index: int,
         messages: list[ModelMessage],
         model_settings: ModelSettings | None,
         model_request_parameters: ModelRequestParameters,
     ) -> ModelResponse:
-        """Make a request using the next model in the round-robin sequence."""
-        current_model = self._get_next_model()
+        model = self.models[index]
         # Use prepare_request to merge settings and customize parameters
-        merged_settings, prepared_params = current_model.prepare_request(
+        merged_settings, prepared_params = model.prepare_request(
             model_settings, model_request_parameters
         )
+        started = self._clock()
+        try:
+            response = await model.request(messages, merged_settings, prepared_params)
+        except Exception as exc:
+            if _is_candidate_fault(exc):
+                self._record_failure(index)
+            raise
+        self._record_success(index, latency=self._clock() - started)
+        self._set_span_attributes(model)
+        return response
 
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        """Make a request using the next model in the round-robin sequence."""
+        index = self._get_next_index()
         try:
-            response = await current_model.request(
-                messages, merged_settings, prepared_params
+            return await self._request_on(
+                index, messages, model_settings, model_request_parameters
+            )
+        except Exception as exc:
+            if not _is_candidate_fault(exc):
+                raise
+            retry_index = self._get_retry_index(index)
+            if retry_index is None:
+                raise
+            return await self._request_on(
+                retry_index, messages, model_settings, model_request_parameters
             )
-            self._set_span_attributes(current_model)
-            return response
-        except Exception:
-            # Unlike FallbackModel, we don't try other models here
-            # The round-robin strategy is about distribution, not failover
+
+    async def _open_stream(
+        self,
+        stack: AsyncExitStack,
+        index: int,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+        run_context: RunContext[Any] | None,
+    ) -> StreamedResponse:
+        model = self.models[index]
+        merged_settings, prepared_params = model.prepare_request(
+            model_settings, model_request_parameters
+        )
+        started = self._clock()
+        try:
+            response = await stack.enter_async_context(
+                model.request_stream(
+                    messages, merged_settings, prepared_params, run_context
+                )
+            )
+        except Exception as exc:
+            if _is_candidate_fault(exc):
+                self._record_failure(index)
             raise
+        # Providers hand the stream over once the first chunk has arrived.
+        ttft = self._clock() - started
+        with self._lock:
+            self.health[index].ttft = _ewma(self.health[index].ttft, ttft)
+        return response
 
     @asynccontextmanager
     async def request_stream(
@@ -127,18 +323,36 @@ class RoundRobinModel(Model):
         model_request_parameters: ModelRequestParameters,
         run_context: RunContext[Any] | None = None,
     ) -> AsyncIterator[StreamedResponse]:
-        """Make a streaming request using the next model in the round-robin sequence."""
-        current_model = self._get_next_model()
-        # Use prepare_request to merge settings and customize parameters
-        merged_settings, prepared_params = current_model.prepare_request(
-            model_settings, model_request_parameters
-        )
+        """Make a streaming request using the next model in the round-robin sequence.
 
-        async with current_model.request_stream(
-            messages, merged_settings, prepared_params, run_context
-        ) as response:
-            self._set_span_attributes(current_model)
-            yield response
+        Only a failure to open the stream is retried; once events have been
+        handed to the caller the request is committed to that candidate.
+        Exceptions other than transport errors, timeouts, 429 and 5xx never
+        count against the candidate.
+        """
+        index = self._get_next_index()
+        args = (messages, model_settings, model_request_parameters, run_context)
+        async with AsyncExitStack() as stack:
+            try:
+                response = await self._open_stream(stack, index, *args)
+            except Exception as exc:
+                if not _is_candidate_fault(exc):
+                    raise
+                retry_index = self._get_retry_index(index)
+                if retry_index is None:
+                    raise
+                index = retry_index
+                response = await self._open_stream(stack, index, *args)
+            self._set_span_attributes(self.models[index])
+            try:
+                yield response
+            except Exception as exc:
+                # The caller's own body raises through this yield too; only a
+                # transport-level failure from the stream counts against it.
+                if _is_candidate_fault(exc):
+                    self._record_failure(index)
+                raise
+            self._record_success(index)
 
     def _set_span_attributes(self, model: Model):
         """Set span attributes for observability."""
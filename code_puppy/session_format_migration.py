@@ -11,9 +11,13 @@ caller/validation layer: it round-trips the normalized messages through
 ``ModelMessagesTypeAdapter`` (lazily imported via ``session_storage``) before
 declaring a migration successful.
 
-Startup entry point is :func:`sweep_legacy_pickle_sessions`, idempotent via a
-marker file in the config dir. Originals are never deleted: migrated pickles
-move to ``<dir>/pre_v2_backup/``, failures to ``<dir>/pre_v2_backup/failed/``.
+Entry point is :func:`sweep_legacy_pickle_sessions`, idempotent via a
+marker file in the config dir. It runs as a background job of
+:mod:`code_puppy.maintenance` (:func:`run_maintenance`), sliced by time
+budget and skipped outright while :func:`maintenance_fingerprint` is
+unchanged; ``load_session`` migrates any pickle it reaches first. Originals
+are never deleted: migrated pickles move to ``<dir>/pre_v2_backup/``,
+failures to ``<dir>/pre_v2_backup/failed/``.
 """
 
 from __future__ import annotations
@@ -23,7 +27,7 @@ import logging
 import os
 import pathlib
 from dataclasses import dataclass
-from typing import Iterable, Optional, Tuple
+from typing import Callable, Iterable, Optional, Tuple
 
 from code_puppy.session_surrogate_unpickler import (
     load_surrogate_pickle,
@@ -37,6 +41,10 @@ _MARKER_FILENAME = ".session_format_v2_migrated"
 _BACKUP_DIRNAME = "pre_v2_backup"
 
 
+def _never() -> bool:
+    return False
+
+
 @dataclass(slots=True)
 class MigrationResult:
     success: bool
@@ -162,11 +170,19 @@ def _marker_path() -> pathlib.Path:
     return pathlib.Path(CONFIG_DIR) / _MARKER_FILENAME
 
 
-def _migrate_directory(directory: pathlib.Path) -> Tuple[int, int]:
-    """Migrate every ``.pkl`` in ``directory``; returns ``(migrated, failed)``."""
+def _migrate_directory(
+    directory: pathlib.Path, should_stop: Callable[[], bool] = _never
+) -> Tuple[int, int, bool]:
+    """Migrate every ``.pkl`` in ``directory``.
+
+    Returns ``(migrated, failed, finished)``; ``finished`` is False when
+    ``should_stop`` cut the pass short.
+    """
     migrated = 0
     failed = 0
     for pkl_path in sorted(directory.glob("*.pkl")):
+        if should_stop():
+            return migrated, failed, False
         if pkl_path.with_suffix(".json").exists():
             continue  # JSON twin already present; nothing to do.
         result = migrate_pickle_file(pkl_path)
@@ -181,11 +197,13 @@ def _migrate_directory(directory: pathlib.Path) -> Tuple[int, int]:
                 result.error,
             )
             quarantine_failed_pickle(pkl_path)
-    return migrated, failed
+    return migrated, failed, True
 
 
-def _retry_quarantined(directory: pathlib.Path) -> Tuple[int, int]:
-    """Retry ``pre_v2_backup/failed/*.pkl``; returns ``(rescued, stuck)``.
+def _retry_quarantined(
+    directory: pathlib.Path, should_stop: Callable[[], bool] = _never
+) -> Tuple[int, int, bool]:
+    """Retry ``pre_v2_backup/failed/*.pkl``; returns ``(rescued, stuck, finished)``.
 
     Runs even when the sweep marker exists (cheap: only when ``failed/``
     is non-empty) so unpickler fixes retroactively rescue quarantined
@@ -194,10 +212,12 @@ def _retry_quarantined(directory: pathlib.Path) -> Tuple[int, int]:
     """
     failed_dir = directory / _BACKUP_DIRNAME / "failed"
     if not failed_dir.is_dir():
-        return 0, 0
+        return 0, 0, True
     rescued = 0
     stuck = 0
     for pkl_path in sorted(failed_dir.glob("*.pkl")):
+        if should_stop():
+            return rescued, stuck, False
         json_path = directory / pkl_path.with_suffix(".json").name
         if json_path.exists():
             logger.debug("Skipping quarantined %s: JSON twin already exists", pkl_path)
@@ -215,7 +235,7 @@ def _retry_quarantined(directory: pathlib.Path) -> Tuple[int, int]:
                 pkl_path,
                 result.error,
             )
-    return rescued, stuck
+    return rescued, stuck, True
 
 
 def archive_legacy_pickle_from_quarantine(
@@ -228,33 +248,48 @@ def archive_legacy_pickle_from_quarantine(
         pass
 
 
-def sweep_legacy_pickle_sessions() -> None:
-    """Startup sweep: migrate every known ``.pkl`` session to JSON.
+def sweep_legacy_pickle_sessions(should_stop: Callable[[], bool] = _never) -> bool:
+    """Migrate every known ``.pkl`` session to JSON.
 
     The main sweep is one-time (marker file); the quarantine-retry pass is
-    self-healing and runs every startup. Per-file failures are quarantined
-    with debug-level detail and summarized in a single warning; the sweep
-    never raises (best-effort at startup, same policy as
+    self-healing and runs whenever the sweep does. Per-file failures are
+    quarantined with debug-level detail and summarized in a single warning;
+    the sweep never raises (best-effort, same policy as
     ``session_migration.sweep_contexts_to_autosaves``).
+
+    ``should_stop`` is polled between files. Returns False when it ended
+    the sweep early (the marker is then left unwritten, so the next call
+    picks up where this one stopped), True otherwise.
     """
     try:
         directories = [d for d in _sweep_directories() if d.is_dir()]
 
         migrated = 0
         failed = 0
+        finished = True
         marker = _marker_path()
         if not marker.exists():
             for directory in directories:
-                dir_migrated, dir_failed = _migrate_directory(directory)
+                dir_migrated, dir_failed, finished = _migrate_directory(
+                    directory, should_stop
+                )
                 migrated += dir_migrated
                 failed += dir_failed
-            marker.parent.mkdir(parents=True, exist_ok=True)
-            marker.touch()
+                if not finished:
+                    break
+            if finished:
+                marker.parent.mkdir(parents=True, exist_ok=True)
+                marker.touch()
 
         rescued = 0
-        for directory in directories:
-            dir_rescued, _stuck = _retry_quarantined(directory)
-            rescued += dir_rescued
+        if finished:
+            for directory in directories:
+                dir_rescued, _stuck, finished = _retry_quarantined(
+                    directory, should_stop
+                )
+                rescued += dir_rescued
+                if not finished:
+                    break
 
         if failed:
             _emit_warning_safely(
@@ -272,6 +307,7 @@ def sweep_legacy_pickle_sessions() -> None:
                 f"Recovered {rescued} previously quarantined session(s) "
                 f"from {_BACKUP_DIRNAME}/failed/."
             )
+        return finished
     except Exception as exc:  # pragma: no cover - defensive
         try:
             from code_puppy.error_logging import log_error_message
@@ -282,6 +318,33 @@ def sweep_legacy_pickle_sessions() -> None:
             )
         except Exception:
             pass
+        return True
+
+
+def maintenance_fingerprint() -> str:
+    """What the sweep depends on, in one stat per directory.
+
+    The marker, each directory's ``failed/`` quarantine (a new arrival or
+    departure bumps its mtime) and the code_puppy version, since unpickler
+    fixes ship in new releases and should get one more go at the quarantine.
+    """
+    from code_puppy import __version__
+    from code_puppy.maintenance import directory_fingerprint
+
+    return "|".join(
+        (
+            __version__,
+            "marked" if _marker_path().exists() else "unmarked",
+            directory_fingerprint(
+                *(str(d / _BACKUP_DIRNAME / "failed") for d in _sweep_directories())
+            ),
+        )
+    )
+
+
+def run_maintenance(budget) -> bool:
+    """:class:`~code_puppy.maintenance.MaintenanceJob` entry point."""
+    return sweep_legacy_pickle_sessions(should_stop=budget.exhausted)
 
 
 def _emit_info_safely(message: str) -> None:
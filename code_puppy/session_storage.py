@@ -259,7 +259,8 @@ def load_session(session_name: str, base_dir: Path) -> SessionHistory:
         )
 
         result = migrate_pickle_file(paths.pickle_path)
-        if not result.success:
+        # The background sweep may have migrated and archived it meanwhile.
+        if not result.success and not paths.json_path.exists():
             raise ValueError(
                 f"Could not migrate legacy session {paths.pickle_path}: {result.error}"
             )
@@ -0,0 +1,275 @@
+"""``--profile-startup``: where does cold start actually go?
+
+Records a tree of named startup phases (pydantic patches, plugin load,
+agent build, MCP autostart, ...) with every module import nested under
+the phase that triggered it, then writes the tree to a JSON report once
+the CLI is ready for its first prompt (or exits, e.g. for ``--help``).
+
+Like ``code_puppy.splash`` this module is **stdlib-only**: ``main.py``
+starts it before the heavy imports it is meant to measure. When profiling
+is off, :func:`phase` and :func:`finish` cost one attribute check.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+FLAG = "--profile-startup"
+DEFAULT_REPORT_PATH = "code_puppy_startup_profile.json"
+
+# Imports cheaper than this are folded into their parent's self time so
+# the report stays readable (thousands of stdlib/pydantic submodules).
+MIN_REPORTED_IMPORT_MS = 1.0
+TOP_IMPORTS = 30
+
+
+def report_path_from_argv(argv: List[str]) -> Optional[str]:
+    """The report path if ``argv`` asks for profiling, else None.
+
+    Mirrors the argparse definition in ``cli_runner`` (an optional value):
+    ``--profile-startup``, ``--profile-startup=PATH`` or
+    ``--profile-startup PATH``.
+    """
+    for i, arg in enumerate(argv):
+        if arg == FLAG:
+            following = argv[i + 1] if i + 1 < len(argv) else ""
+            if following and not following.startswith("-"):
+                return following
+            return DEFAULT_REPORT_PATH
+        if arg.startswith(FLAG + "="):
+            return arg.split("=", 1)[1] or DEFAULT_REPORT_PATH
+    return None
+
+
+class _Node:
+    __slots__ = ("name", "kind", "started", "ms", "children")
+
+    def __init__(self, name: str, kind: str):
+        self.name = name
+        self.kind = kind
+        self.started = time.perf_counter()
+        self.ms = 0.0
+        self.children: List[_Node] = []
+
+    def close(self) -> None:
+        self.ms = (time.perf_counter() - self.started) * 1000.0
+
+    def to_dict(self) -> dict:
+        children = [c.to_dict() for c in self.children if _reported(c)]
+        hidden = [c for c in self.children if not _reported(c)]
+        node = {
+            "name": self.name,
+            "kind": self.kind,
+            "ms": round(self.ms, 2),
+            "self_ms": round(self.ms - sum(c.ms for c in self.children), 2),
+        }
+        if hidden:
+            node["small_imports"] = len(hidden)
+            node["small_imports_ms"] = round(sum(c.ms for c in hidden), 2)
+        if self.kind == "phase":
+            # Every module imported inside the phase, folded ones included.
+            node["import_count"] = self.import_count()
+        if children:
+            node["children"] = children
+        return node
+
+    def import_count(self) -> int:
+        return sum((c.kind == "import") + c.import_count() for c in self.children)
+
+
+def _reported(node: _Node) -> bool:
+    return node.kind == "phase" or node.ms >= MIN_REPORTED_IMPORT_MS
+
+
+class _TimedLoader:
+    """Times ``exec_module`` for one spec, then gets out of the way.
+
+    The wrapper is only ever visible to the import machinery: before the
+    module body runs, its ``__loader__`` and ``__spec__.loader`` are put
+    back to the real loader, so resource lookups and ``inspect`` behave
+    exactly as without profiling.
+    """
+
+    def __init__(self, loader, profiler: "_Profiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        module.__loader__ = self._loader
+        if getattr(module, "__spec__", None) is not None:
+            module.__spec__.loader = self._loader
+        with self._profiler.node(module.__name__, "import"):
+            self._loader.exec_module(module)
+
+
+class _ImportTimer:
+    """Meta-path finder that wraps the loader of every newly found module."""
+
+    def __init__(self, profiler: "_Profiler"):
+        self._profiler = profiler
+        self._finding = False
+
+    def find_spec(self, fullname, path=None, target=None):
+        if self._finding:
+            return None
+        self._finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding = False
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self._profiler)
+        return spec
+
+
+class _Profiler:
+    def __init__(self, report_path: str, argv: List[str]):
+        self.report_path = report_path
+        self.argv = list(argv)
+        self.root = _Node("startup", "phase")
+        self.stack: List[_Node] = [self.root]
+        self.ready: Optional[str] = None
+        self.thread = threading.get_ident()
+        self._timer = _ImportTimer(self)
+
+    def install(self) -> None:
+        sys.meta_path.insert(0, self._timer)
+
+    def uninstall(self) -> None:
+        try:
+            sys.meta_path.remove(self._timer)
+        except ValueError:
+            pass
+
+    @contextmanager
+    def node(self, name: str, kind: str) -> Iterator[None]:
+        if threading.get_ident() != self.thread:
+            # One tree, one stack: background threads go unrecorded.
+            yield
+            return
+        node = _Node(name, kind)
+        self.stack[-1].children.append(node)
+        self.stack.append(node)
+        try:
+            yield
+        finally:
+            node.close()
+            # Tolerate phases that were never closed (e.g. sys.exit inside one).
+            while self.stack[-1] is not node:
+                self.stack.pop().close()
+            self.stack.pop()
+
+    def report(self) -> dict:
+        self.root.close()
+        for open_node in self.stack[1:]:
+            open_node.close()
+        imports: dict = {}
+        import_ms = _collect_imports(self.root, imports)
+        top = sorted(imports.items(), key=lambda item: -item[1][0])[:TOP_IMPORTS]
+        return {
+            "version": 1,
+            "argv": self.argv,
+            "python": sys.version.split()[0],
+            "ready": self.ready,
+            "total_ms": round(self.root.ms, 2),
+            "import_ms": round(import_ms, 2),
+            "tree": self.root.to_dict(),
+            "top_imports": [
+                {"module": name, "ms": round(ms, 2), "self_ms": round(self_ms, 2)}
+                for name, (ms, self_ms) in top
+            ],
+        }
+
+
+def _collect_imports(node: _Node, out: dict) -> float:
+    """Fill ``out`` with every import's times; return the outermost imports' total."""
+    outermost = 0.0
+    for child in node.children:
+        if child.kind == "import":
+            out[child.name] = (child.ms, child.ms - sum(c.ms for c in child.children))
+            outermost += child.ms
+            _collect_imports(child, out)
+        else:
+            outermost += _collect_imports(child, out)
+    return outermost
+
+
+_active: Optional[_Profiler] = None
+
+
+def start(report_path: str, argv: Optional[List[str]] = None) -> None:
+    """Begin recording imports and phases; the report is written by finish()."""
+    global _active
+    if _active is not None:
+        return
+    _active = _Profiler(report_path, sys.argv if argv is None else argv)
+    _active.install()
+    atexit.register(finish, "exit")
+
+
+def start_from_argv(argv: Optional[List[str]] = None) -> bool:
+    """Start profiling if ``argv`` (default ``sys.argv``) carries the flag."""
+    argv = sys.argv if argv is None else argv
+    path = report_path_from_argv(argv[1:])
+    if path is None:
+        return False
+    start(path, argv)
+    return True
+
+
+def is_active() -> bool:
+    return _active is not None
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time a named startup phase; imports inside it are nested under it."""
+    if _active is None:
+        yield
+        return
+    with _active.node(name, "phase"):
+        yield
+
+
+def finish(ready: str) -> Optional[str]:
+    """Stop profiling and write the report; ``ready`` says what we reached.
+
+    Only the first call does anything. Returns the report path, or None
+    when profiling is off (or the report could not be written).
+    """
+    global _active
+    profiler, _active = _active, None
+    if profiler is None:
+        return None
+    profiler.uninstall()
+    profiler.ready = ready
+    report = profiler.report()
+    try:
+        with open(profiler.report_path, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=1)
+            handle.write("\n")
+    except OSError as exc:
+        sys.stderr.write(f"Could not write startup profile: {exc}\n")
+        return None
+    sys.stderr.write(
+        f"Startup profile ({ready}, {report['total_ms']:.0f} ms) written to "
+        f"{os.path.abspath(profiler.report_path)}\n"
+    )
+    return profiler.report_path
@@ -1,6 +1,7 @@
 import asyncio
 import threading
 import time
+from collections import deque
 from contextlib import contextmanager
 
 from rich.console import Console
@@ -13,6 +14,33 @@ from rich.text import Text
 CURRENT_TOKEN_RATE = 0.0
 _TOKEN_RATE_LOCK = threading.Lock()
 
+# The displayed rate is tokens over the last RATE_WINDOW_SECONDS of active
+# (non-tool) time. Samples closer together than RATE_BUCKET_SECONDS share a
+# slot, so the ring stays tiny however fast chunks arrive.
+RATE_WINDOW_SECONDS = 5.0
+RATE_BUCKET_SECONDS = 0.25
+# Redraw cadence while tokens arrive (and for a window after, while the rate
+# settles); otherwise the loop only wakes for the next visible change.
+STREAMING_REFRESH_SECONDS = 0.5
+IDLE_REFRESH_SECONDS = 1.0
+MESSAGE_ROTATE_SECONDS = 5.0
+
+
+def _format_elapsed(seconds: float) -> str:
+    """``42s`` under a minute, then ``3m 20s`` in 10-second steps."""
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    return f"{minutes}m {seconds - seconds % 10:02d}s"
+
+
+def _next_elapsed_change(seconds: float) -> float:
+    """When the string from :func:`_format_elapsed` next changes."""
+    if seconds < 59:
+        return int(seconds) + 1
+    return (int(seconds) // 10 + 1) * 10
+
 
 class StatusDisplay:
     """
@@ -34,7 +62,14 @@ class StatusDisplay:
         # so we exclude that wall-clock time from the t/s calculation.
         self._tool_pause_start = None  # timestamp the current pause began
         self._paused_total = 0.0  # cumulative seconds spent paused
-        self._paused_total_at_last_update = 0.0  # paused total at last rate calc
+        # (active seconds, token count) samples for the windowed rate.
+        self._rate_samples = deque(
+            maxlen=int(RATE_WINDOW_SECONDS / RATE_BUCKET_SECONDS) + 2
+        )
+        # Set by anything that changes what the status line shows; the
+        # display loop clears it when it recomputes.
+        self._dirty = True
+        self._rendered = None  # parts of the last status line drawn
         self.loading_messages = [
             "Fetching...",
             "Sniffing around...",
@@ -63,12 +98,14 @@ class StatusDisplay:
         """
         if self._tool_pause_start is None:
             self._tool_pause_start = time.time()
+            self._dirty = True
 
     def resume_after_tool(self) -> None:
         """Resume t/s timing after a tool finishes executing."""
         if self._tool_pause_start is not None:
             self._paused_total += time.time() - self._tool_pause_start
             self._tool_pause_start = None
+            self._dirty = True
 
     @contextmanager
     def tool_execution(self):
@@ -84,44 +121,53 @@ class StatusDisplay:
         finally:
             self.resume_after_tool()
 
-    def _current_paused_total(self) -> float:
+    def _current_paused_total(self, now: float | None = None) -> float:
         """Total seconds spent paused, including any in-progress pause."""
         paused = self._paused_total
         if self._tool_pause_start is not None:
-            paused += time.time() - self._tool_pause_start
+            paused += (time.time() if now is None else now) - self._tool_pause_start
         return paused
 
-    def _calculate_rate(self) -> float:
-        """Calculate the current token rate (excluding tool-execution time)"""
-        current_time = time.time()
-        paused_now = self._current_paused_total()
-        if self.last_update_time:
-            # Subtract any tool-execution time that elapsed in this interval so
-            # idle-but-busy seconds don't deflate the rate.
-            paused_in_interval = paused_now - self._paused_total_at_last_update
-            time_diff = (current_time - self.last_update_time) - paused_in_interval
-            token_diff = self.token_count - self.last_token_count
-            if time_diff > 0:
-                rate = token_diff / time_diff
-                # Smooth the rate calculation with the current rate
-                if self.current_rate > 0:
-                    self.current_rate = (self.current_rate * 0.7) + (rate * 0.3)
-                else:
-                    self.current_rate = rate
-
-                # Only ensure rate is not negative
-                self.current_rate = max(0, self.current_rate)
-
-                # Update the global rate for other components to access
-                global CURRENT_TOKEN_RATE
-                with _TOKEN_RATE_LOCK:
-                    CURRENT_TOKEN_RATE = self.current_rate
-
-        self.last_update_time = current_time
+    def _record_sample(self, now: float) -> float:
+        """Add the current count to the rate ring; returns the active time."""
+        active = now - self._current_paused_total(now)
+        samples = self._rate_samples
+        sample = (active, self.token_count)
+        if len(samples) >= 2 and active - samples[-2][0] < RATE_BUCKET_SECONDS:
+            samples[-1] = sample
+        else:
+            samples.append(sample)
+        return active
+
+    def _calculate_rate(self, now: float | None = None) -> float:
+        """Tokens per active second over the last ``RATE_WINDOW_SECONDS``.
+
+        Called by the display loop when something changed, not per chunk;
+        the shared ``CURRENT_TOKEN_RATE`` is only written when it moves.
+        """
+        now = time.time() if now is None else now
+        active = self._record_sample(now)
+        samples = list(self._rate_samples)
+        if len(samples) >= 2:
+            window_start = active - RATE_WINDOW_SECONDS
+            base_time, base_count = samples[0]
+            for sample_time, sample_count in samples:
+                if sample_time > window_start:
+                    break
+                base_time, base_count = sample_time, sample_count
+            span = active - max(base_time, window_start)
+            if span > 0:
+                self.current_rate = max(0, (samples[-1][1] - base_count) / span)
         self.last_token_count = self.token_count
-        self._paused_total_at_last_update = paused_now
+        self._publish_rate()
         return self.current_rate
 
+    def _publish_rate(self) -> None:
+        global CURRENT_TOKEN_RATE
+        if CURRENT_TOKEN_RATE != self.current_rate:
+            with _TOKEN_RATE_LOCK:
+                CURRENT_TOKEN_RATE = self.current_rate
+
     def update_rate_from_sse(
         self, completion_tokens: int, completion_time: float
     ) -> None:
@@ -143,10 +189,8 @@ class StatusDisplay:
             else:
                 self.current_rate = rate
 
-            # Update the global rate
-            global CURRENT_TOKEN_RATE
-            with _TOKEN_RATE_LOCK:
-                CURRENT_TOKEN_RATE = self.current_rate
+            self._dirty = True
+            self._publish_rate()
 
     @staticmethod
     def get_current_rate() -> float:
@@ -156,24 +200,22 @@ class StatusDisplay:
             return CURRENT_TOKEN_RATE
 
     def update_token_count(self, tokens: int) -> None:
-        """Update the token count and recalculate the rate"""
+        """Update the token count; the rate is recomputed on the next redraw."""
+        now = time.time()
         # Reset timing if this is the first update of a new task
         if self.start_time is None:
-            self.start_time = time.time()
-            self.last_update_time = self.start_time
+            self.start_time = now
             # Reset token counters for new task
             self.last_token_count = 0
             self.current_rate = 0.0
             # Reset tool-pause accounting for the new task
             self._tool_pause_start = None
             self._paused_total = 0.0
-            self._paused_total_at_last_update = 0.0
+            self._rate_samples.clear()
             # Set initial token count
             self.token_count = tokens if tokens >= 0 else 0
-            return  # Don't calculate rate on first initialization
-
         # Allow for incremental updates (common for streaming) or absolute updates
-        if tokens > self.token_count or tokens < 0:
+        elif tokens > self.token_count or tokens < 0:
             # Incremental update or reset
             self.token_count = tokens if tokens >= 0 else 0
         else:
@@ -181,7 +223,9 @@ class StatusDisplay:
             # This handles simulated token streaming
             self.token_count += tokens
 
-        self._calculate_rate()
+        self.last_update_time = now
+        self._record_sample(now)
+        self._dirty = True
 
     def _get_status_panel(self) -> Panel:
         """Generate a status panel with current rate and animated message"""
@@ -217,46 +261,77 @@ class StatusDisplay:
             padding=(1, 2),
         )
 
-    def _get_status_text(self) -> Text:
-        """Generate a status text with current rate and animated message"""
+    def _status_parts(self, now: float) -> tuple:
+        """What the status line shows at ``now``: rate, message, elapsed."""
         rate_text = (
             f"{self.current_rate:.1f} t/s" if self.current_rate > 0 else "Warming up..."
         )
-
-        # Update spinner
-        self.spinner.update()
-
-        # Rotate through loading messages
-        self.current_message_index = (self.current_message_index + 1) % len(
+        elapsed = max(0.0, now - self.start_time) if self.start_time else 0.0
+        # Rotate on the elapsed clock rather than per redraw, so an idle
+        # display has nothing new to draw between rotations.
+        self.current_message_index = int(elapsed // MESSAGE_ROTATE_SECONDS) % len(
             self.loading_messages
         )
-        message = self.loading_messages[self.current_message_index]
+        return (
+            rate_text,
+            self.loading_messages[self.current_message_index],
+            _format_elapsed(elapsed),
+        )
+
+    def _get_status_text(self) -> Text:
+        """Generate a status text with current rate and animated message"""
+        return self._assemble_status_text(self._status_parts(time.time()))
 
-        # Create a highly visible status text
+    @staticmethod
+    def _assemble_status_text(parts: tuple) -> Text:
+        rate_text, message, elapsed = parts
         return Text.assemble(
             Text(f"⏳ {rate_text} 🐾", style="bold cyan"),
             Text(f" {message}", style="yellow"),
+            Text(f" {elapsed}", style="dim"),
+        )
+
+    def _refresh(self, live: Live) -> float:
+        """Redraw ``live`` if the status line changed; returns the next delay."""
+        now = time.time()
+        settling = (
+            self.last_update_time is not None
+            and now - self.last_update_time <= RATE_WINDOW_SECONDS
+        )
+        if self._dirty or settling:
+            self._dirty = False
+            self._calculate_rate(now)
+        parts = self._status_parts(now)
+        if parts != self._rendered:
+            self._rendered = parts
+            live.update(self._assemble_status_text(parts), refresh=True)
+        if settling:
+            return STREAMING_REFRESH_SECONDS
+        elapsed = max(0.0, now - self.start_time) if self.start_time else 0.0
+        next_change = min(
+            _next_elapsed_change(elapsed),
+            (elapsed // MESSAGE_ROTATE_SECONDS + 1) * MESSAGE_ROTATE_SECONDS,
         )
+        return max(0.05, min(IDLE_REFRESH_SECONDS, next_change - elapsed))
 
     async def _update_display(self) -> None:
-        """Update the display continuously while active using Rich Live display"""
+        """Redraw the Rich Live status line, but only when it changes."""
         # Lazy import to avoid circular dependency during module initialization
         from code_puppy.messaging import emit_info
 
         # Add a newline to ensure we're below the blue bar
         emit_info("")
 
-        # Create a Live display that will update in-place
+        self._rendered = None
+        # No auto-refresh thread: _refresh draws exactly when the text changes.
         with Live(
             self._get_status_text(),
             console=self.console,
-            refresh_per_second=2,  # Update twice per second
+            auto_refresh=False,
             transient=False,  # Keep the final state visible
         ) as live:
-            # Keep updating the live display while active
             while self.is_active:
-                live.update(self._get_status_text())
-                await asyncio.sleep(0.5)
+                await asyncio.sleep(self._refresh(live))
 
     def start(self) -> None:
         """Start the status display"""
@@ -269,7 +344,8 @@ class StatusDisplay:
             self.current_rate = 0
             self._tool_pause_start = None
             self._paused_total = 0.0
-            self._paused_total_at_last_update = 0.0
+            self._rate_samples.clear()
+            self._dirty = True
             self.task = asyncio.create_task(self._update_display())
 
     def _emit_final_stats(self) -> None:
@@ -303,7 +379,7 @@ class StatusDisplay:
             self.current_rate = 0
             self._tool_pause_start = None
             self._paused_total = 0.0
-            self._paused_total_at_last_update = 0.0
+            self._rate_samples.clear()
 
             # Reset global rate to 0 to avoid affecting subsequent tasks
             global CURRENT_TOKEN_RATE
@@ -0,0 +1,383 @@
+"""Token counting for context accounting: exact where possible, calibrated elsewhere.
+
+Compaction thresholds and context-overhead numbers used to come from a flat
+``len(text) / 2.5``, which is off by up to 2x on code-heavy or non-English
+history. :func:`tokenizer_for` now picks, per model:
+
+1. the model family's **exact tokenizer** when one is available locally
+   (tiktoken for OpenAI families, installed with the ``tokenizers`` extra;
+   plugins can register more with :func:`register_tokenizer_family`). It
+   loads on a background thread the first time the family is seen, and
+   counts are served from an LRU cache keyed on content hash, because the
+   same history is recounted before every request;
+2. otherwise a **calibrated chars-per-token ratio**, fitted from the
+   provider-reported ``usage`` of recent responses
+   (:func:`record_usage_sample`);
+3. otherwise the classic 2.5 chars/token heuristic, scaled by the per-model
+   fudge factors in :data:`TOKEN_MULTIPLIER_RULES`.
+
+``token_estimator`` in puppy.cfg can pin ``calibrated`` (never use exact
+tokenizers) or ``heuristic`` (the old fixed ratio, no calibration).
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Protocol, Tuple
+
+HEURISTIC_CHARS_PER_TOKEN = 2.5
+TOKEN_ESTIMATORS = ("auto", "calibrated", "heuristic")
+
+# Models whose tokenizer the char/2.5 heuristic systematically *under*counts;
+# bump by a calibration factor. Case-insensitive substring match — vendor
+# naming order is a coin flip.
+TOKEN_MULTIPLIER_RULES: tuple[tuple[tuple[str, ...], float], ...] = (
+    (("opus-4-7", "4-7-opus"), 1.35),
+)
+
+# A usage sample whose ratio falls outside this band is a compaction,
+# cache accounting quirk or hidden reasoning, not a tokenizer property.
+MIN_CHARS_PER_TOKEN = 1.0
+MAX_CHARS_PER_TOKEN = 8.0
+CALIBRATION_WINDOW = 32
+CALIBRATION_MIN_SAMPLES = 3
+
+COUNT_CACHE_SIZE = 8192
+
+
+class Tokenizer(Protocol):
+    name: str
+    exact: bool
+
+    def count(self, text: str) -> int: ...
+
+
+class CharRatioTokenizer:
+    """``max(1, floor(len(text) / chars_per_token))`` for non-empty text."""
+
+    exact = False
+
+    def __init__(self, name: str, chars_per_token: float):
+        self.name = name
+        self.chars_per_token = chars_per_token
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        return max(1, math.floor(len(text) / self.chars_per_token))
+
+
+class CachedTokenizer:
+    """Wraps an exact encoder with the shared content-hash LRU cache."""
+
+    exact = True
+
+    def __init__(self, name: str, encode: Callable[[str], list]):
+        self.name = name
+        self._encode = encode
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        key = (self.name, len(text), hash(text))
+        cached = _count_cache.get(key)
+        if cached is not None:
+            return cached
+        tokens = len(self._encode(text))
+        _count_cache.put(key, tokens)
+        return tokens
+
+
+class _CountCache:
+    """Thread-safe LRU of token counts keyed on (tokenizer, length, str hash).
+
+    Keys hold a hash instead of the text, so the cache never pins old
+    history in memory.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, int, int], int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, int, int]) -> Optional[int]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Tuple[str, int, int], value: int) -> None:
+        with self._lock:
+            self._entries[key] = value
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+_count_cache = _CountCache(COUNT_CACHE_SIZE)
+
+
+def count_cache_stats() -> Dict[str, int]:
+    """Hit/miss counters and size of the exact-count cache."""
+    return {
+        "hits": _count_cache.hits,
+        "misses": _count_cache.misses,
+        "size": len(_count_cache._entries),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Exact tokenizers per model family
+# ---------------------------------------------------------------------------
+TokenizerLoader = Callable[[], Optional[Tokenizer]]
+
+
+def _tiktoken_loader(encoding_name: str) -> TokenizerLoader:
+    def load() -> Optional[Tokenizer]:
+        try:
+            import tiktoken
+        except ImportError:
+            return None
+        # May download the BPE ranks once; tiktoken caches them on disk.
+        encoding = tiktoken.get_encoding(encoding_name)
+        return CachedTokenizer(f"tiktoken:{encoding_name}", encoding.encode_ordinary)
+
+    return load
+
+
+NameTokens = Tuple[str, ...]
+
+
+def _name_tokens(name: str) -> NameTokens:
+    """``"openai/gpt-4.1-mini"`` -> ``("openai", "gpt", "4", "1", "mini")``."""
+    return tuple(t for t in re.split(r"[^a-z0-9]+", name.lower()) if t)
+
+
+def _contains_run(tokens: NameTokens, run: NameTokens) -> bool:
+    width = len(run)
+    return any(tokens[i : i + width] == run for i in range(len(tokens) - width + 1))
+
+
+# Needles match whole name tokens, so "o1" finds "openai/o1-mini" but not
+# "gemini-pro1". Checked in order, first match wins: keep the more specific
+# needles first.
+_FAMILIES: List[Tuple[Tuple[NameTokens, ...], str, TokenizerLoader]] = [
+    (
+        tuple(
+            _name_tokens(n)
+            for n in ("gpt-4o", "gpt-4.1", "gpt-5", "o1", "o3", "o4-mini", "codex")
+        ),
+        "o200k_base",
+        _tiktoken_loader("o200k_base"),
+    ),
+    (
+        (_name_tokens("gpt-4"), _name_tokens("gpt-3.5")),
+        "cl100k_base",
+        _tiktoken_loader("cl100k_base"),
+    ),
+]
+
+_LOADING = object()
+_loaded: Dict[str, object] = {}
+_loaded_lock = threading.Lock()
+
+
+def register_tokenizer_family(
+    needles: Tuple[str, ...], key: str, loader: TokenizerLoader
+) -> None:
+    """Use ``loader``'s tokenizer for models whose name contains a needle.
+
+    Names and needles are compared as runs of alphanumeric tokens, so
+    ``"gpt-4"`` matches ``"azure/gpt-4-turbo"`` but not ``"gpt-4o"``.
+    ``key`` identifies the tokenizer (families may share one). Registered
+    families take precedence over the built-in ones. ``loader`` runs on a
+    background thread and may return None when the tokenizer is
+    unavailable; the model then falls back to calibrated estimates.
+    """
+    _FAMILIES.insert(0, (tuple(_name_tokens(n) for n in needles), key, loader))
+    _family_memo.clear()
+
+
+# model name -> its family; every message of a history pass asks again.
+_family_memo: Dict[str, Optional[Tuple[str, TokenizerLoader]]] = {}
+
+
+def _family_for(model_name: str) -> Optional[Tuple[str, TokenizerLoader]]:
+    try:
+        return _family_memo[model_name]
+    except KeyError:
+        pass
+    tokens = _name_tokens(model_name)
+    family = None
+    for needles, key, loader in _FAMILIES:
+        if any(_contains_run(tokens, needle) for needle in needles):
+            family = key, loader
+            break
+    _family_memo[model_name] = family
+    return family
+
+
+def _load_into_registry(key: str, loader: TokenizerLoader) -> None:
+    try:
+        tokenizer = loader()
+    except Exception:
+        tokenizer = None
+    with _loaded_lock:
+        _loaded[key] = tokenizer
+
+
+def _exact_tokenizer(model_name: str, wait: bool = False) -> Optional[Tokenizer]:
+    family = _family_for(model_name)
+    if family is None:
+        return None
+    key, loader = family
+    with _loaded_lock:
+        state = _loaded.get(key)
+        start = state is None and key not in _loaded
+        if start:
+            _loaded[key] = _LOADING
+    if start:
+        if wait:
+            _load_into_registry(key, loader)
+        else:
+            threading.Thread(
+                target=_load_into_registry,
+                args=(key, loader),
+                name=f"tokenizer-load-{key}",
+                daemon=True,
+            ).start()
+            return None
+    state = _loaded.get(key)
+    if state is _LOADING:
+        return None
+    return state  # type: ignore[return-value]
+
+
+def preload_tokenizer(model_name: str) -> Optional[Tokenizer]:
+    """Load ``model_name``'s exact tokenizer now (blocking); None if unavailable."""
+    return _exact_tokenizer(model_name, wait=True)
+
+
+# ---------------------------------------------------------------------------
+# Calibration from provider-reported usage
+# ---------------------------------------------------------------------------
+@dataclass
+class _Calibration:
+    samples: Deque[Tuple[int, int]]
+    tokenizer: Optional[CharRatioTokenizer] = None
+
+    def fit(self, model_name: str) -> None:
+        if len(self.samples) < CALIBRATION_MIN_SAMPLES:
+            self.tokenizer = None
+            return
+        # Ratio of sums: the least-squares fit of tokens = chars / ratio
+        # weighted by size, so one tiny turn can't swing it.
+        chars = sum(c for c, _ in self.samples)
+        tokens = sum(t for _, t in self.samples)
+        self.tokenizer = CharRatioTokenizer(f"calibrated:{model_name}", chars / tokens)
+
+
+_calibrations: Dict[str, _Calibration] = {}
+
+
+def record_usage_sample(model_name: str, chars: int, tokens: int) -> bool:
+    """Feed one (estimator chars, provider tokens) observation; True if kept."""
+    if not model_name or chars <= 0 or tokens <= 0:
+        return False
+    ratio = chars / tokens
+    if not MIN_CHARS_PER_TOKEN <= ratio <= MAX_CHARS_PER_TOKEN:
+        return False
+    calibration = _calibrations.get(model_name)
+    if calibration is None:
+        calibration = _calibrations[model_name] = _Calibration(
+            deque(maxlen=CALIBRATION_WINDOW)
+        )
+    calibration.samples.append((chars, tokens))
+    calibration.fit(model_name)
+    return True
+
+
+def calibrated_chars_per_token(model_name: str) -> Optional[float]:
+    """The fitted ratio for ``model_name``, or None until enough samples."""
+    calibration = _calibrations.get(model_name)
+    if calibration is None or calibration.tokenizer is None:
+        return None
+    return calibration.tokenizer.chars_per_token
+
+
+# ---------------------------------------------------------------------------
+# Selection
+# ---------------------------------------------------------------------------
+HEURISTIC = CharRatioTokenizer("heuristic", HEURISTIC_CHARS_PER_TOKEN)
+_heuristics: Dict[float, CharRatioTokenizer] = {1.0: HEURISTIC}
+
+
+def model_token_multiplier(model_name: Optional[str]) -> float:
+    """Per-model fudge factor for the uncalibrated char heuristic.
+
+    Returns 1.0 when ``model_name`` is falsy or doesn't match any rule.
+    """
+    if not model_name:
+        return 1.0
+    lowered = model_name.lower()
+    for needles, factor in TOKEN_MULTIPLIER_RULES:
+        if any(needle in lowered for needle in needles):
+            return factor
+    return 1.0
+
+
+def heuristic_tokenizer(model_name: Optional[str] = None) -> CharRatioTokenizer:
+    """The fixed-ratio estimator, scaled by ``model_name``'s multiplier."""
+    multiplier = model_token_multiplier(model_name)
+    tokenizer = _heuristics.get(multiplier)
+    if tokenizer is None:
+        tokenizer = _heuristics[multiplier] = CharRatioTokenizer(
+            f"heuristic*{multiplier}", HEURISTIC_CHARS_PER_TOKEN / multiplier
+        )
+    return tokenizer
+
+
+def tokenizer_for(model_name: Optional[str], mode: Optional[str] = None) -> Tokenizer:
+    """Best available token counter for ``model_name`` (see module docstring).
+
+    ``mode`` defaults to the ``token_estimator`` config value. Without a
+    model name this is always the plain 2.5 chars/token heuristic.
+    """
+    if not model_name:
+        return HEURISTIC
+    if mode is None:
+        from code_puppy.config import get_token_estimator
+
+        mode = get_token_estimator()
+    if mode == "heuristic":
+        return heuristic_tokenizer(model_name)
+    if mode == "auto":
+        exact = _exact_tokenizer(model_name)
+        if exact is not None:
+            return exact
+    calibration = _calibrations.get(model_name)
+    if calibration is not None and calibration.tokenizer is not None:
+        return calibration.tokenizer
+    return heuristic_tokenizer(model_name)
+
+
+def _reset_for_tests() -> None:
+    _count_cache.clear()
+    _family_memo.clear()
+    _calibrations.clear()
+    with _loaded_lock:
+        _loaded.clear()
@@ -9,16 +9,18 @@ Design note — *why* we re-implement the token counting locally:
 full the context window is. The core runtime has two layers that make
 token counts vary between models:
 
-1. The ``token_ratio_learner`` plugin monkeypatches
-   ``_history.estimate_tokens`` to use *learned* chars-per-token ratios
-   per model. Great for compaction decisions — terrible for a
-   user-facing dashboard, because the same conversation reports
-   different token counts on different models.
-
-2. ``_history._apply_multiplier`` bumps some models (e.g. Opus 4.7 by
-   1.35×) to compensate for tokenizers that over-tokenize relative to
-   our heuristic. Again: useful for safety margins, lousy for
-   "consistency between models".
+1. ``code_puppy.token_counting`` counts with each model's exact
+   tokenizer where one is available, and otherwise with a chars-per-token
+   ratio *learned* from provider-reported usage (the
+   ``token_ratio_learner`` plugin can still monkeypatch
+   ``_history.estimate_tokens`` on top). Great for compaction decisions —
+   terrible for a user-facing dashboard, because the same conversation
+   reports different token counts on different models.
+
+2. Uncalibrated models fall back to the heuristic bumped by
+   ``token_counting.model_token_multiplier`` (e.g. Opus 4.7 by 1.35×) to
+   compensate for tokenizers that over-tokenize relative to it. Again:
+   useful for safety margins, lousy for "consistency between models".
 
 To keep ``/context`` honest and stable across model switches, this
 module uses its OWN raw ``max(1, floor(len(text) / 2.5))`` estimator
@@ -0,0 +1,65 @@
+"""In-process wall-time metrics for tool calls.
+
+``pydantic_patches.patch_tool_call_callbacks`` already times every tool
+execution with ``perf_counter``; it feeds each measurement into
+:func:`record_tool_call` so per-tool call counts, error counts, and timings
+are available for the rest of the process. ``/tool_stats`` renders them.
+
+Stdlib-only on purpose: the patch layer imports this before config and
+messaging are initialised.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from threading import Lock
+from typing import Dict
+
+
+@dataclass
+class ToolTiming:
+    """Aggregated wall time for one tool name."""
+
+    calls: int = 0
+    errors: int = 0
+    total_ms: float = 0.0
+    min_ms: float = 0.0
+    max_ms: float = 0.0
+    last_ms: float = 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+
+_lock = Lock()
+_timings: Dict[str, ToolTiming] = {}
+
+
+def record_tool_call(tool_name: str, duration_ms: float, error: bool = False) -> None:
+    """Fold one tool execution into the registry."""
+    with _lock:
+        timing = _timings.get(tool_name)
+        if timing is None:
+            timing = _timings[tool_name] = ToolTiming(min_ms=duration_ms)
+        timing.calls += 1
+        if error:
+            timing.errors += 1
+        timing.total_ms += duration_ms
+        timing.last_ms = duration_ms
+        if duration_ms < timing.min_ms:
+            timing.min_ms = duration_ms
+        if duration_ms > timing.max_ms:
+            timing.max_ms = duration_ms
+
+
+def get_tool_timings() -> Dict[str, ToolTiming]:
+    """Snapshot of every tool's timing, safe to read without the lock."""
+    with _lock:
+        return {name: replace(timing) for name, timing in _timings.items()}
+
+
+def reset_tool_timings() -> None:
+    """Forget all recorded timings."""
+    with _lock:
+        _timings.clear()
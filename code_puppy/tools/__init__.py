@@ -1,15 +1,10 @@
+import importlib
 import os
 import sys
 
 from code_puppy.callbacks import on_register_agent_tools, on_register_tools
 from code_puppy.messaging import emit_warning
 from code_puppy.tools.agent_tools import register_list_agents
-from code_puppy.tools.subagent_invocation import (
-    register_invoke_agent,
-    register_invoke_agent_with_model,
-)
-from code_puppy.tools.ask_user_question import register_ask_user_question
-
 from code_puppy.tools.command_runner import (
     register_agent_run_shell_command,
     register_agent_share_your_reasoning,
@@ -17,56 +12,153 @@ from code_puppy.tools.command_runner import (
 from code_puppy.tools.display import (
     display_non_streamed_result as display_non_streamed_result,
 )
-from code_puppy.tools.file_modifications import (
-    register_create_file,
-    register_delete_file,
-    register_delete_snippet,
-    register_edit_file,
-    register_replace_in_file,
-)
-from code_puppy.tools.file_operations import (
-    register_grep,
-    register_list_files,
-    register_read_file,
-)
-from code_puppy.tools.image_tools import register_load_image
-from code_puppy.tools.model_tools import register_list_available_models
 
-# Map of tool names to their individual registration functions
+
+class LazyToolRegistration:
+    """A ``TOOL_REGISTRY`` entry whose tool module is imported on first use.
+
+    Most tool modules are only needed once an agent that uses them is built,
+    yet importing them all up front (Playwright for the browser tools, PIL
+    for image loading, ...) used to sit on every cold start. Calling the
+    entry imports ``module``, looks up ``attr`` and registers as usual.
+    """
+
+    __slots__ = ("module", "attr", "_register")
+
+    def __init__(self, module: str, attr: str):
+        self.module = module
+        self.attr = attr
+        self._register = None
+
+    def resolve(self):
+        """Import the tool module (once) and return its register function."""
+        if self._register is None:
+            self._register = getattr(importlib.import_module(self.module), self.attr)
+        return self._register
+
+    def __call__(self, agent, *args, **kwargs):
+        return self.resolve()(agent, *args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"LazyToolRegistration({self.module}:{self.attr})"
+
+
+def _lazy(module: str, attr: str) -> LazyToolRegistration:
+    return LazyToolRegistration(f"code_puppy.tools.{module}", attr)
+
+
+# Map of tool names to their individual registration functions.
+# agent_tools and command_runner are already imported by the agent runtime,
+# so only the remaining tool modules are deferred.
 TOOL_REGISTRY = {
     # Agent Tools
     "list_agents": register_list_agents,
-    "invoke_agent": register_invoke_agent,
-    "invoke_agent_with_model": register_invoke_agent_with_model,
-    "list_available_models": register_list_available_models,
+    "invoke_agent": _lazy("subagent_invocation", "register_invoke_agent"),
+    "invoke_agent_with_model": _lazy(
+        "subagent_invocation", "register_invoke_agent_with_model"
+    ),
+    "invoke_agents_parallel": _lazy(
+        "subagent_fanout", "register_invoke_agents_parallel"
+    ),
+    "list_available_models": _lazy("model_tools", "register_list_available_models"),
     # File Operations
-    "list_files": register_list_files,
-    "read_file": register_read_file,
-    "grep": register_grep,
+    "list_files": _lazy("file_operations", "register_list_files"),
+    "read_file": _lazy("file_operations", "register_read_file"),
+    "grep": _lazy("file_operations", "register_grep"),
     # File Modifications
-    "edit_file": register_edit_file,  # DEPRECATED: auto-expanded to create_file, replace_in_file, delete_snippet
-    "create_file": register_create_file,
-    "replace_in_file": register_replace_in_file,
-    "delete_snippet": register_delete_snippet,
-    "delete_file": register_delete_file,
+    "edit_file": _lazy(
+        "file_modifications", "register_edit_file"
+    ),  # DEPRECATED: auto-expanded to create_file, replace_in_file, delete_snippet
+    "create_file": _lazy("file_modifications", "register_create_file"),
+    "replace_in_file": _lazy("file_modifications", "register_replace_in_file"),
+    "delete_snippet": _lazy("file_modifications", "register_delete_snippet"),
+    "delete_file": _lazy("file_modifications", "register_delete_file"),
     # Command Runner
     "agent_run_shell_command": register_agent_run_shell_command,
     "agent_share_your_reasoning": register_agent_share_your_reasoning,
     # User Interaction
-    "ask_user_question": register_ask_user_question,
+    "ask_user_question": _lazy("ask_user_question", "register_ask_user_question"),
     # Image loading (used by browser/QA agents and friends)
-    "load_image_for_analysis": register_load_image,
+    "load_image_for_analysis": _lazy("image_tools", "register_load_image"),
+}
+
+# Browser tool name -> (module under code_puppy.tools.browser, register function).
+# Kept here rather than in the browser package so listing the tools never
+# imports Playwright; browser.tool_registry resolves the same table eagerly.
+BROWSER_TOOL_SPECS: dict[str, tuple[str, str]] = {
+    "browser_initialize": ("browser_control", "register_initialize_browser"),
+    "browser_close": ("browser_control", "register_close_browser"),
+    "browser_status": ("browser_control", "register_get_browser_status"),
+    "browser_new_page": ("browser_control", "register_create_new_page"),
+    "browser_list_pages": ("browser_control", "register_list_pages"),
+    "browser_navigate": ("browser_navigation", "register_navigate_to_url"),
+    "browser_get_page_info": ("browser_navigation", "register_get_page_info"),
+    "browser_go_back": ("browser_navigation", "register_browser_go_back"),
+    "browser_go_forward": ("browser_navigation", "register_browser_go_forward"),
+    "browser_reload": ("browser_navigation", "register_reload_page"),
+    "browser_wait_for_load": ("browser_navigation", "register_wait_for_load_state"),
+    "browser_find_by_role": ("browser_locators", "register_find_by_role"),
+    "browser_find_by_text": ("browser_locators", "register_find_by_text"),
+    "browser_find_by_label": ("browser_locators", "register_find_by_label"),
+    "browser_find_by_placeholder": ("browser_locators", "register_find_by_placeholder"),
+    "browser_find_by_test_id": ("browser_locators", "register_find_by_test_id"),
+    "browser_xpath_query": ("browser_locators", "register_run_xpath_query"),
+    "browser_find_buttons": ("browser_locators", "register_find_buttons"),
+    "browser_find_links": ("browser_locators", "register_find_links"),
+    "browser_page_snapshot": ("browser_page_snapshot", "register_get_page_snapshot"),
+    "browser_click_by_role": (
+        "browser_semantic_interactions",
+        "register_click_by_role",
+    ),
+    "browser_click_by_text": (
+        "browser_semantic_interactions",
+        "register_click_by_text",
+    ),
+    "browser_set_text_by_label": (
+        "browser_semantic_interactions",
+        "register_set_text_by_label",
+    ),
+    "browser_click": ("browser_interactions", "register_click_element"),
+    "browser_double_click": ("browser_interactions", "register_double_click_element"),
+    "browser_hover": ("browser_interactions", "register_hover_element"),
+    "browser_set_text": ("browser_interactions", "register_set_element_text"),
+    "browser_get_text": ("browser_interactions", "register_get_element_text"),
+    "browser_get_value": ("browser_interactions", "register_get_element_value"),
+    "browser_select_option": ("browser_interactions", "register_select_option"),
+    "browser_check": ("browser_interactions", "register_browser_check"),
+    "browser_uncheck": ("browser_interactions", "register_browser_uncheck"),
+    "browser_execute_js": ("browser_scripts", "register_execute_javascript"),
+    "browser_scroll": ("browser_scripts", "register_scroll_page"),
+    "browser_scroll_to_element": ("browser_scripts", "register_scroll_to_element"),
+    "browser_set_viewport": ("browser_scripts", "register_set_viewport_size"),
+    "browser_wait_for_element": ("browser_scripts", "register_wait_for_element"),
+    "browser_highlight_element": (
+        "browser_scripts",
+        "register_browser_highlight_element",
+    ),
+    "browser_clear_highlights": (
+        "browser_scripts",
+        "register_browser_clear_highlights",
+    ),
+    "browser_screenshot_analyze": (
+        "browser_screenshot",
+        "register_take_screenshot_and_analyze",
+    ),
+    "browser_save_workflow": ("browser_workflows", "register_save_workflow"),
+    "browser_list_workflows": ("browser_workflows", "register_list_workflows"),
+    "browser_read_workflow": ("browser_workflows", "register_read_workflow"),
 }
 
 
 def _load_browser_tool_registry() -> dict[str, object]:
-    """Skip Playwright-backed tool imports on Android."""
+    """Lazy browser tool entries; none at all on Android (no Playwright)."""
     if sys.platform == "android":
         return {}
 
-    from code_puppy.tools.browser.tool_registry import BROWSER_TOOL_REGISTRY
-
-    return BROWSER_TOOL_REGISTRY
+    return {
+        name: _lazy(f"browser.{module}", attr)
+        for name, (module, attr) in BROWSER_TOOL_SPECS.items()
+    }
 
 
 TOOL_REGISTRY.update(_load_browser_tool_registry())
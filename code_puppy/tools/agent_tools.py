@@ -123,13 +123,13 @@ def _save_session_history(
 
     sessions_dir = _get_subagent_sessions_dir()
 
-    # Save the versioned JSON envelope (atomic write via session_storage so
-    # a crash mid-write can't corrupt an existing session file). Shares the
-    # exact serialization used by the main session store -- no drift.
-    from code_puppy.session_storage import build_envelope, write_envelope_file
+    # Append this invocation's new messages to the session journal, or
+    # rewrite the versioned envelope when that is due (see subagent_sessions).
+    # Shares the serialization used by the main session store -- no drift.
+    from code_puppy.tools import subagent_sessions
 
     json_path = sessions_dir / f"{session_id}.json"
-    write_envelope_file(json_path, build_envelope(message_history))
+    subagent_sessions.save_history(json_path, message_history)
 
     # Save or update txt file with metadata
     txt_path = sessions_dir / f"{session_id}.txt"
@@ -154,6 +154,8 @@ def _save_session_history(
         except Exception:
             pass  # If we can't update metadata, no big deal
 
+    subagent_sessions.schedule_sweep(sessions_dir, protect=(session_id,))
+
 
 def _load_session_history(session_id: str) -> List[ModelMessage]:
     """Load session history from filesystem.
@@ -170,7 +172,7 @@ def _load_session_history(session_id: str) -> List[ModelMessage]:
     # Validate session_id format before loading
     _validate_session_id(session_id)
 
-    from code_puppy.session_storage import decode_envelope, read_envelope_file
+    from code_puppy.tools.subagent_sessions import load_history
 
     sessions_dir = _get_subagent_sessions_dir()
     json_path = sessions_dir / f"{session_id}.json"
@@ -178,7 +180,7 @@ def _load_session_history(session_id: str) -> List[ModelMessage]:
 
     if json_path.exists():
         try:
-            return decode_envelope(read_envelope_file(json_path))
+            return load_history(json_path)
         except Exception:
             # Corrupted or incompatible session file: start fresh.
             return []
@@ -195,7 +197,7 @@ def _load_session_history(session_id: str) -> List[ModelMessage]:
             return []
         archive_legacy_pickle(pkl_path)
         try:
-            return decode_envelope(read_envelope_file(json_path))
+            return load_history(json_path)
         except Exception:
             return []
 
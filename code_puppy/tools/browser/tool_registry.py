@@ -1,105 +1,15 @@
-"""Registration map for the optional Playwright-backed browser tools."""
+"""Registration map for the optional Playwright-backed browser tools.
 
-from .browser_control import (
-    register_close_browser,
-    register_create_new_page,
-    register_get_browser_status,
-    register_initialize_browser,
-    register_list_pages,
-)
-from .browser_interactions import (
-    register_browser_check,
-    register_browser_uncheck,
-    register_click_element,
-    register_double_click_element,
-    register_get_element_text,
-    register_get_element_value,
-    register_hover_element,
-    register_select_option,
-    register_set_element_text,
-)
-from .browser_locators import (
-    register_find_buttons,
-    register_find_by_label,
-    register_find_by_placeholder,
-    register_find_by_role,
-    register_find_by_test_id,
-    register_find_by_text,
-    register_find_links,
-    register_run_xpath_query,
-)
-from .browser_navigation import (
-    register_browser_go_back,
-    register_browser_go_forward,
-    register_get_page_info,
-    register_navigate_to_url,
-    register_reload_page,
-    register_wait_for_load_state,
-)
-from .browser_page_snapshot import register_get_page_snapshot
-from .browser_screenshot import register_take_screenshot_and_analyze
-from .browser_scripts import (
-    register_browser_clear_highlights,
-    register_browser_highlight_element,
-    register_execute_javascript,
-    register_scroll_page,
-    register_scroll_to_element,
-    register_set_viewport_size,
-    register_wait_for_element,
-)
-from .browser_semantic_interactions import (
-    register_click_by_role,
-    register_click_by_text,
-    register_set_text_by_label,
-)
-from .browser_workflows import (
-    register_list_workflows,
-    register_read_workflow,
-    register_save_workflow,
-)
+The tool table itself lives in ``code_puppy.tools.BROWSER_TOOL_SPECS`` so
+``TOOL_REGISTRY`` can list browser tools without importing Playwright;
+importing this module resolves every entry eagerly.
+"""
+
+from importlib import import_module
+
+from code_puppy.tools import BROWSER_TOOL_SPECS
 
 BROWSER_TOOL_REGISTRY = {
-    "browser_initialize": register_initialize_browser,
-    "browser_close": register_close_browser,
-    "browser_status": register_get_browser_status,
-    "browser_new_page": register_create_new_page,
-    "browser_list_pages": register_list_pages,
-    "browser_navigate": register_navigate_to_url,
-    "browser_get_page_info": register_get_page_info,
-    "browser_go_back": register_browser_go_back,
-    "browser_go_forward": register_browser_go_forward,
-    "browser_reload": register_reload_page,
-    "browser_wait_for_load": register_wait_for_load_state,
-    "browser_find_by_role": register_find_by_role,
-    "browser_find_by_text": register_find_by_text,
-    "browser_find_by_label": register_find_by_label,
-    "browser_find_by_placeholder": register_find_by_placeholder,
-    "browser_find_by_test_id": register_find_by_test_id,
-    "browser_xpath_query": register_run_xpath_query,
-    "browser_find_buttons": register_find_buttons,
-    "browser_find_links": register_find_links,
-    "browser_page_snapshot": register_get_page_snapshot,
-    "browser_click_by_role": register_click_by_role,
-    "browser_click_by_text": register_click_by_text,
-    "browser_set_text_by_label": register_set_text_by_label,
-    "browser_click": register_click_element,
-    "browser_double_click": register_double_click_element,
-    "browser_hover": register_hover_element,
-    "browser_set_text": register_set_element_text,
-    "browser_get_text": register_get_element_text,
-    "browser_get_value": register_get_element_value,
-    "browser_select_option": register_select_option,
-    "browser_check": register_browser_check,
-    "browser_uncheck": register_browser_uncheck,
-    "browser_execute_js": register_execute_javascript,
-    "browser_scroll": register_scroll_page,
-    "browser_scroll_to_element": register_scroll_to_element,
-    "browser_set_viewport": register_set_viewport_size,
-    "browser_wait_for_element": register_wait_for_element,
-    "browser_highlight_element": register_browser_highlight_element,
-    "browser_clear_highlights": register_browser_clear_highlights,
-    "browser_screenshot_analyze": register_take_screenshot_and_analyze,
-    "browser_save_workflow": register_save_workflow,
-    "browser_list_workflows": register_list_workflows,
-    "browser_read_workflow": register_read_workflow,
+    name: getattr(import_module(f"{__package__}.{module}"), attr)
+    for name, (module, attr) in BROWSER_TOOL_SPECS.items()
 }
@@ -36,6 +36,7 @@ from code_puppy.tools.shell_backgrounding import (
     close_divert_log_on_exit,
     request_background_all,
 )
+from code_puppy.tools.shell_output import READ_CHUNK_BYTES, StreamCapture
 from code_puppy.tools.subagent_context import is_subagent
 
 # Maximum line length for shell command output to prevent massive token usage
@@ -687,8 +688,10 @@ def run_shell_command_streaming(
 
     foreground_limit_seconds = get_command_timeout_seconds()
 
-    stdout_lines = []
-    stderr_lines = []
+    # Raw bytes go to bounded captures (head, tail ring, spill file); only
+    # the lines on their way to the UI are ever decoded.
+    stdout_capture = StreamCapture("stdout", MAX_LINE_LENGTH)
+    stderr_capture = StreamCapture("stderr", MAX_LINE_LENGTH)
 
     stdout_thread = None
     stderr_thread = None
@@ -698,18 +701,30 @@ def run_shell_command_streaming(
     bg_generation_at_start = background_generation()
     divert_log: list = [None]
 
-    def _sink(line, lines_list, stream):
+    def _sink(data: bytes, capture: StreamCapture, stream):
         log = divert_log[0]
         if log is not None:
-            log.write_line(stream, line)
+            for line in capture.split(data):
+                log.write_line(stream, line)
             return
-        lines_list.append(line)
-        if not silent:
+        for line in capture.feed(data, lines=not silent):
             emit_shell_line(line, stream=stream)
 
-    def read_stdout():
+    def _sink_eof(capture: StreamCapture, stream):
+        log = divert_log[0]
+        for line in capture.finish():
+            if log is not None:
+                log.write_line(stream, line)
+            elif not silent:
+                emit_shell_line(line, stream=stream)
+
+    def _sink_text(text: str, capture: StreamCapture, stream):
+        # Windows reads through the text wrapper; re-encode for the capture.
+        _sink(text.encode("utf-8", errors="replace"), capture, stream)
+
+    def read_stream(pipe, capture: StreamCapture, stream):
         try:
-            fd = process.stdout.fileno()
+            fd = pipe.fileno()
         except (ValueError, OSError):
             return
 
@@ -723,28 +738,20 @@ def run_shell_command_streaming(
                 if sys.platform.startswith("win"):
                     # Windows: no select on pipes — PeekNamedPipe to check availability
                     try:
-                        if _win32_pipe_has_data(process.stdout):
-                            line = process.stdout.readline()
+                        if _win32_pipe_has_data(pipe):
+                            line = pipe.readline()
                             if not line:  # EOF
                                 break
-                            line = line.rstrip("\r\n")
-                            line = _truncate_line(line)
-                            _sink(line, stdout_lines, "stdout")
+                            _sink_text(line, capture, stream)
                             last_output_time[0] = time.time()
                         else:
                             # No data available, check if process has exited
                             if process.poll() is not None:
                                 # Process exited, do one final drain
                                 try:
-                                    remaining = process.stdout.read()
+                                    remaining = pipe.read()
                                     if remaining:
-                                        for line in remaining.split("\n"):
-                                            # Strip CR/LF like the readline path —
-                                            # Windows CRLF's stray \r would retrigger
-                                            # the renderer's redraw bypass.
-                                            line = line.rstrip("\r\n")
-                                            line = _truncate_line(line)
-                                            _sink(line, stdout_lines, "stdout")
+                                        _sink_text(remaining, capture, stream)
                                 except (ValueError, OSError):
                                     pass
                                 break
@@ -760,81 +767,27 @@ def run_shell_command_streaming(
                         break
 
                     if ready:
-                        line = process.stdout.readline()
-                        if not line:  # EOF
+                        # Straight from the fd: nothing is ever read through
+                        # the pipe's (text) wrapper, so it holds no buffered data.
+                        data = os.read(fd, READ_CHUNK_BYTES)
+                        if not data:  # EOF
                             break
-                        line = line.rstrip("\r\n")
-                        line = _truncate_line(line)
-                        _sink(line, stdout_lines, "stdout")
+                        _sink(data, capture, stream)
                         last_output_time[0] = time.time()
                     # If not ready, loop continues and checks stop event again
         except (ValueError, OSError):
             pass
         except Exception:
             pass
+        finally:
+            _sink_eof(capture, stream)
+            capture.close()
 
-    def read_stderr():
-        try:
-            fd = process.stderr.fileno()
-        except (ValueError, OSError):
-            return
-
-        try:
-            while True:
-                # Check stop event first
-                if stop_event.is_set():
-                    break
-
-                if sys.platform.startswith("win"):
-                    # Windows: no select on pipes — PeekNamedPipe to check availability
-                    try:
-                        if _win32_pipe_has_data(process.stderr):
-                            line = process.stderr.readline()
-                            if not line:  # EOF
-                                break
-                            line = line.rstrip("\r\n")
-                            line = _truncate_line(line)
-                            _sink(line, stderr_lines, "stderr")
-                            last_output_time[0] = time.time()
-                        else:
-                            # No data available, check if process has exited
-                            if process.poll() is not None:
-                                # Process exited, do one final drain
-                                try:
-                                    remaining = process.stderr.read()
-                                    if remaining:
-                                        for line in remaining.split("\n"):
-                                            # Strip CR/LF like the readline path —
-                                            # Windows CRLF's stray \r would retrigger
-                                            # the renderer's redraw bypass.
-                                            line = line.rstrip("\r\n")
-                                            line = _truncate_line(line)
-                                            _sink(line, stderr_lines, "stderr")
-                                except (ValueError, OSError):
-                                    pass
-                                break
-                            # Sleep briefly to avoid busy-waiting (100ms like POSIX)
-                            time.sleep(0.1)
-                    except (ValueError, OSError):
-                        break
-                else:
-                    try:
-                        ready, _, _ = select.select([fd], [], [], 0.1)
-                    except (ValueError, OSError, select.error):
-                        break
+    def read_stdout():
+        read_stream(process.stdout, stdout_capture, "stdout")
 
-                    if ready:
-                        line = process.stderr.readline()
-                        if not line:  # EOF
-                            break
-                        line = line.rstrip("\r\n")
-                        line = _truncate_line(line)
-                        _sink(line, stderr_lines, "stderr")
-                        last_output_time[0] = time.time()
-        except (ValueError, OSError):
-            pass
-        except Exception:
-            pass
+    def read_stderr():
+        read_stream(process.stderr, stderr_capture, "stderr")
 
     def cleanup_process_and_threads(timeout_type: str = "unknown"):
         nonlocal stdout_thread, stderr_thread
@@ -889,8 +842,8 @@ def run_shell_command_streaming(
             **{
                 "success": False,
                 "command": command,
-                "stdout": "\n".join(stdout_lines[-256:]),
-                "stderr": "\n".join(stderr_lines[-256:]),
+                "stdout": stdout_capture.text(),
+                "stderr": stderr_capture.text(),
                 "exit_code": -9,
                 "execution_time": execution_time,
                 "timeout": True,
@@ -928,8 +881,8 @@ def run_shell_command_streaming(
         return ShellCommandOutput(
             success=True,
             command=command,
-            stdout="\n".join(stdout_lines[-256:]),
-            stderr="\n".join(stderr_lines[-256:]),
+            stdout=stdout_capture.text(),
+            stderr=stderr_capture.text(),
             exit_code=None,
             execution_time=execution_time,
             timeout=False,
@@ -994,16 +947,17 @@ def run_shell_command_streaming(
 
         _unregister_process(process)
 
-        # Apply line length limits to stdout/stderr before returning
-        truncated_stdout = stdout_lines[-256:]
-        truncated_stderr = stderr_lines[-256:]
+        # Last 256 display-truncated lines (plus the head and a pointer to
+        # the full output when a stream spilled to disk)
+        truncated_stdout = stdout_capture.text()
+        truncated_stderr = stderr_capture.text()
 
         # Emit structured ShellOutputMessage for the UI (skip for silent sub-agents)
         if not silent:
             shell_output_msg = ShellOutputMessage(
                 command=command,
-                stdout="\n".join(truncated_stdout),
-                stderr="\n".join(truncated_stderr),
+                stdout=truncated_stdout,
+                stderr=truncated_stderr,
                 exit_code=exit_code,
                 duration_seconds=execution_time,
             )
@@ -1019,8 +973,8 @@ def run_shell_command_streaming(
                 command=command,
                 error="""The process didn't exit cleanly! If the user_interrupted flag is true,
                 please stop all execution and ask the user for clarification!""",
-                stdout="\n".join(truncated_stdout),
-                stderr="\n".join(truncated_stderr),
+                stdout=truncated_stdout,
+                stderr=truncated_stderr,
                 exit_code=exit_code,
                 execution_time=execution_time,
                 timeout=False,
@@ -1030,8 +984,8 @@ def run_shell_command_streaming(
         return ShellCommandOutput(
             success=True,
             command=command,
-            stdout="\n".join(truncated_stdout),
-            stderr="\n".join(truncated_stderr),
+            stdout=truncated_stdout,
+            stderr=truncated_stderr,
             exit_code=exit_code,
             execution_time=execution_time,
             timeout=False,
@@ -1044,8 +998,8 @@ def run_shell_command_streaming(
             success=False,
             command=command,
             error=f"Error during streaming execution: {str(e)}",
-            stdout="\n".join(stdout_lines[-256:]),
-            stderr="\n".join(stderr_lines[-256:]),
+            stdout=stdout_capture.text(),
+            stderr=stderr_capture.text(),
             exit_code=-1,
             timeout=False,
         )
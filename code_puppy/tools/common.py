@@ -833,18 +833,6 @@ def _format_diff_with_syntax_highlighting(
     extension = _extract_file_extension_from_diff(diff_text)
     lexer = _get_lexer_for_extension(extension)
 
-    # Generate background colors from foreground colors
-    add_fg = brighten_hex(addition_color, 0.6)
-    del_fg = brighten_hex(deletion_color, 0.6)
-
-    # Background colors for different line types
-    # Context lines have no background (None) for clean, minimal diffs
-    bg_colors = {
-        "removed": deletion_color,
-        "added": addition_color,
-        "context": None,  # No background for unchanged lines
-    }
-
     lines = diff_text.split("\n")
     # Remove trailing empty line if it exists (from trailing \n in diff)
     if lines and lines[-1] == "":
@@ -858,39 +846,11 @@ def _format_diff_with_syntax_highlighting(
                 result.append("\n")
             continue
 
-        # Skip diff headers - they're redundant noise since we show the filename in the banner
-        if line.startswith(("---", "+++", "@@", "diff ", "index ")):
+        formatted = _format_diff_line(line, lexer, addition_color, deletion_color)
+        # Diff headers come back as None and are skipped entirely
+        if formatted is None:
             continue
-        else:
-            # Determine line type and extract code content
-            if line.startswith("-"):
-                line_type = "removed"
-                code = line[1:]  # Remove the '-' prefix
-                marker_style = f"bold {del_fg} on {bg_colors[line_type]}"
-                prefix = "- "
-            elif line.startswith("+"):
-                line_type = "added"
-                code = line[1:]  # Remove the '+' prefix
-                marker_style = f"bold {add_fg} on {bg_colors[line_type]}"
-                prefix = "+ "
-            else:
-                line_type = "context"
-                code = line[1:] if line.startswith(" ") else line
-                # Context lines have no background - clean and minimal
-                marker_style = ""  # No special styling for context markers
-                prefix = "  "
-
-            # Add the marker prefix
-            if marker_style:  # Only apply style if we have one
-                result.append(prefix, style=marker_style)
-            else:
-                result.append(prefix)
-
-            # Add syntax-highlighted code
-            highlighted = _highlight_code_line(
-                code, bg_colors[line_type], lexer, line_type
-            )
-            result.append_text(highlighted)
+        result.append_text(formatted)
 
         # Add newline after each line except the last
         if i < len(lines) - 1:
@@ -899,6 +859,73 @@ def _format_diff_with_syntax_highlighting(
     return result
 
 
+def _diff_line_kind(line: str) -> str | None:
+    """``added``, ``removed`` or ``context`` for a diff body line.
+
+    Returns None for the headers (``---``, ``+++``, ``@@`` ...) that the
+    formatted diff leaves out, since the banner already names the file.
+    """
+    if line.startswith(("---", "+++", "@@", "diff ", "index ")):
+        return None
+    if line.startswith("-"):
+        return "removed"
+    if line.startswith("+"):
+        return "added"
+    return "context"
+
+
+def _format_diff_line(
+    line: str,
+    lexer,
+    addition_color: str | None,
+    deletion_color: str | None,
+    highlighted: Text | None = None,
+) -> Text | None:
+    """Format one non-empty diff line: marker prefix plus highlighted code.
+
+    Only ``added`` lines depend on ``addition_color`` and only ``removed``
+    lines on ``deletion_color``; context lines depend on neither. Callers
+    redrawing a line under several colors can pass ``highlighted`` (from
+    :func:`_highlight_diff_code`) to skip re-highlighting it.
+    """
+    line_type = _diff_line_kind(line)
+    if line_type is None:
+        return None
+
+    result = Text()
+    if line_type == "removed":
+        code = line[1:]  # Remove the '-' prefix
+        bg_color = deletion_color
+        # Marker foreground is a brighter take on the background color
+        result.append("- ", style=f"bold {brighten_hex(bg_color, 0.6)} on {bg_color}")
+    elif line_type == "added":
+        code = line[1:]  # Remove the '+' prefix
+        bg_color = addition_color
+        result.append("+ ", style=f"bold {brighten_hex(bg_color, 0.6)} on {bg_color}")
+    else:
+        code = line[1:] if line.startswith(" ") else line
+        # Context lines have no background - clean and minimal
+        bg_color = None
+        result.append("  ")
+
+    # Add syntax-highlighted code
+    if highlighted is None:
+        result.append_text(_highlight_code_line(code, bg_color, lexer, line_type))
+    else:
+        code_text = highlighted.copy()
+        if bg_color:
+            code_text.stylize(f"on {bg_color}")
+        result.append_text(code_text)
+    return result
+
+
+def _highlight_diff_code(line: str, lexer) -> Text:
+    """A diff line's code, highlighted but without any background color."""
+    line_type = _diff_line_kind(line) or "context"
+    code = line[1:] if line.startswith(("-", "+", " ")) else line
+    return _highlight_code_line(code, None, lexer, line_type)
+
+
 def format_diff_with_colors(
     diff_text: str,
     addition_color: str | None = None,
@@ -1638,6 +1665,7 @@ def write_project_file(
     never be rerouted to an editor workspace.
     """
     from code_puppy.tools.io_backends import get_filesystem_backend
+    from code_puppy.tools.read_cache import invalidating
 
     backend = get_filesystem_backend()
     if backend is not None:
@@ -1647,7 +1675,8 @@ def write_project_file(
             )
         backend.write_text_file(resolve_path(file_path), content)
         return
-    atomic_write_text(file_path, content, encoding=encoding)
+    with invalidating(file_path):
+        atomic_write_text(file_path, content, encoding=encoding)
 
 
 def _find_best_window(
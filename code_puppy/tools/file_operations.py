@@ -3,6 +3,7 @@
 import os
 import re
 import shutil
+import stat
 import subprocess
 import tempfile
 from typing import List
@@ -22,7 +23,7 @@ from code_puppy.messaging import (  # New structured messaging types
     get_message_bus,
 )
 from code_puppy.tools.common import resolve_path
-from code_puppy.tools import fs_access
+from code_puppy.tools import fs_access, read_cache
 
 
 # Pydantic models for tool return types
@@ -553,12 +554,40 @@ def _read_file(
             return ReadFileOutput(content=message, num_tokens=0, error=message)
         return _finalize_read_output(file_path, raw, start_line, num_lines)
 
-    if not os.path.exists(file_path):
+    try:
+        st = os.stat(file_path)
+    except (OSError, ValueError):
         error_msg = f"File {file_path} does not exist"
         return ReadFileOutput(content=error_msg, num_tokens=0, error=error_msg)
-    if not os.path.isfile(file_path):
+    if not stat.S_ISREG(st.st_mode):
         error_msg = f"{file_path} is not a file"
         return ReadFileOutput(content=error_msg, num_tokens=0, error=error_msg)
+    cache_key = None
+    if (start_line is None or start_line >= 1) and (
+        num_lines is None or num_lines >= 1
+    ):
+        cache_key = read_cache.read_key(st, start_line, num_lines)
+        cached = read_cache.file_read_cache.get(cache_key)
+        if cached is not None:
+            return _cached_read_output(file_path, cached, start_line, num_lines)
+    if start_line is not None and num_lines is not None:
+        if start_line >= 1 and num_lines >= 1:
+            # Shell output spilled to disk is indexed: seek, don't scan.
+            from code_puppy.tools.shell_output import read_spilled_lines
+
+            try:
+                spilled = read_spilled_lines(file_path, start_line, num_lines)
+            except OSError:
+                spilled = None
+            if spilled is not None:
+                return _finalize_read_output(
+                    file_path,
+                    spilled,
+                    start_line,
+                    num_lines,
+                    cache_key,
+                    len(spilled.encode("utf-8")),
+                )
     try:
         # errors="surrogateescape" handles invalid UTF-8 (common on Windows when
         # files contain emojis or were written by non-UTF-8 apps).
@@ -579,11 +608,15 @@ def _read_file(
                     itertools.islice(f, start_idx, start_idx + num_lines)
                 )
                 content = "".join(selected_lines)
+                source_bytes = len(content.encode("utf-8", errors="surrogateescape"))
             else:
                 # Read the entire file
                 content = f.read()
+                source_bytes = st.st_size
 
-        return _finalize_read_output(file_path, content, start_line, num_lines)
+        return _finalize_read_output(
+            file_path, content, start_line, num_lines, cache_key, source_bytes
+        )
     except FileNotFoundError:
         error_msg = "FILE NOT FOUND"
         return ReadFileOutput(content=error_msg, num_tokens=0, error=error_msg)
@@ -600,11 +633,15 @@ def _finalize_read_output(
     content: str,
     start_line: int | None,
     num_lines: int | None,
+    cache_key: read_cache.ReadKey | None = None,
+    source_bytes: int = 0,
 ) -> ReadFileOutput:
     """Sanitize/guard/emit for a just-read file body and build the output.
 
     Shared by the local (disk) and backend (host) read paths so both apply the
-    identical surrogate sanitization, 10k-token guard, and UI emission.
+    identical surrogate sanitization, 10k-token guard, and UI emission. With a
+    ``cache_key`` (local reads only) the result is also stored in the read
+    cache, oversized-file refusals included.
     """
     # Sanitize the content to remove any surrogate characters that could cause
     # issues when the content is later serialized or displayed.
@@ -621,28 +658,53 @@ def _finalize_read_output(
     # Simple approximation: ~4 characters per token
     num_tokens = len(content) // 4
     if num_tokens > 10000:
-        return ReadFileOutput(
+        cached = read_cache.CachedRead(
             content=None,
-            error="The file is massive, greater than 10,000 tokens which is dangerous to read entirely. Please read this file in chunks.",
             num_tokens=0,
+            error="The file is massive, greater than 10,000 tokens which is dangerous to read entirely. Please read this file in chunks.",
+            total_lines=0,
+            source_bytes=source_bytes,
+        )
+    else:
+        total_lines = content.count("\n") + (
+            1 if content and not content.endswith("\n") else 0
+        )
+        cached = read_cache.CachedRead(
+            content=content,
+            num_tokens=num_tokens,
+            error=None,
+            total_lines=total_lines,
+            source_bytes=source_bytes,
         )
+    if cache_key is not None:
+        read_cache.file_read_cache.put(cache_key, cached)
+    return _cached_read_output(file_path, cached, start_line, num_lines)
 
-    total_lines = content.count("\n") + (
-        1 if content and not content.endswith("\n") else 0
-    )
+
+def _cached_read_output(
+    file_path: str,
+    cached: read_cache.CachedRead,
+    start_line: int | None,
+    num_lines: int | None,
+) -> ReadFileOutput:
+    """Emit the file content to the UI (unless refused) and build the output."""
+    if cached.error is not None:
+        return ReadFileOutput(
+            content=cached.content, error=cached.error, num_tokens=cached.num_tokens
+        )
     emit_start_line = start_line if start_line is not None and start_line >= 1 else None
     emit_num_lines = num_lines if num_lines is not None and num_lines >= 1 else None
     get_message_bus().emit(
         FileContentMessage(
             path=file_path,
-            content=content,
+            content=cached.content,
             start_line=emit_start_line,
             num_lines=emit_num_lines,
-            total_lines=total_lines,
-            num_tokens=num_tokens,
+            total_lines=cached.total_lines,
+            num_tokens=cached.num_tokens,
         )
     )
-    return ReadFileOutput(content=content, num_tokens=num_tokens)
+    return ReadFileOutput(content=cached.content, num_tokens=cached.num_tokens)
 
 
 def _sanitize_string(text: str) -> str:
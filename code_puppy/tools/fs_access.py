@@ -27,6 +27,7 @@ from __future__ import annotations
 import os
 from typing import Callable, Iterator, List, Optional, Tuple
 
+from code_puppy.tools import read_cache
 from code_puppy.tools.io_backends import DirEntry, get_filesystem_backend
 
 
@@ -129,7 +130,7 @@ def write_text(path: str, content: str) -> None:
     if backend is not None:
         backend.write_text_file(path, content)
         return
-    with open(path, "w", encoding="utf-8") as f:
+    with read_cache.invalidating(path), open(path, "w", encoding="utf-8") as f:
         f.write(content)
 
 
@@ -141,7 +142,8 @@ def delete_file(path: str) -> None:
     if backend is not None:
         backend.delete_file(path)
         return
-    os.remove(path)
+    with read_cache.invalidating(path):
+        os.remove(path)
 
 
 def make_dirs(path: str) -> None:
@@ -19,6 +19,12 @@ from typing import Any, Dict, Union
 from PIL import Image, UnidentifiedImageError
 from pydantic_ai import BinaryContent, RunContext, ToolReturn
 
+from code_puppy.command_line.image_utils import (
+    REDUCING_GAP,
+    NormalizedImage,
+    image_digest,
+    normalized_image_cache,
+)
 from code_puppy.messaging import emit_error, emit_info, emit_success
 from code_puppy.tools.common import generate_group_id
 
@@ -39,6 +45,8 @@ def _validate_and_prepare_image(
     The MIME type is determined from the decoded image content, not from the
     file extension. If the image is resized, the output is normalized to PNG so
     the returned bytes and MIME type stay in sync like civilized software.
+    Pixels are only decoded when a resize is needed, and resizes are cached
+    by content hash so loading the same file again skips the work.
     """
     try:
         with Image.open(io.BytesIO(image_bytes)) as verified_image:
@@ -49,7 +57,6 @@ def _validate_and_prepare_image(
         raise ValueError(f"Failed to verify image: {exc}") from exc
 
     with Image.open(io.BytesIO(image_bytes)) as image:
-        image.load()
         original_width, original_height = image.size
         image_format = image.format
         actual_media_type = Image.MIME.get(image_format or "")
@@ -69,17 +76,26 @@ def _validate_and_prepare_image(
         output_height = original_height
 
         if max_edge and largest_edge > max_edge:
-            ratio = max_edge / largest_edge
-            output_width = max(1, int(round(original_width * ratio)))
-            output_height = max(1, int(round(original_height * ratio)))
-            resized = image.resize(
-                (output_width, output_height), Image.Resampling.LANCZOS
-            )
-            output = io.BytesIO()
-            resized.save(output, format="PNG", optimize=True)
-            output.seek(0)
-            output_bytes = output.read()
-            output_media_type = "image/png"
+            key = image_digest(image_bytes, "edge", max_edge)
+            resized = normalized_image_cache.get(key)
+            if resized is None:
+                ratio = max_edge / largest_edge
+                size = (
+                    max(1, int(round(original_width * ratio))),
+                    max(1, int(round(original_height * ratio))),
+                )
+                # JPEGs decode straight at 1/2..1/8 scale; no-op otherwise.
+                image.draft(None, size)
+                output = io.BytesIO()
+                image.resize(
+                    size, Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP
+                ).save(output, format="PNG", optimize=True)
+                resized = NormalizedImage(output.getvalue(), "image/png", *size)
+                normalized_image_cache.put(key, resized)
+            output_bytes = resized.data
+            output_media_type = resized.media_type
+            output_width = resized.width
+            output_height = resized.height
             was_resized = True
 
         return {
@@ -0,0 +1,163 @@
+"""Process-wide cache of ``read_file`` results.
+
+Agents re-read the same files turn after turn, and subagents re-read what
+their parent just read. Each read used to open and decode the file and
+re-run the surrogate cleanup and token guard. Results are now cached under
+``(st_dev, st_ino, mtime_ns, size, line range)``, all of it from the one
+``stat`` the tool makes anyway. The device/inode pair names the file however
+the path was spelled (symlinks, ``..``, relative to another cwd), like a
+realpath would, without walking the path components. A repeat read of an
+unchanged file costs that stat and a dict lookup.
+
+Any change to the file changes the key, and writes through the agent's own
+tools (``write_project_file`` and the ``fs_access`` write/delete helpers)
+run inside :func:`invalidating`, so an edit landing within the filesystem's
+mtime granularity with an unchanged size is never served stale.
+
+Reads through a filesystem backend (editor hosts with unsaved buffers) are
+never cached.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator, NamedTuple, Optional, Tuple
+
+MAX_ENTRIES = 2048
+MAX_CACHED_CHARS = 64 * 1024 * 1024
+
+ReadKey = Tuple[int, int, int, int, Optional[int], Optional[int]]
+
+
+class CachedRead(NamedTuple):
+    content: Optional[str]
+    num_tokens: int
+    error: Optional[str]
+    total_lines: int
+    # Bytes behind the result (whole file, or the slice's lines): what a hit
+    # does not read again.
+    source_bytes: int
+
+
+def read_key(
+    st: os.stat_result, start_line: Optional[int], num_lines: Optional[int]
+) -> ReadKey:
+    """Cache key for the file ``st`` describes.
+
+    Only a read with both bounds is a slice; anything else reads the whole
+    file, so those share the unbounded key.
+    """
+    if start_line is None or num_lines is None:
+        start_line = num_lines = None
+    return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size, start_line, num_lines)
+
+
+class _ReadCache:
+    """Thread-safe LRU of read results, bounded by count and cached text."""
+
+    def __init__(self, max_entries: int, max_chars: int):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.bytes_saved = 0
+        self._chars = 0
+        self._entries: "OrderedDict[ReadKey, CachedRead]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: ReadKey) -> Optional[CachedRead]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.bytes_saved += value.source_bytes
+            return value
+
+    def put(self, key: ReadKey, value: CachedRead) -> None:
+        size = len(value.content or "")
+        if size > self.max_chars:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._chars -= len(previous.content or "")
+            self._entries[key] = value
+            self._chars += size
+            while len(self._entries) > self.max_entries or self._chars > self.max_chars:
+                _, evicted = self._entries.popitem(last=False)
+                self._chars -= len(evicted.content or "")
+
+    def invalidate(self, path: str) -> None:
+        """Drop every cached read (all versions and ranges) of the file at ``path``."""
+        try:
+            st = os.stat(path)
+        except (OSError, ValueError):
+            return
+        with self._lock:
+            stale = [
+                key
+                for key in self._entries
+                if key[0] == st.st_dev and key[1] == st.st_ino
+            ]
+            for key in stale:
+                self._chars -= len(self._entries.pop(key).content or "")
+            self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+            self.hits = self.misses = self.invalidations = self.bytes_saved = 0
+
+
+file_read_cache = _ReadCache(MAX_ENTRIES, MAX_CACHED_CHARS)
+
+
+def invalidate(path: str) -> None:
+    """Forget cached reads of the file currently at ``path``."""
+    file_read_cache.invalidate(path)
+
+
+@contextmanager
+def invalidating(path: str) -> Iterator[None]:
+    """Wrap a write or delete of ``path``.
+
+    Invalidates before (the file being replaced or removed) and after (the
+    file now there, e.g. rewritten in place within one mtime tick).
+    """
+    invalidate(path)
+    try:
+        yield
+    finally:
+        invalidate(path)
+
+
+def read_cache_stats() -> dict:
+    """Hit/miss counters, hit rate, bytes saved and size of the read cache."""
+    hits, misses = file_read_cache.hits, file_read_cache.misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        "bytes_saved": file_read_cache.bytes_saved,
+        "invalidations": file_read_cache.invalidations,
+        "size": len(file_read_cache._entries),
+        "chars": file_read_cache._chars,
+    }
+
+
+__all__ = [
+    "CachedRead",
+    "invalidate",
+    "invalidating",
+    "file_read_cache",
+    "read_cache_stats",
+    "read_key",
+]
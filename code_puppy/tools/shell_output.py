@@ -0,0 +1,321 @@
+"""Bounded capture of a foreground shell command's stdout/stderr.
+
+Split from ``command_runner`` (600-line cap). The streaming readers used to
+append every decoded line to a list until the command exited, so a build
+printing hundreds of megabytes held all of it in RAM although the model
+only ever sees the last 256 lines. Each stream now feeds raw bytes to a
+:class:`StreamCapture`:
+
+* the first ``HEAD_BYTES`` stay in a buffer and the last ``TAIL_BYTES`` in a
+  fixed-size ring -- the only output kept in memory;
+* once a stream outgrows the ring, everything (from byte 0) goes to a temp
+  file instead of being dropped;
+* for spilled files, the byte offset of the first line starting after every
+  ``INDEX_STRIDE_BYTES`` is recorded, and :func:`seek_spilled_line` lets
+  ``read_file`` jump to ``start_line`` instead of scanning from the top.
+
+Spilled files live until the process exits; only the most recent
+``MAX_SPILL_FILES`` are kept.
+"""
+
+from __future__ import annotations
+
+import atexit
+import bisect
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+HEAD_BYTES = 64 * 1024
+TAIL_BYTES = 1024 * 1024
+READ_CHUNK_BYTES = 64 * 1024
+INDEX_STRIDE_BYTES = 1024 * 1024
+# Lines of the head shown above the omission note once a stream spilled.
+HEAD_LINES = 20
+TAIL_LINES = 256
+# A line is truncated for display anyway; never buffer more of one than this.
+MAX_PENDING_LINE_BYTES = 16 * 1024
+MAX_SPILL_FILES = 8
+
+
+class _ByteRing:
+    """The last ``capacity`` bytes written, in a preallocated buffer."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._buffer = bytearray(capacity)
+        self._end = 0  # next write position
+        self.size = 0
+
+    def write(self, data) -> None:
+        view = memoryview(data)
+        if len(view) >= self.capacity:
+            self._buffer[:] = view[-self.capacity :]
+            self._end = 0
+            self.size = self.capacity
+            return
+        first = min(len(view), self.capacity - self._end)
+        self._buffer[self._end : self._end + first] = view[:first]
+        rest = len(view) - first
+        if rest:
+            self._buffer[:rest] = view[first:]
+        self._end = (self._end + len(view)) % self.capacity
+        self.size = min(self.capacity, self.size + len(view))
+
+    def getvalue(self) -> bytes:
+        if self.size < self.capacity:
+            return bytes(self._buffer[: self.size])
+        return bytes(self._buffer[self._end :] + self._buffer[: self._end])
+
+
+def _split_lines(data: bytes) -> List[bytes]:
+    # \n, \r and \r\n all end a line, as with the text pipes' newline="".
+    return data.splitlines()
+
+
+def _decode_line(line: bytes, max_length: int) -> str:
+    text = line.decode("utf-8", errors="replace")
+    if len(text) > max_length:
+        return text[:max_length] + "... [truncated]"
+    return text
+
+
+class StreamCapture:
+    """Head buffer, tail ring and (when needed) spill file for one stream.
+
+    ``feed`` is called from the stream's reader thread only; ``text`` may be
+    called from another thread once the reader has finished or detached.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_line_length: int,
+        head_bytes: Optional[int] = None,
+        tail_bytes: Optional[int] = None,
+    ):
+        self.name = name
+        self.max_line_length = max_line_length
+        self.head_bytes = HEAD_BYTES if head_bytes is None else head_bytes
+        self._head = bytearray()
+        self._tail = _ByteRing(TAIL_BYTES if tail_bytes is None else tail_bytes)
+        self._pending = bytearray()  # partial line not yet handed out
+        self.total_bytes = 0
+        self.total_lines = 0  # newline count
+        self.spill_path: Optional[str] = None
+        self._spill = None
+        self._index_lines = [0]
+        self._index_offsets = [0]
+        self._lock = threading.Lock()
+
+    @property
+    def spilled(self) -> bool:
+        return self.spill_path is not None
+
+    def feed(self, data: bytes, lines: bool = True) -> List[str]:
+        """Record ``data``; returns the lines it completed, display-truncated.
+
+        Pass ``lines=False`` when nobody displays them (silent commands).
+        """
+        with self._lock:
+            self._record(data)
+        return self.split(data) if lines else []
+
+    def split(self, data: bytes) -> List[str]:
+        """Display lines completed by ``data``, without recording it."""
+        pending = self._pending
+        pending += data
+        end = max(pending.rfind(b"\n"), pending.rfind(b"\r"))
+        # A trailing \r may be the first half of \r\n: wait for the next byte.
+        if end == len(pending) - 1 and pending.endswith(b"\r"):
+            end = max(pending.rfind(b"\n", 0, end), pending.rfind(b"\r", 0, end))
+        if end < 0:
+            if len(pending) > MAX_PENDING_LINE_BYTES:
+                del pending[MAX_PENDING_LINE_BYTES:]
+            return []
+        complete = bytes(pending[: end + 1])
+        del pending[: end + 1]
+        if len(pending) > MAX_PENDING_LINE_BYTES:
+            del pending[MAX_PENDING_LINE_BYTES:]
+        return [
+            _decode_line(line, self.max_line_length) for line in _split_lines(complete)
+        ]
+
+    def finish(self) -> List[str]:
+        """The final unterminated line, if any (call once at EOF)."""
+        rest = bytes(self._pending)
+        self._pending.clear()
+        if not rest:
+            return []
+        return [_decode_line(line, self.max_line_length) for line in _split_lines(rest)]
+
+    def _record(self, data: bytes) -> None:
+        size = len(data)
+        if not size:
+            return
+        start = self.total_bytes
+        if len(self._head) < self.head_bytes:
+            self._head += data[: self.head_bytes - len(self._head)]
+        if self._spill is None and start + size > self._tail.capacity:
+            self._start_spill()
+        if self._spill is not None:
+            self._spill.write(data)
+            self._index(data, start)
+        self._tail.write(data)
+        self.total_bytes = start + size
+        self.total_lines += data.count(b"\n")
+
+    def _start_spill(self) -> None:
+        try:
+            fd, path = tempfile.mkstemp(
+                prefix=f"code_puppy_{self.name}_", suffix=".log"
+            )
+            self._spill = os.fdopen(fd, "wb")
+            # Nothing has left the ring yet: it holds the whole stream so far.
+            earlier = self._tail.getvalue()
+            self._spill.write(earlier)
+            self._index(earlier, 0, lines_before=0)
+        except OSError:
+            self._spill = None
+            return
+        self.spill_path = path
+
+    def _index(self, data: bytes, start: int, lines_before: Optional[int] = None):
+        """Record (line, offset) for the first line after each stride boundary."""
+        if lines_before is None:
+            lines_before = self.total_lines
+        boundary = self._index_offsets[-1] + INDEX_STRIDE_BYTES
+        while boundary < start + len(data):
+            newline = data.find(b"\n", max(0, boundary - start))
+            if newline < 0:
+                return
+            self._index_lines.append(lines_before + data.count(b"\n", 0, newline) + 1)
+            self._index_offsets.append(start + newline + 1)
+            boundary = self._index_offsets[-1] + INDEX_STRIDE_BYTES
+
+    def close(self) -> None:
+        """Flush the spill file and make it pageable through read_file."""
+        with self._lock:
+            if self._spill is None or self._spill.closed:
+                return
+            try:
+                self._spill.close()
+            except OSError:
+                pass
+            _register_spill(self.spill_path, self._index_lines, self._index_offsets)
+
+    def text(self, tail_lines: int = TAIL_LINES) -> str:
+        """What the model sees: the last lines, plus head and a note if spilled."""
+        with self._lock:
+            tail = self._tail.getvalue()
+            head = bytes(self._head)
+            spilled = self.total_bytes > self._tail.capacity
+            omitted_lines = self.total_lines
+            total_bytes = self.total_bytes
+        lines = _split_lines(tail)
+        if spilled and lines:
+            lines = lines[1:]  # the ring starts mid-line
+        shown = [
+            _decode_line(line, self.max_line_length) for line in lines[-tail_lines:]
+        ]
+        if not spilled:
+            return "\n".join(shown)
+
+        head_shown = [
+            _decode_line(line, self.max_line_length)
+            for line in _split_lines(head)[:HEAD_LINES]
+        ]
+        omitted_lines -= len(head_shown) + len(shown)
+        where = (
+            f"full output ({self.total_lines:,} lines) saved to {self.spill_path}; "
+            "page through it with read_file(start_line=..., num_lines=...)"
+            if self.spill_path
+            else "full output was not saved"
+        )
+        note = (
+            f"[... {max(0, omitted_lines):,} lines ({total_bytes / 1e6:,.1f} MB "
+            f"total) omitted -- {where}]"
+        )
+        return "\n".join(head_shown + [note] + shown)
+
+
+# -- spilled-file index --------------------------------------------------------
+
+_SPILLS: "OrderedDict[str, Tuple[List[int], List[int]]]" = OrderedDict()
+_SPILLS_LOCK = threading.Lock()
+
+
+def _register_spill(path: str, lines: List[int], offsets: List[int]) -> None:
+    evicted = []
+    with _SPILLS_LOCK:
+        _SPILLS[os.path.realpath(path)] = (list(lines), list(offsets))
+        while len(_SPILLS) > MAX_SPILL_FILES:
+            evicted.append(_SPILLS.popitem(last=False)[0])
+    for old in evicted:
+        _remove(old)
+
+
+def seek_spilled_line(path: str, line: int) -> Optional[Tuple[int, int]]:
+    """``(line, byte offset)`` of the nearest indexed line at or before ``line``.
+
+    ``line`` is 0-based and counts ``\\n``-terminated lines. Returns None for
+    files that are not spilled shell output.
+    """
+    with _SPILLS_LOCK:
+        entry = _SPILLS.get(os.path.realpath(path))
+    if entry is None:
+        return None
+    lines, offsets = entry
+    position = bisect.bisect_right(lines, line) - 1
+    return lines[position], offsets[position]
+
+
+def read_spilled_lines(path: str, start_line: int, num_lines: int) -> Optional[str]:
+    """``num_lines`` lines of spilled output from 1-based ``start_line``.
+
+    Seeks to the nearest indexed line, so paging through a multi-gigabyte
+    build log costs at most one stride of reading. None if ``path`` is not
+    spilled shell output.
+    """
+    anchor = seek_spilled_line(path, start_line - 1)
+    if anchor is None:
+        return None
+    line, offset = anchor
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for _ in range(start_line - 1 - line):
+            if not f.readline():
+                return ""
+        chunks = []
+        for _ in range(num_lines):
+            chunk = f.readline()
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return b"".join(chunks).decode("utf-8", errors="replace")
+
+
+def _remove(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+@atexit.register
+def _remove_spills() -> None:
+    with _SPILLS_LOCK:
+        paths = list(_SPILLS)
+        _SPILLS.clear()
+    for path in paths:
+        _remove(path)
+
+
+__all__ = [
+    "READ_CHUNK_BYTES",
+    "StreamCapture",
+    "read_spilled_lines",
+    "seek_spilled_line",
+]
@@ -0,0 +1,165 @@
+"""``invoke_agents_parallel``: fan one request out to several sub-agents.
+
+Each task is an ordinary ``invoke_agent`` run (same sessions, messages and
+error handling), started together and admitted by the sub-agent governor,
+which caps runs globally and per model. Results come back in task order
+with how long each task queued and ran.
+"""
+
+import asyncio
+import time
+from typing import List
+
+from pydantic import BaseModel
+from pydantic_ai import RunContext
+
+from code_puppy.messaging import emit_error, emit_info
+from code_puppy.tools.common import generate_group_id
+from code_puppy.tools.subagent_governor import SlotTiming, current_slot_timing
+
+# One fan-out is one orchestrator decision; beyond this it is a batch job.
+MAX_PARALLEL_TASKS = 16
+
+
+class ParallelAgentTask(BaseModel):
+    """One sub-agent task in an ``invoke_agents_parallel`` call."""
+
+    agent_name: str
+    prompt: str
+    session_id: str | None = None
+
+
+class ParallelAgentResult(BaseModel):
+    """Outcome and timing of one fanned-out task."""
+
+    index: int
+    agent_name: str
+    session_id: str | None = None
+    model_name: str | None = None
+    response: str | None = None
+    error: str | None = None
+    queued_ms: float | None = None
+    run_ms: float | None = None
+    total_ms: float
+
+
+class InvokeAgentsParallelOutput(BaseModel):
+    """Output for the invoke_agents_parallel tool."""
+
+    results: List[ParallelAgentResult]
+    wall_ms: float = 0.0
+    error: str | None = None
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000.0, 1)
+
+
+async def _run_task(
+    context: RunContext,
+    index: int,
+    total: int,
+    task: ParallelAgentTask,
+    group_id: str,
+) -> ParallelAgentResult:
+    from code_puppy.tools.subagent_invocation import _invoke_agent_impl
+
+    label = f"[{index + 1}/{total}] {task.agent_name}"
+
+    def _on_start(timing: SlotTiming) -> None:
+        waited = (
+            f" after {timing.queued_seconds:.1f}s queued"
+            if timing.queued_seconds >= 0.05
+            else ""
+        )
+        emit_info(
+            f"{label} running on {timing.model_name or 'default model'}{waited}",
+            message_group=group_id,
+        )
+
+    # gather() runs each task in its own asyncio.Task, so this is task-local.
+    timing = SlotTiming(on_start=_on_start)
+    current_slot_timing.set(timing)
+    started = time.perf_counter()
+    output = await _invoke_agent_impl(
+        context=context,
+        agent_name=task.agent_name,
+        prompt=task.prompt,
+        session_id=task.session_id,
+    )
+    finished = time.perf_counter()
+
+    ran = timing.started_at is not None
+    outcome = "failed" if output.error else "done"
+    emit_info(f"{label} {outcome} in {finished - started:.1f}s", message_group=group_id)
+    return ParallelAgentResult(
+        index=index,
+        agent_name=task.agent_name,
+        session_id=output.session_id,
+        model_name=output.model_name,
+        response=output.response,
+        error=output.error,
+        queued_ms=_ms(timing.queued_seconds) if ran else None,
+        run_ms=_ms(finished - timing.started_at) if ran else None,
+        total_ms=_ms(finished - started),
+    )
+
+
+async def _invoke_agents_parallel_impl(
+    context: RunContext, tasks: List[ParallelAgentTask]
+) -> InvokeAgentsParallelOutput:
+    group_id = generate_group_id("invoke_agents_parallel")
+    if not tasks:
+        error = "tasks cannot be empty"
+    elif len(tasks) > MAX_PARALLEL_TASKS:
+        error = (
+            f"Too many tasks ({len(tasks)}); at most {MAX_PARALLEL_TASKS} "
+            "per invoke_agents_parallel call"
+        )
+    else:
+        error = None
+    if error:
+        emit_error(error, message_group=group_id)
+        return InvokeAgentsParallelOutput(results=[], error=error)
+
+    emit_info(f"Fanning out {len(tasks)} sub-agent task(s)", message_group=group_id)
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(
+            _run_task(context, index, len(tasks), task, group_id)
+            for index, task in enumerate(tasks)
+        )
+    )
+    return InvokeAgentsParallelOutput(
+        results=list(results), wall_ms=_ms(time.perf_counter() - started)
+    )
+
+
+def register_invoke_agents_parallel(agent):
+    """Register the invoke_agents_parallel fan-out tool."""
+
+    @agent.tool
+    async def invoke_agents_parallel(
+        context: RunContext, tasks: List[ParallelAgentTask]
+    ) -> InvokeAgentsParallelOutput:
+        """Run several independent sub-agent tasks at the same time.
+
+        Use this instead of many separate invoke_agent calls when the tasks
+        do not depend on each other. Runs are capped globally and per model
+        (extra tasks wait their turn), and results come back in the same
+        order as ``tasks``. The same delegation rules as invoke_agent apply:
+        never invoke yourself or an agent already in the invocation chain,
+        and tell each sub-agent to do its work without delegating further.
+
+        Args:
+            tasks: Up to 16 tasks, each with agent_name, prompt, and an
+                optional kebab-case session_id to continue a session.
+
+        Returns:
+            InvokeAgentsParallelOutput: One result per task (response,
+            session_id, model_name, error, queued_ms, run_ms, total_ms) and
+            the overall wall_ms.
+        """
+        return await _invoke_agents_parallel_impl(context, tasks)
+
+    return invoke_agents_parallel
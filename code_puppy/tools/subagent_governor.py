@@ -0,0 +1,166 @@
+"""Concurrency governor for sub-agent model runs.
+
+pydantic-ai runs a model's parallel tool calls concurrently, and
+``invoke_agents_parallel`` fans out on purpose, so without a cap one
+orchestrator turn can open as many provider streams as it likes. Every
+sub-agent run now takes a slot from the governor first:
+
+* at most ``subagent_max_concurrency`` runs at once, and
+* at most ``subagent_max_concurrency_per_model`` of them on one model.
+
+Waiters are served in arrival order, skipping only those whose model is at
+its own cap, so a busy model never holds up runs on an idle one and no run
+is overtaken by a later one that wants the same model.
+
+Limits apply per nesting depth: a parent holds its slot while its children
+run, so sharing one pool across depths could deadlock once every slot was
+held by a parent waiting on its child.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Deque, Dict, Optional, Tuple
+
+
+@dataclass
+class SlotTiming:
+    """Filled in by :meth:`SubagentGovernor.slot` for whoever set it."""
+
+    queued_seconds: float = 0.0
+    started_at: Optional[float] = None
+    model_name: Optional[str] = None
+    on_start: Optional[Callable[["SlotTiming"], None]] = None
+
+
+# Set by a caller (e.g. the fan-out tool) that wants to observe the slot
+# its sub-agent run waits for; the governor never requires it.
+current_slot_timing: contextvars.ContextVar[Optional[SlotTiming]] = (
+    contextvars.ContextVar("current_slot_timing", default=None)
+)
+
+
+class SubagentGovernor:
+    """Global and per-model run limits with fair, arrival-order queueing."""
+
+    def __init__(self, max_concurrent: int, max_per_model: int):
+        self.max_concurrent = max_concurrent
+        self.max_per_model = max_per_model
+        self.active = 0
+        self.active_by_model: Dict[str, int] = {}
+        self.peak = 0
+        self.peak_by_model: Dict[str, int] = {}
+        self._waiters: Deque[Tuple[str, asyncio.Future]] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _has_room(self, model: str) -> bool:
+        return (
+            self.active < self.max_concurrent
+            and self.active_by_model.get(model, 0) < self.max_per_model
+        )
+
+    def _take(self, model: str) -> None:
+        self.active += 1
+        in_use = self.active_by_model.get(model, 0) + 1
+        self.active_by_model[model] = in_use
+        self.peak = max(self.peak, self.active)
+        self.peak_by_model[model] = max(self.peak_by_model.get(model, 0), in_use)
+
+    def _release(self, model: str) -> None:
+        self.active -= 1
+        remaining = self.active_by_model[model] - 1
+        if remaining:
+            self.active_by_model[model] = remaining
+        else:
+            del self.active_by_model[model]
+        self._wake()
+
+    def _wake(self) -> None:
+        # Invariant after every wake: no waiter that could run is waiting.
+        for entry in list(self._waiters):
+            if self.active >= self.max_concurrent:
+                return
+            model, future = entry
+            if future.done():
+                self._waiters.remove(entry)
+            elif self._has_room(model):
+                self._waiters.remove(entry)
+                self._take(model)
+                future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, model_name: Optional[str]) -> AsyncIterator[None]:
+        """Hold one run slot for ``model_name`` for the duration of the block."""
+        model = model_name or ""
+        # Only clock the wait when someone asked for it.
+        timing = current_slot_timing.get()
+        queued_at = time.perf_counter() if timing is not None else 0.0
+        if self._has_room(model):
+            self._take(model)
+        else:
+            entry = (model, asyncio.get_running_loop().create_future())
+            self._waiters.append(entry)
+            try:
+                await entry[1]
+            except BaseException:
+                if entry[1].done() and not entry[1].cancelled():
+                    # Granted, then cancelled before we resumed: hand it on.
+                    self._release(model)
+                else:
+                    try:
+                        self._waiters.remove(entry)
+                    except ValueError:
+                        pass
+                raise
+
+        if timing is not None:
+            timing.started_at = time.perf_counter()
+            timing.queued_seconds = timing.started_at - queued_at
+            timing.model_name = model_name
+            if timing.on_start is not None:
+                timing.on_start(timing)
+        # Nested sub-agents started inside this run report to nobody.
+        token = current_slot_timing.set(None)
+        try:
+            yield
+        finally:
+            current_slot_timing.reset(token)
+            self._release(model)
+
+
+# Futures belong to one event loop, so governors do too.
+_GovernorsByDepth = Dict[int, SubagentGovernor]
+_governors: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _GovernorsByDepth]" = weakref.WeakKeyDictionary()
+
+
+def get_subagent_governor(depth: int = 0) -> SubagentGovernor:
+    """The running loop's governor for ``depth``, with current config limits."""
+    from code_puppy.config import (
+        get_subagent_max_concurrency,
+        get_subagent_max_concurrency_per_model,
+    )
+
+    by_depth = _governors.setdefault(asyncio.get_running_loop(), {})
+    governor = by_depth.get(depth)
+    max_concurrent = get_subagent_max_concurrency()
+    max_per_model = get_subagent_max_concurrency_per_model()
+    if governor is None:
+        governor = by_depth[depth] = SubagentGovernor(max_concurrent, max_per_model)
+    elif (governor.max_concurrent, governor.max_per_model) != (
+        max_concurrent,
+        max_per_model,
+    ):
+        # Picked up a /set change; raising a limit may admit waiters now.
+        governor.max_concurrent = max_concurrent
+        governor.max_per_model = max_per_model
+        governor._wake()
+    return governor
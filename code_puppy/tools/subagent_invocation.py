@@ -53,6 +53,7 @@ from code_puppy.tools.subagent_context import (
     get_subagent_model_name,
     subagent_context,
 )
+from code_puppy.tools.subagent_governor import get_subagent_governor
 from code_puppy.tools.subagent_usage_metrics import (
     _safe_usage_metrics,
     build_invoke_output,
@@ -396,9 +397,17 @@ async def _invoke_agent_impl(
             ):
                 manager = get_mcp_manager()
                 bound_agent_name = getattr(agent_config, "name", None)
+                still_starting = None
                 if bound_agent_name:
-                    await autostart_bound_servers_async(manager, bound_agent_name)
-                mcp_servers = manager.get_servers_for_agent(agent_name=bound_agent_name)
+                    report = await autostart_bound_servers_async(
+                        manager, bound_agent_name
+                    )
+                    # Servers that missed their deadline are still being entered
+                    # by their lifecycle task; attach them on a later run.
+                    still_starting = set(getattr(report, "pending", None) or ())
+                mcp_servers = manager.get_servers_for_agent(
+                    agent_name=bound_agent_name, exclude_names=still_starting
+                )
 
             from code_puppy.agents._compaction import make_history_processor
             from code_puppy.agents._model_message_transform import (
@@ -501,24 +510,30 @@ async def _invoke_agent_impl(
                             event_stream_handler=stream_handler,
                         )
 
-                    # Time the full run (incl. retries) so duration_ms reflects real
-                    # latency: UTC ISO-8601 start/end + monotonic duration. Only for
-                    # invoke_agent_with_model (include_usage_metrics=True).
-                    run_started = time.perf_counter() if include_usage_metrics else None
-                    start_time = (
-                        datetime.now(timezone.utc).isoformat()
-                        if include_usage_metrics
-                        else None
-                    )
-                    task = asyncio.create_task(_run_subagent())
-                    _active_subagent_tasks.add(task)
-
-                    try:
-                        result = await task
-                    finally:
-                        _active_subagent_tasks.discard(task)
-                        if task.cancelled():
-                            await on_agent_run_cancel(group_id)
+                    # Wait for a run slot (global + per-model caps) so parallel
+                    # tool calls and fan-outs cannot flood a provider.
+                    governor = get_subagent_governor(get_subagent_depth())
+                    async with governor.slot(effective_model_name):
+                        # Time the full run (incl. retries) so duration_ms reflects
+                        # real latency: UTC ISO-8601 start/end + monotonic duration.
+                        # Only for invoke_agent_with_model (include_usage_metrics).
+                        run_started = (
+                            time.perf_counter() if include_usage_metrics else None
+                        )
+                        start_time = (
+                            datetime.now(timezone.utc).isoformat()
+                            if include_usage_metrics
+                            else None
+                        )
+                        task = asyncio.create_task(_run_subagent())
+                        _active_subagent_tasks.add(task)
+
+                        try:
+                            result = await task
+                        finally:
+                            _active_subagent_tasks.discard(task)
+                            if task.cancelled():
+                                await on_agent_run_cancel(group_id)
 
                     # Capture usage + latency as close to the run boundary as
                     # possible, before any rendering/history/emit bookkeeping.
@@ -0,0 +1,376 @@
+"""Incremental persistence and retention for sub-agent session files.
+
+A sub-agent session in ``DATA_DIR/subagent_sessions`` is stored as:
+
+* ``<id>.json``  -- the versioned envelope (``session_storage``), holding the
+  history as of the last compaction;
+* ``<id>.jsonl`` -- an append-only journal with one line per invocation,
+  ``{"base": <messages before this batch>, "messages": [...]}``;
+* ``<id>.txt``   -- human-readable metadata (owned by ``agent_tools``).
+
+Rewriting the whole envelope after every invocation made an n-turn
+orchestration write O(n^2) bytes. Now an invocation whose history extends
+what is already on disk appends only its new messages; the envelope is
+rewritten (and the journal dropped) when the journal outgrows it, or when
+the history no longer extends the stored one (compaction, a rewrite, or
+files changed behind our back). Journal growth is thus bounded by the
+envelope size, so total bytes written stay linear in the final size.
+
+``base`` makes replay safe: lines already folded into the envelope (a crash
+between the envelope rewrite and the journal unlink) are skipped, and a torn
+final line ends replay without losing the lines before it.
+
+Retention (age, count, total bytes; see ``config.get_subagent_session_*``)
+is enforced by :func:`sweep_subagent_sessions`, run off the invocation path
+by :func:`schedule_sweep` at most once per ``SWEEP_INTERVAL_SECONDS``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Tuple
+
+from code_puppy.session_storage import (
+    ENCODING_MESSAGES,
+    build_envelope,
+    decode_envelope,
+    encode_history,
+    read_envelope_file,
+    validate_messages_jsonable,
+    write_envelope_file,
+)
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_SUFFIX = ".jsonl"
+# Journals smaller than this never force a compaction, so short sessions
+# with tiny envelopes are not rewritten on every turn.
+MIN_COMPACTION_BYTES = 64 * 1024
+SWEEP_INTERVAL_SECONDS = 600
+# Sessions touched this recently are never swept: they may be mid-run.
+ACTIVE_GRACE_SECONDS = 300
+_SESSION_SUFFIXES = (".json", JOURNAL_SUFFIX, ".txt", ".pkl", ".tmp")
+_MAX_TRACKED_SESSIONS = 64
+
+_Stamp = Optional[Tuple[int, int]]
+
+
+@dataclass
+class _SessionState:
+    """What this process last wrote (or read) for one session."""
+
+    messages: List[Any]
+    # Content hashes, filled lazily: only needed when a caller passes back
+    # equal-but-not-identical message objects.
+    hashes: List[Optional[str]]
+    encoding: str
+    envelope_bytes: int
+    envelope_stamp: _Stamp
+    journal_bytes: int = 0
+    journal_stamp: _Stamp = None
+
+
+_lock = threading.Lock()
+_states: "OrderedDict[str, _SessionState]" = OrderedDict()
+_last_sweep = 0.0
+bytes_written = 0
+
+
+def _stamp(path: Path) -> _Stamp:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _journal_path(json_path: Path) -> Path:
+    return json_path.with_suffix(JOURNAL_SUFFIX)
+
+
+def _hash(message: Any) -> str:
+    from code_puppy.agents._history import hash_message
+
+    return hash_message(message)
+
+
+def _remember(json_path: Path, state: Optional[_SessionState]) -> None:
+    key = str(json_path)
+    with _lock:
+        if state is None:
+            _states.pop(key, None)
+            return
+        _states[key] = state
+        _states.move_to_end(key)
+        while len(_states) > _MAX_TRACKED_SESSIONS:
+            _states.popitem(last=False)
+
+
+def _current_state(json_path: Path) -> Optional[_SessionState]:
+    with _lock:
+        state = _states.get(str(json_path))
+    if state is None:
+        return None
+    # Someone else (another process, a migration, a sweep) touched the files.
+    if state.envelope_stamp != _stamp(json_path):
+        return None
+    if state.journal_stamp != _stamp(_journal_path(json_path)):
+        return None
+    return state
+
+
+def _extends(state: _SessionState, history: List[Any]) -> bool:
+    if len(history) < len(state.messages):
+        return False
+    for index, known in enumerate(state.messages):
+        message = history[index]
+        # Callers normally pass back the very objects we loaded or saved.
+        if message is known:
+            continue
+        if state.hashes[index] is None:
+            state.hashes[index] = _hash(known)
+        if _hash(message) != state.hashes[index]:
+            return False
+    return True
+
+
+def _compact(json_path: Path, history: List[Any]) -> None:
+    """Rewrite the full envelope and drop the journal."""
+    global bytes_written
+    envelope = build_envelope(history)
+    write_envelope_file(json_path, envelope)
+    journal = _journal_path(json_path)
+    journal.unlink(missing_ok=True)
+    stamp = _stamp(json_path)
+    size = stamp[1] if stamp else 0
+    bytes_written += size
+    _remember(
+        json_path,
+        _SessionState(
+            messages=list(history),
+            hashes=[None] * len(history),
+            encoding=envelope["encoding"],
+            envelope_bytes=size,
+            envelope_stamp=stamp,
+        ),
+    )
+
+
+def save_history(json_path: Path, history: List[Any]) -> None:
+    """Persist ``history`` for the session whose envelope is ``json_path``."""
+    global bytes_written
+    history = list(history)
+    state = _current_state(json_path)
+    if state is None or not _extends(state, history):
+        _compact(json_path, history)
+        return
+    new_messages = history[len(state.messages) :]
+    if not new_messages:
+        return
+    encoding, jsonable = encode_history(new_messages)
+    if encoding != ENCODING_MESSAGES or state.encoding != ENCODING_MESSAGES:
+        _compact(json_path, history)
+        return
+    line = (
+        json.dumps(
+            {"base": len(state.messages), "messages": jsonable},
+            separators=(",", ":"),
+        )
+        + "\n"
+    ).encode("utf-8")
+    if state.journal_bytes + len(line) > max(
+        state.envelope_bytes, MIN_COMPACTION_BYTES
+    ):
+        _compact(json_path, history)
+        return
+    journal = _journal_path(json_path)
+    with open(journal, "ab") as f:
+        f.write(line)
+        f.flush()
+        st = os.fstat(f.fileno())
+    bytes_written += len(line)
+    state.messages.extend(new_messages)
+    state.hashes.extend([None] * len(new_messages))
+    state.journal_bytes = st.st_size
+    state.journal_stamp = (st.st_mtime_ns, st.st_size)
+    _remember(json_path, state)
+
+
+def load_history(json_path: Path) -> List[Any]:
+    """Envelope plus replayed journal. Raises if the envelope is unreadable."""
+    envelope_stamp = _stamp(json_path)
+    envelope = read_envelope_file(json_path)
+    messages = list(decode_envelope(envelope))
+    encoding = envelope.get("encoding", ENCODING_MESSAGES)
+
+    journal = _journal_path(json_path)
+    journal_stamp = _stamp(journal)
+    clean = True
+    if journal_stamp is not None:
+        clean = _replay_journal(journal, messages, encoding)
+
+    if clean:
+        _remember(
+            json_path,
+            _SessionState(
+                messages=list(messages),
+                hashes=[None] * len(messages),
+                encoding=encoding,
+                envelope_bytes=envelope_stamp[1] if envelope_stamp else 0,
+                envelope_stamp=envelope_stamp,
+                journal_bytes=journal_stamp[1] if journal_stamp else 0,
+                journal_stamp=journal_stamp,
+            ),
+        )
+    else:
+        # Torn or inconsistent journal: the next save rewrites the envelope
+        # instead of appending after the damage.
+        _remember(json_path, None)
+    return messages
+
+
+def _replay_journal(journal: Path, messages: List[Any], encoding: str) -> bool:
+    """Apply journal lines to ``messages``; False if replay stopped early."""
+    try:
+        raw_lines = journal.read_bytes().splitlines()
+    except OSError:
+        return False
+    for raw in raw_lines:
+        try:
+            entry = json.loads(raw)
+            base = entry["base"]
+            batch = entry["messages"]
+        except (ValueError, KeyError, TypeError):
+            return False
+        if base < len(messages):
+            continue  # already folded into the envelope
+        if base > len(messages) or encoding != ENCODING_MESSAGES:
+            return False
+        try:
+            messages.extend(validate_messages_jsonable(batch))
+        except Exception:
+            return False
+    return True
+
+
+def forget_session(json_path: Path) -> None:
+    """Drop cached state for ``json_path`` (after deleting its files)."""
+    _remember(json_path, None)
+
+
+def _group_sessions(sessions_dir: Path) -> dict:
+    groups: dict = {}
+    try:
+        entries = list(os.scandir(sessions_dir))
+    except OSError:
+        return groups
+    for entry in entries:
+        stem, suffix = os.path.splitext(entry.name)
+        if suffix not in _SESSION_SUFFIXES:
+            continue
+        try:
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            st = entry.stat(follow_symlinks=False)
+        except OSError:
+            continue
+        files, newest, size = groups.get(stem, ([], 0.0, 0))
+        files.append(Path(entry.path))
+        groups[stem] = (files, max(newest, st.st_mtime), size + st.st_size)
+    return groups
+
+
+def sweep_subagent_sessions(
+    sessions_dir: Path,
+    *,
+    max_age_days: int,
+    max_count: int,
+    max_bytes: int,
+    protect: Iterable[str] = (),
+    now: Optional[float] = None,
+) -> List[str]:
+    """Delete sessions beyond the retention policy, oldest first.
+
+    A limit of 0 is disabled. Sessions named in ``protect`` or touched in the
+    last ``ACTIVE_GRACE_SECONDS`` are kept even if that leaves a limit
+    exceeded. Returns the removed session ids.
+    """
+    now = time.time() if now is None else now
+    protected = set(protect)
+    groups = _group_sessions(sessions_dir)
+    oldest_first = sorted(groups.items(), key=lambda item: item[1][1])
+    count = len(groups)
+    total = sum(size for _files, _newest, size in groups.values())
+    removed: List[str] = []
+    for stem, (files, newest, size) in oldest_first:
+        expired = max_age_days > 0 and now - newest > max_age_days * 86400
+        over_count = max_count > 0 and count > max_count
+        over_bytes = max_bytes > 0 and total > max_bytes
+        if not (expired or over_count or over_bytes):
+            continue
+        if stem in protected or now - newest < ACTIVE_GRACE_SECONDS:
+            continue
+        for path in files:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                pass
+        forget_session(sessions_dir / f"{stem}.json")
+        removed.append(stem)
+        count -= 1
+        total -= size
+    return removed
+
+
+def _sweep_with_config(sessions_dir: Path, protect: Tuple[str, ...]) -> None:
+    from code_puppy.config import (
+        get_subagent_session_max_age_days,
+        get_subagent_session_max_count,
+        get_subagent_session_max_mb,
+    )
+
+    try:
+        removed = sweep_subagent_sessions(
+            sessions_dir,
+            max_age_days=get_subagent_session_max_age_days(),
+            max_count=get_subagent_session_max_count(),
+            max_bytes=get_subagent_session_max_mb() * 1024 * 1024,
+            protect=protect,
+        )
+        if removed:
+            logger.debug("Removed %d expired sub-agent sessions", len(removed))
+    except Exception as e:  # never let housekeeping break an invocation
+        logger.debug("Sub-agent session sweep failed: %s", e)
+
+
+def schedule_sweep(sessions_dir: Path, protect: Iterable[str] = ()) -> bool:
+    """Start a background sweep unless one ran in the last interval."""
+    global _last_sweep
+    with _lock:
+        now = time.monotonic()
+        if _last_sweep and now - _last_sweep < SWEEP_INTERVAL_SECONDS:
+            return False
+        _last_sweep = now
+    threading.Thread(
+        target=_sweep_with_config,
+        args=(sessions_dir, tuple(protect)),
+        name="subagent-session-sweep",
+        daemon=True,
+    ).start()
+    return True
+
+
+def reset_state() -> None:
+    """Forget cached session state and the sweep timer (tests)."""
+    global _last_sweep, bytes_written
+    with _lock:
+        _states.clear()
+        _last_sweep = 0.0
+        bytes_written = 0
@@ -127,10 +127,10 @@ class TestAgentManagerBasics:
             assert session_id.startswith("fallback_")
 
     @patch("code_puppy.agents.agent_manager.discover_json_agents")
-    @patch("pkgutil.iter_modules")
     @patch("importlib.import_module")
+    @patch("pkgutil.iter_modules")
     def test_discover_agents_python_classes(
-        self, mock_import, mock_iter_modules, mock_json_agents
+        self, mock_iter_modules, mock_import, mock_json_agents
     ):
         """Test discovering Python agent classes."""
         # Mock module discovery
@@ -233,10 +233,10 @@ class TestAgentManagerBasics:
                 assert "broken_agent" in mock_warn.call_args[0][0]
 
     @patch("code_puppy.agents.agent_manager.discover_json_agents")
-    @patch("pkgutil.iter_modules")
     @patch("importlib.import_module")
+    @patch("pkgutil.iter_modules")
     def test_get_available_agents(
-        self, mock_import, mock_iter_modules, mock_json_agents
+        self, mock_iter_modules, mock_import, mock_json_agents
     ):
         """Test getting available agents with display names."""
         # Setup mock agents
@@ -258,10 +258,10 @@ class TestAgentManagerBasics:
         assert len(agents) > 0
 
     @patch("code_puppy.agents.agent_manager.discover_json_agents")
-    @patch("pkgutil.iter_modules")
     @patch("importlib.import_module")
+    @patch("pkgutil.iter_modules")
     def test_load_agent_python_class(
-        self, mock_import, mock_iter_modules, mock_json_agents
+        self, mock_iter_modules, mock_import, mock_json_agents
     ):
         """Test loading a Python agent class."""
         # Setup registry
@@ -304,10 +304,10 @@ class TestAgentManagerBasics:
                 load_agent("nonexistent-agent")
 
     @patch("code_puppy.agents.agent_manager.discover_json_agents")
-    @patch("pkgutil.iter_modules")
     @patch("importlib.import_module")
+    @patch("pkgutil.iter_modules")
     def test_load_agent_fallback_to_code_puppy(
-        self, mock_import, mock_iter_modules, mock_json_agents
+        self, mock_iter_modules, mock_import, mock_json_agents
     ):
         """Test fallback to code-puppy agent when requested agent not found."""
 
@@ -0,0 +1,312 @@
+"""Agent discovery manifest (``code_puppy.agents._manifest``)."""
+
+import json
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from code_puppy.agents import _manifest, agent_manager
+from code_puppy.agents import json_agent as json_agent_module
+from code_puppy.agents.base_agent import BaseAgent
+
+VALID_CONFIG = {
+    "name": "test-agent",
+    "display_name": "Test Agent",
+    "description": "A test agent",
+    "system_prompt": "You are a helpful test agent.",
+    "tools": ["list_files"],
+}
+
+
+@pytest.fixture(autouse=True)
+def _isolated_manifest(tmp_path: Path, monkeypatch):
+    manifest = tmp_path / "cache" / "agent_manifest.json"
+    monkeypatch.setattr(_manifest, "_manifest_path", lambda: manifest)
+    _manifest.clear_manifest_cache()
+    yield manifest
+    _manifest.clear_manifest_cache()
+
+
+def _write_agent(path: Path, config: dict, age: float = 3600) -> str:
+    """Write an agent file whose mtime is safely outside the racy window."""
+    path.write_text(json.dumps(config))
+    return _backdate(path, age)
+
+
+def _backdate(path: Path, age: float = 3600) -> str:
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+    return str(path)
+
+
+def _counting_json_agent():
+    calls = []
+    real = json_agent_module.JSONAgent
+
+    def _construct(path):
+        calls.append(path)
+        return real(path)
+
+    return calls, patch.object(json_agent_module, "JSONAgent", _construct)
+
+
+def test_unchanged_file_is_not_reparsed(tmp_path: Path):
+    path = _write_agent(tmp_path / "a.json", VALID_CONFIG)
+    calls, counting = _counting_json_agent()
+    with counting:
+        first = _manifest.json_agent_summary(path)
+        second = _manifest.json_agent_summary(path)
+
+    assert (
+        first
+        == second
+        == _manifest.AgentSummary("test-agent", "Test Agent", "A test agent")
+    )
+    assert calls == [path]
+
+
+def test_changed_file_is_reparsed(tmp_path: Path):
+    path = _write_agent(tmp_path / "a.json", VALID_CONFIG)
+    assert _manifest.json_agent_summary(path).name == "test-agent"
+
+    _write_agent(tmp_path / "a.json", {**VALID_CONFIG, "name": "renamed-agent"})
+
+    assert _manifest.json_agent_summary(path).name == "renamed-agent"
+
+
+def test_recently_written_file_is_always_reparsed(tmp_path: Path):
+    path = _write_agent(tmp_path / "a.json", VALID_CONFIG, age=0)
+    calls, counting = _counting_json_agent()
+    with counting:
+        _manifest.json_agent_summary(path)
+        _manifest.json_agent_summary(path)
+
+    assert len(calls) == 2
+
+
+def test_invalid_file_is_remembered_as_an_error(tmp_path: Path):
+    path = _write_agent(tmp_path / "bad.json", {"name": "no-prompt"})
+    calls, counting = _counting_json_agent()
+    with counting:
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                _manifest.json_agent_summary(path)
+
+    assert len(calls) == 1
+
+
+def test_manifest_survives_a_restart(tmp_path: Path, _isolated_manifest: Path):
+    path = _write_agent(tmp_path / "a.json", VALID_CONFIG)
+    _manifest.json_agent_summary(path)
+    _manifest.save_manifest()
+    assert _isolated_manifest.exists()
+
+    # A new process: nothing in memory, only the file on disk.
+    _manifest.clear_manifest_cache()
+    calls, counting = _counting_json_agent()
+    with counting:
+        assert _manifest.json_agent_summary(path).display_name == "Test Agent"
+    assert calls == []
+
+
+def test_deleted_files_are_pruned_on_save(tmp_path: Path, _isolated_manifest: Path):
+    keep = _write_agent(tmp_path / "keep.json", VALID_CONFIG)
+    gone = _write_agent(tmp_path / "gone.json", {**VALID_CONFIG, "name": "gone"})
+    _manifest.json_agent_summary(keep)
+    _manifest.json_agent_summary(gone)
+    os.unlink(gone)
+    _manifest.save_manifest()
+
+    stored = json.loads(_isolated_manifest.read_text())["json_agents"]
+    assert list(stored) == [keep]
+
+
+def test_corrupt_manifest_is_ignored(tmp_path: Path, _isolated_manifest: Path):
+    _isolated_manifest.parent.mkdir(parents=True)
+    _isolated_manifest.write_text("{not json")
+    path = _write_agent(tmp_path / "a.json", VALID_CONFIG)
+
+    assert _manifest.json_agent_summary(path).name == "test-agent"
+
+
+def test_agent_class_is_instantiated_once():
+    constructed = []
+
+    class CountingAgent(BaseAgent):
+        def __init__(self):
+            constructed.append(self)
+            super().__init__()
+
+        name = "counting"
+        display_name = "Counting"
+        description = "Counts constructions"
+
+        def get_system_prompt(self):
+            return ""
+
+        def get_available_tools(self):
+            return []
+
+    for _ in range(3):
+        assert _manifest.class_agent_summary(CountingAgent).display_name == "Counting"
+    assert len(constructed) == 1
+
+
+def test_listing_agents_does_not_construct_them(tmp_path: Path, monkeypatch):
+    path = _write_agent(tmp_path / "a.json", VALID_CONFIG)
+    monkeypatch.setattr(agent_manager, "_AGENT_REGISTRY", {"test-agent": path})
+    monkeypatch.setattr(agent_manager, "_discover_agents", lambda *a, **k: None)
+    _manifest.json_agent_summary(path)
+
+    calls, counting = _counting_json_agent()
+    with counting:
+        assert agent_manager.get_available_agents() == {"test-agent": "Test Agent"}
+        assert agent_manager.get_agent_descriptions() == {"test-agent": "A test agent"}
+    assert calls == []
+
+
+PY_AGENT_SOURCE = """
+from code_puppy.agents.base_agent import BaseAgent
+
+
+class FileAgent(BaseAgent):
+    name = "file-agent"
+    display_name = "File Agent"
+    description = {description!r}
+
+    def get_system_prompt(self):
+        return ""
+
+    def get_available_tools(self):
+        return []
+"""
+
+
+def test_python_module_is_imported_only_when_its_file_changes(
+    tmp_path: Path, monkeypatch
+):
+    import importlib
+    import sys
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "manifest_file_agent", raising=False)
+    source = tmp_path / "manifest_file_agent.py"
+    source.write_text(PY_AGENT_SOURCE.format(description="first"))
+    path = _backdate(source)
+
+    imports = []
+    real_import = importlib.import_module
+
+    def _counting_import(name, *args):
+        imports.append(name)
+        return real_import(name, *args)
+
+    with patch.object(_manifest.importlib, "import_module", _counting_import):
+        (ref,) = _manifest.python_module_agents("manifest_file_agent", path)
+        assert _manifest.python_module_agents("manifest_file_agent", path) == [ref]
+        assert imports == ["manifest_file_agent"]
+
+        source.write_text(PY_AGENT_SOURCE.format(description="second, longer"))
+        _backdate(source)
+        sys.modules.pop("manifest_file_agent")
+        (changed,) = _manifest.python_module_agents("manifest_file_agent", path)
+
+    assert ref.summary == _manifest.AgentSummary("file-agent", "File Agent", "first")
+    assert changed.summary.description == "second, longer"
+    assert imports == ["manifest_file_agent"] * 2
+    assert changed().description == "second, longer"
+
+
+def test_real_discovery_reuses_the_manifest_for_both_halves(
+    tmp_path: Path, monkeypatch, _isolated_manifest: Path
+):
+    agents_dir = tmp_path / "agents"
+    agents_dir.mkdir()
+    json_path = _write_agent(agents_dir / "a.json", VALID_CONFIG)
+    monkeypatch.setattr(
+        "code_puppy.config.get_user_agents_directory", lambda: str(agents_dir)
+    )
+    monkeypatch.setattr("code_puppy.config.get_project_agents_directory", lambda: None)
+    # Installed sources may be fresher than the racy window; that is not what
+    # this test is about.
+    monkeypatch.setattr(_manifest, "_RACY_WINDOW_NS", 0)
+    monkeypatch.setattr(agent_manager, "_AGENT_REGISTRY", {})
+
+    agent_manager._discover_agents()
+    cold = dict(agent_manager._AGENT_REGISTRY)
+    saved = json.loads(_isolated_manifest.read_text())
+
+    assert cold["test-agent"] == json_path
+    planning = cold["planning-agent"]
+    assert isinstance(planning, _manifest.PythonAgentRef)
+    assert planning.module == "code_puppy.agents.agent_planning"
+    assert "code_puppy.agents.agent_planning" in {
+        entry["module"] for entry in saved["python_modules"].values()
+    }
+
+    # A new process: only the on-disk manifest survives.
+    _manifest.clear_manifest_cache()
+    summarized = []
+    monkeypatch.setattr(
+        _manifest, "_summarize_python_module", lambda *a: summarized.append(a)
+    )
+    calls, counting = _counting_json_agent()
+    with counting:
+        agent_manager._discover_agents()
+        names = agent_manager.get_available_agents()
+
+    assert summarized == [] and calls == []
+    assert agent_manager._AGENT_REGISTRY == cold
+    assert names["planning-agent"] == planning.summary.display_name
+    assert type(agent_manager.load_agent("planning-agent")).__name__ == (
+        "PlanningAgent"
+    )
+
+
+@pytest.mark.benchmark
+def test_discovery_benchmark_warm_manifest(tmp_path: Path, monkeypatch):
+    """100 JSON and 100 Python agents: a warm pass parses and builds nothing."""
+    agents_dir = tmp_path / "agents"
+    agents_dir.mkdir()
+    for i in range(100):
+        _write_agent(
+            agents_dir / f"agent_{i}.json",
+            {**VALID_CONFIG, "name": f"json-{i}", "system_prompt": "x" * 2000},
+        )
+    classes = [
+        type(
+            f"PyAgent{i}",
+            (BaseAgent,),
+            {
+                "name": f"py-{i}",
+                "display_name": f"Py {i}",
+                "description": "generated",
+                "get_system_prompt": lambda self: "",
+                "get_available_tools": lambda self: [],
+            },
+        )
+        for i in range(100)
+    ]
+    monkeypatch.setattr(
+        "code_puppy.config.get_user_agents_directory", lambda: str(agents_dir)
+    )
+    monkeypatch.setattr("code_puppy.config.get_project_agents_directory", lambda: None)
+
+    def _discover_and_list():
+        started = time.perf_counter()
+        names = set(json_agent_module.discover_json_agents())
+        names.update(_manifest.class_agent_summary(cls).name for cls in classes)
+        return names, time.perf_counter() - started
+
+    cold_names, cold = _discover_and_list()
+    calls, counting = _counting_json_agent()
+    with counting:
+        warm_names, warm = _discover_and_list()
+
+    assert len(cold_names) == 200
+    assert warm_names == cold_names
+    assert calls == []
+    assert warm < cold
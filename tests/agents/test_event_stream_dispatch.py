@@ -0,0 +1,233 @@
+"""Stream-event dispatch and line buffering in event_stream_handler."""
+
+import asyncio
+import io
+import json
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from pydantic_ai import PartDeltaEvent, PartEndEvent, PartStartEvent
+from pydantic_ai.messages import (
+    TextPart,
+    TextPartDelta,
+    ThinkingPart,
+    ThinkingPartDelta,
+    ToolCallPart,
+    ToolCallPartDelta,
+)
+from rich.console import Console
+
+from code_puppy import callbacks
+from code_puppy.agents import event_stream_handler as esh
+
+
+@pytest.fixture(autouse=True)
+def plain_output(monkeypatch):
+    """No typewriter pacing, a throwaway console, no plugin stream callbacks."""
+    monkeypatch.setattr("code_puppy.config.get_smooth_response_stream", lambda: False)
+    monkeypatch.setattr("code_puppy.config.get_smooth_thinking_stream", lambda: False)
+    monkeypatch.setattr(esh, "get_output_level", lambda: "normal")
+    monkeypatch.setattr(esh, "_suppress_thinking_stream", lambda: False)
+    saved = list(callbacks._callbacks["stream_event"])
+    callbacks._callbacks["stream_event"].clear()
+    esh.set_streaming_console(Console(file=io.StringIO(), width=100))
+    yield
+    esh.set_streaming_console(None)
+    callbacks._callbacks["stream_event"][:] = saved
+
+
+@pytest.fixture
+def task_count(monkeypatch):
+    created = []
+    real_create_task = asyncio.create_task
+
+    def counting_create_task(coro, **kwargs):
+        created.append(coro)
+        return real_create_task(coro, **kwargs)
+
+    monkeypatch.setattr(esh.asyncio, "create_task", counting_create_task)
+    return created
+
+
+def _recorded_stream(deltas: int = 20_000):
+    """A thinking part, a markdown answer with a long minified-JSON line, a tool call."""
+    events = [PartStartEvent(index=0, part=ThinkingPart(content=""))]
+    thinking = deltas // 10
+    events += [
+        PartDeltaEvent(index=0, delta=ThinkingPartDelta(content_delta=f"step {i} "))
+        for i in range(thinking)
+    ]
+    events.append(PartEndEvent(index=0, part=ThinkingPart(content="")))
+
+    blob = json.dumps([{"id": i, "name": f"item-{i}"} for i in range(4000)])
+    markdown = (
+        "## Result\n\nHere is the payload:\n\n```json\n"
+        + blob
+        + "\n```\n\n| a | b |\n|---|---|\n"
+        + "".join(f"| {i} | {i * i} |\n" for i in range(200))
+    )
+    text_deltas = deltas - thinking - 200
+    bounds = [len(markdown) * i // text_deltas for i in range(text_deltas + 1)]
+    events.append(PartStartEvent(index=1, part=TextPart(content="")))
+    events += [
+        PartDeltaEvent(index=1, delta=TextPartDelta(content_delta=markdown[a:b]))
+        for a, b in zip(bounds, bounds[1:])
+    ]
+    events.append(PartEndEvent(index=1, part=TextPart(content="")))
+
+    events.append(
+        PartStartEvent(
+            index=2, part=ToolCallPart(tool_name="edit_file", args="", tool_call_id="t")
+        )
+    )
+    events += [
+        PartDeltaEvent(index=2, delta=ToolCallPartDelta(args_delta='{"k": 1}'))
+        for _ in range(200)
+    ]
+    events.append(PartEndEvent(index=2, part=ToolCallPart(tool_name="edit_file")))
+    return events, markdown
+
+
+async def _replay(events):
+    async def stream():
+        for event in events:
+            # Each event comes off a socket read, which yields to the loop.
+            await asyncio.sleep(0)
+            yield event
+
+    await esh.event_stream_handler(MagicMock(), stream())
+
+
+def test_line_buffer_splits_across_arbitrary_chunk_boundaries():
+    text = "alpha\nbeta gamma\n\n" + "x" * 50 + "\ntail"
+    for size in (1, 2, 3, 7, len(text)):
+        buffer = esh._LineBuffer()
+        lines = []
+        for i in range(0, len(text), size):
+            lines += buffer.feed(text[i : i + size])
+        assert lines == text.split("\n")[:-1], size
+        assert buffer.take_rest() == "tail"
+        assert buffer.take_rest() == ""
+
+
+async def test_no_tasks_are_spawned_without_stream_event_callbacks(task_count):
+    events, _ = _recorded_stream(2000)
+    await _replay(events)
+    assert task_count == []
+
+
+async def test_events_reach_callbacks_in_order_through_one_task(task_count):
+    seen = []
+
+    async def on_stream_event(event_type, event_data, session_id=None):
+        seen.append((event_type, event_data.get("index")))
+
+    callbacks.register_callback("stream_event", on_stream_event)
+    events, _ = _recorded_stream(2000)
+    await _replay(events)
+
+    assert len(task_count) == 1
+    expected = [
+        (
+            {
+                PartStartEvent: "part_start",
+                PartDeltaEvent: "part_delta",
+                PartEndEvent: "part_end",
+            }[type(event)],
+            event.index,
+        )
+        for event in events
+    ]
+    assert seen == expected
+
+
+async def test_full_queue_drops_instead_of_buffering(monkeypatch):
+    release = asyncio.Event()
+    seen = []
+
+    async def slow_callback(event_type, event_data, session_id=None):
+        await release.wait()
+        seen.append(event_type)
+
+    callbacks.register_callback("stream_event", slow_callback)
+    dispatcher = esh._StreamEventDispatcher(maxsize=5)
+    for _ in range(20):
+        dispatcher.fire("part_delta", {})
+    release.set()
+    await dispatcher.aclose()
+
+    # Five queued behind the one the consumer had not yet picked up.
+    assert dispatcher.dropped == 15
+    assert len(seen) == 5
+
+
+async def test_hung_callback_cannot_stall_the_end_of_a_response():
+    cancelled = asyncio.Event()
+
+    async def hung_callback(event_type, event_data, session_id=None):
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    callbacks.register_callback("stream_event", hung_callback)
+    dispatcher = esh._StreamEventDispatcher()
+    for _ in range(3):
+        dispatcher.fire("part_delta", {})
+
+    started = time.perf_counter()
+    await dispatcher.aclose(timeout=0.05)
+    assert time.perf_counter() - started < 1
+    assert cancelled.is_set()
+    assert dispatcher._task.cancelled()
+    assert dispatcher._task not in esh._detached_deliveries
+
+
+@pytest.mark.benchmark
+async def test_benchmark_replay_of_a_20k_delta_stream(task_count):
+    delivered = 0
+
+    async def on_stream_event(event_type, event_data, session_id=None):
+        nonlocal delivered
+        delivered += 1
+
+    events, _ = _recorded_stream(20_000)
+    deltas = sum(isinstance(e, PartDeltaEvent) for e in events)
+
+    started = time.perf_counter()
+    await _replay(events)
+    no_callbacks = time.perf_counter() - started
+
+    callbacks.register_callback("stream_event", on_stream_event)
+    started = time.perf_counter()
+    await _replay(events)
+    with_callbacks = time.perf_counter() - started
+
+    # The old buffering: append, then re-split the whole pending string.
+    pieces = [
+        e.delta.content_delta
+        for e in events
+        if isinstance(e, PartDeltaEvent) and e.index == 1
+    ]
+    started = time.perf_counter()
+    buffer = ""
+    for piece in pieces:
+        buffer += piece
+        while "\n" in buffer:
+            _, buffer = buffer.split("\n", 1)
+    resplit = time.perf_counter() - started
+    started = time.perf_counter()
+    line_buffer = esh._LineBuffer()
+    for piece in pieces:
+        line_buffer.feed(piece)
+    scanned = time.perf_counter() - started
+
+    assert deltas >= 20_000
+    assert delivered == len(events)
+    assert len(task_count) == 1
+    assert with_callbacks < 30
+    # One callback rides on the single dispatch task, not a task per event.
+    assert with_callbacks < 3 * no_callbacks
+    assert scanned < resplit
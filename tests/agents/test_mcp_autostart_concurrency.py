@@ -0,0 +1,150 @@
+"""Tests for concurrent bound-MCP-server autostart in ``agents._builder``."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from code_puppy.agents._builder import autostart_bound_servers_async
+
+
+class FakeManager:
+    """Just enough of ``MCPManager`` for ``autostart_bound_servers_async``.
+
+    ``delays`` maps server name -> seconds ``start_server`` sleeps; a value
+    that is an exception instance is raised instead.
+    """
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = []
+
+    def get_server_by_name(self, name):
+        if name not in self.delays:
+            return None
+        return SimpleNamespace(id=f"id-{name}", name=name)
+
+    def get_server_status(self, server_id):
+        return {"state": "stopped"}
+
+    async def start_server(self, server_id):
+        name = server_id.removeprefix("id-")
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            delay = self.delays[name]
+            if isinstance(delay, Exception):
+                raise delay
+            await asyncio.sleep(delay)
+            self.completed.append(name)
+            return True
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def bindings():
+    """Patch agent bindings so every fake server is auto_start-bound."""
+
+    def _bind(names):
+        bound = {name: {"auto_start": True} for name in names}
+        return patch(
+            "code_puppy.mcp_.agent_bindings.get_bound_servers",
+            return_value=bound,
+        )
+
+    return _bind
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    with (
+        patch("code_puppy.agents._builder.emit_info"),
+        patch("code_puppy.agents._builder.emit_warning") as warn,
+        patch("code_puppy.agents._builder.on_pre_mcp_autostart") as pre,
+    ):
+
+        async def _noop(*_args, **_kwargs):
+            return []
+
+        pre.side_effect = _noop
+        yield warn
+
+
+async def test_wall_time_tracks_slowest_server_not_the_sum(bindings):
+    manager = FakeManager({"a": 0.2, "b": 0.2, "c": 0.2, "d": 0.2})
+    with bindings(manager.delays):
+        started = time.monotonic()
+        report = await autostart_bound_servers_async(
+            manager, "agent", concurrency=4, server_timeout=5
+        )
+        elapsed = time.monotonic() - started
+
+    assert sorted(report.started) == ["a", "b", "c", "d"]
+    assert not report.failed and not report.pending
+    # Sequential would be ~0.8s.
+    assert elapsed < 0.6
+    assert manager.peak_in_flight == 4
+
+
+async def test_concurrency_cap_is_respected(bindings):
+    manager = FakeManager({name: 0.05 for name in "abcdef"})
+    with bindings(manager.delays):
+        report = await autostart_bound_servers_async(
+            manager, "agent", concurrency=2, server_timeout=5
+        )
+
+    assert len(report.started) == 6
+    assert manager.peak_in_flight == 2
+
+
+async def test_failure_does_not_block_other_servers(bindings, quiet):
+    manager = FakeManager({"ok": 0.05, "boom": RuntimeError("no binary"), "ok2": 0.05})
+    with bindings(manager.delays):
+        report = await autostart_bound_servers_async(
+            manager, "agent", concurrency=1, server_timeout=5
+        )
+
+    assert sorted(report.started) == ["ok", "ok2"]
+    assert report.failed == {"boom": "no binary"}
+    assert any("boom" in str(call) for call in quiet.call_args_list)
+
+
+async def test_slow_server_becomes_pending_and_frees_its_slot(bindings):
+    manager = FakeManager({"slow": 0.5, "fast": 0.05})
+    with bindings(manager.delays):
+        started = time.monotonic()
+        report = await autostart_bound_servers_async(
+            manager, "agent", concurrency=1, server_timeout=0.1
+        )
+        elapsed = time.monotonic() - started
+
+    assert report.pending == ["slow"]
+    assert report.started == ["fast"]
+    assert elapsed < 0.4
+    # The slow start was not cancelled; it finishes in the background.
+    await asyncio.sleep(0.5)
+    assert "slow" in manager.completed
+
+
+async def test_budget_returns_with_ready_servers(bindings):
+    manager = FakeManager({"fast": 0.05, "slow": 1.0, "queued": 0.05})
+    with bindings(manager.delays):
+        report = await autostart_bound_servers_async(
+            manager, "agent", concurrency=2, server_timeout=5, budget=0.2
+        )
+
+    assert "fast" in report.started
+    assert "slow" in report.pending
+    assert report.elapsed_seconds < 0.5
+
+
+async def test_no_targets_returns_empty_report(bindings):
+    manager = FakeManager({})
+    with bindings({}):
+        report = await autostart_bound_servers_async(manager, "agent")
+    assert report.started == [] and report.pending == [] and report.failed == {}
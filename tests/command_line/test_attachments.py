@@ -11,6 +11,7 @@ import pytest
 from code_puppy.command_line.attachments import (
     MAX_PATH_LENGTH,
     AttachmentParsingError,
+    PathStatCache,
     PromptLinkAttachment,
     _candidate_paths,
     _detect_path_tokens,
@@ -514,3 +515,116 @@ class TestParsePromptAttachments:
         ):
             result = parse_prompt_attachments("hello")
             assert "some warning" in result.warnings
+
+
+# ---------------------------------------------------------------------------
+# PathStatCache
+# ---------------------------------------------------------------------------
+class _InlineExecutor:
+    def submit(self, fn, *args):
+        fn(*args)
+
+
+class _QueuedExecutor:
+    """Holds submitted stats until the test runs them."""
+
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, fn, *args):
+        self.jobs.append((fn, args))
+
+    def run_all(self):
+        jobs, self.jobs = self.jobs, []
+        for fn, args in jobs:
+            fn(*args)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPathStatCache:
+    def test_miss_answers_false_then_fills_in(self, tmp_path):
+        f = tmp_path / "pic.png"
+        f.write_bytes(b"img")
+        updates = []
+        executor = _QueuedExecutor()
+        cache = PathStatCache(on_update=lambda: updates.append(1), executor=executor)
+        assert cache.is_file(f) is False
+        # Still pending: asked again, no second stat is queued.
+        assert cache.is_file(f) is False
+        assert len(executor.jobs) == 1 and updates == []
+
+        executor.run_all()
+        assert updates == [1]
+        assert cache.is_file(f) is True
+        assert cache.generation == 1
+
+    def test_results_are_reused_until_the_ttl_expires(self, tmp_path):
+        f = tmp_path / "pic.png"
+        clock = _Clock()
+        updates = []
+        cache = PathStatCache(
+            ttl=2.0,
+            on_update=lambda: updates.append(1),
+            executor=_InlineExecutor(),
+            clock=clock,
+        )
+
+        with patch(
+            "code_puppy.command_line.attachments._is_existing_file",
+            wraps=lambda p: p.exists(),
+        ) as stat:
+            cache.is_file(f)
+            clock.now = 1.9
+            assert cache.is_file(f) is False
+            assert stat.call_count == 1
+
+            f.write_bytes(b"img")
+            clock.now = 2.5
+            # Expired: answered from the old entry while the refresh runs...
+            assert cache.is_file(f) is False
+            assert stat.call_count == 2
+            # ...which redraws, and the file now shows up.
+            assert updates == [1]
+            assert cache.is_file(f) is True
+        assert cache.generation == 1
+
+    def test_entries_are_bounded_least_recently_asked_first(self, tmp_path):
+        paths = [tmp_path / f"{n}.png" for n in range(4)]
+        cache = PathStatCache(executor=_InlineExecutor(), max_entries=3)
+        for path in paths[:3]:
+            cache.is_file(path)
+        cache.is_file(paths[0])
+        cache.is_file(paths[3])
+        assert list(cache._entries) == [paths[2], paths[0], paths[3]]
+
+    def test_stat_errors_skip_the_token(self):
+        cache = PathStatCache(executor=_InlineExecutor())
+        with patch(
+            "code_puppy.command_line.attachments._is_existing_file",
+            return_value=None,
+        ):
+            cache.is_file(Path("/some/path.png"))
+            detections, _ = _detect_path_tokens("/some/path.png", cache.is_file)
+        assert detections == []
+
+    def test_detection_through_the_cache_matches_direct_stats(self, tmp_path):
+        d = tmp_path / "my dir"
+        d.mkdir()
+        (d / "pic.png").write_bytes(b"img")
+        (tmp_path / "notes.txt").write_text("x")
+        prompt = f"see {d}/pic.png and {tmp_path}/notes.txt, not /nope/x.png"
+        cache = PathStatCache(executor=_InlineExecutor())
+
+        # Inline executor: first pass queues (and completes) every stat.
+        _detect_path_tokens(prompt, cache.is_file)
+        cached, _ = _detect_path_tokens(prompt, cache.is_file)
+        direct, _ = _detect_path_tokens(prompt)
+        assert cached == direct
+        assert [det.path.name for det in cached] == ["pic.png", "notes.txt"]
@@ -578,3 +578,40 @@ class TestHandleToolsCommand:
 
         with patch("code_puppy.messaging.emit_info"):
             assert handle_tools_command("/tools") is True
+
+
+class TestHandleToolStatsCommand:
+    def setup_method(self):
+        from code_puppy.tool_metrics import reset_tool_timings
+
+        reset_tool_timings()
+
+    def test_empty(self):
+        from code_puppy.command_line.core_commands import handle_tool_stats_command
+
+        with patch("code_puppy.messaging.emit_info") as mock_emit:
+            assert handle_tool_stats_command("/tool_stats") is True
+        assert "No tool calls" in mock_emit.call_args[0][0]
+
+    def test_renders_table(self):
+        from rich.table import Table
+
+        from code_puppy.command_line.core_commands import handle_tool_stats_command
+        from code_puppy.tool_metrics import record_tool_call
+
+        record_tool_call("read_file", 4.0)
+        record_tool_call("grep", 9.0, error=True)
+        with patch("code_puppy.messaging.emit_info") as mock_emit:
+            assert handle_tool_stats_command("/tool_stats") is True
+        table = mock_emit.call_args[0][0]
+        assert isinstance(table, Table)
+        assert table.row_count == 2
+
+    def test_reset(self):
+        from code_puppy.command_line.core_commands import handle_tool_stats_command
+        from code_puppy.tool_metrics import get_tool_timings, record_tool_call
+
+        record_tool_call("read_file", 4.0)
+        with patch("code_puppy.messaging.emit_success"):
+            assert handle_tool_stats_command("/tool_stats reset") is True
+        assert get_tool_timings() == {}
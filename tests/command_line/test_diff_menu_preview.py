@@ -0,0 +1,178 @@
+"""Viewport rendering and the per-color line cache behind the diff preview."""
+
+import io
+import re
+import time
+
+import pytest
+
+from code_puppy.command_line import diff_menu
+from code_puppy.command_line.diff_menu import (
+    ADDITION_COLORS,
+    DELETION_COLORS,
+    SUPPORTED_LANGUAGES,
+    DiffConfiguration,
+    _get_preview_text_for_prompt_toolkit,
+)
+from code_puppy.tools.common import format_diff_with_colors
+
+HEIGHT = 40
+
+
+@pytest.fixture
+def config():
+    config = DiffConfiguration()
+    config.current_add_color = "#0b3e0b"
+    config.current_del_color = "#4a0f0f"
+    return config
+
+
+def _long_samples(lines: int = 2000) -> dict:
+    """Every language's sample, its body repeated out to ``lines`` lines."""
+    samples = {}
+    for language, (filename, diff) in diff_menu.LANGUAGE_SAMPLES.items():
+        head, body = diff.split("\n")[:3], diff.split("\n")[3:]
+        repeated = (body * (lines // len(body) + 1))[:lines]
+        samples[language] = (filename, "\n".join(head + repeated))
+    return samples
+
+
+def test_visible_lines_match_the_full_render(config):
+    for index, language in enumerate(SUPPORTED_LANGUAGES):
+        config.current_language_index = index
+        _, sample = diff_menu.LANGUAGE_SAMPLES[language]
+        buffer = io.StringIO()
+        diff_menu._preview_console(buffer).print(
+            format_diff_with_colors(
+                sample,
+                addition_color=config.current_add_color,
+                deletion_color=config.current_del_color,
+            ),
+            end="",
+        )
+        preview = _get_preview_text_for_prompt_toolkit(config, height=HEIGHT).value
+        assert buffer.getvalue() in preview, language
+
+
+def test_color_change_rerenders_only_that_kind(config, monkeypatch):
+    monkeypatch.setattr(diff_menu, "LANGUAGE_SAMPLES", _long_samples(200))
+    cache = config.preview_cache
+    _get_preview_text_for_prompt_toolkit(config, height=HEIGHT)
+    assert (cache.hits, cache.misses) == (0, HEIGHT)
+
+    config.current_add_color = "#164952"
+    _get_preview_text_for_prompt_toolkit(config, height=HEIGHT)
+    added = sum(kind == "added" for kind, _ in cache.body("python")[:HEIGHT])
+    assert cache.misses == HEIGHT + added
+    assert cache.hits == HEIGHT - added
+
+
+def test_viewport_scrolls_and_clamps(config, monkeypatch):
+    monkeypatch.setattr(diff_menu, "LANGUAGE_SAMPLES", _long_samples(200))
+    config.scroll_preview(10_000)
+    preview = _get_preview_text_for_prompt_toolkit(config, height=HEIGHT).value
+    preview = re.sub(r"\x1b\[[0-9;]*m", "", preview)
+    body = len(config.preview_cache.body("python"))
+    assert config.preview_offset == body - HEIGHT
+    assert f"lines {body - HEIGHT + 1}-{body} of {body}" in preview
+
+    config.next_language()
+    assert config.preview_offset == 0
+
+
+def _cycle_colors(config, languages):
+    """Step through every color per language; sorted per-keypress latencies."""
+    latencies = []
+    for index in languages:
+        config.current_language_index = index
+        for attr, colors in (
+            ("current_add_color", ADDITION_COLORS),
+            ("current_del_color", DELETION_COLORS),
+        ):
+            for color in colors.values():
+                setattr(config, attr, color)
+                started = time.perf_counter()
+                _get_preview_text_for_prompt_toolkit(config, height=HEIGHT)
+                latencies.append(time.perf_counter() - started)
+    return sorted(latencies)
+
+
+def _p95(latencies):
+    return latencies[int(len(latencies) * 0.95)]
+
+
+def test_color_cycling_over_a_2000_line_diff_renders_only_the_viewport(
+    config, monkeypatch
+):
+    from code_puppy.tools import common
+
+    monkeypatch.setattr(diff_menu, "LANGUAGE_SAMPLES", _long_samples(2000))
+    formatted, highlighted = [], []
+    format_line, highlight = common._format_diff_line, common._highlight_diff_code
+    monkeypatch.setattr(
+        common,
+        "_format_diff_line",
+        lambda *args: formatted.append(1) or format_line(*args),
+    )
+    monkeypatch.setattr(
+        common,
+        "_highlight_diff_code",
+        lambda *args: highlighted.append(1) or highlight(*args),
+    )
+    cache = config.preview_cache
+    config.current_language_index = SUPPORTED_LANGUAGES.index("python")
+    _get_preview_text_for_prompt_toolkit(config, height=HEIGHT)
+    visible = [kind for kind, _ in cache.body("python")[:HEIGHT]]
+    in_view = {kind: visible.count(kind) for kind in ("added", "removed")}
+
+    def keypress(attr, color):
+        setattr(config, attr, color)
+        before = (cache.hits, cache.misses, len(formatted))
+        _get_preview_text_for_prompt_toolkit(config, height=HEIGHT)
+        hits, misses, drawn = (cache.hits, cache.misses, len(formatted))
+        return hits - before[0], misses - before[1], drawn - before[2]
+
+    drawn_per_pass = []
+    for _ in range(2):  # cold, then back over the same colors
+        drawn_per_pass.append(0)
+        for attr, kind, colors in (
+            ("current_add_color", "added", ADDITION_COLORS),
+            ("current_del_color", "removed", DELETION_COLORS),
+        ):
+            for color in colors.values():
+                hits, misses, drawn = keypress(attr, color)
+                # Only the viewport is looked up, and only lines of the
+                # recolored kind are drawn again.
+                assert hits + misses == HEIGHT
+                assert drawn == misses <= in_view[kind]
+                drawn_per_pass[-1] += drawn
+
+    assert drawn_per_pass[0] > 0 and drawn_per_pass[1] == 0
+    # Highlighting is color-independent: once per visible line.
+    assert len(highlighted) <= HEIGHT
+
+
+@pytest.mark.benchmark
+def test_benchmark_cycling_languages_and_colors_over_a_2000_line_diff(
+    config, monkeypatch
+):
+    samples = _long_samples(2000)
+    monkeypatch.setattr(diff_menu, "LANGUAGE_SAMPLES", samples)
+    cold = _cycle_colors(config, range(len(SUPPORTED_LANGUAGES)))
+    warm = _cycle_colors(config, [len(SUPPORTED_LANGUAGES) - 1])
+
+    # The old preview formatted and printed the whole diff on every keypress.
+    started = time.perf_counter()
+    for language in SUPPORTED_LANGUAGES[:3]:
+        buffer = io.StringIO()
+        diff_menu._preview_console(buffer).print(
+            format_diff_with_colors(samples[language][1], "#0b3e0b", "#4a0f0f")
+        )
+    full = (time.perf_counter() - started) / 3
+
+    assert len(cold) == len(SUPPORTED_LANGUAGES) * (
+        len(ADDITION_COLORS) + len(DELETION_COLORS)
+    )
+    assert _p95(cold) < 0.1
+    assert _p95(warm) < 0.025
+    assert _p95(cold) < full / 5
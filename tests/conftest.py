@@ -30,7 +30,10 @@ for _xdg_name in _XDG_ENV_VARS:
 
 from code_puppy import config as cp_config  # noqa: E402
 from code_puppy import callbacks as cp_callbacks  # noqa: E402
+from code_puppy import maintenance as cp_maintenance  # noqa: E402
+from code_puppy.command_line import image_utils as cp_image_utils  # noqa: E402
 from code_puppy.messaging import bottom_bar as cp_bottom_bar  # noqa: E402
+from code_puppy.tools import read_cache as cp_read_cache  # noqa: E402
 
 
 def pytest_unconfigure(config):
@@ -152,11 +155,22 @@ def isolate_global_state_between_tests(tmp_path_factory):
     cp_config.clear_model_cache()
     # Clear session-local model cache (required for /model session sticky behavior).
     cp_config.reset_session_model()
+    # The parsed token_estimator belongs to the previous test's config file.
+    cp_config.reset_token_estimator_cache()
+    # Normalized images are keyed on content; tests reuse the same fake bytes.
+    cp_image_utils.normalized_image_cache.clear()
+    # Tests rewrite files within one mtime tick without going through the tools.
+    cp_read_cache.file_read_cache.clear()
+    # interactive_mode() would start the real maintenance worker against the
+    # developer's session dirs; tests drive MaintenanceScheduler directly.
+    original_start_maintenance = cp_maintenance.start_background_maintenance
+    cp_maintenance.start_background_maintenance = lambda: False
 
     yield
 
     # Drop any bar a test installed; next test re-neutralizes.
     cp_bottom_bar.reset_bottom_bar()
+    cp_maintenance.start_background_maintenance = original_start_maintenance
 
     # Restore original config paths and callback registrations.
     cp_config.CONFIG_FILE = original_config_file
@@ -1,5 +1,7 @@
 """Tests for hook engine main class."""
 
+import time
+
 import pytest
 
 from code_puppy.hook_engine import EventData, HookConfig, HookEngine
@@ -160,3 +162,135 @@ class TestHookEngineManagement:
         stats = engine.get_stats()
         assert stats["total_hooks"] == 1
         assert stats["enabled_hooks"] == 1
+
+
+class TestMatcherIndexMaintenance:
+    def _names(self, engine, tool_name, **tool_args):
+        return [
+            hook.command
+            for hook in engine._match_indexed_hooks(
+                engine.registry.get_hook_candidates("PreToolUse", tool_name),
+                tool_name,
+                tool_args,
+            )
+        ]
+
+    def test_add_hook_is_visible_to_next_dispatch(self):
+        engine = HookEngine(
+            {
+                "PreToolUse": [
+                    {"matcher": "Edit", "hooks": [{"type": "command", "command": "a"}]}
+                ]
+            }
+        )
+        assert self._names(engine, "Edit") == ["a"]
+        engine.add_hook(
+            "PreToolUse", HookConfig(matcher="Edit", type="command", command="b")
+        )
+        assert self._names(engine, "Edit") == ["a", "b"]
+
+    def test_remove_hook_is_visible_to_next_dispatch(self):
+        engine = HookEngine()
+        hook = HookConfig(matcher="Edit", type="command", command="a")
+        engine.add_hook("PreToolUse", hook)
+        assert self._names(engine, "Edit") == ["a"]
+        engine.remove_hook("PreToolUse", hook.id)
+        assert self._names(engine, "Edit") == []
+
+    def test_reload_config_replaces_index(self):
+        engine = HookEngine(
+            {
+                "PreToolUse": [
+                    {"matcher": "Edit", "hooks": [{"type": "command", "command": "a"}]}
+                ]
+            }
+        )
+        assert self._names(engine, "Edit") == ["a"]
+        engine.reload_config(
+            {
+                "PreToolUse": [
+                    {"matcher": "Read", "hooks": [{"type": "command", "command": "b"}]}
+                ]
+            }
+        )
+        assert self._names(engine, "Edit") == []
+        assert self._names(engine, "Read") == ["b"]
+
+    def test_disabled_and_spent_once_hooks_are_filtered(self):
+        engine = HookEngine()
+        disabled = HookConfig(matcher="Edit", type="command", command="a")
+        once = HookConfig(matcher="Edit", type="command", command="b", once=True)
+        engine.add_hook("PreToolUse", disabled)
+        engine.add_hook("PreToolUse", once)
+        disabled.enabled = False
+        assert self._names(engine, "Edit") == ["b"]
+        engine.registry.mark_hook_executed(once.id)
+        assert self._names(engine, "Edit") == []
+
+    def test_file_extension_hooks_still_see_arguments(self):
+        engine = HookEngine(
+            {
+                "PreToolUse": [
+                    {
+                        "matcher": "Edit && .py",
+                        "hooks": [{"type": "command", "command": "a"}],
+                    }
+                ]
+            }
+        )
+        assert self._names(engine, "Edit", file_path="x.py") == ["a"]
+        assert self._names(engine, "Edit", file_path="x.ts") == []
+
+    def _two_hundred_hooks(self):
+        """180 exact-name hooks plus 20 pattern hooks that never match."""
+        groups = []
+        for i in range(180):
+            groups.append(
+                {
+                    "matcher": f"tool_{i}",
+                    "hooks": [{"type": "command", "command": f"echo {i}"}],
+                }
+            )
+        for i, matcher in enumerate(
+            ["*.py_never", "^never_", ".never", "never* && .py"] * 5
+        ):
+            groups.append(
+                {
+                    "matcher": matcher,
+                    "hooks": [{"type": "command", "command": f"echo fb{i}"}],
+                }
+            )
+        return HookEngine({"PreToolUse": groups})
+
+    def test_index_narrows_200_hooks_to_the_named_tool(self):
+        engine = self._two_hundred_hooks()
+        assert engine.count_hooks("PreToolUse") == 200
+        candidates = engine.registry.get_hook_candidates("PreToolUse", "tool_7")
+        # The exact-name bucket plus the pattern matchers, not all 200.
+        assert len(candidates) == 21
+        assert self._names(engine, "tool_7", file_path="a.py") == ["echo 7"]
+        assert self._names(engine, "other_3", file_path="a.txt") == []
+
+    @pytest.mark.benchmark
+    async def test_dispatch_benchmark_100k_events_200_hooks(self):
+        """100k events against 200 hooks, matched through the index."""
+        engine = self._two_hundred_hooks()
+
+        events = [
+            EventData(
+                event_type="PreToolUse",
+                tool_name=f"other_{i % 20}",
+                tool_args={"file_path": "a.txt"},
+            )
+            for i in range(100)
+        ]
+        started = time.perf_counter()
+        for _ in range(1000):
+            for event in events:
+                result = await engine.process_event("PreToolUse", event)
+        elapsed = time.perf_counter() - started
+
+        assert result.executed_hooks == 0
+        # Walking 200 string matchers per event took ~70s here; the index
+        # brings 100k events down to ~4s.
+        assert elapsed < 20
@@ -2,7 +2,12 @@
 
 import pytest
 
-from code_puppy.hook_engine.matcher import _extract_file_path, matches
+from code_puppy.hook_engine.matcher import (
+    MatcherIndex,
+    _extract_file_path,
+    compile_matcher,
+    matches,
+)
 
 # One row per branch: (matcher, tool_name, tool_args, expected) — folded from one
 # test per case into a matrix: same branches, less boilerplate.
@@ -73,3 +78,67 @@ class TestExtractFilePath:
         # file_path takes priority over path
         result = _extract_file_path({"file_path": "a.py", "path": "b.py"})
         assert result == "a.py"
+
+
+class TestCompileMatcher:
+    def test_compiled_once_per_string(self):
+        assert compile_matcher("Edit && .py") is compile_matcher("Edit && .py")
+
+    @pytest.mark.parametrize(
+        "matcher,expected_keys",
+        [
+            ("Edit", {"edit"}),
+            ("Edit || Write", {"edit", "write"}),
+            ("Edit && .py", {"edit"}),
+            ("*", None),
+            (".py", None),
+            ("edit*", None),
+            ("^read", None),
+            ("Edit || .py", None),
+        ],
+    )
+    def test_tool_keys(self, matcher, expected_keys):
+        keys = compile_matcher(matcher).tool_keys
+        if expected_keys is None:
+            assert keys is None
+        else:
+            assert expected_keys <= keys
+
+    def test_alias_names_share_a_bucket(self):
+        keys = compile_matcher("Bash").tool_keys
+        assert "agent_run_shell_command" in keys
+
+    @pytest.mark.parametrize(
+        "matcher,tool_name,tool_args,expected",
+        _MATCH_CASES,
+        ids=[f"{m}~{t}" for m, t, _a, _e in _MATCH_CASES],
+    )
+    def test_keys_never_exclude_a_match(self, matcher, tool_name, tool_args, expected):
+        keys = compile_matcher(matcher).tool_keys
+        if expected and keys is not None:
+            assert tool_name.lower() in keys
+
+
+class _Hook:
+    def __init__(self, matcher):
+        self.matcher = matcher
+
+
+class TestMatcherIndex:
+    def test_candidates_keep_registration_order(self):
+        hooks = [_Hook("Write"), _Hook("*"), _Hook("Edit"), _Hook(".py"), _Hook("Edit")]
+        index = MatcherIndex({"pre_tool_use": hooks})
+        got = [hook for hook, _ in index.candidates("pre_tool_use", "edit")]
+        assert got == [hooks[1], hooks[2], hooks[3], hooks[4]]
+
+    def test_unrelated_exact_hooks_are_skipped(self):
+        hooks = [_Hook(f"tool_{i}") for i in range(50)]
+        index = MatcherIndex({"pre_tool_use": hooks})
+        assert index.candidates("pre_tool_use", "TOOL_7") == (
+            (hooks[7], compile_matcher("tool_7")),
+        )
+        assert index.candidates("pre_tool_use", "other") == ()
+
+    def test_unknown_event(self):
+        index = MatcherIndex({"pre_tool_use": [_Hook("*")]})
+        assert index.candidates("post_tool_use", "Edit") == ()
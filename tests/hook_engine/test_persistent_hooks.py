@@ -0,0 +1,275 @@
+"""Tests for ``"mode": "persistent"`` hooks (hook_engine/workers.py)."""
+
+import asyncio
+import sys
+import textwrap
+import time
+
+import pytest
+
+from code_puppy.hook_engine import EventData, HookConfig, HookEngine
+from code_puppy.hook_engine import workers
+from code_puppy.hook_engine.executor import execute_hook
+from code_puppy.hook_engine.validator import validate_hooks_config
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="worker scripts use POSIX shells"
+)
+
+# Reads one JSON event per line and answers according to tool_name.
+WORKER = textwrap.dedent(
+    """
+    import json, os, sys, time
+    for line in sys.stdin:
+        event = json.loads(line)
+        tool = event["tool_name"]
+        if tool == "crash":
+            sys.exit(3)
+        if tool == "sleep":
+            time.sleep(float(event["tool_input"]["seconds"]))
+        if tool == "garbage":
+            print("not json", flush=True)
+            continue
+        if tool == "block":
+            reply = {"exit_code": 1, "stderr": "nope"}
+        elif tool == "deny":
+            reply = {"decision": "block", "reason": "policy"}
+        elif tool == "pid":
+            reply = {"stdout": str(os.getpid())}
+        else:
+            reply = {"stdout": "ok " + tool}
+        print(json.dumps(reply), flush=True)
+    """
+)
+
+
+@pytest.fixture(autouse=True)
+async def _reap_workers():
+    yield
+    await workers.shutdown_hook_workers()
+    workers.kill_hook_workers()
+
+
+@pytest.fixture
+def worker_script(tmp_path):
+    path = tmp_path / "worker.py"
+    path.write_text(WORKER)
+    return f'"{sys.executable}" "{path}"'
+
+
+def _hook(command, **kwargs):
+    kwargs.setdefault("timeout", 5000)
+    return HookConfig(
+        matcher="*", type="command", command=command, mode="persistent", **kwargs
+    )
+
+
+def _event(tool_name, **tool_args):
+    return EventData(event_type="PreToolUse", tool_name=tool_name, tool_args=tool_args)
+
+
+def _pool():
+    (pool,) = workers._pools[asyncio.get_running_loop()].values()
+    return pool
+
+
+class TestConfig:
+    def test_spawn_is_default(self):
+        assert HookConfig(matcher="*", type="command", command="x").mode == "spawn"
+
+    def test_invalid_mode_rejected(self):
+        with pytest.raises(ValueError):
+            HookConfig(matcher="*", type="command", command="x", mode="forever")
+
+    def test_invalid_workers_rejected(self):
+        with pytest.raises(ValueError):
+            HookConfig(matcher="*", type="command", command="x", workers=0)
+
+    def test_validator_reports_bad_mode_and_workers(self):
+        ok, errors = validate_hooks_config(
+            {
+                "PreToolUse": [
+                    {
+                        "matcher": "*",
+                        "hooks": [
+                            {
+                                "type": "command",
+                                "command": "x",
+                                "mode": "daemon",
+                                "workers": 0,
+                            }
+                        ],
+                    }
+                ]
+            }
+        )
+        assert not ok
+        assert any("mode" in e for e in errors)
+        assert any("workers" in e for e in errors)
+
+    def test_registry_reads_mode_and_workers(self):
+        engine = HookEngine(
+            {
+                "PreToolUse": [
+                    {
+                        "matcher": "*",
+                        "hooks": [
+                            {
+                                "type": "command",
+                                "command": "x",
+                                "mode": "persistent",
+                                "workers": 3,
+                            }
+                        ],
+                    }
+                ]
+            }
+        )
+        (hook,) = engine.get_hooks_for_event("PreToolUse")
+        assert (hook.mode, hook.workers) == ("persistent", 3)
+
+
+class TestPersistentExecution:
+    async def test_one_process_serves_many_events(self, worker_script):
+        hook = _hook(worker_script)
+        pids = set()
+        for _ in range(5):
+            result = await execute_hook(hook, _event("pid"))
+            assert result.success
+            pids.add(result.stdout)
+        assert len(pids) == 1
+        assert _pool().starts == 1
+
+    async def test_exit_code_one_blocks(self, worker_script):
+        result = await execute_hook(_hook(worker_script), _event("block"))
+        assert result.blocked is True
+        assert result.error == "nope"
+
+    async def test_control_payload_blocks_and_is_stripped(self, worker_script):
+        result = await execute_hook(_hook(worker_script), _event("deny"))
+        assert result.blocked is True
+        assert result.error == "policy"
+        assert result.stdout == ""
+
+    async def test_crash_is_reported_then_worker_restarts(self, worker_script):
+        hook = _hook(worker_script)
+        crashed = await execute_hook(hook, _event("crash"))
+        assert crashed.blocked is False
+        assert crashed.exit_code == -1
+        assert "exited" in crashed.error
+
+        recovered = await execute_hook(hook, _event("Edit"))
+        assert recovered.stdout == "ok Edit"
+        assert _pool().starts == 2
+        assert _pool().consecutive_failures == 0
+
+    async def test_malformed_reply_restarts_worker(self, worker_script):
+        hook = _hook(worker_script)
+        bad = await execute_hook(hook, _event("garbage"))
+        assert "not JSON" in bad.error
+        assert (await execute_hook(hook, _event("Edit"))).stdout == "ok Edit"
+
+    async def test_deadline_kills_and_blocks_like_spawn_mode(self, worker_script):
+        hook = _hook(worker_script, timeout=300)
+        started = time.perf_counter()
+        result = await execute_hook(hook, _event("sleep", seconds=5))
+        assert time.perf_counter() - started < 2
+        assert result.blocked is True
+        assert "timed out" in result.error
+        # Timeouts do not count towards the spawn fallback.
+        assert _pool().consecutive_failures == 0
+        assert (await execute_hook(hook, _event("Edit"))).stdout == "ok Edit"
+
+    async def test_repeated_crashes_fall_back_to_spawn(self, tmp_path):
+        script = tmp_path / "oneshot.py"
+        # Answers once and exits: fine per spawn, useless as a worker.
+        script.write_text("print('spawned')\n")
+        hook = _hook(f'"{sys.executable}" "{script}"')
+        for _ in range(workers.MAX_CONSECUTIVE_FAILURES):
+            result = await execute_hook(hook, _event("Edit"))
+            assert result.exit_code == -1
+        assert _pool().broken
+
+        fallback = await execute_hook(hook, _event("Edit"))
+        assert fallback.success
+        assert fallback.stdout.strip() == "spawned"
+
+    async def test_concurrency_is_bounded_by_workers(self, worker_script):
+        hook = _hook(worker_script, workers=2)
+        results = await asyncio.gather(
+            *(execute_hook(hook, _event("sleep", seconds=0.2)) for _ in range(6))
+        )
+        assert all(r.success for r in results)
+        assert _pool().starts == 2
+        pids = await asyncio.gather(
+            *(execute_hook(hook, _event("pid")) for _ in range(4))
+        )
+        assert len({r.stdout for r in pids}) <= 2
+
+    async def test_reload_config_restarts_workers(self, worker_script):
+        engine = HookEngine(
+            {
+                "PreToolUse": [
+                    {
+                        "matcher": "*",
+                        "hooks": [
+                            {
+                                "type": "command",
+                                "command": worker_script,
+                                "mode": "persistent",
+                            }
+                        ],
+                    }
+                ]
+            }
+        )
+        first = await engine.process_event("PreToolUse", _event("pid"))
+        engine.reload_config(
+            {
+                "PreToolUse": [
+                    {
+                        "matcher": "*",
+                        "hooks": [
+                            {
+                                "type": "command",
+                                "command": worker_script,
+                                "mode": "persistent",
+                            }
+                        ],
+                    }
+                ]
+            }
+        )
+        second = await engine.process_event("PreToolUse", _event("pid"))
+        assert first.results[0].stdout != second.results[0].stdout
+
+    @pytest.mark.benchmark
+    async def test_benchmark_persistent_vs_spawn(self, tmp_path, worker_script):
+        """1000 events through a trivial Python hook in persistent mode.
+
+        Spawn mode is sampled at 50 events (it needs a fresh interpreter for
+        each); the per-event comparison is what matters.
+        """
+        spawn_script = tmp_path / "spawn_hook.py"
+        spawn_script.write_text("import sys, json; json.load(sys.stdin); print('ok')\n")
+        spawn_hook = HookConfig(
+            matcher="*",
+            type="command",
+            command=f'"{sys.executable}" "{spawn_script}"',
+            timeout=10000,
+        )
+        persistent_hook = _hook(worker_script)
+        event = _event("Edit", file_path="a.py")
+
+        started = time.perf_counter()
+        for _ in range(50):
+            assert (await execute_hook(spawn_hook, event)).success
+        spawn_per_event = (time.perf_counter() - started) / 50
+
+        started = time.perf_counter()
+        for _ in range(1000):
+            assert (await execute_hook(persistent_hook, event)).success
+        persistent_per_event = (time.perf_counter() - started) / 1000
+
+        assert _pool().starts == 1
+        assert persistent_per_event * 5 < spawn_per_event
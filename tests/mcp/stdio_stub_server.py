@@ -0,0 +1,91 @@
+"""Minimal stdio MCP server used by the tool-index tests.
+
+Run as a script (``python stdio_stub_server.py``). It counts every
+``tools/list`` request it serves and exposes that count through the
+``list_tools_count`` tool, so tests can assert how often the client re-lists.
+
+Tools:
+    echo              -- returns its arguments as JSON (schema has typed props)
+    list_tools_count  -- returns the number of ``tools/list`` requests served
+    add_tool          -- registers an extra ``late`` tool and sends
+                         ``notifications/tools/list_changed``
+    block             -- blocks the server's event loop for ``seconds``
+                         (simulates a wedged server that stops answering)
+"""
+
+import json
+import time
+
+import anyio
+from mcp import types
+from mcp.server.lowlevel import NotificationOptions, Server
+from mcp.server.stdio import stdio_server
+
+server = Server("stdio-stub")
+state = {"list_tools": 0, "late": False}
+
+_ECHO = types.Tool(
+    name="echo",
+    description="Echo arguments back",
+    inputSchema={
+        "type": "object",
+        "properties": {"flag": {"type": "boolean"}, "count": {"type": "integer"}},
+    },
+)
+_COUNT = types.Tool(
+    name="list_tools_count",
+    description="Number of tools/list requests served",
+    inputSchema={"type": "object", "properties": {}},
+)
+_ADD = types.Tool(
+    name="add_tool",
+    description="Register the late tool and notify list_changed",
+    inputSchema={"type": "object", "properties": {}},
+)
+_BLOCK = types.Tool(
+    name="block",
+    description="Block the event loop",
+    inputSchema={"type": "object", "properties": {"seconds": {"type": "number"}}},
+)
+_LATE = types.Tool(
+    name="late",
+    description="Only present after add_tool",
+    inputSchema={"type": "object", "properties": {"items": {"type": "array"}}},
+)
+
+
+@server.list_tools()
+async def list_tools() -> list[types.Tool]:
+    state["list_tools"] += 1
+    tools = [_ECHO, _COUNT, _ADD, _BLOCK]
+    if state["late"]:
+        tools.append(_LATE)
+    return tools
+
+
+@server.call_tool()
+async def call_tool(name: str, arguments: dict) -> list[types.TextContent]:
+    if name == "list_tools_count":
+        payload = state["list_tools"]
+    elif name == "add_tool":
+        state["late"] = True
+        await server.request_context.session.send_tool_list_changed()
+        payload = "ok"
+    elif name == "block":
+        time.sleep(arguments.get("seconds", 1))
+        payload = "unblocked"
+    else:
+        payload = arguments
+    return [types.TextContent(type="text", text=json.dumps(payload))]
+
+
+async def main() -> None:
+    options = server.create_initialization_options(
+        NotificationOptions(tools_changed=True)
+    )
+    async with stdio_server() as (read_stream, write_stream):
+        await server.run(read_stream, write_stream, options)
+
+
+if __name__ == "__main__":
+    anyio.run(main)
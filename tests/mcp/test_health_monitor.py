@@ -3,7 +3,7 @@ Comprehensive tests for health_monitor.py.
 
 Tests health monitoring system including:
 - Health check execution and monitoring loops
-- Server type-specific health checks (SSE, HTTP, stdio)
+- MCP ping probes for every transport (SSE, HTTP, stdio)
 - Consecutive failure handling and recovery
 - Health history tracking and status queries
 - Circuit breaker functionality
@@ -12,9 +12,10 @@ Tests health monitoring system including:
 
 import asyncio
 from datetime import datetime, timedelta
-from unittest.mock import Mock, patch
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
 
-import httpx
 import pytest
 
 from code_puppy.mcp_.health_monitor import (
@@ -22,7 +23,8 @@ from code_puppy.mcp_.health_monitor import (
     HealthMonitor,
     HealthStatus,
 )
-from code_puppy.mcp_.managed_server import ManagedMCPServer
+from code_puppy.mcp_.managed_server import ManagedMCPServer, ServerConfig
+from code_puppy.mcp_.status_tracker import ServerStatusTracker
 
 
 @pytest.fixture
@@ -438,128 +440,99 @@ class TestHealthMonitor:
         assert quarantine_duration > 0
         assert quarantine_duration <= 1800  # Max 30 minutes
 
-    async def test_sse_health_check_success(self, health_monitor, sse_server):
-        """Test successful SSE health check."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.get.return_value = (
-                mock_response
-            )
-
-            result = await health_monitor._check_sse_health(sse_server)
-
-            assert result.success is True
-            assert result.error is None
-
-    async def test_sse_health_check_failure(self, health_monitor, sse_server):
-        """Test SSE health check failure."""
-        mock_response = Mock()
-        mock_response.status_code = 500
-        mock_response.reason_phrase = "Internal Server Error"
-
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.get.return_value = (
-                mock_response
-            )
+    @pytest.mark.parametrize("server_type", ["sse", "http", "stdio"])
+    async def test_every_transport_uses_ping_probe(
+        self, health_monitor, mock_server, server_type
+    ):
+        """All transports are probed with MCP ping, not config inspection."""
+        mock_server.config.type = server_type
+        mock_server.ping = AsyncMock(return_value=True)
 
-            result = await health_monitor._check_sse_health(sse_server)
+        status = await health_monitor.check_health(mock_server)
 
-            assert result.success is False
-            assert "HTTP 500" in result.error
+        mock_server.ping.assert_awaited_once_with(timeout=health_monitor.probe_timeout)
+        assert status.is_healthy is True
+        assert status.latency_ms is not None
 
-    async def test_sse_health_check_no_url(self, health_monitor, sse_server):
-        """Test SSE health check with no URL configured."""
-        sse_server.config.config = {}
+    async def test_ping_health_check_timeout(self, health_monitor, stdio_server):
+        stdio_server.ping = AsyncMock(side_effect=asyncio.TimeoutError())
 
-        result = await health_monitor._check_sse_health(sse_server)
+        result = await health_monitor._check_ping_health(stdio_server)
 
         assert result.success is False
-        assert "No URL configured" in result.error
+        assert result.timed_out is True
+        assert "timed out" in result.error
 
-    async def test_sse_health_check_exception(self, health_monitor, sse_server):
-        """Test SSE health check with exception."""
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_client.return_value.__aenter__.return_value.get.side_effect = (
-                httpx.RequestError("Connection error")
-            )
+    async def test_ping_health_check_error(self, health_monitor, stdio_server):
+        stdio_server.ping = AsyncMock(side_effect=RuntimeError("no open session"))
 
-            result = await health_monitor._check_sse_health(sse_server)
+        result = await health_monitor._check_ping_health(stdio_server)
 
-            assert result.success is False
-            assert "Connection error" in result.error
+        assert result.success is False
+        assert result.timed_out is False
+        assert "no open session" in result.error
 
-    async def test_sse_health_check_fallback_to_base_url(
-        self, health_monitor, sse_server
+    async def test_ping_health_check_unexpected_result(
+        self, health_monitor, stdio_server
     ):
-        """Test SSE health check fallback to base URL when health endpoint returns 404."""
-        base_url = "http://localhost:3000"
-        sse_server.config.config = {"url": base_url}
+        stdio_server.ping = AsyncMock(return_value=False)
 
-        mock_health_response = Mock()
-        mock_health_response.status_code = 404
-        mock_base_response = Mock()
-        mock_base_response.status_code = 200
+        result = await health_monitor._check_ping_health(stdio_server)
 
-        with patch("httpx.AsyncClient") as mock_client:
-            client_instance = mock_client.return_value.__aenter__.return_value
-            client_instance.get.side_effect = [mock_health_response, mock_base_response]
+        assert result.success is False
 
-            result = await health_monitor._check_sse_health(sse_server)
+    async def test_successful_probe_records_latency(self, mock_server):
+        tracker = ServerStatusTracker()
+        monitor = HealthMonitor(check_interval=1, status_tracker=tracker)
+        mock_server.ping = AsyncMock(return_value=True)
 
-            assert result.success is True
-            assert client_instance.get.call_count == 2
+        for _ in range(5):
+            status = await monitor.check_health(mock_server)
+            monitor._observe_probe("s1", mock_server, status)
 
-    async def test_http_health_check(self, health_monitor, http_server):
-        """Test HTTP healthcheck uses same logic as SSE."""
-        with patch.object(health_monitor, "_check_sse_health") as mock_sse_check:
-            mock_sse_check.return_value = HealthCheckResult(
-                success=True, latency_ms=0.0, error=None
-            )
+        latency = tracker.get_latency_percentiles("s1")
+        assert latency["count"] == 5
+        assert latency["p50_ms"] is not None
 
-            result = await health_monitor._check_http_health(http_server)
+    async def test_repeated_timeouts_open_breaker_and_quarantine(self, mock_server):
+        monitor = HealthMonitor(
+            check_interval=1, timeout_threshold=3, isolation_seconds=42
+        )
+        mock_server.ping = AsyncMock(side_effect=asyncio.TimeoutError())
 
-            mock_sse_check.assert_called_once_with(http_server)
-            assert result.success is True
+        for _ in range(2):
+            status = await monitor.check_health(mock_server)
+            monitor._observe_probe("s1", mock_server, status)
+        mock_server.quarantine.assert_not_called()
 
-    async def test_stdio_health_check_success(self, health_monitor, stdio_server):
-        """Test successful stdio health check."""
-        with patch("shutil.which", return_value="/usr/bin/node"):
-            result = await health_monitor._check_stdio_health(stdio_server)
+        status = await monitor.check_health(mock_server)
+        monitor._observe_probe("s1", mock_server, status)
 
-            assert result.success is True
-            assert result.error is None
+        assert monitor.circuit_breakers["s1"].is_open()
+        mock_server.quarantine.assert_called_once_with(42)
 
-    async def test_stdio_health_check_no_command(self, health_monitor, stdio_server):
-        """Test stdio health check with no command configured."""
-        stdio_server.config.config = {}
+    async def test_non_timeout_failures_do_not_trip_breaker(self, mock_server):
+        monitor = HealthMonitor(check_interval=1, timeout_threshold=2)
+        mock_server.ping = AsyncMock(side_effect=RuntimeError("boom"))
 
-        result = await health_monitor._check_stdio_health(stdio_server)
+        for _ in range(5):
+            status = await monitor.check_health(mock_server)
+            monitor._observe_probe("s1", mock_server, status)
 
-        assert result.success is False
-        assert "No command configured" in result.error
+        assert monitor.circuit_breakers["s1"].is_closed()
+        mock_server.quarantine.assert_not_called()
 
-    async def test_stdio_health_check_command_not_found(
-        self, health_monitor, stdio_server
+    async def test_monitoring_loop_skips_disconnected_server(
+        self, health_monitor, mock_server
     ):
-        """Test stdio health check with command not in PATH."""
-        with patch("shutil.which", return_value=None):
-            result = await health_monitor._check_stdio_health(stdio_server)
-
-            assert result.success is False
-            assert "not found in PATH" in result.error
+        mock_server.is_connected.return_value = False
+        await health_monitor.start_monitoring("s1", mock_server)
+        health_monitor.health_history["s1"].clear()
 
-    async def test_stdio_health_check_exception(self, health_monitor, stdio_server):
-        """Test stdio health check when get_pydantic_server raises exception."""
-        stdio_server.get_pydantic_server.side_effect = Exception(
-            "Server creation failed"
-        )
+        await asyncio.sleep(1.5)
 
-        result = await health_monitor._check_stdio_health(stdio_server)
-
-        assert result.success is False
-        assert "Server creation failed" in result.error
+        assert len(health_monitor.health_history["s1"]) == 0
+        await health_monitor.stop_monitoring("s1")
 
     async def test_shutdown(self, health_monitor, mock_server):
         """Test graceful shutdown of all monitoring tasks."""
@@ -720,3 +693,88 @@ class TestHealthCheckResult:
         assert result.success is True
         assert result.latency_ms == 75.2
         assert result.error is None
+
+
+class TestPingProbeAgainstStdioServer:
+    """Probe a real stdio MCP server, including one whose event loop is wedged."""
+
+    STUB = Path(__file__).with_name("stdio_stub_server.py")
+
+    def _server(self) -> ManagedMCPServer:
+        return ManagedMCPServer(
+            ServerConfig(
+                id="stub-id",
+                name="stub",
+                type="stdio",
+                config={"command": sys.executable, "args": [str(self.STUB)]},
+            )
+        )
+
+    async def test_ping_succeeds_on_live_server(self):
+        server = self._server()
+        server.enable()
+        tracker = ServerStatusTracker()
+        monitor = HealthMonitor(check_interval=1, status_tracker=tracker)
+        async with server._toolset:
+            status = await monitor.check_health(server)
+            monitor._observe_probe("stub-id", server, status)
+
+        assert status.is_healthy is True
+        assert tracker.get_latency_percentiles("stub-id")["count"] == 1
+
+    async def test_wedged_server_times_out_and_is_isolated(self):
+        server = self._server()
+        server.enable()
+        monitor = HealthMonitor(
+            check_interval=1, probe_timeout=0.3, timeout_threshold=2
+        )
+        async with server._toolset:
+            # Blocks the stub's event loop, so it stops answering requests
+            # while the process stays alive.
+            blocker = asyncio.create_task(
+                server._toolset.direct_call_tool("block", {"seconds": 3})
+            )
+            await asyncio.sleep(0.2)
+            for _ in range(2):
+                status = await monitor.check_health(server)
+                monitor._observe_probe("stub-id", server, status)
+                assert status.timed_out is True
+            blocker.cancel()
+
+        assert monitor.circuit_breakers["stub-id"].is_open()
+        assert server.is_quarantined()
+
+    async def test_manager_started_server_is_probed(self):
+        from code_puppy.mcp_.manager import MCPManager
+
+        with (
+            patch.object(MCPManager, "sync_from_config"),
+            patch.object(MCPManager, "_initialize_servers"),
+            patch("code_puppy.callbacks.register_callback"),
+        ):
+            manager = MCPManager()
+        server = self._server()
+        manager._managed_servers = {"stub-id": server}
+        manager.health_monitor.check_interval = 0.05
+        probed = asyncio.Event()
+        record_latency = manager.status_tracker.record_latency
+
+        def on_latency(server_id, latency_ms):
+            record_latency(server_id, latency_ms)
+            probed.set()
+
+        manager.status_tracker.record_latency = on_latency
+        # The lifecycle manager's job (holding the session open) done inline.
+        lifecycle = AsyncMock()
+        lifecycle.start_server.return_value = True
+        with patch(
+            "code_puppy.mcp_.manager.get_lifecycle_manager", return_value=lifecycle
+        ):
+            async with server._toolset:
+                assert await manager.start_server("stub-id")
+                await asyncio.wait_for(probed.wait(), timeout=10)
+                assert manager.list_servers()[0].latency_ms is not None
+                await manager.stop_server("stub-id")
+
+        assert manager.health_monitor.monitoring_tasks == {}
+        await manager.shutdown()
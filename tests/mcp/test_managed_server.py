@@ -16,7 +16,7 @@ from code_puppy.mcp_.managed_server import (
     process_tool_call,
 )
 
-TOOLSET = "code_puppy.mcp_.managed_server.MCPToolset"
+TOOLSET = "code_puppy.mcp_.managed_server.IndexedMCPToolset"
 SSE_TRANSPORT = "code_puppy.mcp_.managed_server.SSETransport"
 HTTP_TRANSPORT = "code_puppy.mcp_.managed_server.StreamableHttpTransport"
 STDIO = "code_puppy.mcp_.managed_server.BlockingStdioToolset"
@@ -235,9 +235,9 @@ class TestProcessToolCall:
         mock_ctx.deps = {"some": "deps"}
         mock_call_tool = AsyncMock(return_value="tool_result")
 
-        with patch("rich.console.Console") as mock_console_cls:
+        with patch("code_puppy.mcp_.managed_server._get_console") as mock_get_console:
             mock_console = Mock()
-            mock_console_cls.return_value = mock_console
+            mock_get_console.return_value = mock_console
             result = await process_tool_call(
                 ctx=mock_ctx,
                 call_tool=mock_call_tool,
@@ -258,7 +258,7 @@ class TestProcessToolCall:
         mock_ctx.deps = None
         mock_call_tool = AsyncMock(return_value="result")
 
-        with patch("rich.console.Console"):
+        with patch("code_puppy.mcp_.managed_server._get_console"):
             result = await process_tool_call(
                 ctx=mock_ctx, call_tool=mock_call_tool, name="t", tool_args={}
             )
@@ -290,7 +290,7 @@ class TestProcessToolCall:
         toolset = FakeToolset()
         call_tool = functools.partial(toolset.direct_call_tool)
 
-        with patch("rich.console.Console"):
+        with patch("code_puppy.mcp_.managed_server._get_console"):
             result = await process_tool_call(
                 ctx=mock_ctx, call_tool=call_tool, name="t", tool_args={"flag": "true"}
             )
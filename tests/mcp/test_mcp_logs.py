@@ -7,9 +7,11 @@ from unittest.mock import patch
 
 import pytest
 
+from code_puppy.mcp_ import mcp_logs
 from code_puppy.mcp_.mcp_logs import (
     MAX_LOG_SIZE,
     clear_logs,
+    flush_logs,
     get_log_stats,
     get_mcp_logs_dir,
     list_servers_with_logs,
@@ -183,3 +185,163 @@ class TestMCPLogs:
         # Original file should be gone, rotated file should exist
         assert not log_path.exists()
         assert (temp_logs_dir / f"{server_name}.log.1").exists()
+
+
+class TestBufferedWriter:
+    """Tests for the buffered writer and the reverse-seek tail reader."""
+
+    def test_write_log_keeps_file_open_between_lines(self, temp_logs_dir):
+        """Many lines cost one open(), not one per line."""
+        with patch(
+            "code_puppy.mcp_.mcp_logs.open", wraps=open, create=True
+        ) as spy_open:
+            for i in range(500):
+                write_log("chatty", f"line {i}")
+            flush_logs("chatty")
+
+        assert spy_open.call_count == 1
+        assert len(read_logs("chatty")) == 500
+
+    def test_lines_are_buffered_until_flush(self, temp_logs_dir):
+        write_log("buffered", "pending")
+        log_path = temp_logs_dir / "buffered.log"
+        assert log_path.read_text() == ""
+
+        flush_logs("buffered")
+        assert "pending" in log_path.read_text()
+
+    def test_writer_rotates_when_size_exceeded(self, temp_logs_dir):
+        log_path = temp_logs_dir / "big.log"
+        log_path.write_text("x" * (MAX_LOG_SIZE - 10) + "\n")
+
+        write_log("big", "tips it over the limit")
+        write_log("big", "lands in the fresh file")
+        flush_logs("big")
+
+        rotated = temp_logs_dir / "big.log.1"
+        assert rotated.exists()
+        assert "tips it over" in rotated.read_text()
+        current = read_logs("big")
+        assert len(current) == 1
+        assert "lands in the fresh file" in current[0]
+
+    def test_rotate_log_if_needed_flushes_pending_lines_first(self, temp_logs_dir):
+        log_path = temp_logs_dir / "rot.log"
+        log_path.write_text("x" * MAX_LOG_SIZE + "\n")
+        write_log("rot", "pending before rotate")
+
+        rotate_log_if_needed("rot")
+
+        assert not log_path.exists()
+        assert "pending before rotate" in (temp_logs_dir / "rot.log.1").read_text()
+
+    def test_retired_writer_hands_lines_to_its_replacement(self, temp_logs_dir):
+        log_path = temp_logs_dir / "race.log"
+        write_log("race", "before clear")
+        stale = mcp_logs._get_writer(log_path)
+
+        clear_logs("race")
+
+        assert stale.write("lost\n") is False
+        assert stale._file is None
+        # write_log raced with the clear: it looked up the retired writer.
+        with patch.object(
+            mcp_logs,
+            "_get_writer",
+            side_effect=[stale, mcp_logs._get_writer(log_path)],
+        ):
+            write_log("race", "after clear")
+        assert [line.split("] ")[-1] for line in read_logs("race")] == ["after clear"]
+
+    def test_concurrent_rotate_checks_lose_no_lines(self, temp_logs_dir):
+        import threading
+
+        done = threading.Event()
+
+        def rotate_checks():
+            while not done.is_set():
+                rotate_log_if_needed("busy")
+
+        checker = threading.Thread(target=rotate_checks)
+        checker.start()
+        try:
+            for i in range(2000):
+                write_log("busy", f"line {i}")
+        finally:
+            done.set()
+            checker.join()
+
+        assert len(read_logs("busy")) == 2000
+
+    @pytest.mark.parametrize("block_size", [7, 64, 64 * 1024])
+    def test_tail_matches_full_read(self, temp_logs_dir, block_size):
+        log_path = temp_logs_dir / "tail.log"
+        log_path.write_text(
+            "".join(f"entry {i} éè中\n" for i in range(300)),
+            encoding="utf-8",
+        )
+        everything = read_logs("tail")
+
+        with patch("code_puppy.mcp_.mcp_logs.TAIL_BLOCK_SIZE", block_size):
+            for n in (1, 2, 17, 299, 300, 1000):
+                assert read_logs("tail", lines=n) == everything[-n:]
+
+    def test_tail_spans_rotated_files(self, temp_logs_dir):
+        (temp_logs_dir / "span.log.2").write_text("a\nb\n")
+        (temp_logs_dir / "span.log.1").write_text("c\nd\n")
+        (temp_logs_dir / "span.log").write_text("e\n")
+
+        assert read_logs("span", lines=4, include_rotated=True) == ["b", "c", "d", "e"]
+        assert read_logs("span", lines=4) == ["e"]
+
+    @staticmethod
+    def _count_bytes_read(bytes_read):
+        real_open = open
+
+        def counting_open(*args, **kwargs):
+            handle = real_open(*args, **kwargs)
+            original_read = handle.read
+
+            def read(size=-1):
+                data = original_read(size)
+                bytes_read.append(len(data))
+                return data
+
+            handle.read = read
+            return handle
+
+        return patch("code_puppy.mcp_.mcp_logs.open", counting_open, create=True)
+
+    def test_tail_reads_only_the_last_blocks(self, temp_logs_dir):
+        log_path = temp_logs_dir / "long.log"
+        log_path.write_bytes(
+            b"".join(b"[INFO] line %d\n" % i for i in range(50_000)) + b"the end\n"
+        )
+
+        bytes_read = []
+        with patch("code_puppy.mcp_.mcp_logs.TAIL_BLOCK_SIZE", 1024):
+            with self._count_bytes_read(bytes_read):
+                tail = read_logs("long", lines=50)
+
+        assert len(tail) == 50
+        assert tail[-1] == "the end"
+        assert sum(bytes_read) <= 2 * 1024
+
+    @pytest.mark.benchmark
+    def test_tail_of_100mb_log_reads_only_the_end(self, temp_logs_dir):
+        """Benchmark-style check: tailing a 100 MB log touches a few blocks."""
+        log_path = temp_logs_dir / "huge.log"
+        line = b"[2024-01-01 00:00:00.000] [INFO] " + b"y" * 90 + b"\n"
+        chunk = line * (1024 * 1024 // len(line))
+        with open(log_path, "wb") as f:
+            for _ in range(100):
+                f.write(chunk)
+            f.write(b"[2024-01-01 00:00:00.000] [INFO] the end\n")
+
+        bytes_read = []
+        with self._count_bytes_read(bytes_read):
+            tail = read_logs("huge", lines=50)
+
+        assert len(tail) == 50
+        assert tail[-1].endswith("the end")
+        assert sum(bytes_read) <= 2 * 64 * 1024
@@ -3,7 +3,7 @@
 from datetime import datetime, timedelta
 
 from code_puppy.mcp_.managed_server import ServerState
-from code_puppy.mcp_.status_tracker import ServerStatusTracker
+from code_puppy.mcp_.status_tracker import LatencyHistogram, ServerStatusTracker
 
 
 class TestServerStatusTracker:
@@ -139,3 +139,45 @@ class TestServerStatusTracker:
     def test_cleanup_no_events(self):
         tracker = ServerStatusTracker()
         tracker.cleanup_old_data()  # Should not raise
+
+
+class TestLatencyHistogram:
+    def test_empty(self):
+        histogram = LatencyHistogram()
+        assert histogram.percentile(50) is None
+        assert histogram.summary()["count"] == 0
+
+    def test_percentiles_within_bucket_accuracy(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 1001):
+            histogram.record(float(value))
+        # Buckets are 25% wide, so estimates land within that of the truth.
+        for q, expected in ((50, 500), (95, 950), (99, 990)):
+            assert abs(histogram.percentile(q) - expected) <= expected * 0.25
+        assert histogram.min_ms == 1.0
+        assert histogram.max_ms == 1000.0
+
+    def test_overflow_clamped_to_max(self):
+        histogram = LatencyHistogram()
+        histogram.record(10 * 60 * 1000)
+        assert histogram.percentile(99) == 10 * 60 * 1000
+
+    def test_memory_is_bounded(self):
+        histogram = LatencyHistogram()
+        size = len(histogram._counts)
+        for value in range(10_000):
+            histogram.record(value % 700)
+        assert len(histogram._counts) == size
+        assert histogram.count == 10_000
+
+    def test_tracker_exposes_percentiles(self):
+        tracker = ServerStatusTracker()
+        for value in (10, 20, 30):
+            tracker.record_latency("s1", value)
+        latency = tracker.get_latency_percentiles("s1")
+        assert latency["count"] == 3
+        assert 10 <= latency["p50_ms"] <= 30
+        assert tracker.get_server_summary("s1")["latency"] == latency
+        assert "s1" in tracker.get_all_server_ids()
+        # Latency samples don't flood the event history.
+        assert tracker.get_events("s1") == []
@@ -0,0 +1,146 @@
+"""Tests for the per-server MCP tool index (``code_puppy.mcp_.tool_index``).
+
+The integration tests drive a real stdio MCP server (``stdio_stub_server.py``)
+through ``ManagedMCPServer`` + ``process_tool_call`` and count how many
+``tools/list`` requests the server actually receives.
+"""
+
+import json
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from code_puppy.mcp_.managed_server import (
+    ManagedMCPServer,
+    ServerConfig,
+    process_tool_call,
+)
+from code_puppy.mcp_.tool_arg_coercion import (
+    coerce_tool_args,
+    compile_tool_arg_coercer,
+)
+from code_puppy.mcp_.tool_index import ToolIndex
+
+STUB = Path(__file__).with_name("stdio_stub_server.py")
+
+
+def _tool(name, schema=None):
+    tool = Mock()
+    tool.name = name
+    tool.inputSchema = schema
+    return tool
+
+
+class TestToolIndex:
+    def test_rebuild_indexes_by_name(self):
+        index = ToolIndex()
+        index.rebuild([_tool("a", {"type": "object"}), _tool("b")])
+        assert index.populated
+        assert len(index) == 2
+        assert index.get("a").input_schema == {"type": "object"}
+        assert index.get("missing") is None
+
+    def test_sync_skips_same_list_object(self):
+        index = ToolIndex()
+        tools = [_tool("a")]
+        index.sync(tools)
+        index.sync(tools)
+        assert index.builds == 1
+        index.sync([_tool("a")])
+        assert index.builds == 2
+
+    def test_invalidate_clears(self):
+        index = ToolIndex()
+        index.rebuild([_tool("a")])
+        index.invalidate()
+        assert not index.populated
+        assert index.get("a") is None
+
+
+@pytest.mark.parametrize(
+    "schema,args",
+    [
+        (
+            {"properties": {"n": {"type": "integer"}, "s": {"type": "string"}}},
+            {"n": "100.0", "s": "x", "extra": "true"},
+        ),
+        (
+            {"properties": {"v": {"anyOf": [{"type": "array"}, {"type": "null"}]}}},
+            {"v": '["a"]'},
+        ),
+        ({"properties": {"b": {"type": ["boolean", "null"]}}}, {"b": "FALSE"}),
+        ({"properties": {"o": {"type": "object"}}}, {"o": "[1]"}),
+        (None, {"x": "1"}),
+    ],
+)
+def test_compiled_coercer_matches_coerce_tool_args(schema, args):
+    assert compile_tool_arg_coercer(schema)(args) == coerce_tool_args(args, schema)
+
+
+# --- stdio stub integration ---
+
+
+def _stub_server() -> ManagedMCPServer:
+    return ManagedMCPServer(
+        ServerConfig(
+            id="stub-id",
+            name="stub",
+            type="stdio",
+            config={"command": sys.executable, "args": [str(STUB)]},
+        )
+    )
+
+
+async def _call(toolset, name, args):
+    ctx = Mock()
+    ctx.deps = None
+    return await process_tool_call(ctx, toolset.direct_call_tool, name, args)
+
+
+async def _list_tools_requests(toolset) -> int:
+    return json.loads(await toolset.direct_call_tool("list_tools_count", {}))
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_do_not_relist_tools():
+    """N tool calls cost one tools/list request, not N."""
+    toolset = _stub_server()._toolset
+    with patch("code_puppy.mcp_.managed_server._get_console"):
+        async with toolset:
+            for i in range(25):
+                result = await _call(toolset, "echo", {"flag": "true", "count": str(i)})
+                assert result == {"flag": True, "count": i}
+            assert await _list_tools_requests(toolset) == 1
+            assert toolset.tool_index.builds == 1
+
+
+@pytest.mark.asyncio
+async def test_list_changed_notification_refreshes_index():
+    toolset = _stub_server()._toolset
+    with patch("code_puppy.mcp_.managed_server._get_console"):
+        async with toolset:
+            await _call(toolset, "echo", {})
+            assert toolset.tool_index.get("late") is None
+
+            await toolset.direct_call_tool("add_tool", {})
+            # The notification is delivered asynchronously on the session's
+            # receive loop; an extra round-trip guarantees it has been handled.
+            await _list_tools_requests(toolset)
+            assert not toolset.tool_index.populated
+
+            for _ in range(10):
+                result = await _call(toolset, "late", {"items": '["a", "b"]'})
+                assert result == {"items": ["a", "b"]}
+            assert await _list_tools_requests(toolset) == 2
+
+
+@pytest.mark.asyncio
+async def test_index_dropped_when_session_closes():
+    toolset = _stub_server()._toolset
+    with patch("code_puppy.mcp_.managed_server._get_console"):
+        async with toolset:
+            await _call(toolset, "echo", {})
+            assert toolset.tool_index.populated
+    assert not toolset.tool_index.populated
@@ -0,0 +1,203 @@
+"""Bounded startup buffers and the headless sink on MessageBus / MessageQueue."""
+
+import logging
+import time
+import tracemalloc
+
+import pytest
+
+from code_puppy import messaging
+from code_puppy.messaging import bus as bus_module
+from code_puppy.messaging import message_queue as queue_module
+from code_puppy.messaging.bus import MessageBus
+from code_puppy.messaging.message_queue import MessageQueue, MessageType, UIMessage
+from code_puppy.messaging.messages import MessageLevel, TextMessage
+
+
+def _text(i):
+    return TextMessage(level=MessageLevel.INFO, text=f"msg-{i}")
+
+
+def test_bus_buffer_keeps_newest_and_counts_drops():
+    bus = MessageBus(maxsize=10)
+    for i in range(25):
+        bus.emit(_text(i))
+
+    assert [m.text for m in bus.get_buffered_messages()] == [
+        f"msg-{i}" for i in range(15, 25)
+    ]
+    assert bus.buffer_dropped_count == 15
+    bus.clear_buffer()
+    assert bus.buffer_dropped_count == 15
+
+    bus.mark_renderer_active()
+    for i in range(12):
+        bus.emit(_text(i))
+    assert bus.outgoing_qsize == 10
+    assert bus.outgoing_dropped_count == 2
+
+
+def test_bus_headless_sink_bypasses_the_buffer():
+    bus = MessageBus(maxsize=10)
+    bus.set_session_context("sess")
+    bus.emit(_text("early"))
+    seen = []
+    assert bus.set_headless_sink(seen.append) is None
+
+    for i in range(3):
+        bus.emit(_text(i))
+    assert [m.text for m in seen] == ["msg-0", "msg-1", "msg-2"]
+    assert all(m.session_id == "sess" for m in seen)
+    assert [m.text for m in bus.get_buffered_messages()] == ["msg-early"]
+
+    # An attached renderer still wins over the sink.
+    bus.mark_renderer_active()
+    bus.emit(_text("rendered"))
+    assert len(seen) == 3 and bus.outgoing_qsize == 1
+
+    def broken(message):
+        raise RuntimeError("sink down")
+
+    bus.mark_renderer_inactive()
+    assert bus.set_headless_sink(broken) == seen.append
+    bus.emit(_text("lost"))  # logged, not raised
+    bus.set_headless_sink(None)
+    bus.emit(_text("buffered"))
+    assert bus.get_buffered_messages()[-1].text == "msg-buffered"
+
+
+def test_queue_buffer_is_bounded_and_sink_bypasses_it():
+    mq = MessageQueue(maxsize=5)
+    for i in range(8):
+        mq.emit_simple(MessageType.INFO, f"m{i}")
+    assert [m.content for m in mq._startup_buffer] == ["m3", "m4", "m5", "m6", "m7"]
+    assert mq.buffer_dropped_count == 3
+
+    seen = []
+    mq.set_headless_sink(seen.append)
+    mq.emit_simple(MessageType.INFO, "direct")
+    assert [m.content for m in seen] == ["direct"]
+    assert len(mq._startup_buffer) == 5
+
+    mq.set_headless_sink(None)
+    mq.mark_renderer_active()
+    for i in range(7):
+        mq.emit_simple(MessageType.INFO, f"q{i}")
+    assert mq.queue_dropped_count == 2
+
+
+def test_startup_drops_are_logged_once_when_a_renderer_attaches(caplog):
+    bus = MessageBus(maxsize=2)
+    mq = MessageQueue(maxsize=2)
+    for i in range(5):
+        bus.emit(_text(i))
+        mq.emit_simple(MessageType.INFO, f"m{i}")
+
+    with caplog.at_level(logging.WARNING, logger="code_puppy.messaging"):
+        bus.mark_renderer_active()
+        mq.mark_renderer_active()
+        bus.mark_renderer_active()
+        mq.mark_renderer_active()
+
+    assert [r.getMessage() for r in caplog.records] == [
+        "Message bus dropped 3 startup message(s) before a renderer attached",
+        "Message queue dropped 3 startup message(s) before a renderer started",
+    ]
+
+
+@pytest.fixture
+def fresh_globals(monkeypatch):
+    bus, mq = MessageBus(maxsize=2), MessageQueue(maxsize=2)
+    monkeypatch.setattr(bus_module, "_global_bus", bus)
+    monkeypatch.setattr(queue_module, "_global_queue", mq)
+    return bus, mq
+
+
+def test_set_headless_sink_covers_the_bus_and_the_legacy_queue(fresh_globals):
+    seen = []
+    messaging.set_headless_sink(seen.append)
+    messaging.emit_info("legacy")
+    messaging.bus_emit_info("structured")
+    messaging.set_headless_sink(None)
+
+    assert [getattr(m, "content", getattr(m, "text", None)) for m in seen] == [
+        "legacy",
+        "structured",
+    ]
+    bus, mq = fresh_globals
+    assert bus.get_buffered_messages() == [] and list(mq._startup_buffer) == []
+
+
+def test_log_dropped_messages_reports_only_nonzero_counts(fresh_globals, caplog):
+    bus, mq = fresh_globals
+    with caplog.at_level(logging.WARNING, logger="code_puppy.messaging"):
+        messaging.log_dropped_messages()
+        for i in range(3):
+            bus.emit(_text(i))
+        messaging.log_dropped_messages()
+
+    assert [r.getMessage() for r in caplog.records] == [
+        "Dropped messages (bus startup buffer: 1)"
+    ]
+
+
+def _old_bus_emit(buffer, message, maxsize):
+    """What MessageBus.emit used to do with no renderer attached."""
+    buffer.append(message)
+    if len(buffer) > maxsize:
+        buffer = buffer[-maxsize:]
+    return buffer
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("kind", ["bus", "queue"])
+def test_benchmark_one_million_headless_emits(kind):
+    total, chunk = 1_000_000, 100_000
+    if kind == "bus":
+        target = MessageBus()
+        message = _text("x")
+    else:
+        target = MessageQueue()
+        message = UIMessage(type=MessageType.INFO, content="x")
+    emit = target.emit
+    maxsize = target._startup_buffer.maxlen
+
+    # Memory: fill the ring and run well past it under tracemalloc.
+    tracemalloc.start()
+    for _ in range(2 * chunk):
+        emit(message)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    chunks = []
+    for _ in range(total // chunk):
+        started = time.perf_counter()
+        for _ in range(chunk):
+            emit(message)
+        chunks.append((time.perf_counter() - started) / chunk)
+
+    target.set_headless_sink(lambda m: None)
+    started = time.perf_counter()
+    for _ in range(chunk):
+        emit(message)
+    sink_cost = (time.perf_counter() - started) / chunk
+    target.set_headless_sink(None)
+
+    # The old list-slice trim, past the point where the buffer filled up.
+    buffer = []
+    for _ in range(maxsize):
+        buffer = _old_bus_emit(buffer, message, maxsize)
+    started = time.perf_counter()
+    for _ in range(chunk // 10):
+        buffer = _old_bus_emit(buffer, message, maxsize)
+    old_cost = (time.perf_counter() - started) / (chunk // 10)
+
+    assert len(target._startup_buffer) == maxsize
+    assert target.buffer_dropped_count == total + 2 * chunk - maxsize
+    # Flat: the last 100k emits cost about what the first 100k did.
+    assert max(chunks) < 3 * min(chunks)
+    # Bounded: nothing beyond the ring's own blocks is retained.
+    assert peak < 256 * 1024
+    # A ring append beats the old list trim alone; the sink skips both.
+    assert max(chunks) < old_cost
+    assert sink_cost < 2 * max(chunks)
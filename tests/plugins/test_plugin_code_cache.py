@@ -0,0 +1,243 @@
+"""Compiled-code cache for trusted project plugins (``_ProjectPluginLoader``)."""
+
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import code_puppy.plugins as plugins_module
+from code_puppy.plugins import _ensure_project_ns, _load_one_project_plugin, trust
+
+
+@pytest.fixture(autouse=True)
+def _isolate(tmp_path: Path, monkeypatch):
+    """Throwaway trust store and code cache; restore global import state."""
+    monkeypatch.setattr(trust, "TRUST_STORE_FILE", tmp_path / "trusted.json")
+    monkeypatch.setattr(trust, "_verified_hashes", {})
+    monkeypatch.setattr(
+        plugins_module, "_PROJECT_PLUGIN_CODE_CACHE", str(tmp_path / "code_cache")
+    )
+    saved_prefix = sys.pycache_prefix
+    saved_path = list(sys.path)
+    saved_meta_path = list(sys.meta_path)
+    saved_modules = set(sys.modules)
+    try:
+        yield
+    finally:
+        sys.pycache_prefix = saved_prefix
+        sys.path[:] = saved_path
+        sys.meta_path[:] = saved_meta_path
+        for name in set(sys.modules) - saved_modules:
+            if name.startswith("project_plugins."):
+                sys.modules.pop(name, None)
+
+
+def _unload(plugin_name: str) -> None:
+    for name in list(sys.modules):
+        if name.startswith(f"project_plugins.{plugin_name}"):
+            sys.modules.pop(name, None)
+
+
+def _make_plugin(project_root: Path, name: str, body: str) -> Path:
+    plugin_dir = project_root / ".code_puppy" / "plugins" / name
+    plugin_dir.mkdir(parents=True)
+    (plugin_dir / "register_callbacks.py").write_text(body)
+    return plugin_dir
+
+
+def _trust_and_load(project_root: Path, plugin_dir: Path) -> bool:
+    """Mirror ``_load_project_plugins``: check trust, then load."""
+    name = plugin_dir.name
+    _unload(name)
+    _ensure_project_ns()
+    assert trust.get_trust_status(project_root, name, plugin_dir) == trust.TRUSTED
+    return _load_one_project_plugin(plugin_dir, name)
+
+
+def _cache_entries(tmp_path: Path) -> list[Path]:
+    return sorted((tmp_path / "code_cache").rglob("*.code"))
+
+
+def _counting_compile():
+    calls = []
+    real_compile = compile
+
+    def _compile(source, filename, *args, **kwargs):
+        calls.append(filename)
+        return real_compile(source, filename, *args, **kwargs)
+
+    return calls, patch.object(plugins_module, "compile", _compile, create=True)
+
+
+def test_second_trusted_load_reuses_compiled_code(tmp_path: Path):
+    project = tmp_path / "proj"
+    marker = tmp_path / "ran"
+    plugin_dir = _make_plugin(
+        project,
+        "cached",
+        f"from pathlib import Path\nPath(r{str(marker)!r}).write_text('ran')\n",
+    )
+    trust.trust_plugin(project, "cached", plugin_dir)
+
+    calls, compile_patch = _counting_compile()
+    with compile_patch:
+        assert _trust_and_load(project, plugin_dir)
+        assert len(calls) == 1
+        marker.unlink()
+        assert _trust_and_load(project, plugin_dir)
+        assert len(calls) == 1
+
+    assert marker.read_text() == "ran"
+    assert len(_cache_entries(tmp_path)) == 1
+
+
+def test_cache_is_written_outside_the_project_tree(tmp_path: Path):
+    project = tmp_path / "proj"
+    plugin_dir = _make_plugin(project, "tidy", "VALUE = 1\n")
+    trust.trust_plugin(project, "tidy", plugin_dir)
+
+    assert _trust_and_load(project, plugin_dir)
+
+    assert _cache_entries(tmp_path)
+    leftovers = [p for p in project.rglob("*") if p.suffix in {".pyc", ".code"}]
+    assert leftovers == []
+    assert not any(p.name == "__pycache__" for p in project.rglob("*"))
+
+
+def test_untrusted_load_path_never_touches_the_cache(tmp_path: Path):
+    project = tmp_path / "proj"
+    plugin_dir = _make_plugin(project, "unchecked", "VALUE = 1\n")
+
+    assert _load_one_project_plugin(plugin_dir, "unchecked")
+    assert _cache_entries(tmp_path) == []
+
+
+def test_changed_source_is_recompiled_not_served_stale(tmp_path: Path):
+    project = tmp_path / "proj"
+    marker = tmp_path / "ran"
+    callbacks_body = "from pathlib import Path\nPath(r{!r}).write_text({!r})\n"
+    plugin_dir = _make_plugin(
+        project, "edited", callbacks_body.format(str(marker), "v1")
+    )
+    trust.trust_plugin(project, "edited", plugin_dir)
+    assert _trust_and_load(project, plugin_dir)
+    assert marker.read_text() == "v1"
+
+    (plugin_dir / "register_callbacks.py").write_text(
+        callbacks_body.format(str(marker), "v2")
+    )
+    # The edit invalidates trust first; re-accepting is what lets it load.
+    assert trust.get_trust_status(project, "edited", plugin_dir) == trust.CHANGED
+    trust.trust_plugin(project, "edited", plugin_dir)
+    assert _trust_and_load(project, plugin_dir)
+    assert marker.read_text() == "v2"
+
+
+def test_entry_for_different_source_is_ignored(tmp_path: Path):
+    """An entry whose stored digest disagrees with the source is not executed."""
+    project = tmp_path / "proj"
+    marker = tmp_path / "ran"
+    plugin_dir = _make_plugin(
+        project,
+        "swapped",
+        f"from pathlib import Path\nPath(r{str(marker)!r}).write_text('source')\n",
+    )
+    trust.trust_plugin(project, "swapped", plugin_dir)
+    assert _trust_and_load(project, plugin_dir)
+    (entry,) = _cache_entries(tmp_path)
+
+    # Keep the key, swap the payload for code compiled from something else.
+    import hashlib
+    import marshal
+
+    other = compile(
+        f"from pathlib import Path\nPath(r{str(marker)!r}).write_text('cache')\n",
+        "x",
+        "exec",
+    )
+    entry.write_bytes(hashlib.sha256(b"other").digest() + marshal.dumps(other))
+
+    assert _trust_and_load(project, plugin_dir)
+    assert marker.read_text() == "source"
+
+
+@pytest.mark.parametrize("payload", [b"", b"short", b"\x00" * 32 + b"garbage"])
+def test_corrupt_entry_falls_back_to_source(tmp_path: Path, payload: bytes):
+    project = tmp_path / "proj"
+    marker = tmp_path / "ran"
+    plugin_dir = _make_plugin(
+        project,
+        "corrupt",
+        f"from pathlib import Path\nPath(r{str(marker)!r}).write_text('source')\n",
+    )
+    trust.trust_plugin(project, "corrupt", plugin_dir)
+    assert _trust_and_load(project, plugin_dir)
+    (entry,) = _cache_entries(tmp_path)
+    entry.write_bytes(payload)
+    marker.unlink()
+
+    assert _trust_and_load(project, plugin_dir)
+    assert marker.read_text() == "source"
+
+
+def test_unwritable_cache_still_loads(tmp_path: Path, monkeypatch):
+    project = tmp_path / "proj"
+    plugin_dir = _make_plugin(project, "readonly", "VALUE = 1\n")
+    trust.trust_plugin(project, "readonly", plugin_dir)
+
+    def _fail(*_args, **_kwargs):
+        raise OSError("read-only filesystem")
+
+    monkeypatch.setattr(plugins_module, "atomic_write_bytes", _fail)
+    assert _trust_and_load(project, plugin_dir)
+
+
+def test_sibling_modules_are_cached_too(tmp_path: Path):
+    project = tmp_path / "proj"
+    plugin_dir = _make_plugin(project, "pkg", "from . import helper\n")
+    (plugin_dir / "__init__.py").write_text("")
+    (plugin_dir / "helper.py").write_text("VALUE = 2\n")
+    trust.trust_plugin(project, "pkg", plugin_dir)
+
+    assert _trust_and_load(project, plugin_dir)
+    # __init__, register_callbacks, helper.
+    assert len(_cache_entries(tmp_path)) == 3
+
+    calls, compile_patch = _counting_compile()
+    with compile_patch:
+        assert _trust_and_load(project, plugin_dir)
+    assert calls == []
+
+
+@pytest.mark.benchmark
+def test_startup_benchmark_warm_cache_skips_compilation(tmp_path: Path):
+    """Several large plugins: a warm cache avoids every compile."""
+    project = tmp_path / "proj"
+    body = "".join(
+        f"def handler_{i}(value):\n"
+        f"    data = {{'index': {i}, 'value': value, 'items': list(range(8))}}\n"
+        f"    return sum(data['items']) + data['index']\n\n"
+        for i in range(1500)
+    )
+    plugin_dirs = []
+    for n in range(5):
+        plugin_dir = _make_plugin(project, f"big_{n}", body)
+        trust.trust_plugin(project, plugin_dir.name, plugin_dir)
+        plugin_dirs.append(plugin_dir)
+
+    def _load_all() -> float:
+        started = time.perf_counter()
+        for plugin_dir in plugin_dirs:
+            assert _trust_and_load(project, plugin_dir)
+        return time.perf_counter() - started
+
+    cold = _load_all()
+    calls, compile_patch = _counting_compile()
+    with compile_patch:
+        warm = _load_all()
+
+    assert calls == []
+    # Loose bound: unmarshal beats compile by a wide margin on any machine.
+    assert warm < cold
@@ -199,3 +199,195 @@ class TestNormalizeImageBytes:
         # Verify it's still a valid image
         result = Image.open(io.BytesIO(out))
         assert result.width > 0
+
+
+# ---------------------------------------------------------------------------
+# Encode-free sizing, JPEG draft decoding and the normalized-output cache
+# ---------------------------------------------------------------------------
+
+
+def _make_jpeg_bytes(width: int, height: int, quality: int = 92) -> bytes:
+    """A noisy photo-like JPEG (noise compresses badly, like real photos)."""
+    from PIL import Image
+
+    noise = Image.effect_noise((width, height), 40)
+    gradient = Image.linear_gradient("L").resize((width, height))
+    image = Image.merge(
+        "RGB",
+        (
+            Image.blend(noise, gradient, 0.6),
+            noise.transpose(Image.Transpose.FLIP_LEFT_RIGHT),
+            gradient,
+        ),
+    )
+    buf = io.BytesIO()
+    image.save(buf, format="JPEG", quality=quality)
+    return buf.getvalue()
+
+
+def _make_screenshot_png(width: int = 3840, height: int = 2160) -> bytes:
+    """Flat UI panels and rows of text, like a 4K desktop screenshot."""
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", (width, height), (245, 245, 245))
+    draw = ImageDraw.Draw(image)
+    for y in range(0, height, 24):
+        draw.rectangle((0, y, width, y + 1), fill=(225, 225, 225))
+        for x in range(40, width - 140, 300):
+            draw.text((x, y + 6), f"def f_{x}_{y}(): return {x * y}", fill=(30, 30, 60))
+    draw.rectangle((200, 300, 1800, 1500), fill=(40, 90, 160))
+    buf = io.BytesIO()
+    image.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class TestEncodeFreeSizing:
+    def test_bytes_within_budget_are_never_decoded(self) -> None:
+        import code_puppy.command_line.image_utils as iu
+
+        jpeg = _make_jpeg_bytes(5000, 400)
+        with patch.object(iu, "_safe_open_image") as opened:
+            out, mt = normalize_image_bytes(jpeg, "image/jpeg")
+        opened.assert_not_called()
+        assert out is jpeg
+        assert mt == "image/jpeg"
+
+    def test_resize_decision_does_not_encode(self) -> None:
+        from PIL import Image
+
+        img = Image.new("RGB", (2000, 2000))
+        with patch.object(Image.Image, "save") as save:
+            small = _resize_image_if_needed(img, 20 * 1024 * 1024)
+            shrunk = _resize_image_if_needed(img, 1024 * 1024)
+        save.assert_not_called()
+        assert small is img
+        # Pixel bytes bound the PNG size, so the result always fits.
+        assert shrunk.width * shrunk.height * 3 <= 1024 * 1024
+
+    def test_known_encoded_size_drives_the_scale(self) -> None:
+        from PIL import Image
+
+        img = Image.new("RGB", (1000, 1000))
+        assert _resize_image_if_needed(img, 100_000, encoded_size=90_000) is img
+        result = _resize_image_if_needed(img, 100_000, encoded_size=400_000)
+        assert result.size == (450, 450)
+
+    def test_oversized_jpeg_is_decoded_at_reduced_scale(self) -> None:
+        from PIL import Image, JpegImagePlugin
+
+        jpeg = _make_jpeg_bytes(4000, 3000)
+        budget = len(jpeg) // 4
+        drafts = []
+        real_draft = JpegImagePlugin.JpegImageFile.draft
+
+        def spy(self, mode, size):
+            result = real_draft(self, mode, size)
+            drafts.append(self.size)
+            return result
+
+        with patch.object(JpegImagePlugin.JpegImageFile, "draft", spy):
+            out, mt = normalize_image_bytes(jpeg, "image/jpeg", max_bytes=budget)
+
+        assert mt == "image/png"
+        assert len(out) <= budget
+        # Decoded at 1/2 scale or smaller rather than the full 12 MP.
+        assert drafts and drafts[0][0] <= 2000
+        assert Image.open(io.BytesIO(out)).width < drafts[0][0]
+
+
+class TestNormalizedImageCache:
+    def test_repeat_normalization_is_a_cache_hit(self) -> None:
+        import code_puppy.command_line.image_utils as iu
+
+        png = _make_png_bytes(300, 300)
+        first = normalize_image_bytes(png, "image/png", max_bytes=50)
+        with patch.object(iu, "_safe_open_image") as opened:
+            second = normalize_image_bytes(png, "image/png", max_bytes=50)
+        opened.assert_not_called()
+        assert second == first
+        stats = iu.normalized_image_cache_stats()
+        assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+    def test_budget_is_part_of_the_key(self) -> None:
+        import code_puppy.command_line.image_utils as iu
+
+        png = _make_png_bytes(300, 300)
+        normalize_image_bytes(png, "image/png", max_bytes=50)
+        normalize_image_bytes(png, "image/png", max_bytes=60)
+        assert iu.normalized_image_cache_stats()["misses"] == 2
+
+    def test_evicts_by_total_bytes(self) -> None:
+        from code_puppy.command_line.image_utils import (
+            NormalizedImage,
+            _NormalizedImageCache,
+        )
+
+        cache = _NormalizedImageCache(max_entries=10, max_bytes=100)
+        for key in "abc":
+            cache.put(key, NormalizedImage(b"x" * 40, "image/png", 1, 1))
+        cache.put("huge", NormalizedImage(b"x" * 101, "image/png", 1, 1))
+
+        assert cache.get("a") is None
+        assert cache.get("b") is not None
+        assert cache.get("huge") is None
+        assert cache._bytes == 80
+
+    def test_clipboard_file_paste_reuses_the_normalized_png(self, tmp_path) -> None:
+        from code_puppy.command_line import clipboard
+
+        path = tmp_path / "shot.jpg"
+        path.write_bytes(_make_jpeg_bytes(200, 100))
+        first = clipboard.get_image_file_as_png(str(path))
+        with patch.object(clipboard, "_safe_open_image", wraps=_safe_open_image):
+            with patch("PIL.Image.Image.save") as save:
+                second = clipboard.get_image_file_as_png(str(path))
+        save.assert_not_called()
+        assert first is not None and second == first
+        assert first.startswith(b"\x89PNG")
+
+
+@pytest.mark.benchmark
+def test_benchmark_4k_screenshot_and_20mp_photo() -> None:
+    """Old pipeline (trial PNG encode, resize, encode again) vs the new one."""
+    import time
+
+    from PIL import Image
+
+    import code_puppy.command_line.image_utils as iu
+
+    def legacy(data: bytes, max_bytes: int) -> bytes:
+        image = _safe_open_image(data)
+        buf = io.BytesIO()
+        image.save(buf, format="PNG", optimize=True)
+        if buf.tell() <= max_bytes:
+            return data
+        scale = (max_bytes / buf.tell()) ** 0.5 * 0.9
+        image = image.resize(
+            (int(image.width * scale), int(image.height * scale)),
+            Image.Resampling.LANCZOS,
+        )
+        buf = io.BytesIO()
+        image.save(buf, format="PNG", optimize=True)
+        return buf.getvalue()
+
+    def timed(fn, *args):
+        started = time.perf_counter()
+        result = fn(*args)
+        return result, time.perf_counter() - started
+
+    # A 4K screenshot and a 20MP photo.
+    for data in (_make_screenshot_png(), _make_jpeg_bytes(5472, 3648, quality=80)):
+        _, old_s = timed(legacy, data, MAX_IMAGE_SIZE_BYTES)
+        (kept, _), new_s = timed(normalize_image_bytes, data, "image/png")
+        assert kept is data
+        tight = len(data) // 4
+        _, cold_s = timed(
+            lambda: normalize_image_bytes(data, "image/png", max_bytes=tight)
+        )
+        _, warm_s = timed(
+            lambda: normalize_image_bytes(data, "image/png", max_bytes=tight)
+        )
+        assert warm_s < cold_s / 10
+        assert new_s < old_s / 10
+
+    assert iu.normalized_image_cache_stats()["hits"] == 2
@@ -0,0 +1,278 @@
+"""Background maintenance scheduler and the session-format migration job."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from code_puppy import config as cp_config
+from code_puppy import maintenance
+from code_puppy import session_format_migration as sfm
+from code_puppy.maintenance import MaintenanceJob, MaintenanceScheduler
+
+PLAIN_FIXTURE = Path(__file__).parent / "fixtures" / "session_v1_plain.pkl"
+
+
+class _CountingJob:
+    """A job over ``items`` that does one item per budget check."""
+
+    def __init__(self, name, items, fingerprint="fp"):
+        self.name = name
+        self.items = list(items)
+        self.done = []
+        self.runs = 0
+        self.fp = fingerprint
+
+    def run(self, budget):
+        self.runs += 1
+        while self.items:
+            if budget.exhausted():
+                return False
+            self.done.append(self.items.pop(0))
+        return True
+
+    def job(self, budget_seconds=5.0):
+        return MaintenanceJob(
+            name=self.name,
+            run=self.run,
+            fingerprint=lambda: self.fp,
+            budget_seconds=budget_seconds,
+        )
+
+
+@pytest.fixture
+def state_path(tmp_path):
+    return str(tmp_path / "state" / "maintenance_state.json")
+
+
+def _scheduler(state_path, *jobs):
+    scheduler = MaintenanceScheduler(state_path, start_delay=0, round_pause=0)
+    for job in jobs:
+        scheduler.register(job)
+    return scheduler
+
+
+def test_unchanged_fingerprint_skips_the_job(state_path):
+    counting = _CountingJob("count", range(3))
+    assert _scheduler(state_path, counting.job()).run_pending() == {"count": "done"}
+
+    # A fresh process: state comes from disk.
+    assert _scheduler(state_path, counting.job()).run_pending() == {"count": "skipped"}
+    assert counting.runs == 1
+
+    counting.fp = "new work"
+    assert _scheduler(state_path, counting.job()).run_pending() == {"count": "done"}
+    assert counting.runs == 2
+    saved = json.loads(Path(state_path).read_text())["count"]
+    assert saved["complete"] and saved["fingerprint"] == "new work"
+    assert saved["last_run"] > 0
+
+
+def test_budgeted_job_gets_further_slices(state_path, monkeypatch):
+    ticks = iter(range(10_000))
+    monkeypatch.setattr(maintenance.time, "monotonic", lambda: next(ticks))
+    counting = _CountingJob("count", range(10))
+    other = _CountingJob("other", range(2))
+    # Each check advances the clock by one: two items per five-tick slice.
+    scheduler = _scheduler(
+        state_path, counting.job(budget_seconds=5), other.job(budget_seconds=50)
+    )
+
+    assert scheduler.run_pending(max_rounds=1) == {
+        "count": "partial",
+        "other": "done",
+    }
+    assert json.loads(Path(state_path).read_text())["count"]["complete"] is False
+
+    # The next launch resumes (partial runs are never skipped).
+    outcomes = _scheduler(state_path, counting.job(budget_seconds=5)).run_pending()
+    assert outcomes == {"count": "done"}
+    assert counting.done == list(range(10))
+    assert counting.runs > 2
+
+
+def test_failing_job_is_retried_and_does_not_block_others(state_path):
+    def boom(budget):
+        raise RuntimeError("disk on fire")
+
+    counting = _CountingJob("count", range(2))
+    scheduler = _scheduler(
+        state_path, MaintenanceJob("boom", boom, lambda: "x"), counting.job()
+    )
+    assert scheduler.run_pending() == {"boom": "failed", "count": "done"}
+    assert _scheduler(
+        state_path, MaintenanceJob("boom", boom, lambda: "x")
+    ).run_pending() == {"boom": "failed"}
+
+
+def test_corrupt_state_file_starts_over(state_path):
+    os.makedirs(os.path.dirname(state_path))
+    Path(state_path).write_text("{not json")
+    counting = _CountingJob("count", range(1))
+
+    assert _scheduler(state_path, counting.job()).run_pending() == {"count": "done"}
+    assert json.loads(Path(state_path).read_text())["count"]["complete"]
+
+
+def test_worker_runs_once_in_the_background_at_low_priority(state_path):
+    seen = {}
+    ran = threading.Event()
+
+    def job(budget):
+        seen["thread"] = threading.current_thread().name
+        if sys.platform.startswith("linux"):
+            seen["nice"] = os.getpriority(os.PRIO_PROCESS, threading.get_native_id())
+        ran.set()
+        return True
+
+    scheduler = _scheduler(state_path, MaintenanceJob("probe", job, lambda: "p"))
+    assert scheduler.start()
+    assert not scheduler.start()
+    assert ran.wait(5)
+    scheduler.stop(timeout=5)
+
+    assert seen["thread"] == "code-puppy-maintenance"
+    if "nice" in seen:
+        assert seen["nice"] >= os.getpriority(os.PRIO_PROCESS, 0)
+
+
+def test_thread_priority_is_left_alone_off_linux(monkeypatch):
+    calls = []
+    monkeypatch.setattr(sys, "platform", "darwin")
+    monkeypatch.setattr(os, "setpriority", lambda *a: calls.append(a), raising=False)
+    maintenance._lower_thread_priority()
+    assert calls == []
+
+
+# ---------------------------------------------------------------------------
+# The session-format migration job
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def sweep_dirs(tmp_path, monkeypatch):
+    autosaves = tmp_path / "autosaves"
+    contexts = tmp_path / "contexts"
+    data = tmp_path / "data"
+    config = tmp_path / "config"
+    for directory in (autosaves, contexts, data, config):
+        directory.mkdir()
+    monkeypatch.setattr(cp_config, "AUTOSAVE_DIR", str(autosaves))
+    monkeypatch.setattr(cp_config, "CONTEXTS_DIR", str(contexts))
+    monkeypatch.setattr(cp_config, "DATA_DIR", str(data))
+    monkeypatch.setattr(cp_config, "CONFIG_DIR", str(config))
+    monkeypatch.setattr(cp_config, "STATE_DIR", str(tmp_path / "state"))
+    return autosaves, config
+
+
+def test_stopped_sweep_leaves_the_marker_for_the_next_run(sweep_dirs):
+    autosaves, config = sweep_dirs
+    for i in range(4):
+        shutil.copy(PLAIN_FIXTURE, autosaves / f"s{i}.pkl")
+    checks = iter([False, False, True])
+
+    assert sfm.sweep_legacy_pickle_sessions(should_stop=lambda: next(checks)) is False
+    assert sorted(p.name for p in autosaves.glob("*.json")) == ["s0.json", "s1.json"]
+    assert not (config / ".session_format_v2_migrated").exists()
+
+    assert sfm.sweep_legacy_pickle_sessions() is True
+    assert len(list(autosaves.glob("*.json"))) == 4
+    assert (config / ".session_format_v2_migrated").exists()
+
+
+def test_idle_job_costs_one_stat_per_directory(sweep_dirs, monkeypatch):
+    autosaves, _config = sweep_dirs
+    failed = autosaves / "pre_v2_backup" / "failed"
+    failed.mkdir(parents=True)
+    (failed / "stuck.pkl").write_bytes(b"not a pickle")
+    monkeypatch.setattr(maintenance, "_scheduler", None)
+    scheduler = maintenance.get_maintenance_scheduler()
+    assert scheduler.run_pending() == {"session-format-migration": "done"}
+
+    calls = []
+    real_stat = os.stat
+    real_migrate = sfm.migrate_pickle_file
+    monkeypatch.setattr(
+        os, "stat", lambda path, *a, **k: calls.append(path) or real_stat(path, *a, **k)
+    )
+    monkeypatch.setattr(
+        sfm, "migrate_pickle_file", lambda *a: pytest.fail("should have been skipped")
+    )
+    assert scheduler.run_pending() == {"session-format-migration": "skipped"}
+    # The state file, the marker and one per sweep directory.
+    assert len(calls) <= 1 + 1 + 4
+
+    # A new quarantine arrival is new work.
+    monkeypatch.setattr(os, "stat", real_stat)
+    monkeypatch.setattr(sfm, "migrate_pickle_file", real_migrate)
+    (failed / "another.pkl").write_bytes(b"also not a pickle")
+    assert scheduler.run_pending() == {"session-format-migration": "done"}
+
+
+def _synthetic_sessions(autosaves: Path, total: int, legacy: int, quarantined: int):
+    """``total`` sessions: mostly JSON autosaves, some legacy, some quarantined."""
+    for i in range(total - legacy - quarantined):
+        (autosaves / f"auto_session_{i}.json").write_text("{}")
+        (autosaves / f"auto_session_{i}_meta.json").write_text("{}")
+    for i in range(legacy):
+        shutil.copy(PLAIN_FIXTURE, autosaves / f"legacy_{i}.pkl")
+    failed = autosaves / "pre_v2_backup" / "failed"
+    failed.mkdir(parents=True)
+    # Truncated real sessions: unpickling gets most of the way, then fails.
+    stuck = PLAIN_FIXTURE.read_bytes()[:-40]
+    for i in range(quarantined):
+        (failed / f"stuck_{i}.pkl").write_bytes(stuck)
+
+
+@pytest.mark.benchmark
+def test_benchmark_time_to_first_prompt_with_5k_sessions(tmp_path, monkeypatch):
+    """Startup-path cost of the sweeps: synchronous (old) vs scheduled (new)."""
+    from code_puppy.session_migration import sweep_contexts_to_autosaves
+
+    def launch_dirs(name):
+        root = tmp_path / name
+        autosaves = root / "autosaves"
+        autosaves.mkdir(parents=True)
+        monkeypatch.setattr(cp_config, "AUTOSAVE_DIR", str(autosaves))
+        monkeypatch.setattr(cp_config, "CONTEXTS_DIR", str(root / "contexts"))
+        monkeypatch.setattr(cp_config, "DATA_DIR", str(root / "data"))
+        monkeypatch.setattr(cp_config, "CONFIG_DIR", str(root / "config"))
+        monkeypatch.setattr(cp_config, "STATE_DIR", str(root / "state"))
+        _synthetic_sessions(autosaves, 5000, legacy=200, quarantined=100)
+
+    def timed(fn):
+        started = time.perf_counter()
+        fn()
+        return time.perf_counter() - started
+
+    def old_startup():
+        sweep_contexts_to_autosaves()
+        sfm.sweep_legacy_pickle_sessions()
+
+    launch_dirs("old")
+    old_first = timed(old_startup)
+    old_steady = timed(old_startup)
+
+    launch_dirs("new")
+    monkeypatch.setattr(maintenance, "_scheduler", None)
+    scheduler = maintenance.get_maintenance_scheduler()
+    scheduler.start_delay = 0
+    scheduler.round_pause = 0
+    new_first = timed(lambda: (sweep_contexts_to_autosaves(), scheduler.start()))
+    scheduler._thread.join(120)
+    assert len(list(Path(cp_config.AUTOSAVE_DIR).glob("legacy_*.json"))) == 200
+
+    monkeypatch.setattr(maintenance, "_scheduler", None)
+    relaunch = maintenance.get_maintenance_scheduler()
+    new_steady = timed(sweep_contexts_to_autosaves)
+    # Later launches find nothing new: every job is skipped off the prompt path.
+    assert set(relaunch.run_pending().values()) == {"skipped"}
+    assert new_first < old_first / 10
+    assert new_steady < old_steady
@@ -0,0 +1,215 @@
+"""On-disk cache and search index of ModelsDevRegistry."""
+
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from code_puppy import models_dev_parser
+from code_puppy.models_dev_parser import ModelsDevRegistry
+
+
+@pytest.fixture(autouse=True)
+def _quiet_and_fresh_cache(tmp_path):
+    with (
+        patch("code_puppy.config.CACHE_DIR", str(tmp_path / "cache")),
+        patch.object(models_dev_parser, "emit_info"),
+        patch.object(models_dev_parser, "emit_warning"),
+    ):
+        yield
+
+
+@pytest.fixture
+def offline():
+    with patch.object(ModelsDevRegistry, "_fetch_from_api", return_value=None):
+        yield
+
+
+def _source(tmp_path, models):
+    path = tmp_path / "models.json"
+    path.write_text(
+        json.dumps(
+            {
+                "acme": {
+                    "name": "Acme",
+                    "env": ["ACME_KEY"],
+                    "models": {
+                        model_id: {"name": name, "tool_call": True}
+                        for model_id, name in models.items()
+                    },
+                }
+            }
+        )
+    )
+    return path
+
+
+def _snapshot(registry):
+    return (
+        registry.providers,
+        list(registry.models.items()),
+        registry.provider_models,
+    )
+
+
+def test_bundled_registry_is_reused_from_cache(offline):
+    cold = ModelsDevRegistry()
+    warm = ModelsDevRegistry()
+
+    assert not cold.from_cache
+    assert warm.from_cache
+    assert warm.data_source == cold.data_source
+    assert _snapshot(warm) == _snapshot(cold)
+
+
+def test_changed_source_content_invalidates_the_cache(tmp_path):
+    path = _source(tmp_path, {"m1": "Model One"})
+    ModelsDevRegistry(json_path=path)
+    assert ModelsDevRegistry(json_path=path).from_cache
+
+    # Same size, different content.
+    _source(tmp_path, {"m1": "Model Two"})
+    registry = ModelsDevRegistry(json_path=path)
+
+    assert not registry.from_cache
+    assert registry.get_model("acme", "m1").name == "Model Two"
+
+
+def test_corrupt_cache_is_ignored_and_rewritten(tmp_path):
+    path = _source(tmp_path, {"m1": "Model One"})
+    ModelsDevRegistry(json_path=path)
+    (cache_file,) = (tmp_path / "cache" / "models_dev").iterdir()
+    cache_file.write_bytes(b"\x00garbage")
+
+    registry = ModelsDevRegistry(json_path=path)
+    assert not registry.from_cache
+    assert registry.get_model("acme", "m1") is not None
+    assert ModelsDevRegistry(json_path=path).from_cache
+
+
+def test_live_api_is_revalidated_with_its_etag():
+    api_data = {
+        "acme": {
+            "name": "Acme",
+            "env": [],
+            "models": {"m1": {"name": "Model One"}},
+        }
+    }
+    fresh = MagicMock(status_code=200, headers={"etag": '"v1"'})
+    fresh.json.return_value = api_data
+    not_modified = MagicMock(status_code=304, headers={})
+
+    with patch("code_puppy.models_dev_parser.httpx.Client") as client_cls:
+        client = client_cls.return_value.__enter__.return_value
+        client.get.side_effect = [fresh, not_modified]
+        first = ModelsDevRegistry()
+        second = ModelsDevRegistry()
+
+    assert client.get.call_args_list[0].kwargs["headers"] is None
+    assert client.get.call_args_list[1].kwargs["headers"] == {"If-None-Match": '"v1"'}
+    assert not first.from_cache
+    assert second.from_cache
+    assert second.data_source == "live:models.dev"
+    assert _snapshot(second) == _snapshot(first)
+
+
+def _reference_search(registry, query=None, capability_filters=None):
+    """The linear scan search_models used to do."""
+    models = list(registry.models.values())
+    if query:
+        q = query.lower()
+        models = [m for m in models if q in m.name.lower() or q in m.model_id.lower()]
+    for capability, required in (capability_filters or {}).items():
+        if isinstance(required, bool):
+            models = [
+                m for m in models if m.supports_capability(capability) == required
+            ]
+        else:
+            models = [m for m in models if getattr(m, capability, None) == required]
+    return sorted(models, key=lambda m: m.name.lower())
+
+
+QUERIES = [
+    None,
+    "",
+    "g",
+    "4o",
+    "gpt",
+    "GPT-4",
+    "claude",
+    "sonnet",
+    "onne",  # mid-token
+    "llama-3",
+    "qwen3 coder",
+    "mini",
+    "-",
+    "zzz-no-such-model",
+]
+FILTERS = [
+    None,
+    {"tool_call": True},
+    {"reasoning": True, "attachment": False},
+    {"has_vision": True},
+    {"open_weights": False, "tool_call": True},
+    {"knowledge": "2024-04"},
+    {"not_a_capability": False},
+]
+
+
+def test_indexed_search_matches_the_linear_scan(offline):
+    registry = ModelsDevRegistry()
+    for query in QUERIES:
+        for filters in FILTERS:
+            assert registry.search_models(query, filters) == _reference_search(
+                registry, query, filters
+            ), (query, filters)
+
+    for provider_id in list(registry.providers)[:10]:
+        expected = sorted(
+            (
+                registry.models[f"{provider_id}::{m}"]
+                for m in registry.provider_models[provider_id]
+            ),
+            key=lambda m: m.name.lower(),
+        )
+        assert registry.get_models(provider_id) == expected
+    assert registry.get_models("no-such-provider") == []
+
+
+def test_index_follows_changes_to_the_models_dict(tmp_path):
+    registry = ModelsDevRegistry(json_path=_source(tmp_path, {"m1": "Alpha"}))
+    assert [m.model_id for m in registry.search_models("alp")] == ["m1"]
+
+    extra = models_dev_parser.ModelInfo(
+        provider_id="acme", model_id="m2", name="Alpine"
+    )
+    registry.models[extra.full_id] = extra
+    registry.provider_models["acme"].append("m2")
+
+    assert [m.model_id for m in registry.search_models("alp")] == ["m1", "m2"]
+
+
+@pytest.mark.benchmark
+def test_benchmark_construction_and_searches(offline):
+    started = time.perf_counter()
+    ModelsDevRegistry()
+    cold = time.perf_counter() - started
+
+    warm = []
+    for _ in range(5):
+        started = time.perf_counter()
+        registry = ModelsDevRegistry()
+        warm.append(time.perf_counter() - started)
+    assert registry.from_cache
+
+    queries = ["gpt", "claude", "llama", "qwen", "gemini", "4o", "mini", "sonnet"]
+    registry.search_models("warm-up")
+    started = time.perf_counter()
+    for i in range(1000):
+        registry.search_models(queries[i % len(queries)])
+    searches = time.perf_counter() - started
+
+    assert min(warm) < cold
+    # Sub-millisecond per search, with plenty of headroom for slow CI.
+    assert searches < 1.0
@@ -1,5 +1,6 @@
 import os
 import sys
+import time
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -940,8 +941,77 @@ async def test_attachment_placeholder_processor_renders_images(tmp_path: Path) -
         height=1,
     )
 
+    # Stats run off the render path: the first render shows the raw text,
+    # and the placeholder fills in once the worker reports the file.
+    first = processor.apply_transformation(transformation_input)
+    assert "".join(text for _style, text in first.fragments) == document_text
+    deadline = time.monotonic() + 5
+    while processor._stat_cache.generation == 0:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
     transformed = processor.apply_transformation(transformation_input)
     rendered_text = "".join(text for _style, text in transformed.fragments)
 
     assert "[png image]" in rendered_text
     assert "fluffy pupper" not in rendered_text
+
+
+def _transformation_input(text: str) -> TransformationInput:
+    document = Document(text=text, cursor_position=len(text))
+    return TransformationInput(
+        buffer_control=BufferControl(buffer=Buffer(document=document)),
+        document=document,
+        lineno=0,
+        source_to_display=lambda i: i,
+        fragments=[("", text)],
+        width=max(1, len(text)),
+        height=1,
+    )
+
+
+def test_keystroke_replay_stats_each_path_once(tmp_path: Path) -> None:
+    from code_puppy.command_line.attachments import PathStatCache, _detect_path_tokens
+
+    shots = tmp_path / "screen shots"
+    shots.mkdir()
+    (shots / "before.png").write_bytes(b"png")
+    (tmp_path / "after.png").write_bytes(b"png")
+    prompt = (
+        f"compare {shots}/before.png against {tmp_path}/after.png and check "
+        f"./src/main.py plus ../notes/todo.md, then summarise what changed"
+    )
+
+    stats = []
+    real_stat = os.stat
+
+    def counting_stat(path, *args, **kwargs):
+        stats.append(path)
+        return real_stat(path, *args, **kwargs)
+
+    class Inline:
+        def submit(self, fn, *args):
+            fn(*args)
+
+    renders_per_keystroke = 3  # edit, cursor/toolbar refresh, completion menu
+    with patch("os.stat", counting_stat):
+        for end in range(1, len(prompt) + 1):
+            for _ in range(renders_per_keystroke):
+                _detect_path_tokens(prompt[:end])
+        direct = len(stats)
+
+        stats.clear()
+        processor = AttachmentPlaceholderProcessor(
+            PathStatCache(executor=Inline(), clock=lambda: 0.0)
+        )
+        for end in range(1, len(prompt) + 1):
+            for _ in range(renders_per_keystroke):
+                rendered = processor.apply_transformation(
+                    _transformation_input(prompt[:end])
+                )
+        cached = len(stats)
+
+    text = "".join(t for _style, t in rendered.fragments)
+    assert text.count("[png image]") == 2
+    # Each distinct candidate path is statted once, not once per keystroke.
+    assert cached * 10 < direct
@@ -8,6 +8,7 @@ import pytest
 
 from code_puppy.provider_credentials import (
     _SECRET_HEADER_NAMES,
+    clear_credential_caches,
     credential_display,
     credential_hint,
     extract_env_var_from_model_config,
@@ -239,6 +240,12 @@ class TestIsCredentialSet:
 class TestEnvironmentWithoutCredentials:
     """The child-shell scrub set derives from api_key fields only."""
 
+    @pytest.fixture(autouse=True)
+    def _fresh_caches(self):
+        clear_credential_caches()
+        yield
+        clear_credential_caches()
+
     def test_keeps_custom_endpoint_header_non_secret(self, monkeypatch):
         from code_puppy.provider_credentials import environment_without_credentials
 
@@ -291,29 +298,84 @@ class TestEnvironmentWithoutCredentials:
         assert "MY_LLM_TOKEN" not in env
         assert env["SITE_URL"] == "https://example.com"
 
-    def test_catalog_change_applies_to_next_call(self, monkeypatch):
+    def test_catalog_change_applies_to_next_call(self, monkeypatch, tmp_path):
         """A mid-session catalog edit reaches the scrub set with no invalidation step."""
+        import json
+
         from code_puppy.provider_credentials import (
             credential_env_var_names,
             environment_without_credentials,
             save_credential,
         )
 
-        catalog_keys: list = []
+        extra_models = tmp_path / "extra_models.json"
+        extra_models.write_text("{}")
         monkeypatch.setattr(
-            "code_puppy.provider_credentials.all_api_key_env_vars",
-            lambda: list(catalog_keys),
+            "code_puppy.model_factory.EXTRA_MODELS_FILE", str(extra_models)
         )
         monkeypatch.setattr("code_puppy.config.set_config_value", lambda *a, **k: None)
         monkeypatch.setenv("NEW_CUSTOM_API_KEY", "placeholder")
         assert "NEW_CUSTOM_API_KEY" not in credential_env_var_names()
+        assert "NEW_CUSTOM_API_KEY" in environment_without_credentials()
 
-        catalog_keys.append("NEW_CUSTOM_API_KEY")
+        extra_models.write_text(
+            json.dumps(
+                {
+                    "new-custom": {
+                        "type": "custom_openai",
+                        "name": "m",
+                        "api_key": "$NEW_CUSTOM_API_KEY",
+                    }
+                }
+            )
+        )
         assert "NEW_CUSTOM_API_KEY" in credential_env_var_names()
+        assert "NEW_CUSTOM_API_KEY" not in environment_without_credentials()
 
         save_credential("NEW_CUSTOM_API_KEY", "brand-new-secret")
         assert "NEW_CUSTOM_API_KEY" not in environment_without_credentials()
 
+    def test_names_cached_until_catalog_fingerprint_changes(self, monkeypatch):
+        from code_puppy.provider_credentials import credential_env_var_names
+
+        fingerprint = ["v1"]
+        loads = []
+        monkeypatch.setattr(
+            "code_puppy.model_factory.ModelFactory.config_fingerprint",
+            lambda: tuple(fingerprint),
+        )
+        monkeypatch.setattr(
+            "code_puppy.provider_credentials._load_merged_model_config",
+            lambda: loads.append(1) or {},
+        )
+
+        first = credential_env_var_names()
+        assert credential_env_var_names() is first
+        assert len(loads) == 2  # api_key + secret-header passes, once
+
+        fingerprint[0] = "v2"
+        credential_env_var_names()
+        assert len(loads) == 4
+
+    def test_environment_rebuilt_when_os_environ_changes(self, monkeypatch):
+        from code_puppy.provider_credentials import environment_without_credentials
+
+        monkeypatch.setattr(
+            "code_puppy.model_factory.ModelFactory.config_fingerprint",
+            lambda: ("stable",),
+        )
+        monkeypatch.setenv("SOME_USER_VAR", "one")
+        first = environment_without_credentials()
+        assert first["SOME_USER_VAR"] == "one"
+
+        first["SOME_USER_VAR"] = "caller mutation"
+        assert environment_without_credentials()["SOME_USER_VAR"] == "one"
+
+        monkeypatch.setenv("SOME_USER_VAR", "two")
+        assert environment_without_credentials()["SOME_USER_VAR"] == "two"
+        monkeypatch.delenv("SOME_USER_VAR")
+        assert "SOME_USER_VAR" not in environment_without_credentials()
+
 
 if __name__ == "__main__":
     unittest.main()
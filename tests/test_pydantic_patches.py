@@ -183,3 +183,136 @@ def test_apply_all_patches_no_summary_for_optional_skips(monkeypatch, caplog):
     assert results["patch_termflow_clipboard"] is False
     assert results["patch_termflow_code_padding"] is False
     assert _error_records(caplog) == []
+
+
+# ---------------------------------------------------------------------------
+# execute_tool_call wrapper: fast path + timing registry
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def patched_noop_tool_manager(monkeypatch):
+    """Apply the tool-call patch over a no-op ``execute_tool_call``."""
+    from pydantic_ai.tool_manager import ToolManager
+
+    from code_puppy import tool_metrics
+
+    async def _noop_execute(self, validated, **kwargs):
+        return "ok"
+
+    for attr in ("execute_tool_call", "get_tool_def", "validate_tool_call"):
+        monkeypatch.setattr(ToolManager, attr, getattr(ToolManager, attr))
+    monkeypatch.setattr(ToolManager, "execute_tool_call", _noop_execute)
+    assert pydantic_patches.patch_tool_call_callbacks() is True
+    tool_metrics.reset_tool_timings()
+    yield ToolManager
+    tool_metrics.reset_tool_timings()
+
+
+def _validated(tool_name="noop", args=None):
+    from types import SimpleNamespace
+
+    args = {} if args is None else args
+    return SimpleNamespace(
+        call=SimpleNamespace(tool_name=tool_name, args=args), validated_args=args
+    )
+
+
+async def test_no_hooks_skips_callback_dispatch(patched_noop_tool_manager, monkeypatch):
+    from code_puppy import callbacks
+
+    monkeypatch.setattr(callbacks, "count_callbacks", lambda phase=None: 0)
+
+    async def _must_not_run(*args, **kwargs):
+        raise AssertionError("callback dispatch should be skipped")
+
+    monkeypatch.setattr(callbacks, "on_pre_tool_call", _must_not_run)
+    monkeypatch.setattr(callbacks, "on_post_tool_call", _must_not_run)
+
+    result = await patched_noop_tool_manager.execute_tool_call(None, _validated())
+    assert result == "ok"
+
+
+async def test_tool_wall_time_is_recorded(patched_noop_tool_manager):
+    from code_puppy.tool_metrics import get_tool_timings
+
+    for _ in range(3):
+        await patched_noop_tool_manager.execute_tool_call(None, _validated("a"))
+    await patched_noop_tool_manager.execute_tool_call(None, _validated("b"))
+
+    timings = get_tool_timings()
+    assert timings["a"].calls == 3
+    assert timings["b"].calls == 1
+    assert timings["a"].total_ms >= timings["a"].max_ms >= timings["a"].min_ms >= 0
+
+
+async def test_failed_tool_call_counts_as_error(monkeypatch):
+    from pydantic_ai.tool_manager import ToolManager
+
+    from code_puppy.tool_metrics import get_tool_timings, reset_tool_timings
+
+    async def _boom(self, validated, **kwargs):
+        raise RuntimeError("boom")
+
+    for attr in ("execute_tool_call", "get_tool_def", "validate_tool_call"):
+        monkeypatch.setattr(ToolManager, attr, getattr(ToolManager, attr))
+    monkeypatch.setattr(ToolManager, "execute_tool_call", _boom)
+    pydantic_patches.patch_tool_call_callbacks()
+    reset_tool_timings()
+
+    with pytest.raises(RuntimeError):
+        await ToolManager.execute_tool_call(None, _validated("explodes"))
+    assert get_tool_timings()["explodes"].errors == 1
+    reset_tool_timings()
+
+
+def test_cp_prefix_mode_follows_model_switch_without_config_reads(monkeypatch):
+    from pydantic_ai.tool_manager import ToolManager
+
+    from code_puppy import config
+
+    monkeypatch.setattr(config, "mutate_config", lambda *a, **k: None)
+    for attr in ("execute_tool_call", "get_tool_def", "validate_tool_call"):
+        monkeypatch.setattr(ToolManager, attr, getattr(ToolManager, attr))
+    monkeypatch.setattr(ToolManager, "get_tool_def", lambda self, name: name)
+    assert pydantic_patches.patch_tool_call_callbacks() is True
+
+    reads = []
+    real_get = config.get_global_model_name
+
+    def _counting_get():
+        reads.append(1)
+        return real_get()
+
+    monkeypatch.setattr(config, "get_global_model_name", _counting_get)
+
+    config.set_model_name("claude-code-sonnet")
+    assert [ToolManager.get_tool_def(None, "cp_read") for _ in range(5)] == ["read"] * 5
+    assert len(reads) == 1
+
+    config.set_model_name("gpt-5")
+    assert ToolManager.get_tool_def(None, "cp_read") == "cp_read"
+    assert ToolManager.get_tool_def(None, "cp_read") == "cp_read"
+    assert len(reads) == 2
+
+
+@pytest.mark.benchmark
+async def test_dispatch_10k_noop_tool_calls(patched_noop_tool_manager, monkeypatch):
+    """Benchmark-style: 10k no-op calls through the patched ToolManager."""
+    import time
+
+    from code_puppy import callbacks
+    from code_puppy.tool_metrics import get_tool_timings
+
+    monkeypatch.setattr(callbacks, "count_callbacks", lambda phase=None: 0)
+    execute = patched_noop_tool_manager.execute_tool_call
+    validated = _validated()
+
+    start = time.perf_counter()
+    for _ in range(10_000):
+        await execute(None, validated)
+    elapsed = time.perf_counter() - start
+
+    assert get_tool_timings()["noop"].calls == 10_000
+    # Generous ceiling: the hook-free path is a few microseconds per call.
+    assert elapsed < 2.0
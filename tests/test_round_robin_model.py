@@ -0,0 +1,256 @@
+"""Health-aware routing in RoundRobinModel, driven by fake local models."""
+
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+import httpx
+import pytest
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models import Model, ModelRequestParameters
+
+from code_puppy.model_factory import ModelFactory
+from code_puppy.round_robin_model import (
+    EJECT_BASE_SECONDS,
+    EJECT_MAX_SECONDS,
+    CandidateHealth,
+    RoundRobinModel,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class FakeModel(Model):
+    """Spends ``latency`` seconds of fake time per request; fails on demand."""
+
+    def __init__(self, name: str, clock: FakeClock, latency: float = 0.1):
+        super().__init__()
+        self._name = name
+        self.clock = clock
+        self.latency = latency
+        self.failing = False
+        self.status = 503
+        self.calls = 0
+
+    @property
+    def model_name(self) -> str:
+        return self._name
+
+    @property
+    def system(self) -> str:
+        return "fake"
+
+    def _serve(self) -> None:
+        self.calls += 1
+        self.clock.advance(self.latency)
+        if self.failing:
+            raise ModelHTTPError(self.status, self._name)
+
+    async def request(self, messages, model_settings, model_request_parameters):
+        self._serve()
+        return ModelResponse(parts=[TextPart(content=self._name)])
+
+    @asynccontextmanager
+    async def request_stream(
+        self, messages, model_settings, model_request_parameters, run_context=None
+    ):
+        self._serve()
+        yield self._name
+
+
+def _router(clock, *latencies, **kwargs):
+    models = [FakeModel(f"m{i}", clock, latency) for i, latency in enumerate(latencies)]
+    return RoundRobinModel(*models, clock=clock, **kwargs), models
+
+
+async def _send(router, count: int, gap: float = 0.0) -> list:
+    served = []
+    for _ in range(count):
+        response = await router.request([], None, ModelRequestParameters())
+        served.append(response.parts[0].content)
+        router._clock.advance(gap)
+    return served
+
+
+async def test_healthy_equal_candidates_rotate_in_order():
+    clock = FakeClock()
+    router, _ = _router(clock, 0.1, 0.1, 0.1)
+    assert await _send(router, 6) == ["m0", "m1", "m2"] * 2
+
+    router, _ = _router(clock, 0.1, 0.1, rotate_every=2)
+    assert await _send(router, 6) == ["m0", "m0", "m1", "m1", "m0", "m0"]
+
+
+async def test_traffic_shifts_towards_the_faster_candidate():
+    clock = FakeClock()
+    router, (fast, slow) = _router(clock, 0.2, 2.0)
+
+    await _send(router, 300)
+
+    # Weights settle at roughly 1 : 0.1, and the slow one is never starved.
+    assert fast.calls > 8 * slow.calls
+    assert slow.calls >= 10
+    assert router.health[0].latency == pytest.approx(0.2)
+    assert router.health[1].latency == pytest.approx(2.0)
+
+
+async def test_failing_candidate_is_ejected_with_exponential_backoff():
+    clock = FakeClock()
+    router, (good, bad) = _router(clock, 0.1, 0.1)
+    bad.failing = True
+
+    served = await _send(router, 600, gap=1.0)
+
+    # Every request succeeded: the first failure was retried on m0.
+    assert served == ["m0"] * 600
+    # ~660s of traffic with ejections of 5, 10, 20, ... 300s: a handful of probes.
+    assert 3 <= bad.calls <= 10
+    health = router.health[1]
+    assert health.consecutive_failures == bad.calls
+    assert health.error_rate > 0.5
+
+
+def test_backoff_doubles_per_consecutive_failure_up_to_the_cap():
+    health = CandidateHealth()
+    windows = []
+    for _ in range(9):
+        health.record_failure(now=0.0)
+        windows.append(health.ejected_until)
+
+    assert windows[:4] == [EJECT_BASE_SECONDS * 2**n for n in range(4)]
+    assert windows[-1] == EJECT_MAX_SECONDS
+
+    health.record_success(latency=0.1)
+    health.record_failure(now=0.0)
+    assert health.ejected_until == EJECT_BASE_SECONDS
+
+
+async def test_recovered_candidate_rejoins_the_rotation():
+    clock = FakeClock()
+    router, (good, bad) = _router(clock, 0.1, 0.1)
+    bad.failing = True
+    await _send(router, 2)
+    assert router.health[1].ejected_until > clock.now
+
+    bad.failing = False
+    clock.advance(EJECT_BASE_SECONDS)
+    await _send(router, 200)
+
+    assert router.health[1].consecutive_failures == 0
+    assert router.health[1].ejected_until == 0.0
+    # The error-rate penalty decays, so traffic evens out again.
+    assert bad.calls > 80
+
+
+async def test_retry_happens_once_then_the_error_surfaces():
+    clock = FakeClock()
+    router, models = _router(clock, 0.1, 0.1, 0.1)
+    for model in models:
+        model.failing = True
+
+    with pytest.raises(ModelHTTPError):
+        await router.request([], None, ModelRequestParameters())
+
+    assert [m.calls for m in models] == [1, 1, 0]
+
+
+async def test_stream_open_failure_retries_and_records_ttft():
+    clock = FakeClock()
+    router, (first, second) = _router(clock, 0.3, 0.5)
+    first.failing = True
+
+    async with router.request_stream([], None, ModelRequestParameters()) as stream:
+        assert stream == "m1"
+
+    assert (first.calls, second.calls) == (1, 1)
+    assert router.health[1].ttft == pytest.approx(0.5)
+    assert router.health[1].requests == 1
+    assert router.health[0].failures == 1
+
+
+async def test_transport_errors_inside_the_stream_count_against_the_candidate():
+    clock = FakeClock()
+    router, _ = _router(clock, 0.1, 0.1)
+
+    with pytest.raises(httpx.ReadError):
+        async with router.request_stream([], None, ModelRequestParameters()):
+            raise httpx.ReadError("connection reset mid-stream")
+
+    assert router.health[0].failures == 1
+    assert router.health[0].ejected_until > clock.now
+
+
+async def test_caller_errors_inside_the_stream_do_not_blame_the_candidate():
+    clock = FakeClock()
+    router, _ = _router(clock, 0.1, 0.1)
+
+    with pytest.raises(RuntimeError):
+        async with router.request_stream([], None, ModelRequestParameters()):
+            raise RuntimeError("bug in the event handler")
+
+    assert router.health[0].failures == 0
+    assert router.health[0].ejected_until == 0.0
+
+
+async def test_client_error_is_neither_retried_nor_ejected():
+    clock = FakeClock()
+    router, models = _router(clock, 0.1, 0.1)
+    for model in models:
+        model.failing = True
+        model.status = 400
+
+    with pytest.raises(ModelHTTPError):
+        await router.request([], None, ModelRequestParameters())
+    with pytest.raises(ModelHTTPError):
+        async with router.request_stream([], None, ModelRequestParameters()):
+            pass
+
+    assert [m.calls for m in models] == [1, 1]
+    assert [h.failures for h in router.health] == [0, 0]
+    assert [h.ejected_until for h in router.health] == [0.0, 0.0]
+
+
+async def test_plain_round_robin_routing_neither_ejects_nor_retries():
+    clock = FakeClock()
+    router, (good, bad) = _router(clock, 0.1, 0.1, routing="round_robin")
+    bad.failing = True
+
+    served = []
+    for _ in range(4):
+        try:
+            served.append(
+                (await router.request([], None, ModelRequestParameters()))
+                .parts[0]
+                .content
+            )
+        except ModelHTTPError:
+            served.append("error")
+
+    assert served == ["m0", "error", "m0", "error"]
+
+
+def test_unknown_routing_mode_is_rejected():
+    with pytest.raises(ValueError, match="routing"):
+        RoundRobinModel(FakeModel("m0", FakeClock()), routing="random")
+
+
+def test_factory_passes_routing_through():
+    config = {
+        "a": {"type": "openai", "name": "gpt-a"},
+        "b": {"type": "openai", "name": "gpt-b"},
+        "rr": {"type": "round_robin", "models": ["a", "b"], "routing": "round_robin"},
+    }
+    with patch.dict("os.environ", {"OPENAI_API_KEY": "sk-test"}):
+        model = ModelFactory.get_model("rr", config)
+
+    assert isinstance(model, RoundRobinModel)
+    assert not model.adaptive
@@ -0,0 +1,186 @@
+"""--profile-startup reports, lazy tool imports and the cold-start budget."""
+
+import json
+import os
+import subprocess
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+from code_puppy import startup_profile
+
+# Modules imported under "import cli_runner" for ``--help``: 5214 measured on
+# Python 3.11 with the locked dependencies, plus ~15% for dependency drift.
+# A new eager import of a heavy package blows through this; a slow box doesn't.
+CLI_RUNNER_IMPORT_BUDGET = int(os.environ.get("CODE_PUPPY_STARTUP_IMPORT_BUDGET", 6000))
+# Only needed once the user actually browses or pastes an image.
+DEFERRED_PACKAGES = ("playwright", "PIL")
+
+
+@pytest.fixture
+def profiler():
+    yield startup_profile
+    # Never leak an active profiler (and its meta-path hook) into other tests.
+    startup_profile.finish("test teardown")
+
+
+def _phases(node, path=()):
+    path = path + (node["name"],)
+    if node["kind"] == "phase":
+        yield path
+    for child in node.get("children", []):
+        yield from _phases(child, path)
+
+
+@pytest.mark.parametrize(
+    ("argv", "expected"),
+    [
+        (["-p", "hi"], None),
+        (["--profile-startup"], startup_profile.DEFAULT_REPORT_PATH),
+        (["--profile-startup", "-i"], startup_profile.DEFAULT_REPORT_PATH),
+        (["--profile-startup", "out.json"], "out.json"),
+        (["-i", "--profile-startup=out.json"], "out.json"),
+    ],
+)
+def test_report_path_from_argv(argv, expected):
+    assert startup_profile.report_path_from_argv(argv) == expected
+
+
+def test_phases_are_free_when_profiling_is_off(tmp_path):
+    assert not startup_profile.is_active()
+    with startup_profile.phase("anything"):
+        pass
+    assert startup_profile.finish("ready") is None
+
+
+def test_report_nests_imports_under_their_phase(profiler, tmp_path, monkeypatch):
+    (tmp_path / "sp_outer.py").write_text("import sp_inner\nVALUE = 1\n")
+    (tmp_path / "sp_inner.py").write_text("import time\ntime.sleep(0.02)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(startup_profile, "MIN_REPORTED_IMPORT_MS", 0.0)
+    report_path = tmp_path / "report.json"
+
+    profiler.start(str(report_path), ["code-puppy", "--profile-startup"])
+    with profiler.phase("outer phase"):
+        with profiler.phase("inner phase"):
+            import sp_outer  # noqa: F401
+    assert profiler.finish("interactive prompt") == str(report_path)
+
+    report = json.loads(report_path.read_text())
+    assert report["ready"] == "interactive prompt"
+    assert ("startup", "outer phase", "inner phase") in list(_phases(report["tree"]))
+    (outer,) = report["tree"]["children"]
+    (inner,) = outer["children"]
+    (module,) = inner["children"]
+    assert module["name"] == "sp_outer"
+    assert module["children"][0]["name"] == "sp_inner"
+    assert module["children"][0]["ms"] >= 20
+    assert module["ms"] >= module["children"][0]["ms"]
+    assert report["import_ms"] == pytest.approx(module["ms"], abs=0.01)
+    assert report["top_imports"][0]["module"] == "sp_outer"
+
+    # The timing loader never outlives the import.
+    module = sys.modules["sp_outer"]
+    assert not isinstance(module.__loader__, startup_profile._TimedLoader)
+    assert module.__spec__.loader is module.__loader__
+    assert not startup_profile.is_active()
+
+
+def test_lazy_tool_entries_import_their_module_on_first_registration():
+    from code_puppy.tools import LazyToolRegistration
+
+    entry = LazyToolRegistration("code_puppy.tools.image_tools", "register_load_image")
+    agent = MagicMock()
+    entry(agent)
+
+    agent.tool.assert_called_once()
+    from code_puppy.tools.image_tools import register_load_image
+
+    assert entry.resolve() is register_load_image
+
+
+def _run(*args, env=None, timeout=120):
+    return subprocess.run(
+        [sys.executable, *args],
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+        env={**os.environ, "CODE_PUPPY_NO_SPLASH": "1", **(env or {})},
+        check=False,
+    )
+
+
+def test_tool_registry_lists_tools_without_importing_them():
+    script = r"""
+import sys
+import code_puppy.tools as tools
+
+assert "browser_navigate" in tools.TOOL_REGISTRY
+assert "load_image_for_analysis" in tools.TOOL_REGISTRY
+deferred = [
+    name for name in sys.modules
+    if name.startswith(("playwright", "code_puppy.tools.browser"))
+    or name in ("code_puppy.tools.image_tools", "code_puppy.tools.file_modifications")
+]
+assert deferred == [], deferred
+"""
+    result = _run("-c", script)
+    assert result.returncode == 0, result.stderr
+
+
+@pytest.fixture(scope="module")
+def help_profile(tmp_path_factory):
+    report_path = tmp_path_factory.mktemp("profile") / "startup.json"
+    result = _run("-m", "code_puppy", f"--profile-startup={report_path}", "--help")
+    assert result.returncode == 0, result.stderr
+    return result, json.loads(report_path.read_text())
+
+
+def _imports(node):
+    for child in node.get("children", []):
+        if child["kind"] == "import":
+            yield child["name"]
+        yield from _imports(child)
+
+
+def test_profile_startup_writes_the_phase_breakdown(help_profile):
+    result, report = help_profile
+
+    assert "--profile-startup" in result.stdout
+    assert report["ready"] == "exit"
+    phases = {path[-1] for path in _phases(report["tree"])}
+    assert {"import cli_runner", "pydantic patches", "plugin load"} <= phases
+    assert report["import_ms"] > 0
+    assert report["top_imports"]
+
+
+def test_import_cli_runner_defers_heavy_packages(help_profile):
+    _, report = help_profile
+    (cli_runner,) = [
+        node
+        for node in report["tree"]["children"]
+        if node["name"] == "import cli_runner"
+    ]
+
+    eager = sorted(
+        name for name in _imports(cli_runner) if name.split(".")[0] in DEFERRED_PACKAGES
+    )
+    assert eager == []
+    assert 0 < cli_runner["import_count"] <= CLI_RUNNER_IMPORT_BUDGET
+
+
+def test_phase_import_count_includes_folded_imports(profiler, tmp_path, monkeypatch):
+    (tmp_path / "sp_tiny.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(startup_profile, "MIN_REPORTED_IMPORT_MS", float("inf"))
+    report_path = tmp_path / "report.json"
+
+    profiler.start(str(report_path), ["code-puppy", "--profile-startup"])
+    with profiler.phase("tiny phase"):
+        import sp_tiny  # noqa: F401
+    profiler.finish("exit")
+
+    (phase,) = json.loads(report_path.read_text())["tree"]["children"]
+    assert phase["import_count"] == 1
+    assert phase["small_imports"] == 1
@@ -51,29 +51,37 @@ class TestStatusDisplay:
         assert rate == 0
 
     def test_calculate_rate_with_previous_data(self, status_display):
-        """Test rate calculation with previous timing data."""
+        """Test rate calculation over the sample window."""
         # First update to establish baseline (10 tokens)
-        status_display.update_token_count(10)
-
-        # Wait a tiny bit and simulate manual time passage
-        initial_time = time.time()
-        status_display.last_update_time = (
-            initial_time - 1.0
-        )  # Pretend last update was 1 second ago
-        status_display.current_rate = 5.0  # Set existing rate for smoothing
+        with patch("code_puppy.status_display.time.time", return_value=100.0):
+            status_display.update_token_count(10)
 
-        # Second update with more tokens (20 total = 10 new tokens in ~1 second)
+        # 10 more tokens one second later
         status_display.token_count = 20
+        with patch("code_puppy.status_display.time.time", return_value=101.0):
+            rate = status_display._calculate_rate()
 
-        rate = status_display._calculate_rate()
-
-        # Smoothing expectation: 10 t/s raw blended 70/30 with the existing 5.0:
-        # 5.0 * 0.7 + 10.0 * 0.3 = 3.5 + 3.0 = 6.5 t/s.
-        assert rate > 0
-        assert rate > 5.0  # Should be higher than the previous rate component
+        assert rate == pytest.approx(10.0)
         # Global rate should be updated - check from module namespace
         assert code_puppy.status_display.CURRENT_TOKEN_RATE == rate
 
+    def test_rate_window_forgets_old_bursts(self, status_display):
+        """Only the last RATE_WINDOW_SECONDS of samples count toward the rate."""
+        with patch("code_puppy.status_display.time.time") as mock_time:
+            mock_time.return_value = 100.0
+            status_display.update_token_count(0)
+            mock_time.return_value = 101.0
+            status_display.update_token_count(1000)  # a burst, long ago
+            mock_time.return_value = 120.0
+            status_display.update_token_count(1050)
+            mock_time.return_value = 125.0
+            status_display.update_token_count(1100)
+            assert status_display._calculate_rate() == pytest.approx(10.0)
+
+            # Nothing new for a whole window: the rate decays to zero.
+            mock_time.return_value = 131.0
+            assert status_display._calculate_rate() == 0
+
     def test_calculate_rate_negative_rates_handled(self, status_display):
         """Test that negative rates are clamped to 0."""
         status_display.last_update_time = time.time() - 1.0
@@ -551,3 +559,69 @@ class TestToolPauseExclusion:
         msg = mock_emit.call_args[0][0]
         assert "in 4.0s" in msg
         assert "25.0 t/s avg" in msg  # 100 tokens / 4s active
+
+
+class TestRefreshCost:
+    """The display loop redraws only on visible change and never locks per chunk."""
+
+    class _CountingLock:
+        def __init__(self):
+            self.acquisitions = 0
+
+        def __enter__(self):
+            self.acquisitions += 1
+
+        def __exit__(self, *exc):
+            return False
+
+    @pytest.fixture
+    def harness(self, monkeypatch):
+        clock = [1000.0]
+        lock = self._CountingLock()
+        monkeypatch.setattr(code_puppy.status_display, "CURRENT_TOKEN_RATE", 0.0)
+        monkeypatch.setattr(code_puppy.status_display.time, "time", lambda: clock[0])
+        monkeypatch.setattr(code_puppy.status_display, "_TOKEN_RATE_LOCK", lock)
+        display = StatusDisplay(console=MagicMock())
+        with patch("code_puppy.status_display.asyncio.create_task"):
+            display.start()
+        return display, clock, lock, MagicMock()
+
+    def test_refresh_cost_idle_and_streaming(self, harness):
+        display, clock, lock, live = harness
+
+        # Ten minutes of waiting on the model with nothing arriving.
+        idle_end = clock[0] + 600
+        while clock[0] < idle_end:
+            clock[0] += display._refresh(live)
+        idle_renders = live.update.call_count
+        idle_locks = lock.acquisitions
+
+        # Then 5k chunks at 50 chunks/s, the loop running alongside.
+        live.reset_mock()
+        next_refresh = clock[0]
+        for _ in range(5000):
+            clock[0] += 0.02
+            display.update_token_count(1)
+            if clock[0] >= next_refresh:
+                next_refresh = clock[0] + display._refresh(live)
+        stream_renders = live.update.call_count
+        stream_locks = lock.acquisitions - idle_locks
+
+        assert display.token_count == 5000
+        assert display.current_rate == pytest.approx(50.0, rel=0.05)
+        # Redraws happen only when the elapsed/message text changes (the old
+        # loop did 1200 updates plus 1200 auto-refreshes idle, 400 streaming).
+        assert idle_renders <= 60 + 54 + 120
+        assert idle_locks == 0
+        assert stream_renders <= 200
+        # At most one lock per recomputed rate, never one per chunk.
+        assert stream_locks <= stream_renders
+        assert len(display._rate_samples) <= display._rate_samples.maxlen
+
+    def test_status_line_shows_elapsed_time(self, harness):
+        display, clock, _lock, live = harness
+        clock[0] += 125
+        display._refresh(live)
+        text = str(live.update.call_args[0][0])
+        assert "2m 00s" in text
+        assert "Warming up..." in text
@@ -0,0 +1,296 @@
+"""Exact, calibrated and heuristic token counting (code_puppy.token_counting)."""
+
+import json
+import re
+import time
+from pathlib import Path
+
+import pytest
+from pydantic_ai.messages import (
+    ModelRequest,
+    ModelResponse,
+    TextPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+from pydantic_ai.usage import RequestUsage
+
+from code_puppy import token_counting
+from code_puppy.agents import _history
+from code_puppy.token_counting import CachedTokenizer
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# The fake family's "true" tokenizer: words, single punctuation marks and one
+# token per CJK character -- far denser than 2.5 chars/token on CJK, sparser
+# on prose, which is exactly where the flat heuristic goes wrong.
+_PIECES = re.compile(r"[぀-ヿ一-鿿]|\w{1,6}|[^\w\s]")
+
+
+def _fake_encode(text):
+    return _PIECES.findall(text)
+
+
+def _corpus():
+    """Code, prose, JSON and non-English samples, ~4-20 KB each."""
+    history = (ROOT / "code_puppy" / "agents" / "_history.py").read_text()
+    readme = (ROOT / "README.md").read_text(encoding="utf-8")
+    return {
+        "python": history[:20_000],
+        "prose": re.sub(r"[`#*\[\]()<>|]", "", readme)[:20_000],
+        "json": json.dumps(
+            [{"id": i, "path": f"src/mod_{i}.py", "ok": i % 3 == 0} for i in range(300)]
+        ),
+        "japanese": "関数の引数を検証してからキャッシュを更新します。" * 600,
+        "chinese": "这个函数会在写入文件之前检查路径是否存在。" * 600,
+    }
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    token_counting._reset_for_tests()
+    monkeypatch.setattr(token_counting, "_FAMILIES", list(token_counting._FAMILIES))
+    yield
+    token_counting._reset_for_tests()
+
+
+@pytest.fixture
+def fake_family():
+    token_counting.register_tokenizer_family(
+        ("fakemodel",), "fake", lambda: CachedTokenizer("fake", _fake_encode)
+    )
+    return "fakemodel-large"
+
+
+def test_without_a_model_the_heuristic_is_unchanged():
+    assert _history.estimate_tokens("a" * 10) == 4
+    assert _history.estimate_tokens("") == 1
+    assert token_counting.tokenizer_for(None) is token_counting.HEURISTIC
+
+
+def test_multiplier_still_applies_to_uncalibrated_models():
+    text = "x" * 1000
+    assert token_counting.tokenizer_for("some-model").count(text) == 400
+    assert token_counting.tokenizer_for("claude-opus-4-7").count(text) == 540
+    assert _history.model_token_multiplier("claude-opus-4-7") == 1.35
+
+
+def test_exact_tokenizer_loads_in_the_background(fake_family):
+    text = "def f(x):\n    return x + 1\n"
+    # First sight of the family: heuristic now, exact once the thread finishes.
+    first = token_counting.tokenizer_for(fake_family, mode="auto")
+    assert not first.exact
+
+    deadline = time.monotonic() + 5
+    while not token_counting.tokenizer_for(fake_family, mode="auto").exact:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    exact = token_counting.tokenizer_for(fake_family, mode="auto")
+    assert exact.count(text) == len(_fake_encode(text))
+
+
+def test_failing_loader_falls_back_for_good():
+    def broken():
+        raise OSError("no network")
+
+    token_counting.register_tokenizer_family(("brokenmodel",), "broken", broken)
+    assert token_counting.preload_tokenizer("brokenmodel") is None
+    tokenizer = token_counting.tokenizer_for("brokenmodel", mode="auto")
+    assert tokenizer is token_counting.HEURISTIC
+
+
+def test_mode_pins_the_estimator(fake_family):
+    token_counting.preload_tokenizer(fake_family)
+    for _ in range(3):
+        token_counting.record_usage_sample(fake_family, 4000, 1000)
+
+    assert token_counting.tokenizer_for(fake_family, mode="auto").exact
+    calibrated = token_counting.tokenizer_for(fake_family, mode="calibrated")
+    assert calibrated.chars_per_token == pytest.approx(4.0)
+    heuristic = token_counting.tokenizer_for(fake_family, mode="heuristic")
+    assert heuristic.chars_per_token == 2.5
+
+
+def test_count_cache_hits_on_repeated_content(fake_family):
+    tokenizer = token_counting.preload_tokenizer(fake_family)
+    for _ in range(5):
+        tokenizer.count("hello world, " * 50)
+
+    stats = token_counting.count_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (4, 1, 1)
+
+
+def test_count_cache_evicts_least_recently_used(monkeypatch, fake_family):
+    monkeypatch.setattr(token_counting._count_cache, "maxsize", 2)
+    tokenizer = token_counting.preload_tokenizer(fake_family)
+    tokenizer.count("a")
+    tokenizer.count("b")
+    tokenizer.count("a")
+    tokenizer.count("c")  # evicts "b"
+    tokenizer.count("b")
+
+    assert token_counting.count_cache_stats()["misses"] == 4
+
+
+def test_outlier_samples_are_rejected():
+    assert not token_counting.record_usage_sample("m", 100, 1000)
+    assert not token_counting.record_usage_sample("m", 100_000, 10)
+    assert not token_counting.record_usage_sample("m", 0, 10)
+    assert token_counting.calibrated_chars_per_token("m") is None
+
+
+def _conversation(texts, encode, overhead=5000):
+    """Alternating request/response turns whose usage a real provider would report."""
+    messages = []
+    input_tokens = overhead
+    for i, text in enumerate(texts):
+        request = ModelRequest(
+            parts=[
+                UserPromptPart(content=text)
+                if i % 2 == 0
+                else ToolReturnPart(
+                    tool_name="read_file", content=text, tool_call_id=f"c{i}"
+                )
+            ]
+        )
+        messages.append(request)
+        input_tokens += sum(
+            len(encode(_history.stringify_part(p))) for p in request.parts
+        )
+        response = ModelResponse(
+            parts=[TextPart(content=f"ack {i}")],
+            usage=RequestUsage(input_tokens=input_tokens, output_tokens=3),
+        )
+        messages.append(response)
+        input_tokens += sum(
+            len(encode(_history.stringify_part(p))) for p in response.parts
+        )
+    return messages
+
+
+def test_calibration_recovers_the_ratio_from_usage_deltas():
+    corpus = _corpus()
+    texts = [corpus["python"][i : i + 2000] for i in range(0, 12_000, 2000)]
+    messages = _conversation(texts, _fake_encode)
+
+    accepted = _history.record_usage_calibration(messages, "acme-1")
+
+    # Six responses, five deltas; the system-prompt overhead never leaks in.
+    assert accepted == len(texts) - 1
+    chars = sum(
+        len(_history.stringify_part(p)) for m in messages[1:] for p in m.parts
+    ) - len(_history.stringify_part(messages[-1].parts[0]))
+    tokens = messages[-1].usage.input_tokens - messages[1].usage.input_tokens
+    assert token_counting.calibrated_chars_per_token("acme-1") == pytest.approx(
+        chars / tokens
+    )
+
+
+def test_calibration_only_samples_the_new_part_of_a_run():
+    texts = ["alpha beta gamma " * 40] * 6
+    messages = _conversation(texts, _fake_encode)
+
+    assert _history.record_usage_calibration(messages, "acme-1", start=8) == 2
+    assert _history.record_usage_calibration(messages, None) == 0
+
+
+def test_estimates_use_the_calibrated_ratio(monkeypatch):
+    monkeypatch.setattr("code_puppy.config.get_token_estimator", lambda: "calibrated")
+    for _ in range(3):
+        token_counting.record_usage_sample("acme-1", 5000, 1000)
+    message = ModelRequest(parts=[UserPromptPart(content="z" * 993)])
+    part_chars = len(_history.stringify_part(message.parts[0]))
+
+    assert _history.estimate_tokens_for_message(message, "acme-1") == part_chars // 5
+    assert _history.estimate_context_overhead("y" * 500, None, "acme-1") == 100
+    assert _history.estimate_tokens("y" * 500, "acme-1") == 100
+
+
+def test_estimator_mode_is_read_once_until_the_key_is_written(monkeypatch):
+    from code_puppy import config
+
+    reads = []
+    real_get_value = config.get_value
+    monkeypatch.setattr(
+        config, "get_value", lambda key: reads.append(key) or real_get_value(key)
+    )
+    for _ in range(3):
+        token_counting.record_usage_sample("acme-1", 5000, 1000)
+    message = ModelRequest(parts=[UserPromptPart(content="z" * 993)])
+    for _ in range(100):
+        _history.estimate_tokens_for_message(message, "acme-1")
+    assert reads.count("token_estimator") == 1
+
+    config.set_config_value("token_estimator", "heuristic")
+    assert token_counting.tokenizer_for("acme-1").chars_per_token == 2.5
+    config.reset_value("token_estimator")
+    assert token_counting.tokenizer_for("acme-1").chars_per_token == 5.0
+
+
+@pytest.mark.parametrize(
+    ("model", "family"),
+    [
+        ("openai/o1-preview", "o200k_base"),
+        ("o3", "o200k_base"),
+        ("azure-gpt-4.1-mini", "o200k_base"),
+        ("gpt-5.1-codex", "o200k_base"),
+        ("gpt-4-turbo", "cl100k_base"),
+        ("gpt-3.5-turbo", "cl100k_base"),
+        ("gemini-pro1.5", None),
+        ("mistral-large-o3x", None),
+        ("claude-sonnet-4", None),
+    ],
+)
+def test_families_match_whole_name_tokens(model, family):
+    found = token_counting._family_for(model)
+    assert (found[0] if found else None) == family
+
+
+def _relative_error(tokenizer, text):
+    truth = len(_fake_encode(text))
+    return abs(tokenizer.count(text) - truth) / truth
+
+
+def test_calibrated_estimates_beat_the_heuristic_on_held_out_text(fake_family):
+    corpus = _corpus()
+    heuristic, calibrated = {}, {}
+    for name, text in corpus.items():
+        # One session per workload: calibrate on the first half, in chunks
+        # the size of tool outputs, then estimate the unseen second half.
+        half = len(text) // 2
+        chunks = [text[i : i + 1500] for i in range(0, half, 1500)]
+        model = f"acme-{name}"
+        _history.record_usage_calibration(_conversation(chunks, _fake_encode), model)
+        held_out = text[half:]
+        heuristic[name] = _relative_error(
+            token_counting.heuristic_tokenizer(model), held_out
+        )
+        calibrated[name] = _relative_error(
+            token_counting.tokenizer_for(model, mode="calibrated"), held_out
+        )
+    exact = token_counting.preload_tokenizer(fake_family)
+    assert all(_relative_error(exact, text) == 0 for text in corpus.values())
+
+    assert max(calibrated.values()) < 0.15
+    assert sum(calibrated.values()) < sum(heuristic.values()) / 3
+
+
+@pytest.mark.benchmark
+def test_benchmark_cached_exact_counts(fake_family):
+    texts = list(_corpus().values())
+    exact = token_counting.preload_tokenizer(fake_family)
+    rounds = 50
+
+    token_counting._count_cache.clear()
+    started = time.perf_counter()
+    for text in texts:
+        exact.count(text)
+    cold_s = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            exact.count(text)
+    warm_s = time.perf_counter() - started
+
+    # Cached recounts must beat re-encoding by a wide margin.
+    assert warm_s / rounds < cold_s / 5
@@ -2,9 +2,20 @@
 
 from unittest.mock import MagicMock
 
+import pytest
+
+from code_puppy.provider_credentials import clear_credential_caches
 from code_puppy.tools import command_runner
 
 
+@pytest.fixture(autouse=True)
+def _fresh_credential_caches():
+    """Tests patch the catalog helpers; don't let a cached scrub set mask that."""
+    clear_credential_caches()
+    yield
+    clear_credential_caches()
+
+
 class _StopPopen(Exception):
     """Sentinel raised by the fake Popen once the env has been captured."""
 
@@ -164,3 +175,42 @@ def test_hook_environment_includes_provider_credentials(monkeypatch):
     assert env["GITHUB_TOKEN"] == "user-token"
     assert env["CLAUDE_TOOL_NAME"] == "Edit"
     assert env["CLAUDE_FILE_PATH"] == "a.py"
+
+
+async def test_repeated_spawns_load_the_catalog_once(monkeypatch):
+    """1000 sequential shell commands reuse one catalog load and env scrub."""
+    from code_puppy.model_factory import ModelFactory
+
+    real_load_config = ModelFactory.load_config
+    loads = []
+
+    def counting_load_config():
+        loads.append(1)
+        return real_load_config()
+
+    monkeypatch.setattr(ModelFactory, "load_config", counting_load_config)
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "should-not-leak")
+
+    envs = []
+
+    def fake_popen(*args, **kwargs):
+        envs.append(kwargs.get("env"))
+        raise _StopPopen()
+
+    monkeypatch.setattr(command_runner.subprocess, "Popen", fake_popen)
+    monkeypatch.setattr(
+        command_runner, "get_command_executor", lambda: None, raising=False
+    )
+
+    async def _no_callbacks(*args, **kwargs):
+        return []
+
+    monkeypatch.setattr("code_puppy.callbacks.on_run_shell_command", _no_callbacks)
+
+    for _ in range(1000):
+        await command_runner.run_shell_command(MagicMock(), "true", None, 5, False)
+
+    assert len(envs) == 1000
+    assert all("ANTHROPIC_API_KEY" not in env for env in envs)
+    # One miss = the api_key pass + the secret-header pass.
+    assert len(loads) == 2
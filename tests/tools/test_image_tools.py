@@ -0,0 +1,40 @@
+"""Resize and caching behaviour of the load_image tool's preparation step."""
+
+import io
+from unittest.mock import patch
+
+from PIL import Image
+
+from code_puppy.command_line import image_utils
+from code_puppy.tools.image_tools import MAX_IMAGE_EDGE, _validate_and_prepare_image
+
+
+def _jpeg(width, height):
+    buf = io.BytesIO()
+    Image.effect_noise((width, height), 30).convert("RGB").save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+def test_small_images_are_returned_without_decoding():
+    data = _jpeg(640, 480)
+    with patch.object(Image.Image, "load") as load:
+        prepared = _validate_and_prepare_image(data, "a.jpg", MAX_IMAGE_EDGE)
+
+    load.assert_not_called()
+    assert prepared["image_bytes"] is data
+    assert prepared["was_resized"] is False
+    assert prepared["media_type"] == "image/jpeg"
+
+
+def test_resized_output_is_cached_by_content():
+    data = _jpeg(4096, 3072)
+    first = _validate_and_prepare_image(data, "a.jpg", MAX_IMAGE_EDGE)
+    with patch.object(Image.Image, "resize") as resize:
+        second = _validate_and_prepare_image(data, "b.jpeg", MAX_IMAGE_EDGE)
+
+    resize.assert_not_called()
+    assert first["was_resized"] and second["was_resized"]
+    assert second["image_bytes"] == first["image_bytes"]
+    assert (second["output_width"], second["output_height"]) == (2048, 1536)
+    assert second["media_type"] == "image/png"
+    assert image_utils.normalized_image_cache_stats()["hits"] == 1
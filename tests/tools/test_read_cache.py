@@ -0,0 +1,158 @@
+"""The process-wide read_file cache and its invalidation."""
+
+import builtins
+import os
+import threading
+import time
+
+import pytest
+
+from code_puppy.messaging import MessageBus
+from code_puppy.tools import file_operations, fs_access
+from code_puppy.tools.common import write_project_file
+from code_puppy.tools.file_operations import _read_file
+from code_puppy.tools.read_cache import file_read_cache, read_cache_stats
+
+
+@pytest.fixture(autouse=True)
+def bus(monkeypatch):
+    """A private headless bus, whatever renderer state earlier tests left."""
+    bus = MessageBus()
+    monkeypatch.setattr(file_operations, "get_message_bus", lambda: bus)
+    return bus
+
+
+@pytest.fixture
+def no_open(monkeypatch):
+    """Fail any open() of a file under ``tmp_path`` while active."""
+    real_open = builtins.open
+    blocked = []
+
+    def guarded(file, *args, **kwargs):
+        if blocked and str(file).startswith(blocked[0]):
+            raise AssertionError(f"opened {file}")
+        return real_open(file, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "open", guarded)
+    return blocked
+
+
+def test_repeat_reads_are_served_without_opening_the_file(tmp_path, no_open, bus):
+    path = tmp_path / "mod.py"
+    path.write_text("a = 1\nb = 2\nc = 3\n")
+    first = _read_file(None, str(path))
+    sliced = _read_file(None, str(path), start_line=2, num_lines=1)
+
+    no_open.append(str(tmp_path))
+    bus.clear_buffer()
+    assert _read_file(None, str(path)) == first
+    assert _read_file(None, str(path), start_line=2, num_lines=1) == sliced
+    # Only one bound means a whole-file read: same entry as no bounds.
+    assert _read_file(None, str(path), start_line=2).content == first.content
+
+    assert sliced.content == "b = 2\n"
+    # Hits still show the read in the UI.
+    shown = [m.content for m in bus.get_buffered_messages()]
+    assert shown == [first.content, "b = 2\n", first.content]
+    stats = read_cache_stats()
+    assert (stats["hits"], stats["misses"]) == (3, 2)
+    assert stats["bytes_saved"] == 2 * 18 + 6
+
+
+def test_external_change_is_seen_through_mtime_and_size(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("one\n")
+    assert _read_file(None, str(path)).content == "one\n"
+
+    path.write_text("three\n")
+    assert _read_file(None, str(path)).content == "three\n"
+
+    before = os.stat(path)
+    path.write_text("THREE\n")
+    os.utime(path, ns=(before.st_atime_ns, before.st_mtime_ns + 1_000_000))
+    assert _read_file(None, str(path)).content == "THREE\n"
+
+
+def test_tool_writes_invalidate_even_within_one_mtime_tick(tmp_path):
+    path = tmp_path / "same.txt"
+    path.write_text("old!\n")
+    before = os.stat(path)
+    assert _read_file(None, str(path)).content == "old!\n"
+
+    # Same inode, same size and the mtime put back: only invalidation helps.
+    fs_access.write_text(str(path), "new!\n")
+    os.utime(path, ns=(before.st_atime_ns, before.st_mtime_ns))
+    assert _read_file(None, str(path)).content == "new!\n"
+
+    write_project_file(str(path), "edit\n")
+    assert _read_file(None, str(path)).content == "edit\n"
+    fs_access.delete_file(str(path))
+    assert _read_file(None, str(path)).error.endswith("does not exist")
+    assert read_cache_stats()["invalidations"] == 3
+
+
+def test_oversized_refusal_is_cached_and_cache_is_shared_across_threads(
+    tmp_path, no_open
+):
+    path = tmp_path / "huge.log"
+    path.write_text("x" * 50_000)
+    refused = _read_file(None, str(path))
+    assert refused.content is None and "massive" in refused.error
+
+    # A subagent reading from another thread hits the same entry.
+    no_open.append(str(tmp_path))
+    results = []
+    reader = threading.Thread(
+        target=lambda: results.append(_read_file(None, str(path)))
+    )
+    reader.start()
+    reader.join()
+    assert results == [refused]
+    assert read_cache_stats()["bytes_saved"] == 50_000
+
+
+@pytest.mark.benchmark
+def test_benchmark_500_files_over_10_turns(tmp_path, bus):
+    files = []
+    for i in range(500):
+        path = tmp_path / f"pkg{i % 20}" / f"module_{i}.py"
+        path.parent.mkdir(exist_ok=True)
+        body = "".join(
+            f"def handler_{i}_{n}(request):\n    return {{'id': {n}, 'ok': True}}\n"
+            for n in range(300)
+        )
+        path.write_text(body)
+        files.append(str(path))
+    edited_per_turn = 10
+    bus.set_headless_sink(lambda message: None)
+
+    def turns(cached):
+        elapsed = 0.0
+        for turn in range(10):
+            if not cached:
+                file_read_cache.clear()
+            # The agent edits a few files between turns.
+            for path in files[turn * edited_per_turn : (turn + 1) * edited_per_turn]:
+                if turn:
+                    write_project_file(path, f"# turn {turn}\n" + open(path).read())
+            started = time.perf_counter()
+            for n, path in enumerate(files):
+                # Whole files mostly, and a slice of every fifth.
+                if n % 5:
+                    out = _read_file(None, path)
+                else:
+                    out = _read_file(None, path, start_line=40, num_lines=60)
+                assert out.error is None
+            elapsed += time.perf_counter() - started
+        return elapsed
+
+    uncached = turns(cached=False)
+    file_read_cache.clear()
+    cached = turns(cached=True)
+    stats = read_cache_stats()
+
+    # Turn one is all misses, later turns miss only the files just edited.
+    assert stats["misses"] == 500 + 9 * edited_per_turn
+    assert stats["hit_rate"] > 0.88
+    # Hits still build and emit the UI message; the disk read and decode go.
+    assert cached < uncached / 1.5
@@ -0,0 +1,175 @@
+"""Bounded stdout/stderr capture for streaming shell commands."""
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+from unittest.mock import MagicMock
+
+import pytest
+
+from code_puppy.tools import shell_output
+from code_puppy.tools.command_runner import MAX_LINE_LENGTH, run_shell_command_streaming
+from code_puppy.tools.file_operations import _read_file
+from code_puppy.tools.shell_output import StreamCapture, read_spilled_lines
+
+
+@pytest.fixture(autouse=True)
+def small_buffers(monkeypatch):
+    monkeypatch.setattr(shell_output, "HEAD_BYTES", 512)
+    monkeypatch.setattr(shell_output, "TAIL_BYTES", 8192)
+    monkeypatch.setattr(shell_output, "INDEX_STRIDE_BYTES", 4096)
+    yield
+    shell_output._remove_spills()
+
+
+def _feed_in_chunks(capture, data, size):
+    lines = []
+    for i in range(0, len(data), size):
+        lines += capture.feed(data[i : i + size])
+    return lines + capture.finish()
+
+
+def test_small_output_matches_the_old_line_list():
+    data = b"".join(f"line {i}\n".encode() for i in range(300))
+    data += b"progress 1\rprogress 2\r\n" + b"x" * 1000 + b"\nno newline"
+    expected = data.decode().splitlines()
+
+    for size in (1, 7, 4096):
+        capture = StreamCapture("stdout", MAX_LINE_LENGTH)
+        lines = _feed_in_chunks(capture, data, size)
+        truncated = [
+            line
+            if len(line) <= MAX_LINE_LENGTH
+            else line[:MAX_LINE_LENGTH] + "... [truncated]"
+            for line in expected
+        ]
+        assert lines == truncated, size
+        assert capture.text() == "\n".join(truncated[-256:])
+        assert not capture.spilled
+
+
+def test_large_output_spills_everything_and_keeps_memory_fixed():
+    data = b"".join(f"row {i:06d} ".encode() + b"." * 40 + b"\n" for i in range(5000))
+    capture = StreamCapture("stdout", MAX_LINE_LENGTH)
+    _feed_in_chunks(capture, data, 1000)
+    capture.close()
+
+    assert capture.spilled
+    with open(capture.spill_path, "rb") as f:
+        assert f.read() == data
+    assert len(capture._tail.getvalue()) == 8192
+    assert len(capture._head) == 512
+
+    text = capture.text().split("\n")
+    assert text[0].startswith("row 000000")
+    assert text[-1].startswith("row 004999")
+    note = next(line for line in text if line.startswith("[..."))
+    assert capture.spill_path in note and "5,000 lines" in note
+    assert len(text) <= shell_output.HEAD_LINES + 1 + shell_output.TAIL_LINES
+
+
+def test_spilled_output_pages_through_read_file_by_seeking():
+    data = b"".join(f"entry {i}\n".encode() for i in range(20_000))
+    capture = StreamCapture("stdout", MAX_LINE_LENGTH)
+    _feed_in_chunks(capture, data, 3000)
+    capture.close()
+    assert len(capture._index_lines) > 10
+    all_lines = data.decode().splitlines(keepends=True)
+
+    for start in (1, 2, 4097, 12_345, 19_999):
+        assert read_spilled_lines(capture.spill_path, start, 3) == "".join(
+            all_lines[start - 1 : start + 2]
+        )
+    assert read_spilled_lines(capture.spill_path, 25_000, 3) == ""
+    assert read_spilled_lines(__file__, 1, 3) is None
+
+    result = _read_file(MagicMock(), capture.spill_path, start_line=15_000, num_lines=2)
+    assert result.content == "entry 14999\nentry 15000\n"
+
+
+def test_streaming_command_returns_tail_and_spill_path():
+    script = "import sys\nfor i in range(4000): print('out', i)\nprint('bad', file=sys.stderr)"
+    process = subprocess.Popen(
+        [sys.executable, "-c", script],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        start_new_session=True,
+    )
+    result = run_shell_command_streaming(process, timeout=30, command="x", silent=True)
+
+    assert result.success and result.exit_code == 0
+    assert result.stdout.split("\n")[-1] == "out 3999"
+    assert "saved to" in result.stdout
+    assert result.stderr == "bad"
+
+
+_RSS_PROBE = textwrap.dedent(
+    """
+    import json, resource, subprocess, sys
+    from code_puppy.tools.command_runner import run_shell_command_streaming
+
+    def peak_kb():
+        # ru_maxrss inherits the forking parent's high-water mark on Linux;
+        # VmHWM belongs to this process image alone.
+        try:
+            with open("/proc/self/status") as f:
+                for line in f:
+                    if line.startswith("VmHWM:"):
+                        return int(line.split()[1])
+        except OSError:
+            pass
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    mode, megabytes = sys.argv[1], int(sys.argv[2])
+    writer = (
+        "import sys\\n"
+        "block = b''.join(b'%08d build output line padded out to a typical width ....\\\\n' % i"
+        " for i in range(16384))\\n"
+        f"for _ in range({megabytes}): sys.stdout.buffer.write(block)\\n"
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-c", writer], stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE, text=True, start_new_session=True,
+    )
+    baseline = peak_kb()
+    if mode == "lines":
+        # What the readers used to do: every truncated line in a list.
+        lines = [line.rstrip("\\r\\n")[:256] for line in process.stdout]
+        process.wait()
+        stdout = "\\n".join(lines[-256:])
+    else:
+        stdout = run_shell_command_streaming(
+            process, timeout=60, command="big", silent=True
+        ).stdout
+    growth_mb = (peak_kb() - baseline) / 1024
+    print(json.dumps({"growth_mb": growth_mb, "tail": stdout.splitlines()[-1]}))
+    """
+)
+
+
+def _probe(mode, megabytes):
+    out = subprocess.run(
+        [sys.executable, "-c", _RSS_PROBE, mode, str(megabytes)],
+        capture_output=True,
+        text=True,
+        timeout=600,
+        cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    )
+    assert out.returncode == 0, out.stderr
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="ru_maxrss is POSIX")
+def test_benchmark_peak_rss_for_1gb_of_output():
+    old = _probe("lines", 128)
+    # 1 GB of output, almost all of it spilled to disk.
+    new = _probe("capture", 1024)
+
+    # Both end on the same line: the last of a repeated 16,384-line block.
+    assert new["tail"] == old["tail"]
+    assert new["growth_mb"] < 64
+    assert new["growth_mb"] < old["growth_mb"] / 4
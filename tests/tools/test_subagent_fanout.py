@@ -0,0 +1,332 @@
+"""invoke_agents_parallel and the sub-agent concurrency governor."""
+
+import asyncio
+import time
+from contextlib import ExitStack, contextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models.function import FunctionModel
+
+from code_puppy.tools import subagent_governor
+from code_puppy.tools.subagent_fanout import (
+    MAX_PARALLEL_TASKS,
+    ParallelAgentTask,
+    register_invoke_agents_parallel,
+)
+from code_puppy.tools.subagent_governor import SubagentGovernor
+
+RUN_SECONDS = 0.2
+
+
+class _Provider:
+    """A FunctionModel that records how many requests it serves at once."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.in_flight = 0
+        self.peak = 0
+        self.model = FunctionModel(
+            self._respond, stream_function=self._stream, model_name=name
+        )
+
+    async def _hold(self):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(RUN_SECONDS)
+        finally:
+            self.in_flight -= 1
+
+    async def _respond(self, messages, info):
+        await self._hold()
+        return ModelResponse(parts=[TextPart(content=f"answer from {self.name}")])
+
+    async def _stream(self, messages, info):
+        await self._hold()
+        yield f"answer from {self.name}"
+
+
+def _agent_config(model_name: str):
+    config = MagicMock()
+
+    @contextmanager
+    def temporary_override(_model_name):
+        yield
+
+    config.temporary_model_name_override.side_effect = temporary_override
+    config.get_model_name.return_value = model_name
+    config.get_full_system_prompt.return_value = "You are a test agent."
+    config.get_available_tools.return_value = []
+    config.get_message_history.return_value = []
+    return config
+
+
+@pytest.fixture
+def providers():
+    return {"model-a": _Provider("model-a"), "model-b": _Provider("model-b")}
+
+
+@contextmanager
+def _fanout_env(providers, *, max_concurrency: int, max_per_model: int):
+    """Real pydantic-ai agents on FunctionModels; everything else stubbed."""
+    agent_models = {"alpha": "model-a", "beta": "model-b"}
+    progress = []
+
+    def _load_model(requested, *_args, **_kwargs):
+        return providers[requested].model, requested
+
+    with ExitStack() as stack:
+        p = stack.enter_context
+        p(
+            patch(
+                "code_puppy.agents.agent_manager.load_agent",
+                side_effect=lambda name: _agent_config(agent_models[name]),
+            )
+        )
+        p(
+            patch(
+                "code_puppy.agents._builder.load_model_with_fallback",
+                side_effect=_load_model,
+            )
+        )
+        p(
+            patch(
+                "code_puppy.model_factory.ModelFactory.load_config",
+                return_value={"model-a": {}, "model-b": {}},
+            )
+        )
+        p(patch("code_puppy.model_factory.make_model_settings", return_value=None))
+        p(
+            patch(
+                "code_puppy.model_utils.prepare_prompt_for_model",
+                side_effect=lambda _m, instructions, prompt, **_k: MagicMock(
+                    instructions=instructions, user_prompt=prompt
+                ),
+            )
+        )
+        # Disables MCP autostart (read through get_value).
+        p(patch("code_puppy.config.get_value", return_value="true"))
+        p(patch("code_puppy.config.get_output_level", return_value="medium"))
+        p(
+            patch(
+                "code_puppy.config.get_subagent_max_concurrency",
+                return_value=max_concurrency,
+            )
+        )
+        p(
+            patch(
+                "code_puppy.config.get_subagent_max_concurrency_per_model",
+                return_value=max_per_model,
+            )
+        )
+        p(
+            patch(
+                "code_puppy.agents._compaction.make_history_processor",
+                return_value=lambda messages: messages,
+            )
+        )
+        p(
+            patch(
+                "code_puppy.agents.retry_profiles.make_streaming_retry",
+                new=lambda *_a, **_k: lambda func: func,
+            )
+        )
+        p(patch("code_puppy.tools.register_tools_for_agent"))
+        p(
+            patch(
+                "code_puppy.tools.subagent_invocation.on_wrap_pydantic_agent",
+                side_effect=lambda _cfg, agent, **_kwargs: agent,
+            )
+        )
+        p(
+            patch(
+                "code_puppy.tools.subagent_invocation.on_agent_run_context",
+                return_value=[],
+            )
+        )
+        p(
+            patch(
+                "code_puppy.agents._builder.autostart_bound_servers_async",
+                new=AsyncMock(),
+            )
+        )
+        p(patch("code_puppy.tools.subagent_invocation.get_message_bus"))
+        p(patch("code_puppy.tools.subagent_invocation.set_session_context"))
+        p(patch("code_puppy.tools.subagent_invocation.emit_info"))
+        p(patch("code_puppy.tools.subagent_invocation.emit_success"))
+        p(patch("code_puppy.tools.subagent_invocation.emit_error"))
+        p(patch("code_puppy.tools.subagent_invocation._save_session_history"))
+        p(
+            patch(
+                "code_puppy.tools.subagent_invocation._load_session_history",
+                return_value=[],
+            )
+        )
+        p(
+            patch(
+                "code_puppy.tools.subagent_fanout.emit_info",
+                side_effect=lambda text, **_k: progress.append(text),
+            )
+        )
+        p(patch("code_puppy.tools.subagent_fanout.emit_error"))
+        yield progress
+
+
+def _capture_tool():
+    mock_agent = MagicMock()
+    captured = {}
+
+    def capture(func):
+        captured["func"] = func
+        return func
+
+    mock_agent.tool = capture
+    register_invoke_agents_parallel(mock_agent)
+    return captured["func"]
+
+
+def _tasks(*agent_names):
+    return [
+        ParallelAgentTask(agent_name=name, prompt=f"task {i}")
+        for i, name in enumerate(agent_names)
+    ]
+
+
+class TestInvokeAgentsParallel:
+    async def test_global_cap_and_wall_clock_speedup(self, providers):
+        tool = _capture_tool()
+        with _fanout_env(providers, max_concurrency=3, max_per_model=3):
+            started = time.perf_counter()
+            out = await tool(MagicMock(), _tasks(*["alpha"] * 8))
+            wall = time.perf_counter() - started
+
+        assert out.error is None
+        assert [r.index for r in out.results] == list(range(8))
+        assert all(r.response == "answer from model-a" for r in out.results)
+        assert providers["model-a"].peak == 3
+        # Serial would take 8 x 0.2s; three at a time needs three waves.
+        assert wall < 8 * RUN_SECONDS / 2
+        assert wall >= 3 * RUN_SECONDS * 0.9
+
+    async def test_per_model_cap_does_not_starve_other_models(self, providers):
+        tool = _capture_tool()
+        with _fanout_env(providers, max_concurrency=4, max_per_model=2):
+            out = await tool(MagicMock(), _tasks(*["alpha"] * 4, *["beta"] * 4))
+
+        assert providers["model-a"].peak == 2
+        assert providers["model-b"].peak == 2
+        assert [r.model_name for r in out.results] == ["model-a"] * 4 + ["model-b"] * 4
+        # beta tasks arrived after every alpha task, but ran in the first wave.
+        first_beta = out.results[4]
+        assert first_beta.queued_ms < RUN_SECONDS * 1000 / 2
+
+    async def test_per_task_timing_and_progress(self, providers):
+        tool = _capture_tool()
+        with _fanout_env(providers, max_concurrency=1, max_per_model=1) as progress:
+            out = await tool(MagicMock(), _tasks("alpha", "alpha"))
+
+        first, second = out.results
+        assert first.queued_ms < second.queued_ms
+        assert second.queued_ms >= RUN_SECONDS * 1000 * 0.9
+        for result in out.results:
+            assert result.run_ms >= RUN_SECONDS * 1000 * 0.9
+            assert result.total_ms >= result.run_ms
+        assert out.wall_ms >= 2 * RUN_SECONDS * 1000 * 0.9
+        assert any("[2/2] alpha running on model-a" in line for line in progress)
+        assert sum("done in" in line for line in progress) == 2
+
+    async def test_rejects_empty_and_oversized_requests(self, providers):
+        tool = _capture_tool()
+        with _fanout_env(providers, max_concurrency=2, max_per_model=2):
+            empty = await tool(MagicMock(), [])
+            oversized = await tool(
+                MagicMock(), _tasks(*["alpha"] * (MAX_PARALLEL_TASKS + 1))
+            )
+
+        assert empty.error and empty.results == []
+        assert "Too many tasks" in oversized.error
+        assert providers["model-a"].peak == 0
+
+
+class TestSubagentGovernor:
+    async def test_waiters_are_served_in_arrival_order(self):
+        governor = SubagentGovernor(max_concurrent=1, max_per_model=1)
+        order = []
+
+        async def run(label):
+            async with governor.slot("m"):
+                order.append(label)
+                await asyncio.sleep(0)
+
+        await asyncio.gather(*(run(i) for i in range(5)))
+        assert order == list(range(5))
+        assert governor.peak == 1
+
+    async def test_cancelled_waiter_gives_up_its_place(self):
+        governor = SubagentGovernor(max_concurrent=1, max_per_model=1)
+        release = asyncio.Event()
+
+        async def holder():
+            async with governor.slot("m"):
+                await release.wait()
+
+        holding = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        assert governor.queued == 1
+
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        release.set()
+        await holding
+        assert governor.active == 0
+        assert governor.queued == 0
+
+    async def test_nested_runs_do_not_inherit_the_parent_timing(self):
+        governor = SubagentGovernor(max_concurrent=2, max_per_model=2)
+        starts = []
+        timing = subagent_governor.SlotTiming(on_start=starts.append)
+        subagent_governor.current_slot_timing.set(timing)
+
+        async with governor.slot("parent"):
+            async with governor.slot("child"):
+                pass
+
+        assert starts == [timing]
+        assert timing.model_name == "parent"
+
+    async def test_raising_a_limit_admits_waiters(self):
+        with (
+            patch("code_puppy.config.get_subagent_max_concurrency", return_value=1),
+            patch(
+                "code_puppy.config.get_subagent_max_concurrency_per_model",
+                return_value=4,
+            ),
+        ):
+            governor = subagent_governor.get_subagent_governor(depth=7)
+        release = asyncio.Event()
+
+        async def run():
+            async with governor.slot("m"):
+                await release.wait()
+
+        tasks = [asyncio.create_task(run()) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert (governor.active, governor.queued) == (1, 1)
+
+        with (
+            patch("code_puppy.config.get_subagent_max_concurrency", return_value=2),
+            patch(
+                "code_puppy.config.get_subagent_max_concurrency_per_model",
+                return_value=4,
+            ),
+        ):
+            assert subagent_governor.get_subagent_governor(depth=7) is governor
+        await asyncio.sleep(0)
+        assert (governor.active, governor.queued) == (2, 0)
+        release.set()
+        await asyncio.gather(*tasks)
@@ -0,0 +1,223 @@
+"""Journaled sub-agent session persistence and retention sweeps."""
+
+import json
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart, UserPromptPart
+
+from code_puppy.tools import subagent_sessions
+from code_puppy.tools.agent_tools import _load_session_history, _save_session_history
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state():
+    subagent_sessions.reset_state()
+    yield
+    subagent_sessions.reset_state()
+
+
+@pytest.fixture
+def sessions_dir(tmp_path: Path):
+    directory = tmp_path / "subagent_sessions"
+    directory.mkdir()
+    with (
+        patch(
+            "code_puppy.tools.agent_tools._get_subagent_sessions_dir",
+            return_value=directory,
+        ),
+        patch.object(subagent_sessions, "schedule_sweep", return_value=False),
+    ):
+        yield directory
+
+
+def _turn(i: int) -> list:
+    return [
+        ModelRequest(parts=[UserPromptPart(content=f"step {i}: " + "do it " * 20)]),
+        ModelResponse(parts=[TextPart(content=f"done {i}: " + "result " * 40)]),
+    ]
+
+
+def _dir_bytes(directory: Path) -> int:
+    return sum(p.stat().st_size for p in directory.iterdir() if p.is_file())
+
+
+def _texts(messages) -> list:
+    return [part.content for message in messages for part in message.parts]
+
+
+def test_five_hundred_invocations_write_linear_bytes(sessions_dir: Path):
+    history = _load_session_history("long-run")
+    rewrite_everything_bytes = 0
+    for i in range(500):
+        # Each run hands back the loaded/saved messages plus its new turn.
+        history = history + _turn(i)
+        _save_session_history(
+            session_id="long-run",
+            message_history=history,
+            agent_name="worker",
+            initial_prompt="start" if i == 0 else None,
+        )
+        rewrite_everything_bytes += (sessions_dir / "long-run.json").stat().st_size
+
+    envelope = sessions_dir / "long-run.json"
+    subagent_sessions.reset_state()
+    loaded = _load_session_history("long-run")
+    assert _texts(loaded) == _texts(history)
+
+    subagent_sessions._compact(envelope, history)
+    full_envelope_bytes = envelope.stat().st_size
+    # Appends plus geometric compactions: a small multiple of the final size,
+    # far below what rewriting the envelope every time would cost.
+    assert subagent_sessions.bytes_written < 5 * full_envelope_bytes
+    assert subagent_sessions.bytes_written * 20 < rewrite_everything_bytes
+    # Journal never grows past the envelope it will be folded into.
+    assert _dir_bytes(sessions_dir) < 3 * full_envelope_bytes
+
+
+def test_append_only_writes_the_new_messages(sessions_dir: Path):
+    first = _turn(0)
+    _save_session_history("small", first, "worker", "start")
+    _save_session_history("small", first + _turn(1), "worker")
+
+    (line,) = (sessions_dir / "small.jsonl").read_text().splitlines()
+    entry = json.loads(line)
+    assert entry["base"] == 2
+    assert len(entry["messages"]) == 2
+
+
+def test_lines_already_in_the_envelope_are_skipped(sessions_dir: Path):
+    history = _turn(0)
+    _save_session_history("crashy", history, "worker", "start")
+    history = history + _turn(1)
+    _save_session_history("crashy", history, "worker")
+    journal = (sessions_dir / "crashy.jsonl").read_bytes()
+
+    # Crash between the envelope rewrite and the journal unlink.
+    subagent_sessions._compact(sessions_dir / "crashy.json", history)
+    (sessions_dir / "crashy.jsonl").write_bytes(journal)
+
+    subagent_sessions.reset_state()
+    assert _texts(_load_session_history("crashy")) == _texts(history)
+
+
+def test_torn_journal_keeps_complete_lines_then_compacts(sessions_dir: Path):
+    history = _turn(0)
+    _save_session_history("torn", history, "worker", "start")
+    for i in (1, 2):
+        history = history + _turn(i)
+        _save_session_history("torn", history, "worker")
+    with open(sessions_dir / "torn.jsonl", "ab") as f:
+        f.write(b'{"base": 6, "messages": [{"kind"')
+
+    subagent_sessions.reset_state()
+    loaded = _load_session_history("torn")
+    assert _texts(loaded) == _texts(history)
+
+    _save_session_history("torn", loaded + _turn(3), "worker")
+    assert not (sessions_dir / "torn.jsonl").exists()
+    assert len(_load_session_history("torn")) == 8
+
+
+def test_diverging_history_rewrites_the_envelope(sessions_dir: Path):
+    history = _turn(0) + _turn(1)
+    _save_session_history("compacted", history, "worker", "start")
+    _save_session_history("compacted", history + _turn(2), "worker")
+    assert (sessions_dir / "compacted.jsonl").exists()
+
+    summarized = [ModelRequest(parts=[UserPromptPart(content="summary")])]
+    _save_session_history("compacted", summarized + _turn(3), "worker")
+
+    assert not (sessions_dir / "compacted.jsonl").exists()
+    subagent_sessions.reset_state()
+    loaded = _load_session_history("compacted")
+    assert _texts(loaded)[0] == "summary"
+    assert len(loaded) == 3
+
+
+def test_files_changed_elsewhere_are_not_appended_to(sessions_dir: Path):
+    history = _turn(0)
+    _save_session_history("shared", history, "worker", "start")
+    other = _turn(7)
+    subagent_sessions.save_history(sessions_dir / "shared.json", other)
+    # Simulate another process rewriting the envelope: new stamp.
+    stamp = time.time() + 5
+    os.utime(sessions_dir / "shared.json", (stamp, stamp))
+
+    _save_session_history("shared", other + _turn(8), "worker")
+    subagent_sessions.reset_state()
+    assert _texts(_load_session_history("shared")) == _texts(other + _turn(8))
+
+
+def _make_session(directory: Path, stem: str, size: int, age: float) -> None:
+    stamp = time.time() - age
+    for suffix in (".json", ".txt"):
+        path = directory / f"{stem}{suffix}"
+        path.write_bytes(b"x" * size)
+        os.utime(path, (stamp, stamp))
+
+
+def test_sweep_removes_expired_sessions(tmp_path: Path):
+    _make_session(tmp_path, "old", 10, age=40 * 86400)
+    _make_session(tmp_path, "recent", 10, age=86400)
+
+    removed = subagent_sessions.sweep_subagent_sessions(
+        tmp_path, max_age_days=30, max_count=0, max_bytes=0
+    )
+
+    assert removed == ["old"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["recent.json", "recent.txt"]
+
+
+def test_sweep_enforces_count_and_bytes_oldest_first(tmp_path: Path):
+    for i in range(6):
+        _make_session(tmp_path, f"s{i}", 100, age=3600 * (10 - i))
+
+    by_count = subagent_sessions.sweep_subagent_sessions(
+        tmp_path, max_age_days=0, max_count=4, max_bytes=0
+    )
+    assert by_count == ["s0", "s1"]
+
+    by_bytes = subagent_sessions.sweep_subagent_sessions(
+        tmp_path, max_age_days=0, max_count=0, max_bytes=450
+    )
+    assert by_bytes == ["s2", "s3"]
+    assert _dir_bytes(tmp_path) <= 450
+
+
+def test_sweep_spares_protected_and_active_sessions(tmp_path: Path):
+    _make_session(tmp_path, "pinned", 10, age=3600)
+    _make_session(tmp_path, "running", 10, age=5)
+
+    removed = subagent_sessions.sweep_subagent_sessions(
+        tmp_path, max_age_days=0, max_count=1, max_bytes=1, protect=["pinned"]
+    )
+
+    assert removed == []
+
+
+def test_sweep_ignores_unrelated_files(tmp_path: Path):
+    (tmp_path / "pre_v2_backup").mkdir()
+    (tmp_path / "notes.md").write_text("keep me")
+    os.utime(tmp_path / "notes.md", (0, 0))
+
+    assert (
+        subagent_sessions.sweep_subagent_sessions(
+            tmp_path, max_age_days=1, max_count=0, max_bytes=0
+        )
+        == []
+    )
+    assert (tmp_path / "notes.md").exists()
+
+
+def test_background_sweep_runs_at_most_once_per_interval(tmp_path: Path):
+    with patch.object(subagent_sessions, "_sweep_with_config") as sweep:
+        assert subagent_sessions.schedule_sweep(tmp_path, protect=["a"])
+        assert not subagent_sessions.schedule_sweep(tmp_path, protect=["a"])
+    deadline = time.time() + 5
+    while not sweep.called and time.time() < deadline:
+        time.sleep(0.01)
+    sweep.assert_called_once_with(tmp_path, ("a",))